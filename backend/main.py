@@ -5,6 +5,7 @@ Phase 1: 기반 구축
 """
 
 import os
+import asyncio
 import ssl
 
 # ============================================================================
@@ -39,7 +40,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # Models import (테이블 생성을 위해)
-from models import Base, engine, init_db
+from models import Base, engine, async_engine, init_db
 
 # Routers import
 from routers import menus_router, screens_router, resources_router
@@ -132,12 +133,42 @@ async def startup_event():
             print("[WARNING] init.sql not found, skipping database initialization")
     except Exception as e:
         print(f"[ERROR] Database initialization error: {e}")
+    
+    # 생성 작업 큐 워커 풀 시작 (고아 작업 리퍼 포함)
+    try:
+        from services.job_queue import get_job_queue
+        await get_job_queue().start()
+    except Exception as e:
+        print(f"[ERROR] Job queue start failed: {e}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """앱 종료 시 실행"""
     print("[SHUTDOWN] ForgeFlow API Shutting down...")
+    
+    # 작업 큐 워커 종료 (실행 중 작업은 리스 만료 후 재개됨)
+    from services.job_queue import get_job_queue
+    await get_job_queue().stop()
+    
+    # Gemini HTTP 커넥션 풀 종료
+    from services.gemini_client import close_gemini_client
+    await close_gemini_client()
+    
+    # 남은 Gemini 사용량 기록 저장
+    from services.usage_metrics import get_usage_recorder
+    await get_usage_recorder().flush_async()
+    
+    # 이벤트 버스 (Redis Pub/Sub 리스너) 종료
+    from services.event_bus import get_event_bus
+    await get_event_bus().close()
+    
+    # 문서 렌더링 프로세스 풀 종료
+    from services.docx_renderer import get_docx_render_pool
+    await asyncio.to_thread(get_docx_render_pool().shutdown)
+    
+    # 비동기 DB 커넥션 풀 종료
+    await async_engine.dispose()
 
 
 @app.get("/", response_class=HTMLResponse, tags=["root"])
@@ -0,0 +1,35 @@
+-- 007: 영속 생성 작업 큐 (generation_jobs) 테이블 추가
+-- BackgroundTasks 대신 DB에 작업을 저장하여 재시작/배포 중에도 유실되지 않도록 함
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    screen_id INTEGER,
+    payload JSON,
+    result JSON,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    lease_owner VARCHAR(100),
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    FOREIGN KEY (screen_id) REFERENCES screens(id) ON DELETE CASCADE,
+    CONSTRAINT generation_jobs_status_check CHECK (status IN ('queued', 'running', 'succeeded', 'failed'))
+);
+
+COMMENT ON TABLE generation_jobs IS '프로토타입 생성 작업 큐 (리스/하트비트 기반 워커 풀)';
+COMMENT ON COLUMN generation_jobs.lease_expires_at IS '리스 만료 시각 (만료 시 리퍼가 재큐잉)';
+
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_id ON generation_jobs(id);
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_screen_id ON generation_jobs(screen_id);
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_claim ON generation_jobs(status, available_at, priority);
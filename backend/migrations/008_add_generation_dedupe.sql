@@ -0,0 +1,13 @@
+-- 008: 동일 생성 요청 병합(dedupe_key) + 최신 요청 우선(generation_token)
+-- 동시에 들어온 같은 입력의 생성 요청은 진행 중인 작업에 합류하고,
+-- 서로 다른 요청이 겹치면 마지막 요청만 결과를 저장합니다.
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS dedupe_key VARCHAR(64);
+COMMENT ON COLUMN generation_jobs.dedupe_key IS '동일 요청 병합 키 (화면 ID + 입력 해시)';
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_dedupe_key ON generation_jobs(dedupe_key);
+
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS generation_token VARCHAR(64);
+COMMENT ON COLUMN screens.generation_token IS '현재 유효한 생성 요청 토큰 (이전 요청의 결과 덮어쓰기 방지)';
@@ -0,0 +1,21 @@
+-- 009: 산출물 외부 저장소(BlobStore) 참조
+-- 생성된 문서 본문은 BlobStore(로컬 파일 시스템 / S3 호환)에 SHA-256 키로 저장하고,
+-- screens 행에는 해시/크기/Content-Type만 저장합니다.
+-- 기존 design_doc / test_plan_doc / user_manual_doc(BYTEA) 데이터는 첫 다운로드 시 BlobStore로 옮겨지고 NULL이 됩니다.
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_content_type VARCHAR(100);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_content_type VARCHAR(100);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_content_type VARCHAR(100);
+
+COMMENT ON COLUMN screens.design_doc_sha256 IS '설계서 blob SHA-256';
+COMMENT ON COLUMN screens.test_plan_doc_sha256 IS '테스트 계획서 blob SHA-256';
+COMMENT ON COLUMN screens.user_manual_doc_sha256 IS '사용자 매뉴얼 blob SHA-256';
@@ -0,0 +1,9 @@
+-- 010: 4단계 생성 단계별 결과 재사용 (증분 재생성)
+-- 단계마다 입력 해시(Step 명세 + 이전 단계 입력 해시/출력 코드)와 출력 코드를 저장하고,
+-- Wizard 일부만 바뀐 재생성은 입력이 처음 달라진 단계부터 다시 생성합니다.
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS stage_memo JSON;
+COMMENT ON COLUMN screens.stage_memo IS '4단계 생성 단계별 입력 해시/출력 코드 [{stage, input_hash, code}]';
@@ -0,0 +1,19 @@
+-- 011: 작업별 Gemini 모델 라우팅 (model_routes) 테이블 추가
+-- 4단계 생성/연속 생성/문서 추출 작업마다 모델과 생성 설정을 지정하고,
+-- 429/5xx 시 보조 모델로 장애 조치합니다. enabled 행은 GEMINI_MODEL_ROUTES 환경 변수 라우트를 덮어씁니다.
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+CREATE TABLE IF NOT EXISTS model_routes (
+    operation VARCHAR(50) PRIMARY KEY,
+    model VARCHAR(100),
+    fallback_models JSON,
+    generation_config JSON,
+    enabled BOOLEAN NOT NULL DEFAULT TRUE,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE model_routes IS '작업별 Gemini 모델 라우팅 (stage-1~4, continuation, modal, design-spec, test-plan, user-manual, default)';
+COMMENT ON COLUMN model_routes.fallback_models IS '429/5xx 시 순서대로 시도할 보조 모델 목록';
+COMMENT ON COLUMN model_routes.generation_config IS '덮어쓸 생성 설정 {temperature, max_output_tokens, top_p, top_k}';
@@ -0,0 +1,26 @@
+-- 012: Gemini 호출별 토큰/지연 시간 기록 (llm_usage) 테이블 추가
+-- 작업(stage-N, continuation, design-spec 등)/화면/모델별 입력·캐시·출력 토큰과 응답 시간을 기록하고
+-- /api/ai/metrics에서 p50/p95 지연 시간과 일별 토큰 사용량으로 집계합니다.
+--
+-- ⚠️ 주의: 이 마이그레이션은 이미 init.sql에 포함되었습니다.
+-- 기존 데이터베이스를 업데이트할 때만 이 파일을 사용하세요.
+
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id SERIAL PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL,
+    operation VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    screen_id INTEGER,
+    status VARCHAR(30) NOT NULL DEFAULT 'ok',
+    cache_hit BOOLEAN NOT NULL DEFAULT FALSE,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS ix_llm_usage_created_at ON llm_usage(created_at);
+
+COMMENT ON TABLE llm_usage IS 'Gemini 호출별 토큰/지연 시간 기록 (services/usage_metrics.py)';
+COMMENT ON COLUMN llm_usage.screen_id IS '대상 화면 ID (화면 삭제 후에도 집계 유지를 위해 외래 키 없음)';
+COMMENT ON COLUMN llm_usage.latency_ms IS 'API 응답 시간 (할당량 대기 제외)';
@@ -75,3 +75,80 @@ CREATE INDEX IF NOT EXISTS ix_wizard_test_results_id ON wizard_test_results(id);
 CREATE INDEX IF NOT EXISTS ix_wizard_test_results_screen_id ON wizard_test_results(screen_id);
 
 
+
+-- 5. generation_jobs 테이블 생성 (영속 생성 작업 큐)
+CREATE TABLE IF NOT EXISTS generation_jobs (
+    id SERIAL PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    screen_id INTEGER,
+    dedupe_key VARCHAR(64),
+    payload JSON,
+    result JSON,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    priority INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    available_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    last_error TEXT,
+    lease_owner VARCHAR(100),
+    lease_expires_at TIMESTAMP,
+    heartbeat_at TIMESTAMP,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    FOREIGN KEY (screen_id) REFERENCES screens(id) ON DELETE CASCADE,
+    CONSTRAINT generation_jobs_status_check CHECK (status IN ('queued', 'running', 'succeeded', 'failed'))
+);
+
+-- generation_jobs 테이블 인덱스 (워커 클레임: 상태 + 실행 가능 시각)
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_id ON generation_jobs(id);
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_screen_id ON generation_jobs(screen_id);
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_claim ON generation_jobs(status, available_at, priority);
+
+-- 6. 동일 요청 병합 / 최신 요청 우선 (기존 DB 업그레이드 포함, 008 마이그레이션)
+ALTER TABLE generation_jobs ADD COLUMN IF NOT EXISTS dedupe_key VARCHAR(64);
+CREATE INDEX IF NOT EXISTS ix_generation_jobs_dedupe_key ON generation_jobs(dedupe_key);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS generation_token VARCHAR(64);
+
+-- 7. 산출물 외부 저장소(BlobStore) 참조 (기존 DB 업그레이드 포함, 009 마이그레이션)
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS design_doc_content_type VARCHAR(100);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS test_plan_doc_content_type VARCHAR(100);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_sha256 VARCHAR(64);
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_size BIGINT;
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS user_manual_doc_content_type VARCHAR(100);
+
+-- 8. 단계별 생성 결과 재사용 (기존 DB 업그레이드 포함, 010 마이그레이션)
+ALTER TABLE screens ADD COLUMN IF NOT EXISTS stage_memo JSON;
+
+-- 9. 작업별 모델 라우팅 (011 마이그레이션)
+CREATE TABLE IF NOT EXISTS model_routes (
+    operation VARCHAR(50) PRIMARY KEY,
+    model VARCHAR(100),
+    fallback_models JSON,
+    generation_config JSON,
+    enabled BOOLEAN NOT NULL DEFAULT TRUE,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+COMMENT ON TABLE model_routes IS '작업별 Gemini 모델 라우팅 (stage-1~4, continuation, modal, design-spec, test-plan, user-manual, default)';
+
+-- 10. Gemini 호출별 토큰/지연 시간 기록 (012 마이그레이션)
+CREATE TABLE IF NOT EXISTS llm_usage (
+    id SERIAL PRIMARY KEY,
+    created_at TIMESTAMP NOT NULL,
+    operation VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    screen_id INTEGER,
+    status VARCHAR(30) NOT NULL DEFAULT 'ok',
+    cache_hit BOOLEAN NOT NULL DEFAULT FALSE,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    cached_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    latency_ms INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_llm_usage_created_at ON llm_usage(created_at);
+COMMENT ON TABLE llm_usage IS 'Gemini 호출별 토큰/지연 시간 기록 (services/usage_metrics.py)';
@@ -2,10 +2,16 @@
 ForgeFlow - Database Models
 """
 
-from .database import Base, engine, SessionLocal, get_db, init_db
+from .database import (
+    Base, engine, SessionLocal, get_db, init_db,
+    async_engine, AsyncSessionLocal, get_async_db,
+)
 from .menu import Menu
 from .screen import Screen
 from .resource import Layout, Component, Action
+from .job import GenerationJob, JobStatus
+from .model_route import ModelRouteConfig
+from .llm_usage import LLMUsage
 
 __all__ = [
     "Base",
@@ -13,9 +19,16 @@ __all__ = [
     "SessionLocal",
     "get_db",
     "init_db",
+    "async_engine",
+    "AsyncSessionLocal",
+    "get_async_db",
     "Menu",
     "Screen",
     "Layout",
     "Component",
     "Action",
+    "GenerationJob",
+    "JobStatus",
+    "ModelRouteConfig",
+    "LLMUsage",
 ]
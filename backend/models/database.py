@@ -1,12 +1,25 @@
 # -*- coding: utf-8 -*-
 """
 Database configuration and connection management
+
+- 동기 엔진/세션 (SessionLocal, get_db): 작업 큐 워커, 생성 백그라운드 작업, 스크립트
+  async 코드에서는 세션 작업(조회/커밋)을 asyncio.to_thread로 실행합니다 (템플릿 조립 등 동기 서비스 공유)
+- 비동기 엔진/세션 (AsyncSessionLocal, get_async_db): async 라우터 핸들러
+  동기 세션의 쿼리는 이벤트 루프를 막으므로, 느린 쿼리 하나가 같은 워커의 모든 요청(상태 폴링 등)을 멈추게 합니다.
+  postgresql은 asyncpg, sqlite는 aiosqlite 드라이버를 사용합니다.
+
+환경 변수:
+- DATABASE_URL: 동기 엔진 URL (기본값: sqlite:///./forgeflow.db)
+- ASYNC_DATABASE_URL: 비동기 엔진 URL (기본값: DATABASE_URL의 드라이버를 asyncpg/aiosqlite로 바꾼 URL)
+- DB_POOL_SIZE / DB_MAX_OVERFLOW: 커넥션 풀 크기 (엔진별)
+- DB_ECHO: SQL 로그 출력 여부
 """
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Generator, AsyncGenerator
 import os
 from dotenv import load_dotenv
 
@@ -45,6 +58,32 @@ else:
         max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
     )
 
+
+
+def _async_database_url(url: str) -> str:
+    """동기 DATABASE_URL → 비동기 드라이버 URL (postgresql → asyncpg, sqlite → aiosqlite)"""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    return url
+
+
+# 비동기 Engine 생성 (async 라우터 핸들러용)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(DATABASE_URL)
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=_echo)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=_echo,
+        pool_pre_ping=True,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+    )
+
 if _using_default_db:
     print("⚠️ Using default local SQLite database (sqlite:///./forgeflow.db).\n   Set DATABASE_URL in your .env for a production database and avoid committing credentials to source control.")
 
@@ -55,6 +94,15 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async Session Factory
+# expire_on_commit=False: 커밋 후 속성 접근 시 암묵적 재조회(비동기에서는 불가)가 일어나지 않도록 함
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Base class for models
 Base = declarative_base()
 
@@ -75,6 +123,19 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for FastAPI
+    
+    Usage:
+        @app.get("/items")
+        async def read_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db():
     """
     Initialize database tables
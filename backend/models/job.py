@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+GenerationJob Model - 생성 작업 큐 테이블 모델
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON
+from datetime import datetime
+from zoneinfo import ZoneInfo
+import enum
+from .database import Base
+
+# 한국 시간대
+KST = ZoneInfo("Asia/Seoul")
+
+
+class JobStatus(str, enum.Enum):
+    """작업 상태"""
+    QUEUED = "queued"  # 대기 (재시도 대기 포함)
+    RUNNING = "running"  # 워커가 리스(lease)를 보유하고 실행 중
+    SUCCEEDED = "succeeded"  # 성공
+    FAILED = "failed"  # 최종 실패 (재시도 소진 또는 재시도 불가 오류)
+
+
+class GenerationJob(Base):
+    """
+    생성 작업 큐 테이블
+    - /api/ai/generate 요청을 영속화하여 재시작/배포 중에도 유실되지 않도록 함
+    - 워커는 리스(lease_expires_at)를 잡고 하트비트로 연장
+    - 리스가 만료된 RUNNING 작업은 리퍼가 재큐잉 또는 실패 처리
+    """
+    __tablename__ = "generation_jobs"
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+
+    # 작업 정보
+    kind = Column(String(50), nullable=False, comment="작업 종류 (prototype 등)")
+    screen_id = Column(
+        Integer,
+        ForeignKey("screens.id", ondelete="CASCADE"),
+        nullable=True,
+        index=True,
+        comment="대상 화면 ID"
+    )
+    dedupe_key = Column(String(64), nullable=True, index=True, comment="동일 요청 병합 키 (입력 해시)")
+    payload = Column(JSON, nullable=True, comment="작업 입력 데이터 (JSON)")
+    result = Column(JSON, nullable=True, comment="작업 결과 요약 (JSON)")
+
+    # 상태 관리
+    status = Column(
+        Enum(JobStatus, values_callable=lambda x: [e.value for e in x]),
+        default=JobStatus.QUEUED,
+        nullable=False,
+        comment="작업 상태"
+    )
+    priority = Column(Integer, default=0, nullable=False, comment="우선순위 (작을수록 먼저)")
+    attempts = Column(Integer, default=0, nullable=False, comment="실행 시도 횟수")
+    max_attempts = Column(Integer, default=3, nullable=False, comment="최대 시도 횟수")
+    available_at = Column(
+        DateTime,
+        default=lambda: datetime.now(KST),
+        nullable=False,
+        comment="실행 가능 시각 (재시도 백오프)"
+    )
+    last_error = Column(Text, nullable=True, comment="마지막 오류 메시지")
+
+    # 리스 & 하트비트
+    lease_owner = Column(String(100), nullable=True, comment="리스 보유 워커 ID")
+    lease_expires_at = Column(DateTime, nullable=True, comment="리스 만료 시각")
+    heartbeat_at = Column(DateTime, nullable=True, comment="마지막 하트비트 시각")
+
+    # 타임스탬프
+    created_at = Column(
+        DateTime,
+        default=lambda: datetime.now(KST),
+        nullable=False,
+        comment="생성 시각"
+    )
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(KST),
+        onupdate=lambda: datetime.now(KST),
+        nullable=False,
+        comment="수정 시각"
+    )
+    started_at = Column(DateTime, nullable=True, comment="마지막 실행 시작 시각")
+    finished_at = Column(DateTime, nullable=True, comment="완료 시각")
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, kind='{self.kind}', status='{self.status}')>"
+
+    def to_dict(self):
+        """모델을 딕셔너리로 변환"""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "screen_id": self.screen_id,
+            "dedupe_key": self.dedupe_key,
+            "status": self.status.value if isinstance(self.status, JobStatus) else self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "last_error": self.last_error,
+            "result": self.result,
+            "lease_owner": self.lease_owner,
+            "available_at": self.available_at.isoformat() if self.available_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+LLMUsage Model - Gemini 호출별 토큰/지연 시간 기록 테이블 모델
+"""
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from .database import Base
+
+
+class LLMUsage(Base):
+    """
+    Gemini 호출 기록 테이블 (호출 1회 = 1행)
+    - services/usage_metrics.py가 일괄 INSERT, /api/ai/metrics가 집계
+    - screen_id는 화면 삭제 후에도 집계에 남도록 외래 키 없이 저장
+    - USAGE_METRICS_RETENTION_DAYS보다 오래된 행은 주기적으로 삭제
+    """
+    __tablename__ = "llm_usage"
+
+    # Primary Key
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    # 호출 정보
+    created_at = Column(DateTime, nullable=False, index=True, comment="호출 시각 (KST)")
+    operation = Column(String(50), nullable=False, comment="작업 이름 (stage-1~4, continuation, design-spec 등)")
+    model = Column(String(100), nullable=False, comment="실제 호출한 모델")
+    screen_id = Column(Integer, nullable=True, comment="대상 화면 ID")
+    status = Column(String(30), nullable=False, default="ok", comment="ok 또는 오류 유형")
+    cache_hit = Column(Boolean, nullable=False, default=False, comment="응답 캐시 적중 (API 미호출)")
+
+    # usageMetadata
+    prompt_tokens = Column(Integer, nullable=False, default=0, comment="입력 토큰 수 (캐시 포함)")
+    cached_tokens = Column(Integer, nullable=False, default=0, comment="컨텍스트 캐시 토큰 수")
+    output_tokens = Column(Integer, nullable=False, default=0, comment="출력 토큰 수")
+    latency_ms = Column(Integer, nullable=False, default=0, comment="API 응답 시간 (할당량 대기 제외)")
+
+    def __repr__(self):
+        return f"<LLMUsage(id={self.id}, operation='{self.operation}', model='{self.model}')>"
+
+    def to_dict(self):
+        """모델을 딕셔너리로 변환"""
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "operation": self.operation,
+            "model": self.model,
+            "screen_id": self.screen_id,
+            "status": self.status,
+            "cache_hit": self.cache_hit,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "latency_ms": self.latency_ms,
+        }
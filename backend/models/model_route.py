@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+ModelRouteConfig Model - 작업별 Gemini 모델 라우팅 테이블 모델
+"""
+
+from sqlalchemy import Column, String, Boolean, DateTime, JSON
+from datetime import datetime
+from zoneinfo import ZoneInfo
+from .database import Base
+
+# 한국 시간대
+KST = ZoneInfo("Asia/Seoul")
+
+
+class ModelRouteConfig(Base):
+    """
+    작업별 모델 라우팅 테이블
+    - operation: stage-1 ~ stage-4, continuation, modal, design-spec, test-plan, user-manual, default
+    - enabled 행은 GEMINI_MODEL_ROUTES 환경 변수 라우트를 덮어씀 (services/model_router.py)
+    """
+    __tablename__ = "model_routes"
+
+    # Primary Key
+    operation = Column(String(50), primary_key=True, comment="작업 이름")
+
+    # 라우트
+    model = Column(String(100), nullable=True, comment="기본 모델 (NULL이면 GEMINI_MODEL)")
+    fallback_models = Column(JSON, nullable=True, comment="429/5xx 시 순서대로 시도할 보조 모델 목록")
+    generation_config = Column(
+        JSON,
+        nullable=True,
+        comment="덮어쓸 생성 설정 {temperature, max_output_tokens, top_p, top_k}"
+    )
+    enabled = Column(Boolean, default=True, nullable=False, comment="사용 여부")
+
+    # 타임스탬프
+    updated_at = Column(
+        DateTime,
+        default=lambda: datetime.now(KST),
+        onupdate=lambda: datetime.now(KST),
+        nullable=False,
+        comment="수정 시각"
+    )
+
+    def __repr__(self):
+        return f"<ModelRouteConfig(operation='{self.operation}', model='{self.model}')>"
+
+    def to_dict(self):
+        """모델을 딕셔너리로 변환"""
+        return {
+            "operation": self.operation,
+            "model": self.model,
+            "fallback_models": self.fallback_models or [],
+            "generation_config": self.generation_config or {},
+            "enabled": self.enabled,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 """
 Screen Model - 화면 테이블 모델
+
+[지연 로드 컬럼]
+산출물(LargeBinary, 수 MB)과 프롬프트/코드/Wizard 데이터는 기본 조회에서 제외됩니다 (deferred).
+- 상태 조회: .options(Screen.status_only())
+- 목록/상세(to_dict): .options(Screen.with_content())
+- 산출물 존재 여부: has_*_doc (IS NOT NULL 컬럼 표현식 - blob 미로드)
+
+[산출물 저장]
+산출물 본문은 BlobStore(services/blob_store.py)에 저장하고 행에는 *_sha256/*_size/*_content_type만 둡니다.
+기존 LargeBinary 컬럼(design_doc 등)은 이전 데이터 호환용이며, 다운로드 시 BlobStore로 옮겨집니다.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, JSON, LargeBinary
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Enum, JSON, LargeBinary, and_, or_
+from sqlalchemy.orm import relationship, deferred, column_property, load_only, undefer_group
 from datetime import datetime
+from typing import Dict, Any, Optional
 from zoneinfo import ZoneInfo
 import enum
 from .database import Base
@@ -57,15 +68,53 @@ class Screen(Base):
     name = Column(String(255), nullable=False, comment="화면 이름")
     description = Column(Text, nullable=True, comment="화면 설명")
     
-    # 프롬프트 & AI 생성 결과
-    prompt = Column(Text, nullable=True, comment="LLM에 전달된 전체 프롬프트 (SYSTEM + USER)")
-    wizard_data = Column(JSON, nullable=True, comment="Step by Step Wizard 데이터 (step1~step4)")
-    prototype_html = Column(Text, nullable=True, comment="HTML 프로토타입")
+    # 프롬프트 & AI 생성 결과 (지연 로드: "content" 그룹)
+    prompt = deferred(
+        Column(Text, nullable=True, comment="LLM에 전달된 전체 프롬프트 (SYSTEM + USER)"),
+        group="content"
+    )
+    wizard_data = deferred(
+        Column(JSON, nullable=True, comment="Step by Step Wizard 데이터 (step1~step4)"),
+        group="content"
+    )
+    prototype_html = deferred(
+        Column(Text, nullable=True, comment="HTML 프로토타입"),
+        group="content"
+    )
+    # 단계별 입력 해시/출력 코드 (증분 재생성 - 생성 작업에서만 조회)
+    stage_memo = deferred(
+        Column(JSON, nullable=True, comment="4단계 생성 단계별 입력 해시/출력 코드 [{stage, input_hash, code}]")
+    )
     
-    # 산출물
-    design_doc = Column(LargeBinary, nullable=True, comment="설계서 (Binary)")
-    test_plan_doc = Column(LargeBinary, nullable=True, comment="테스트 계획서 (Binary)")
-    user_manual_doc = Column(LargeBinary, nullable=True, comment="사용자 매뉴얼 (Binary)")
+    # 산출물 (이전 데이터 호환용 본문 - 지연 로드: 각각 개별 조회)
+    design_doc = deferred(Column(LargeBinary, nullable=True, comment="설계서 (Binary, 이전 데이터)"))
+    test_plan_doc = deferred(Column(LargeBinary, nullable=True, comment="테스트 계획서 (Binary, 이전 데이터)"))
+    user_manual_doc = deferred(Column(LargeBinary, nullable=True, comment="사용자 매뉴얼 (Binary, 이전 데이터)"))
+    
+    # 산출물 BlobStore 참조
+    design_doc_sha256 = Column(String(64), nullable=True, comment="설계서 blob SHA-256")
+    design_doc_size = Column(BigInteger, nullable=True, comment="설계서 크기 (bytes)")
+    design_doc_content_type = Column(String(100), nullable=True, comment="설계서 Content-Type")
+    test_plan_doc_sha256 = Column(String(64), nullable=True, comment="테스트 계획서 blob SHA-256")
+    test_plan_doc_size = Column(BigInteger, nullable=True, comment="테스트 계획서 크기 (bytes)")
+    test_plan_doc_content_type = Column(String(100), nullable=True, comment="테스트 계획서 Content-Type")
+    user_manual_doc_sha256 = Column(String(64), nullable=True, comment="사용자 매뉴얼 blob SHA-256")
+    user_manual_doc_size = Column(BigInteger, nullable=True, comment="사용자 매뉴얼 크기 (bytes)")
+    user_manual_doc_content_type = Column(String(100), nullable=True, comment="사용자 매뉴얼 Content-Type")
+    
+    # 존재 여부 (SELECT 시 IS NOT NULL로 계산 - 본문 미로드, 값 변경 후에는 commit/refresh 시 갱신)
+    has_prototype = column_property(
+        and_(prototype_html.expression.isnot(None), prototype_html.expression != "")
+    )
+    has_design_doc = column_property(
+        or_(design_doc_sha256.isnot(None), design_doc.expression.isnot(None))
+    )
+    has_test_plan_doc = column_property(
+        or_(test_plan_doc_sha256.isnot(None), test_plan_doc.expression.isnot(None))
+    )
+    has_user_manual_doc = column_property(
+        or_(user_manual_doc_sha256.isnot(None), user_manual_doc.expression.isnot(None))
+    )
     
     # 상태 관리
     status = Column(
@@ -105,6 +154,11 @@ class Screen(Base):
         nullable=False,
         comment="할당량 초과로 인한 재시도 횟수"
     )
+    generation_token = Column(
+        String(64),
+        nullable=True,
+        comment="현재 유효한 생성 요청 토큰 (이전 요청의 결과 덮어쓰기 방지)"
+    )
     
     # 타임스탬프
     created_at = Column(
@@ -127,6 +181,58 @@ class Screen(Base):
     def __repr__(self):
         return f"<Screen(id={self.id}, name='{self.name}', status='{self.status}')>"
 
+    @classmethod
+    def status_only(cls):
+        """생성 상태 조회용 로더 옵션 (상태 컬럼 + has_prototype만)"""
+        return load_only(
+            cls.id,
+            cls.generation_status,
+            cls.generation_progress,
+            cls.generation_message,
+            cls.generation_step,
+            cls.retry_count,
+            cls.has_prototype,
+        )
+
+    @classmethod
+    def with_content(cls):
+        """to_dict()용 로더 옵션 (프롬프트/코드/Wizard 데이터 포함, 산출물 제외)"""
+        return undefer_group("content")
+
+    @classmethod
+    def document_ref_only(cls, kind: str):
+        """산출물 다운로드용 로더 옵션 (이름 + 해당 산출물 참조 컬럼만, 본문 제외)"""
+        return load_only(
+            cls.id,
+            cls.name,
+            getattr(cls, f"{kind}_sha256"),
+            getattr(cls, f"{kind}_size"),
+            getattr(cls, f"{kind}_content_type"),
+        )
+
+    def get_document_ref(self, kind: str) -> Optional[Dict[str, Any]]:
+        """
+        산출물 BlobStore 참조 (kind: design_doc | test_plan_doc | user_manual_doc)
+
+        Returns:
+            {"sha256", "size", "content_type"} 또는 None (없거나 이전 데이터 본문만 있는 경우)
+        """
+        sha256 = getattr(self, f"{kind}_sha256")
+        if not sha256:
+            return None
+        return {
+            "sha256": sha256,
+            "size": getattr(self, f"{kind}_size"),
+            "content_type": getattr(self, f"{kind}_content_type"),
+        }
+
+    def set_document_ref(self, kind: str, sha256: str, size: int, content_type: str):
+        """산출물 BlobStore 참조 저장 (이전 데이터 본문 컬럼은 비움)"""
+        setattr(self, f"{kind}_sha256", sha256)
+        setattr(self, f"{kind}_size", size)
+        setattr(self, f"{kind}_content_type", content_type)
+        setattr(self, kind, None)
+
     def to_dict(self):
         """모델을 딕셔너리로 변환"""
         return {
@@ -137,9 +243,9 @@ class Screen(Base):
             "prompt": self.prompt,
             "wizard_data": self.wizard_data,
             "prototype_html": self.prototype_html,
-            "has_design_doc": self.design_doc is not None,
-            "has_test_plan_doc": self.test_plan_doc is not None,
-            "has_user_manual_doc": self.user_manual_doc is not None,
+            "has_design_doc": bool(self.has_design_doc),
+            "has_test_plan_doc": bool(self.has_test_plan_doc),
+            "has_user_manual_doc": bool(self.has_user_manual_doc),
             "status": self.status.value if isinstance(self.status, ScreenStatus) else self.status,
             "generation_status": self.generation_status.value if isinstance(self.generation_status, GenerationStatus) else self.generation_status,
             "generation_progress": self.generation_progress,
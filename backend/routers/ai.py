@@ -2,14 +2,23 @@
 """
 AI 생성 API 라우터
 """
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi import APIRouter, HTTPException, Depends, Request, Query
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from typing import Dict, Any
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
 from fastapi import File, UploadFile, Form
 from typing import List
+import asyncio
+import hashlib
+import io
+import json
 import logging
+import time
+import uuid
+import zipfile
+from urllib.parse import quote
 
 from schemas.ai import (
     GenerateRequest,
@@ -19,11 +28,29 @@ from schemas.ai import (
     WizardPromptTestRequest,
     WizardPromptTestResponse,
     GenerationStatusResponse,
+    DocumentBundleJobResponse,
+    DraftPrototypeRequest,
+    DraftPrototypeResponse,
 )
 from services.ai_service import get_ai_service, AIService
 from services.ai_service import AIServiceError
-from services.document_service import DocumentService
-from models.database import get_db, SessionLocal
+from services.document_service import DocumentService, DOCUMENT_KINDS
+from services.event_bus import get_event_bus, screen_channel
+from services.job_queue import get_job_queue, JobContext, JobError
+from services.response_cache import bypass_response_cache, is_response_cache_bypassed, get_response_cache
+from services.single_flight import get_single_flight
+from services.model_router import get_model_router
+from services.usage_metrics import get_usage_recorder, usage_screen
+from services.rate_limiter import get_rate_limiter_stats
+from services.modal_fanout import get_modal_fanout
+from services.gemini_client import get_gemini_client
+from utils.doc_prompts import compaction_stats
+from services.image_ingest import get_image_ingestor
+from services.prototype_assembler import assemble_prototype
+from services.blob_store import get_blob_store, BlobInfo, DOCX_CONTENT_TYPE
+from utils.blob_response import blob_download_response
+from models.database import get_db, get_async_db, SessionLocal, AsyncSessionLocal
+from models.menu import Menu
 from models.screen import Screen, GenerationStatus
 
 # 로깅 설정
@@ -33,15 +60,160 @@ logger = logging.getLogger(__name__)
 # 라우터 생성
 router = APIRouter(prefix="/api/ai", tags=["AI"])
 
+# 이벤트 스트림을 종료하는 최종 상태
+TERMINAL_GENERATION_STATUSES = (GenerationStatus.COMPLETED.value, GenerationStatus.FAILED.value)
 
-async def _background_generate(screen_id: int, menu_name: str, screen_name: str, wizard_data: Dict[str, Any], ai_service: AIService):
-    """Separate session for background generation to avoid session conflicts."""
-    bg_db: Session = SessionLocal()
+# 작업 큐 재시도 대상 AI 오류 유형 (일시적 오류)
+RETRYABLE_AI_ERRORS = {"quota_exceeded", "timeout", "network_error", "api_error", "empty_response", "unknown_error"}
+
+# 작업 큐 작업 종류
+PROTOTYPE_JOB_KIND = "prototype"
+DOCUMENT_BUNDLE_JOB_KIND = "document_bundle"
+
+# 산출물 종류 → (파일명 접미사, 다운로드 경로 세그먼트)
+DOCUMENT_FILES = {
+    "design_doc": ("화면설계서", "design"),
+    "test_plan_doc": ("테스트계획서", "testPlan"),
+    "user_manual_doc": ("사용자매뉴얼", "userManual"),
+}
+
+
+def _status_value(status) -> str:
+    """Enum/문자열 상태 값을 문자열로 변환"""
+    return status.value if hasattr(status, 'value') else status
+
+
+def _screen_status_snapshot(screen: Screen) -> Dict[str, Any]:
+    """Screen의 생성 상태 스냅샷 (GenerationStatusResponse 필드와 동일)"""
+    return {
+        "screen_id": screen.id,
+        "generation_status": _status_value(screen.generation_status),
+        "generation_progress": screen.generation_progress or 0,
+        "generation_message": screen.generation_message,
+        "generation_step": screen.generation_step or 0,
+        "retry_count": screen.retry_count or 0,
+        "has_prototype": bool(screen.has_prototype),
+    }
+
+
+async def _publish_status(snapshot: Dict[str, Any], event_type: str = "status"):
+    """
+    생성 상태 이벤트 발행 (SSE 구독자 + 상태 조회 스냅샷)
+
+    최종 상태(completed/failed)는 스냅샷을 남기지 않습니다 (상태 조회는 DB 기준).
+    """
+    try:
+        await get_event_bus().publish(
+            screen_channel(snapshot["screen_id"]),
+            {"type": event_type, **snapshot},
+            retain=snapshot.get("generation_status") not in TERMINAL_GENERATION_STATUSES
+        )
+    except Exception as e:
+        logger.warning(f"[EVENT] Publish failed for screen {snapshot.get('screen_id')}: {e}")
+
+
+async def _current_status(screen_id: int, db: Optional[AsyncSession] = None) -> Optional[Dict[str, Any]]:
+    """
+    화면의 현재 생성 상태 이벤트 (화면이 없으면 None)
+
+    EventBus 스냅샷이 하트비트 주기(JOB_HEARTBEAT_SECONDS) 안에 발행됐으면 DB를 읽지 않고 그대로 사용합니다.
+    더 오래된 스냅샷은 DB 상태와 비교해 상태가 같을 때만 사용합니다
+    (워커가 죽어 발행이 멈춘 경우 DB 상태로 응답 - 리퍼가 정리한 상태 포함).
+    """
+    snapshot = await get_event_bus().get_snapshot(screen_channel(screen_id))
+    if snapshot and time.time() - snapshot.get("published_at", 0) <= get_job_queue().heartbeat_seconds:
+        return snapshot
+
+    async def load(session: AsyncSession) -> Optional[Screen]:
+        return await session.scalar(select(Screen).options(Screen.status_only()).where(Screen.id == screen_id))
+
+    if db is not None:
+        screen = await load(db)
+    else:
+        async with AsyncSessionLocal() as session:
+            screen = await load(session)
+    if not screen:
+        return None
+    current = {"type": "status", **_screen_status_snapshot(screen)}
+    if snapshot and all(snapshot.get(key) == current[key] for key in ("generation_status", "generation_step", "retry_count")):
+        # DB 상태와 일치 - 진행률/메시지가 더 자세한 스냅샷 사용
+        return snapshot
+    return current
+
+
+def _format_stage_range(stages: List[int]) -> str:
+    """[1, 2, 3] → "1-3", [1] → "1" (재사용 단계는 앞에서부터, 생략 단계는 끝까지 연속)"""
+    return f"{stages[0]}-{stages[-1]}" if len(stages) > 1 else str(stages[0])
+
+
+def _assemble_draft(
+    db: Session,
+    wizard_data: Optional[Dict[str, Any]],
+    menu_name: str,
+    screen_name: str
+) -> Optional[Dict[str, Any]]:
+    """리소스 템플릿으로 초안 조립 (실패해도 생성은 계속 - None 반환)"""
+    if not wizard_data:
+        return None
     try:
+        return assemble_prototype(db, wizard_data, menu_name, screen_name)
+    except Exception as e:
+        logger.warning(f"⚠️ Template draft assembly failed: {type(e).__name__}: {e}")
+        return None
+
+
+async def _background_generate(
+    screen_id: int,
+    menu_name: str,
+    screen_name: str,
+    wizard_data: Dict[str, Any],
+    ai_service: AIService,
+    chunk_callback: Optional[Callable[[int, str, str], Awaitable[None]]] = None,
+    progress_listener: Optional[Callable[[int, str], Awaitable[None]]] = None,
+    job_ctx: Optional[JobContext] = None,
+    generation_token: Optional[str] = None,
+    seed_code: Optional[str] = None,
+    stage_callback: Optional[Callable[[int, str], Awaitable[None]]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Separate session for background generation to avoid session conflicts.
+    
+    chunk_callback이 주어지면 스트리밍 모드로 생성하고, progress_listener는
+    이벤트 발행과 별도로 진행률을 전달받습니다.
+    성공 시 요약({"reused_stages", "template_seeded", "stages_run", "skipped_stages"}), 실패 시 None을 반환합니다.
+    
+    이전 생성의 단계별 기록(screens.stage_memo)을 넘겨 입력이 같은 앞 단계는 재사용하고,
+    성공하면 새 기록으로 교체합니다. 캐시 우회 요청은 기록을 사용하지 않습니다.
+    
+    seed_code(템플릿 초안)가 없고 PROTOTYPE_TEMPLATE_SEED가 켜져 있으면 리소스 템플릿으로
+    초안을 조립해 Stage 1 대신 사용합니다.
+    
+    DB는 상태 전이(GENERATING → VALIDATING → COMPLETED/FAILED) 시에만 기록하고,
+    진행률/단계 변경은 EventBus로만 발행합니다.
+    동기 세션 작업(조회, 행 잠금, 커밋)은 이벤트 루프를 막지 않도록 모두 스레드에서 실행합니다.
+    
+    job_ctx가 주어지면(작업 큐 실행) 실패 시 반환 대신 JobError를 발생시켜
+    큐가 재시도 여부를 결정하도록 합니다.
+    
+    generation_token이 주어지면 더 최근의 생성 요청이 화면을 점유한 경우
+    (screens.generation_token 불일치) 어떤 상태/결과도 기록하지 않습니다 (최신 요청 우선).
+    """
+    bg_db: Session = SessionLocal()
+
+    def begin() -> Optional[Dict[str, Any]]:
+        """화면 조회 + 초안 조립 + GENERATING 기록 (동기)"""
         screen = bg_db.query(Screen).filter(Screen.id == screen_id).first()
         if not screen:
             logger.error(f"[BG] Screen {screen_id} not found.")
-            return
+            return None
+        if _is_superseded(screen, generation_token):
+            logger.info(f"[BG] Screen {screen_id}: superseded by a newer request before start - skipped")
+            return None
+        stage_memo = None if is_response_cache_bypassed() else screen.stage_memo
+        draft_code = seed_code
+        if draft_code is None and ai_service.template_seed:
+            draft = _assemble_draft(bg_db, wizard_data, menu_name, screen_name)
+            draft_code = draft["code"] if draft else None
 
         # 시작 상태 업데이트
         screen.generation_status = GenerationStatus.GENERATING
@@ -49,120 +221,440 @@ async def _background_generate(screen_id: int, menu_name: str, screen_name: str,
         screen.generation_message = "AI 생성 환경 초기화 중..."
         screen.generation_step = 2
         bg_db.commit()
+        return {"snapshot": _screen_status_snapshot(screen), "stage_memo": stage_memo, "seed_code": draft_code}
 
-        async def update_progress_callback(percent: int, message: str):
-            try:
-                s = bg_db.query(Screen).filter(Screen.id == screen_id).first()
-                if s:
-                    s.generation_progress = percent
-                    s.generation_message = message
-                    bg_db.commit()
-            except SQLAlchemyError as e:
-                logger.error(f"[BG] Progress update failed: {e}")
-                bg_db.rollback()
-
-        # 실제 생성 호출
-        result = await ai_service.generate_prototype(
-            menu_name=menu_name,
-            screen_name=screen_name,
-            wizard_data=wizard_data,
-            progress_callback=update_progress_callback
-        )
-
-        screen = bg_db.query(Screen).filter(Screen.id == screen_id).first()
+    def lock_screen() -> Optional[Screen]:
+        """행 잠금 후 토큰/리스 확인 (동시에 끝난 다른 요청이 결과를 덮어쓰지 않도록, 무효면 None)"""
+        screen = bg_db.query(Screen).filter(Screen.id == screen_id).with_for_update().first()
         if not screen:
             logger.error(f"[BG] Screen {screen_id} vanished post-generation.")
-            return
+            return None
+        if _is_superseded(screen, generation_token) or _lost_lease(job_ctx):
+            bg_db.rollback()
+            logger.info(f"[BG] Screen {screen_id}: superseded by a newer request or lease lost - result discarded")
+            return None
+        return screen
 
+    def mark_validating() -> Optional[Dict[str, Any]]:
+        screen = lock_screen()
+        if not screen:
+            return None
         screen.generation_status = GenerationStatus.VALIDATING
         screen.generation_progress = 95
         screen.generation_message = "생성된 코드 저장 중..."
         screen.generation_step = 4
         bg_db.commit()
+        return _screen_status_snapshot(screen)
 
+    def save_result(result: Dict[str, Any], message: str) -> Optional[Dict[str, Any]]:
+        screen = lock_screen()
+        if not screen:
+            return None
         screen.prototype_html = result.get("prototype_html", "")
         screen.prompt = result.get("full_prompt", "")
+        screen.stage_memo = result.get("stages") or None
         screen.status = "in_review"
 
         screen.generation_status = GenerationStatus.COMPLETED
         screen.generation_progress = 100
-        screen.generation_message = "프로토타입 생성 완료!"
+        screen.generation_message = message
         bg_db.commit()
-        logger.info(f"[BG] Generation completed for screen {screen_id}")
+        return _screen_status_snapshot(screen)
+
+    try:
+        started = await asyncio.to_thread(begin)
+        if not started:
+            return None
+        snapshot = started["snapshot"]
+        await _publish_status(snapshot)
+
+        last_stage_label = None
+
+        async def update_progress_callback(percent: int, message: str):
+            nonlocal last_stage_label
+            # "Stage 2/4: 기능 구현 (1200 tokens)" → "Stage 2/4: 기능 구현"
+            stage_label = message.split(" (")[0]
+            event_type = "stage" if stage_label != last_stage_label else "progress"
+            last_stage_label = stage_label
+
+            snapshot["generation_progress"] = percent
+            snapshot["generation_message"] = message
+            await _publish_status(snapshot, event_type)
+            if progress_listener:
+                await progress_listener(percent, message)
+
+        # 실제 생성 호출
+        with usage_screen(screen_id):
+            result = await ai_service.generate_prototype(
+                menu_name=menu_name,
+                screen_name=screen_name,
+                wizard_data=wizard_data,
+                progress_callback=update_progress_callback,
+                chunk_callback=chunk_callback,
+                stage_memo=started["stage_memo"],
+                seed_code=started["seed_code"],
+                stage_callback=stage_callback
+            )
+        reused_stages = result.get("reused_stages", [])
+
+        validating = await asyncio.to_thread(mark_validating)
+        if not validating:
+            return None
+        await _publish_status(validating)
+
+        skipped_stages = result.get("skipped_stages", [])
+        notes = []
+        if reused_stages:
+            notes.append(f"Stage {_format_stage_range(reused_stages)} 재사용")
+        elif result.get("template_seeded"):
+            notes.append("Stage 1 템플릿 초안 사용")
+        if skipped_stages:
+            notes.append(f"Stage {_format_stage_range(skipped_stages)} 생략")
+        suffix = f" ({', '.join(notes)})" if notes else ""
+
+        completed = await asyncio.to_thread(save_result, result, f"프로토타입 생성 완료!{suffix}")
+        if not completed:
+            return None
+        await _publish_status(completed, "completed")
+        logger.info(
+            f"[BG] Generation completed for screen {screen_id} "
+            f"(reused stages: {reused_stages}, template seeded: {result.get('template_seeded', False)}, "
+            f"skipped stages: {skipped_stages}, plan: {result.get('stage_plan')}, "
+            f"input tokens per turn: {[t['input_tokens'] for t in result.get('turn_usage', [])]})"
+        )
+        return {
+            "reused_stages": reused_stages,
+            "template_seeded": result.get("template_seeded", False),
+            "stages_run": len(result.get("stages", [])) - len(reused_stages) - int(result.get("template_seeded", False)),
+            "skipped_stages": skipped_stages
+        }
 
     except AIServiceError as aie:
         logger.error(f"[BG] AIServiceError: {aie.message}")
-        try:
-            s = bg_db.query(Screen).filter(Screen.id == screen_id).first()
-            if s:
-                s.generation_status = GenerationStatus.FAILED
-                s.generation_message = f"생성 실패: {aie.message[:160]}"
-                bg_db.commit()
-        except Exception:
-            bg_db.rollback()
+        await _mark_generation_failed(
+            bg_db, screen_id, f"생성 실패: {aie.message[:160]}",
+            retryable=aie.error_type in RETRYABLE_AI_ERRORS, job_ctx=job_ctx,
+            generation_token=generation_token
+        )
+        return None
     except Exception as e:
         logger.error(f"[BG] Unexpected error: {e}")
+        await _mark_generation_failed(
+            bg_db, screen_id, f"알 수 없는 오류: {str(e)[:160]}",
+            retryable=True, job_ctx=job_ctx,
+            generation_token=generation_token
+        )
+        return None
+    finally:
+        await asyncio.to_thread(bg_db.close)
+
+
+async def _mark_generation_failed(
+    bg_db: Session,
+    screen_id: int,
+    message: str,
+    retryable: bool,
+    job_ctx: Optional[JobContext] = None,
+    generation_token: Optional[str] = None
+):
+    """
+    생성 실패 처리
+
+    작업 큐에서 실행 중이고 재시도가 남아 있으면 화면을 재시도 대기 상태로 두고
+    JobError를 발생시켜 큐가 백오프 후 재실행하도록 합니다. 그 외에는 FAILED로 기록합니다.
+    더 최근의 요청이 화면을 점유했거나 작업 리스를 잃었다면 아무것도 기록하지 않고 재시도도 하지 않습니다.
+    """
+    will_retry = job_ctx is not None and retryable and not job_ctx.is_final_attempt
+    if _lost_lease(job_ctx):
+        # 리퍼가 작업을 넘겨받음 - 화면 상태는 리퍼/다음 실행이 기록
+        await asyncio.to_thread(bg_db.rollback)
+        raise JobError(message, retryable=False)
+
+    def record() -> tuple:
+        """실패/재시도 대기 기록 (동기) → (상태 스냅샷 | None, 이벤트 유형, 재시도 여부, 메시지)"""
         try:
+            bg_db.rollback()
             s = bg_db.query(Screen).filter(Screen.id == screen_id).first()
-            if s:
-                s.generation_status = GenerationStatus.FAILED
-                s.generation_message = f"알 수 없는 오류: {str(e)[:160]}"
+            if s and _is_superseded(s, generation_token):
+                return None, None, False, "더 최근의 생성 요청으로 대체됨"
+            if not s:
+                return None, None, will_retry, message
+            if will_retry:
+                s.generation_status = GenerationStatus.WAITING_QUOTA
+                s.generation_message = f"{message[:120]} - 재시도 대기 ({job_ctx.attempt}/{job_ctx.max_attempts})"
+                s.retry_count = job_ctx.attempt
                 bg_db.commit()
+                return _screen_status_snapshot(s), "status", True, message
+            s.generation_status = GenerationStatus.FAILED
+            s.generation_message = message
+            bg_db.commit()
+            return _screen_status_snapshot(s), "failed", False, message
         except Exception:
             bg_db.rollback()
+            return None, None, will_retry, message
+
+    snapshot, event_type, will_retry, message = await asyncio.to_thread(record)
+    if snapshot:
+        await _publish_status(snapshot, event_type)
+
+    if job_ctx is not None:
+        raise JobError(message, retryable=will_retry)
+
+
+async def _run_prototype_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """작업 큐 핸들러: 프로토타입 생성"""
+    with bypass_response_cache(payload.get("bypass_cache", False)):
+        summary = await _background_generate(
+            screen_id=payload["screen_id"],
+            menu_name=payload["menu_name"],
+            screen_name=payload["screen_name"],
+            wizard_data=payload.get("wizard_data"),
+            ai_service=get_ai_service(),
+            job_ctx=ctx,
+            generation_token=payload.get("generation_token")
+        )
+    return {"screen_id": payload["screen_id"], **(summary or {})}
+
+
+def _mark_orphaned_screen(job: Dict[str, Any], status: GenerationStatus, message: str) -> Optional[Dict[str, Any]]:
+    """
+    리퍼가 정리한 작업의 화면 상태 기록 (동기 - 스레드에서 호출, 상태 스냅샷 반환)
+
+    화면이 이미 최종 상태이거나 더 최근의 생성 요청이 점유했으면 기록하지 않고 None을 반환합니다.
+    """
+    db = SessionLocal()
+    try:
+        s = (
+            db.query(Screen)
+            .options(Screen.status_only(), undefer(Screen.generation_token))
+            .filter(Screen.id == job["screen_id"])
+            .first()
+        )
+        if not s or _status_value(s.generation_status) in TERMINAL_GENERATION_STATUSES:
+            return None
+        if _is_superseded(s, (job.get("payload") or {}).get("generation_token")):
+            return None
+        s.generation_status = status
+        s.generation_message = message
+        db.commit()
+        return _screen_status_snapshot(s)
     finally:
-        bg_db.close()
+        db.close()
+
+
+async def _on_prototype_job_orphaned(job: Dict[str, Any], error: str):
+    """리퍼가 고아 작업을 최종 실패 처리한 경우 화면 상태를 FAILED로 정리"""
+    if job.get("screen_id") is None:
+        return
+    snapshot = await asyncio.to_thread(
+        _mark_orphaned_screen, job, GenerationStatus.FAILED, f"생성 작업이 중단되었습니다: {error[:120]}"
+    )
+    if snapshot:
+        await _publish_status(snapshot, "failed")
+
+
+async def _on_prototype_job_requeued(job: Dict[str, Any], error: str):
+    """리퍼가 고아 작업을 재큐잉한 경우 화면을 재시도 대기 상태로 기록 (GENERATING 스냅샷이 남지 않도록)"""
+    if job.get("screen_id") is None:
+        return
+    snapshot = await asyncio.to_thread(
+        _mark_orphaned_screen, job, GenerationStatus.WAITING_QUOTA,
+        f"생성 작업 재개 대기 중 ({job['attempts']}/{job['max_attempts']}): {error[:80]}"
+    )
+    if snapshot:
+        await _publish_status(snapshot)
+
+
+# 작업 큐 핸들러 등록 (API 프로세스와 worker.py 모두 이 모듈을 import)
+get_job_queue().register(
+    PROTOTYPE_JOB_KIND,
+    _run_prototype_job,
+    on_orphan_failed=_on_prototype_job_orphaned,
+    on_orphan_requeued=_on_prototype_job_requeued
+)
+
+
+def _is_superseded(screen: Screen, generation_token: Optional[str]) -> bool:
+    """더 최근의 생성 요청이 화면을 점유했는지 여부 (토큰 없는 호출은 항상 유효)"""
+    return generation_token is not None and screen.generation_token != generation_token
+
+
+def _lost_lease(job_ctx: Optional[JobContext]) -> bool:
+    """작업 큐 실행 중 리스를 잃었는지 여부 (다른 워커가 재개하므로 결과를 기록하지 않음)"""
+    return job_ctx is not None and job_ctx.lease_lost
+
+
+def _generation_dedupe_key(request: GenerateRequest) -> str:
+    """동일 생성 요청 병합 키 (화면 ID + 입력 해시)"""
+    canonical = json.dumps(
+        {
+            "screen_id": request.screen_id,
+            "menu_name": request.menu_name,
+            "screen_name": request.screen_name,
+            "wizard_data": request.wizard_data,
+        },
+        ensure_ascii=False,
+        sort_keys=True
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+# 이 프로세스에서 진행 중인 스트리밍 생성 (병합 키 -> 생성 태스크)
+_inflight_streams: Dict[str, asyncio.Task] = {}
+
+
+async def _find_inflight_generation(screen_id: int, dedupe_key: str) -> Optional[Dict[str, Any]]:
+    """
+    같은 입력으로 진행 중인 생성 (작업 큐 작업 또는 이 프로세스의 스트리밍 생성)
+
+    Returns:
+        {"job_id": int | None} 또는 None
+    """
+    task = _inflight_streams.get(dedupe_key)
+    if task is not None and not task.done():
+        return {"job_id": None}
+    job = await get_job_queue().find_active_job(screen_id, dedupe_key)
+    if job:
+        return {"job_id": job["id"]}
+    return None
+
+
+def _find_screen(db: Session, screen_id: int) -> Optional[Screen]:
+    """화면 조회 (동기 - 스레드에서 호출)"""
+    return db.query(Screen).filter(Screen.id == screen_id).first()
+
+
+def _reset_screen_for_generation(
+    db: Session,
+    screen: Screen,
+    wizard_data: Optional[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], str]:
+    """
+    생성 시작 전 화면 상태/결과 초기화 및 Wizard 데이터 저장 (동기 - 스레드에서 호출)
+    
+    새 generation_token을 발급하므로 이전에 시작된 생성은 결과를 기록하지 못합니다.
+    
+    Returns:
+        (상태 스냅샷, 새 generation_token)
+    """
+    # 상태/결과 초기화
+    screen.generation_token = uuid.uuid4().hex
+    screen.generation_status = GenerationStatus.IDLE
+    screen.generation_progress = 0
+    screen.generation_message = "생성 요청 초기화 중..."
+    screen.generation_step = 0
+    screen.retry_count = 0
+    screen.prototype_html = None
+    screen.prompt = None
+    screen.status = "draft"
+    db.commit()
+
+    # Wizard 저장 단계
+    screen.generation_status = GenerationStatus.SAVING_WIZARD
+    screen.generation_progress = 5
+    screen.generation_message = "Wizard 데이터 저장 중..."
+    screen.generation_step = 1
+    db.commit()
+
+    screen.wizard_data = wizard_data
+    screen.generation_progress = 25
+    screen.generation_message = "Wizard 데이터 저장 완료"
+    db.commit()
+    return _screen_status_snapshot(screen), screen.generation_token
+
+
+def _save_draft_prototype(
+    db: Session,
+    screen_id: int,
+    wizard_data: Optional[Dict[str, Any]],
+    code: str
+) -> Optional[Dict[str, Any]]:
+    """템플릿 초안을 화면의 최신 결과로 저장 (동기 - 스레드에서 호출, 상태 스냅샷 반환 / 화면이 없으면 None)"""
+    screen = _find_screen(db, screen_id)
+    if not screen:
+        return None
+    screen.generation_token = uuid.uuid4().hex
+    screen.wizard_data = wizard_data
+    screen.prototype_html = code
+    screen.prompt = None
+    screen.stage_memo = None
+    screen.status = "in_review"
+    screen.generation_status = GenerationStatus.COMPLETED
+    screen.generation_progress = 100
+    screen.generation_message = "템플릿 초안 생성 완료! (AI 미사용)"
+    screen.generation_step = 4
+    screen.retry_count = 0
+    db.commit()
+    return _screen_status_snapshot(screen)
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Server-Sent Events 메시지 포맷"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
 
 @router.post("/generate", response_model=GenerateAckResponse)
 async def generate_prototype(
     request: GenerateRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    ai_service: AIService = Depends(get_ai_service)
+    db: Session = Depends(get_db)
 ):
-    """프로토타입 생성 (비동기). Returns immediate ack; polling tracks progress."""
+    """
+    프로토타입 생성 (비동기). Returns immediate ack; progress is pushed via SSE (/events/{screen_id}).
+    
+    생성 작업은 영속 작업 큐에 등록되어 워커 풀이 실행하므로 API 재시작/배포 중에도 유실되지 않습니다.
+    작업 상태는 GET /api/ai/jobs/{job_id}로 조회할 수 있습니다.
+    
+    같은 화면/같은 입력의 생성이 이미 진행 중이면 새로 시작하지 않고 기존 작업에 합류합니다
+    (coalesced=true). bypass_cache=true면 항상 새로 생성합니다.
+    """
     try:
-        screen = db.query(Screen).filter(Screen.id == request.screen_id).first()
+        screen = await asyncio.to_thread(_find_screen, db, request.screen_id)
         if not screen:
             raise HTTPException(status_code=404, detail="화면을 찾을 수 없습니다")
+        screen_id = screen.id
 
-        # 상태/결과 초기화
-        screen.generation_status = GenerationStatus.IDLE
-        screen.generation_progress = 0
-        screen.generation_message = "생성 요청 초기화 중..."
-        screen.generation_step = 0
-        screen.retry_count = 0
-        screen.prototype_html = None
-        screen.prompt = None
-        screen.status = "draft"
-        db.commit()
+        dedupe_key = _generation_dedupe_key(request)
 
-        # Wizard 저장 단계
-        screen.generation_status = GenerationStatus.SAVING_WIZARD
-        screen.generation_progress = 5
-        screen.generation_message = "Wizard 데이터 저장 중..."
-        screen.generation_step = 1
-        db.commit()
+        # 확인 → 초기화 → 등록을 화면 단위로 직렬화 (더블 클릭/다중 워커 경합 방지)
+        async with get_single_flight().lock(f"generate:{screen_id}", ttl=30):
+            inflight = None if request.bypass_cache else await _find_inflight_generation(screen_id, dedupe_key)
+            if inflight:
+                logger.info(f"[GENERATE] Screen {screen_id}: coalesced into in-flight generation {inflight['job_id']}")
+                return GenerateAckResponse(
+                    screen_id=screen_id,
+                    job_id=inflight["job_id"],
+                    message="동일한 생성 요청이 이미 진행 중입니다. 진행 상황은 /api/ai/events/{screen_id} (SSE)로 확인하세요.",
+                    started=True,
+                    previous_prototype_cleared=False,
+                    coalesced=True
+                )
 
-        screen.wizard_data = request.wizard_data
-        screen.generation_progress = 25
-        screen.generation_message = "Wizard 데이터 저장 완료"
-        db.commit()
+            snapshot, generation_token = await asyncio.to_thread(
+                _reset_screen_for_generation, db, screen, request.wizard_data
+            )
 
-        # 백그라운드 작업 등록
-        background_tasks.add_task(
-            _background_generate,
-            screen_id=screen.id,
-            menu_name=request.menu_name,
-            screen_name=request.screen_name,
-            wizard_data=request.wizard_data,
-            ai_service=ai_service
-        )
+            # 작업 큐 등록
+            job = await get_job_queue().enqueue(
+                PROTOTYPE_JOB_KIND,
+                payload={
+                    "screen_id": screen_id,
+                    "menu_name": request.menu_name,
+                    "screen_name": request.screen_name,
+                    "wizard_data": request.wizard_data,
+                    "bypass_cache": request.bypass_cache,
+                    "generation_token": generation_token,
+                },
+                screen_id=screen_id,
+                dedupe_key=dedupe_key
+            )
+
+        snapshot["generation_message"] = "생성 작업 대기 중..."
+        await _publish_status(snapshot)
 
         return GenerateAckResponse(
-            screen_id=screen.id,
-            message="프로토타입 생성이 시작되었습니다. 상태는 폴링으로 확인하세요.",
+            screen_id=screen_id,
+            job_id=job["id"],
+            message="프로토타입 생성이 시작되었습니다. 진행 상황은 /api/ai/events/{screen_id} (SSE)로 확인하세요.",
             started=True,
             previous_prototype_cleared=True
         )
@@ -170,10 +662,225 @@ async def generate_prototype(
         raise
     except Exception as e:
         logger.error(f"Generate endpoint error: {e}")
-        db.rollback()
+        await asyncio.to_thread(db.rollback)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        db.close()
+        await asyncio.to_thread(db.close)
+
+
+@router.post("/generate/draft", response_model=DraftPrototypeResponse)
+async def generate_prototype_draft(
+    request: DraftPrototypeRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    템플릿 초안 생성 (LLM 미사용, 즉시 반환)
+    
+    Wizard 데이터와 리소스 템플릿(Layout/Component/Action)으로 실행 가능한 React 컴포넌트를 조립합니다.
+    save=true면 화면의 프로토타입으로 저장하고 생성 완료 상태로 기록합니다
+    (진행 중인 생성이 있으면 이 초안이 최신 결과가 되어 이전 생성 결과는 기록되지 않습니다).
+    """
+    try:
+        started = time.perf_counter()
+        draft = await asyncio.to_thread(
+            assemble_prototype, db, request.wizard_data, request.menu_name, request.screen_name
+        )
+        elapsed_ms = int((time.perf_counter() - started) * 1000)
+
+        saved = False
+        if request.save:
+            if request.screen_id is None:
+                raise HTTPException(status_code=400, detail="저장하려면 screen_id가 필요합니다")
+            async with get_single_flight().lock(f"generate:{request.screen_id}", ttl=30):
+                snapshot = await asyncio.to_thread(
+                    _save_draft_prototype, db, request.screen_id, request.wizard_data, draft["code"]
+                )
+            if not snapshot:
+                raise HTTPException(status_code=404, detail="화면을 찾을 수 없습니다")
+            await _publish_status(snapshot, "completed")
+            saved = True
+
+        return DraftPrototypeResponse(
+            screen_id=request.screen_id,
+            prototype_html=draft["code"],
+            layout=draft["layout"],
+            layout_template=draft["layout_template"],
+            component_templates=draft["component_templates"],
+            action_templates=draft["action_templates"],
+            elapsed_ms=elapsed_ms,
+            saved=saved
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Draft endpoint error: {e}")
+        await asyncio.to_thread(db.rollback)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await asyncio.to_thread(db.close)
+
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(job_id: int):
+    """
+    생성 작업 상태 조회
+    
+    **Returns**: 작업 상태 (queued, running, succeeded, failed), 시도 횟수, 마지막 오류 등
+    """
+    job = await get_job_queue().get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다")
+    return job
+
+
+@router.post("/generate/stream")
+async def generate_prototype_stream(
+    request: GenerateRequest,
+    db: Session = Depends(get_db),
+    ai_service: AIService = Depends(get_ai_service)
+):
+    """
+    프로토타입 생성 (스트리밍, Server-Sent Events)
+    
+    streamGenerateContent로 각 단계를 스트리밍하며 부분 코드를 즉시 전달합니다.
+    생성은 별도 태스크에서 진행되므로 클라이언트 연결이 끊겨도 결과는 DB에 저장됩니다.
+    
+    같은 입력의 생성이 이미 진행 중이면 새로 시작하지 않고 그 진행 상황(progress)과
+    최종 결과(done/error)만 전달합니다 (이 경우 chunk 이벤트 없음).
+    
+    **이벤트**:
+    - `draft`: {"prototype_html": str, "layout": str} (리소스 템플릿으로 조립한 즉시 초안, 생성 시작 시 1회)
+    - `progress`: {"percent": int, "message": str} (출력 토큰 기준)
+    - `chunk`: {"stage": int, "text": str} (증분 응답 - Stage 2~4는 GEMINI_STAGE_OUTPUT=patch면 변경 블록)
+    - `stage_code`: {"stage": int, "code": str} (단계 완료 시 적용된 전체 코드)
+    - `done`: {"screen_id": int, "generation_status": "completed"}
+    - `error`: {"screen_id": int, "message": str}
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def on_chunk(stage: int, delta: str, accumulated: str):
+        await queue.put(_sse_event("chunk", {"stage": stage, "text": delta}))
+
+    async def on_progress(percent: int, message: str):
+        await queue.put(_sse_event("progress", {"percent": percent, "message": message}))
+
+    async def on_stage_code(stage: int, code: str):
+        await queue.put(_sse_event("stage_code", {"stage": stage, "code": code}))
+
+    try:
+        screen = await asyncio.to_thread(_find_screen, db, request.screen_id)
+        if not screen:
+            raise HTTPException(status_code=404, detail="화면을 찾을 수 없습니다")
+        screen_id = screen.id
+        dedupe_key = _generation_dedupe_key(request)
+
+        async with get_single_flight().lock(f"generate:{screen_id}", ttl=30):
+            inflight = None if request.bypass_cache else await _find_inflight_generation(screen_id, dedupe_key)
+            if not inflight:
+                snapshot, generation_token = await asyncio.to_thread(
+                    _reset_screen_for_generation, db, screen, request.wizard_data
+                )
+                await _publish_status(snapshot)
+
+                draft = await asyncio.to_thread(
+                    _assemble_draft, db, request.wizard_data, request.menu_name, request.screen_name
+                )
+                if draft:
+                    await queue.put(_sse_event("draft", {"prototype_html": draft["code"], "layout": draft["layout"]}))
+
+                # 태스크 생성 시점의 컨텍스트(캐시 우회 플래그)가 태스크로 복사됨
+                with bypass_response_cache(request.bypass_cache):
+                    task = asyncio.create_task(_background_generate(
+                        screen_id=screen_id,
+                        menu_name=request.menu_name,
+                        screen_name=request.screen_name,
+                        wizard_data=request.wizard_data,
+                        ai_service=ai_service,
+                        chunk_callback=on_chunk,
+                        progress_listener=on_progress,
+                        generation_token=generation_token,
+                        seed_code=draft["code"] if draft and ai_service.template_seed else None,
+                        stage_callback=on_stage_code
+                    ))
+                _inflight_streams[dedupe_key] = task
+                task.add_done_callback(
+                    lambda t: _inflight_streams.pop(dedupe_key, None) if _inflight_streams.get(dedupe_key) is t else None
+                )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Generate stream endpoint error: {e}")
+        await asyncio.to_thread(db.rollback)
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        await asyncio.to_thread(db.close)
+
+    if inflight:
+        logger.info(f"[GENERATE] Screen {screen_id}: stream follows in-flight generation {inflight['job_id']}")
+        return StreamingResponse(
+            _follow_generation_stream(screen_id),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def event_stream():
+        while not task.done() or not queue.empty():
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+
+        if task.result():
+            yield _sse_event("done", {"screen_id": screen_id, "generation_status": GenerationStatus.COMPLETED.value})
+        else:
+            failed = await _current_status(screen_id)
+            message = failed.get("generation_message") if failed else "생성 실패"
+            yield _sse_event("error", {"screen_id": screen_id, "message": message})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _follow_generation_stream(screen_id: int):
+    """진행 중인 생성의 상태 이벤트를 /generate/stream 형식(progress/done/error)으로 전달"""
+    bus = get_event_bus()
+    channel = screen_channel(screen_id)
+    async with bus.subscribe(channel) as queue:
+        # 구독 전에 끝났을 수 있으므로 현재 상태부터 확인 (최종 상태는 스냅샷이 없어 DB 조회)
+        event = await _current_status(screen_id)
+        while True:
+            if event:
+                status = event.get("generation_status")
+                if status == GenerationStatus.COMPLETED.value:
+                    yield _sse_event("done", {"screen_id": screen_id, "generation_status": status})
+                    return
+                if status == GenerationStatus.FAILED.value:
+                    yield _sse_event("error", {"screen_id": screen_id, "message": event.get("generation_message")})
+                    return
+                yield _sse_event("progress", {
+                    "percent": event.get("generation_progress", 0),
+                    "message": event.get("generation_message")
+                })
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=15.0)
+            except asyncio.TimeoutError:
+                # 프록시 타임아웃 방지용 keep-alive 주석
+                yield ": keep-alive\n\n"
+                event = None
+
+
+def _document_flight_key(doc_type: str, screen: Screen, images: List[Dict[str, Any]]) -> str:
+    """문서 생성 병합 키 (문서 종류 + 화면 + 입력 해시)"""
+    digest = hashlib.sha256()
+    digest.update((screen.prototype_html or "").encode("utf-8"))
+    digest.update(json.dumps(screen.wizard_data, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    for image in images:
+        digest.update(image["label"].encode("utf-8"))
+        digest.update(image["sha256"].encode("ascii"))
+    return f"document:{doc_type}:{screen.id}:{digest.hexdigest()}"
 
 
 # 설계서 생성
@@ -182,15 +889,16 @@ async def generate_design_doc(
     screen_id: int = Form(...),
     screenshots: List[UploadFile] = File(default=[]),
     screenshot_labels: List[str] = Form(default=[]),
-    db: Session = Depends(get_db)
+    bypass_cache: bool = Form(default=False),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     [Step 2, 3 완료] 설계서(Word) 생성 및 다운로드
     """
     logger.info(f"📥 Design Doc Generation Start: Screen {screen_id}")
     
-    # 1. DB 조회
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    # 1. DB 조회 (코드/Wizard 데이터 포함, 기존 산출물 제외)
+    screen = await db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
     if not screen:
         raise HTTPException(status_code=404, detail="Screen not found")
     
@@ -199,12 +907,7 @@ async def generate_design_doc(
         raise HTTPException(status_code=400, detail="No generated code found. Please generate prototype first.")
 
     # 2. 이미지 처리
-    processed_images = []
-    for idx, file in enumerate(screenshots):
-        content = await file.read()
-        if content:
-            label = screenshot_labels[idx] if idx < len(screenshot_labels) else f"Image {idx+1}"
-            processed_images.append({"label": label, "bytes": content})
+    processed_images = await _read_screenshots(screenshots, screenshot_labels)
     
     logger.info(f"   📸 Images received: {len(processed_images)}")
 
@@ -212,26 +915,32 @@ async def generate_design_doc(
     doc_service = DocumentService()
     
     try:
-        # 🔥 여기가 핵심: LLM 분석 + Word 생성
-        docx_buffer = await doc_service.generate_design_doc(
-            screen_name=screen.name,
-            react_code=screen.prototype_html,
-            wizard_data=screen.wizard_data,
-            images=processed_images
-        )
-
-        # 🔥 2. [추가] 생성된 파일을 DB에 저장
-        file_content = docx_buffer.getvalue() # 바이너리 데이터 추출
-        screen.design_doc = file_content
-        db.commit() # DB 저장 확정
-        logger.info(f"💾 Design doc saved to DB ({len(file_content)} bytes)")
+        async def _generate_and_save() -> bytes:
+            # 🔥 여기가 핵심: LLM 분석 + Word 생성
+            with bypass_response_cache(bypass_cache), usage_screen(screen.id):
+                docx_buffer = await doc_service.generate_design_doc(
+                    screen_name=screen.name,
+                    react_code=screen.prototype_html,
+                    wizard_data=screen.wizard_data,
+                    images=processed_images
+                )
+            file_content = docx_buffer.getvalue()
+            info = await asyncio.to_thread(get_blob_store().put, file_content, DOCX_CONTENT_TYPE)
+            screen.set_document_ref("design_doc", info.sha256, info.size, info.content_type)
+            await db.commit()
+            logger.info(f"💾 Design doc saved to blob store ({info.size} bytes, sha256={info.sha256[:12]})")
+            return file_content
 
-        # 3. 버퍼 포인터 초기화 (중요! 읽어버려서 끝에 가 있으므로 다시 처음으로)
-        docx_buffer.seek(0)
+        # 같은 입력의 동시 요청은 한 번만 생성하고 결과를 공유
+        if bypass_cache:
+            file_content = await _generate_and_save()
+        else:
+            flight_key = _document_flight_key("design", screen, processed_images)
+            file_content = await get_single_flight().do(flight_key, _generate_and_save)
+        docx_buffer = io.BytesIO(file_content)
         
         # 4. 파일명 인코딩 (한글 파일명 깨짐 방지)
 
-        from urllib.parse import quote
         safe_filename = f"{screen.name}_화면설계서.docx"
         quoted_filename = quote(safe_filename)
 
@@ -259,15 +968,16 @@ async def generate_test_plan(
     screen_id: int = Form(...),
     screenshots: List[UploadFile] = File(default=[]),
     screenshot_labels: List[str] = Form(default=[]),
-    db: Session = Depends(get_db)
+    bypass_cache: bool = Form(default=False),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     테스트 계획서(Word) 생성 및 다운로드
     """
     logger.info(f"📥 Test Plan Generation Start: Screen {screen_id}")
     
-    # 1. DB 조회
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    # 1. DB 조회 (코드/Wizard 데이터 포함, 기존 산출물 제외)
+    screen = await db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
     if not screen:
         raise HTTPException(status_code=404, detail="Screen not found")
     
@@ -275,12 +985,7 @@ async def generate_test_plan(
         raise HTTPException(status_code=400, detail="No generated code found. Please generate prototype first.")
 
     # 2. 이미지 처리
-    processed_images = []
-    for idx, file in enumerate(screenshots):
-        content = await file.read()
-        if content:
-            label = screenshot_labels[idx] if idx < len(screenshot_labels) else f"Image {idx+1}"
-            processed_images.append({"label": label, "bytes": content})
+    processed_images = await _read_screenshots(screenshots, screenshot_labels)
     
     logger.info(f"   📸 Images received: {len(processed_images)}")
 
@@ -288,22 +993,29 @@ async def generate_test_plan(
     doc_service = DocumentService()
     
     try:
-        docx_buffer = await doc_service.generate_test_plan_doc(
-            screen_name=screen.name,
-            react_code=screen.prototype_html,
-            wizard_data=screen.wizard_data,
-            images=processed_images
-        )
-
-        # DB에 저장
-        file_content = docx_buffer.getvalue()
-        screen.test_plan_doc = file_content
-        db.commit()
-        logger.info(f"💾 Test plan saved to DB ({len(file_content)} bytes)")
+        async def _generate_and_save() -> bytes:
+            with bypass_response_cache(bypass_cache), usage_screen(screen.id):
+                docx_buffer = await doc_service.generate_test_plan_doc(
+                    screen_name=screen.name,
+                    react_code=screen.prototype_html,
+                    wizard_data=screen.wizard_data,
+                    images=processed_images
+                )
+            file_content = docx_buffer.getvalue()
+            info = await asyncio.to_thread(get_blob_store().put, file_content, DOCX_CONTENT_TYPE)
+            screen.set_document_ref("test_plan_doc", info.sha256, info.size, info.content_type)
+            await db.commit()
+            logger.info(f"💾 Test plan saved to blob store ({info.size} bytes, sha256={info.sha256[:12]})")
+            return file_content
 
-        docx_buffer.seek(0)
+        # 같은 입력의 동시 요청은 한 번만 생성하고 결과를 공유
+        if bypass_cache:
+            file_content = await _generate_and_save()
+        else:
+            flight_key = _document_flight_key("testPlan", screen, processed_images)
+            file_content = await get_single_flight().do(flight_key, _generate_and_save)
+        docx_buffer = io.BytesIO(file_content)
         
-        from urllib.parse import quote
         safe_filename = f"{screen.name}_테스트계획서.docx"
         quoted_filename = quote(safe_filename)
 
@@ -330,15 +1042,16 @@ async def generate_user_manual(
     screen_id: int = Form(...),
     screenshots: List[UploadFile] = File(default=[]),
     screenshot_labels: List[str] = Form(default=[]),
-    db: Session = Depends(get_db)
+    bypass_cache: bool = Form(default=False),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     사용자 매뉴얼(Word) 생성 및 다운로드
     """
     logger.info(f"📥 User Manual Generation Start: Screen {screen_id}")
     
-    # 1. DB 조회
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    # 1. DB 조회 (코드/Wizard 데이터 포함, 기존 산출물 제외)
+    screen = await db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
     if not screen:
         raise HTTPException(status_code=404, detail="Screen not found")
     
@@ -346,12 +1059,7 @@ async def generate_user_manual(
         raise HTTPException(status_code=400, detail="No generated code found. Please generate prototype first.")
 
     # 2. 이미지 처리
-    processed_images = []
-    for idx, file in enumerate(screenshots):
-        content = await file.read()
-        if content:
-            label = screenshot_labels[idx] if idx < len(screenshot_labels) else f"Image {idx+1}"
-            processed_images.append({"label": label, "bytes": content})
+    processed_images = await _read_screenshots(screenshots, screenshot_labels)
     
     logger.info(f"   📸 Images received: {len(processed_images)}")
 
@@ -359,22 +1067,29 @@ async def generate_user_manual(
     doc_service = DocumentService()
     
     try:
-        docx_buffer = await doc_service.generate_user_manual_doc(
-            screen_name=screen.name,
-            react_code=screen.prototype_html,
-            wizard_data=screen.wizard_data,
-            images=processed_images
-        )
-
-        # DB에 저장
-        file_content = docx_buffer.getvalue()
-        screen.user_manual_doc = file_content
-        db.commit()
-        logger.info(f"💾 User manual saved to DB ({len(file_content)} bytes)")
+        async def _generate_and_save() -> bytes:
+            with bypass_response_cache(bypass_cache), usage_screen(screen.id):
+                docx_buffer = await doc_service.generate_user_manual_doc(
+                    screen_name=screen.name,
+                    react_code=screen.prototype_html,
+                    wizard_data=screen.wizard_data,
+                    images=processed_images
+                )
+            file_content = docx_buffer.getvalue()
+            info = await asyncio.to_thread(get_blob_store().put, file_content, DOCX_CONTENT_TYPE)
+            screen.set_document_ref("user_manual_doc", info.sha256, info.size, info.content_type)
+            await db.commit()
+            logger.info(f"💾 User manual saved to blob store ({info.size} bytes, sha256={info.sha256[:12]})")
+            return file_content
 
-        docx_buffer.seek(0)
+        # 같은 입력의 동시 요청은 한 번만 생성하고 결과를 공유
+        if bypass_cache:
+            file_content = await _generate_and_save()
+        else:
+            flight_key = _document_flight_key("userManual", screen, processed_images)
+            file_content = await get_single_flight().do(flight_key, _generate_and_save)
+        docx_buffer = io.BytesIO(file_content)
         
-        from urllib.parse import quote
         safe_filename = f"{screen.name}_사용자매뉴얼.docx"
         quoted_filename = quote(safe_filename)
 
@@ -395,6 +1110,231 @@ async def generate_user_manual(
         raise HTTPException(status_code=500, detail=f"사용자 매뉴얼 생성 실패: {str(e)}")
 
 
+# =============================================================================
+# 산출물 일괄 생성 (설계서 + 테스트 계획서 + 사용자 매뉴얼)
+# =============================================================================
+
+async def _read_screenshots(screenshots: List[UploadFile], screenshot_labels: List[str]) -> List[Dict[str, Any]]:
+    """업로드된 스크린샷 → 전처리된 [{"label", "bytes", "sha256", "content_type"}] (빈 파일/중복 제외)"""
+    return await get_image_ingestor().ingest(screenshots, screenshot_labels)
+
+
+async def _generate_document_bundle(
+    db: AsyncSession,
+    screen: Screen,
+    images: List[Dict[str, Any]],
+    bypass_cache: bool = False,
+    on_status: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None
+) -> tuple:
+    """
+    세 산출물 동시 생성 → BlobStore 저장 → 화면에 참조 기록
+
+    Returns:
+        (문서별 상태 {kind: {...}}, 문서별 내용 {kind: bytes} - 성공한 문서만)
+    """
+    screen_id = screen.id
+    statuses: Dict[str, Dict[str, Any]] = {}
+    contents: Dict[str, bytes] = {}
+    # 문서가 동시에 끝날 수 있으므로 참조 기록/커밋을 직렬화 (AsyncSession은 동시 사용 불가)
+    commit_lock = asyncio.Lock()
+
+    async def on_document(kind: str, buffer: Optional[io.BytesIO], error: Optional[Exception]):
+        if error is not None:
+            statuses[kind] = {"status": "failed", "error": str(error)[:200]}
+        else:
+            content = buffer.getvalue()
+            info = await asyncio.to_thread(get_blob_store().put, content, DOCX_CONTENT_TYPE)
+            async with commit_lock:
+                screen.set_document_ref(kind, info.sha256, info.size, info.content_type)
+                await db.commit()
+            contents[kind] = content
+            statuses[kind] = {
+                "status": "completed",
+                "size": info.size,
+                "sha256": info.sha256,
+                "download_url": f"/api/ai/screens/{screen_id}/documents/{DOCUMENT_FILES[kind][1]}/download",
+            }
+            logger.info(f"💾 [Bundle] Screen {screen_id} {kind} saved to blob store ({info.size} bytes)")
+        if on_status:
+            await on_status(kind, statuses[kind])
+
+    with bypass_response_cache(bypass_cache), usage_screen(screen_id):
+        await DocumentService().generate_bundle(
+            screen_name=screen.name,
+            react_code=screen.prototype_html,
+            wizard_data=screen.wizard_data,
+            images=images,
+            on_document=on_document
+        )
+    return statuses, contents
+
+
+def _bundle_zip(screen_name: str, contents: Dict[str, bytes]) -> bytes:
+    """생성된 문서들을 zip으로 묶기 (docx는 이미 압축되어 있으므로 무압축 저장)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+        for kind in DOCUMENT_KINDS:
+            if kind in contents:
+                zf.writestr(f"{screen_name}_{DOCUMENT_FILES[kind][0]}.docx", contents[kind])
+    return buffer.getvalue()
+
+
+@router.post("/documents/bundle")
+async def generate_document_bundle(
+    screen_id: int = Form(...),
+    screenshots: List[UploadFile] = File(default=[]),
+    screenshot_labels: List[str] = Form(default=[]),
+    bypass_cache: bool = Form(default=False),
+    stream: bool = Form(default=False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    설계서 + 테스트 계획서 + 사용자 매뉴얼 일괄 생성
+    
+    스크린샷은 한 번만 업로드하고, 세 문서의 LLM 분석과 Word 작성을 동시에 진행합니다.
+    생성된 문서는 화면에 저장되어 기존 다운로드 엔드포인트로도 받을 수 있습니다.
+    
+    - `stream=false` (기본): 세 문서를 담은 zip 반환
+    - `stream=true`: Server-Sent Events로 문서별 상태 전달
+      - `document`: {"kind", "status": "completed"|"failed", "size", "download_url" | "error"}
+      - `done`: {"screen_id", "documents": {kind: 상태}}
+    
+    연결을 유지하기 어려운 경우 POST /documents/bundle/jobs (작업 큐)를 사용하세요.
+    """
+    screen = await db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
+    if not screen:
+        raise HTTPException(status_code=404, detail="Screen not found")
+    if not screen.prototype_html:
+        raise HTTPException(status_code=400, detail="No generated code found. Please generate prototype first.")
+
+    processed_images = await _read_screenshots(screenshots, screenshot_labels)
+    logger.info(f"📥 Document Bundle Start: Screen {screen_id} (images: {len(processed_images)}, stream={stream})")
+
+    if stream:
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def on_status(kind: str, status: Dict[str, Any]):
+            await queue.put(_sse_event("document", {"kind": kind, **status}))
+
+        task = asyncio.create_task(
+            _generate_document_bundle(db, screen, processed_images, bypass_cache, on_status)
+        )
+
+        async def event_stream():
+            try:
+                while not task.done() or not queue.empty():
+                    try:
+                        yield await asyncio.wait_for(queue.get(), timeout=1.0)
+                    except asyncio.TimeoutError:
+                        continue
+                if task.exception():
+                    yield _sse_event("error", {"screen_id": screen_id, "message": str(task.exception())[:200]})
+                else:
+                    statuses, _ = task.result()
+                    yield _sse_event("done", {"screen_id": screen_id, "documents": statuses})
+            finally:
+                await db.close()
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    try:
+        # 같은 입력의 동시 요청은 한 번만 생성하고 결과를 공유
+        async def _generate() -> tuple:
+            return await _generate_document_bundle(db, screen, processed_images, bypass_cache)
+
+        if bypass_cache:
+            statuses, contents = await _generate()
+        else:
+            flight_key = _document_flight_key("bundle", screen, processed_images)
+            statuses, contents = await get_single_flight().do(flight_key, _generate)
+    except Exception as e:
+        logger.error(f"❌ Document bundle generation failed: {e}")
+        raise HTTPException(status_code=500, detail=f"문서 일괄 생성 실패: {str(e)}")
+
+    if not contents:
+        raise HTTPException(status_code=500, detail=f"문서 일괄 생성 실패: {statuses}")
+
+    failed = [kind for kind, status in statuses.items() if status["status"] != "completed"]
+    filename = f"{screen.name}_산출물.zip"
+    return StreamingResponse(
+        io.BytesIO(_bundle_zip(screen.name, contents)),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            # 일부 문서 실패 시 실패한 종류를 헤더로 알림
+            "X-Failed-Documents": ",".join(failed),
+        }
+    )
+
+
+@router.post("/documents/bundle/jobs", response_model=DocumentBundleJobResponse)
+async def enqueue_document_bundle(
+    screen_id: int = Form(...),
+    screenshots: List[UploadFile] = File(default=[]),
+    screenshot_labels: List[str] = Form(default=[]),
+    bypass_cache: bool = Form(default=False),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    산출물 일괄 생성 작업 등록 (작업 큐)
+    
+    스크린샷은 BlobStore에 저장되고 작업에는 해시만 전달됩니다.
+    진행 결과는 GET /api/ai/jobs/{job_id}의 result.documents (문서별 상태)로 확인합니다.
+    """
+    screen = await db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
+    if not screen:
+        raise HTTPException(status_code=404, detail="Screen not found")
+    if not screen.prototype_html:
+        raise HTTPException(status_code=400, detail="No generated code found. Please generate prototype first.")
+
+    store = get_blob_store()
+    images = []
+    for image in await _read_screenshots(screenshots, screenshot_labels):
+        info = await asyncio.to_thread(store.put, image["bytes"], image["content_type"])
+        images.append({"label": image["label"], "sha256": info.sha256, "content_type": info.content_type})
+
+    job = await get_job_queue().enqueue(
+        DOCUMENT_BUNDLE_JOB_KIND,
+        payload={"screen_id": screen_id, "images": images, "bypass_cache": bypass_cache},
+        screen_id=screen_id
+    )
+    return DocumentBundleJobResponse(
+        screen_id=screen_id,
+        job_id=job["id"],
+        message="산출물 일괄 생성 작업이 등록되었습니다. 결과는 /api/ai/jobs/{job_id}로 확인하세요."
+    )
+
+
+async def _run_document_bundle_job(payload: Dict[str, Any], ctx: JobContext) -> Dict[str, Any]:
+    """작업 큐 핸들러: 산출물 일괄 생성"""
+    screen_id = payload["screen_id"]
+    store = get_blob_store()
+    images = []
+    for image in payload.get("images", []):
+        # 등록 시점에 이미 전처리된 스크린샷
+        content = await asyncio.to_thread(store.get_bytes, image["sha256"])
+        images.append({**image, "bytes": content})
+
+    async with AsyncSessionLocal() as bg_db:
+        screen = await bg_db.scalar(select(Screen).options(Screen.with_content()).where(Screen.id == screen_id))
+        if not screen or not screen.prototype_html:
+            raise JobError(f"Screen {screen_id} has no prototype", retryable=False)
+        statuses, contents = await _generate_document_bundle(
+            bg_db, screen, images, payload.get("bypass_cache", False)
+        )
+
+    if not contents:
+        raise JobError(f"All documents failed: {statuses}")
+    return {"screen_id": screen_id, "documents": statuses}
+
+
+get_job_queue().register(DOCUMENT_BUNDLE_JOB_KIND, _run_document_bundle_job)
+
+
 @router.get("/health")
 async def health_check(ai_service: AIService = Depends(get_ai_service)):
     """
@@ -404,26 +1344,56 @@ async def health_check(ai_service: AIService = Depends(get_ai_service)):
     ```json
     {
       "status": "ok",
-      "model": "gpt-4-turbo-preview"
+      "model": "gemini-2.5-flash",
+      "model_routes": {"routes": {...}, "fallback_model": null, "failovers": 0}
     }
     ```
     """
     return {
         "status": "ok",
-        "model": ai_service.model,
+        "model": ai_service.client.model_name,
+        "model_routes": get_model_router().describe(),
         "service": "AI Service"
     }
 
 
+@router.get("/metrics")
+async def get_usage_metrics(days: int = Query(7, ge=1, le=90)):
+    """
+    Gemini 사용량/지연 시간 지표
+    
+    - usage: 최근 days일 호출 기록 집계 (llm_usage 테이블, 없으면 이 프로세스의 메모리 기록)
+      - totals / by_operation / by_model / by_day: 호출 수, 오류/캐시 적중 수,
+        입력·캐시·출력 토큰 합계, 지연 시간 p50/p95/max (ms, 캐시 적중 제외)
+      - top_screens: 토큰 사용량 상위 화면
+    - rate_limits, model_routes, response_cache: 이 프로세스의 스케줄러/라우팅/응답 캐시 통계
+    - generation: 패치 적용, JSON 복구, 모달 병렬 생성, 문서 프롬프트 코드 압축 통계
+    """
+    client = get_gemini_client()
+    return {
+        "usage": await asyncio.to_thread(get_usage_recorder().summarize, days),
+        "rate_limits": get_rate_limiter_stats(),
+        "model_routes": get_model_router().describe(),
+        "response_cache": get_response_cache().get_stats(),
+        "generation": {
+            "patch": client.patch_stats,
+            "json": client.json_stats,
+            "modal_fanout": get_modal_fanout().get_stats(),
+            "doc_code_compaction": compaction_stats,
+        },
+    }
+
+
 @router.get("/status/{screen_id}", response_model=GenerationStatusResponse)
 async def get_generation_status(
     screen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    AI 생성 진행 상황 조회 (폴링용)
+    AI 생성 진행 상황 조회 (폴링 호환용)
     
-    프론트엔드에서 2초마다 이 엔드포인트를 호출하여 진행 상황을 확인합니다.
+    실시간 진행 상황은 `/api/ai/events/{screen_id}` (SSE)로 푸시됩니다.
+    이 엔드포인트는 EventBus 스냅샷을 우선 사용하고, 없을 때만 DB를 조회합니다.
     
     **상태 값**:
     - `idle`: 생성 전 또는 완료 후
@@ -443,21 +1413,13 @@ async def get_generation_status(
     - 100: 완료
     """
     try:
-        # 화면 조회
-        screen = db.query(Screen).filter(Screen.id == screen_id).first()
-        if not screen:
+        # 진행 중 상태는 최근 EventBus 스냅샷에서 조회 (오래된 스냅샷/최종 상태는 DB 상태 컬럼만 조회)
+        status = await _current_status(screen_id, db)
+        if not status:
             raise HTTPException(status_code=404, detail=f"Screen {screen_id} not found")
         
         # 응답 생성
-        return GenerationStatusResponse(
-            screen_id=screen.id,
-            generation_status=screen.generation_status.value if hasattr(screen.generation_status, 'value') else screen.generation_status,
-            generation_progress=screen.generation_progress or 0,
-            generation_message=screen.generation_message,
-            generation_step=screen.generation_step or 0,
-            retry_count=screen.retry_count or 0,
-            has_prototype=bool(screen.prototype_html)
-        )
+        return GenerationStatusResponse(**{k: v for k, v in status.items() if k not in ("type", "published_at")})
         
     except HTTPException:
         raise
@@ -466,12 +1428,65 @@ async def get_generation_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/events/{screen_id}")
+async def stream_generation_events(
+    screen_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    AI 생성 진행 이벤트 스트림 (Server-Sent Events)
+    
+    연결 직후 현재 상태를 1회 전송하고, 이후 진행률/단계 변경/완료 이벤트를 푸시합니다.
+    `completed` 또는 `failed` 상태가 되면 스트림을 종료합니다.
+    
+    **이벤트** (`event: status`, data의 `type` 필드로 구분):
+    - `status`: 상태 전이 (generating, validating 등)
+    - `stage`: 단계 변경 (Stage N/4)
+    - `progress`: 진행률 변경
+    - `completed` / `failed`: 최종 상태
+    """
+    bus = get_event_bus()
+    channel = screen_channel(screen_id)
+
+    initial = await _current_status(screen_id, db)
+    if not initial:
+        raise HTTPException(status_code=404, detail=f"Screen {screen_id} not found")
+    await db.close()
+
+    async def event_stream():
+        async with bus.subscribe(channel) as queue:
+            yield _sse_event("status", initial)
+            if initial.get("generation_status") in TERMINAL_GENERATION_STATUSES:
+                return
+
+            while True:
+                if await request.is_disconnected():
+                    break
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15.0)
+                except asyncio.TimeoutError:
+                    # 프록시 타임아웃 방지용 keep-alive 주석
+                    yield ": keep-alive\n\n"
+                    continue
+
+                yield _sse_event("status", event)
+                if event.get("generation_status") in TERMINAL_GENERATION_STATUSES:
+                    break
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 
 @router.put("/screens/{screen_id}/wizard-draft")
 async def save_wizard_draft(
     screen_id: int,
     request: Dict,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Wizard 작업 중 임시저장
@@ -497,7 +1512,7 @@ async def save_wizard_draft(
         logger.info(f"💾 [Wizard Draft] Saving draft for screen_id: {screen_id}")
         
         # 1. Screen 존재 확인
-        screen = db.query(Screen).filter(Screen.id == screen_id).first()
+        screen = await db.get(Screen, screen_id)
         if not screen:
             raise HTTPException(status_code=404, detail=f"Screen not found: {screen_id}")
         
@@ -507,8 +1522,8 @@ async def save_wizard_draft(
             raise HTTPException(status_code=400, detail="wizard_data is required")
         
         screen.wizard_data = wizard_data
-        db.commit()
-        db.refresh(screen)
+        await db.commit()
+        await db.refresh(screen, ["updated_at"])
         
         logger.info(f"✅ [Wizard Draft] Saved successfully")
         logger.info(f"📊 Data size: {len(str(wizard_data))} chars")
@@ -537,14 +1552,14 @@ async def save_wizard_draft(
         raise
     except Exception as e:
         logger.error(f"❌ Error saving wizard draft: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/screens/{screen_id}/wizard-draft")
 async def load_wizard_draft(
     screen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     임시저장된 Wizard 데이터 불러오기
@@ -572,10 +1587,16 @@ async def load_wizard_draft(
     try:
         logger.info(f"📂 [Wizard Draft] Loading draft for screen_id: {screen_id}")
         
-        # 1. Screen 조회
-        screen = db.query(Screen).filter(Screen.id == screen_id).first()
-        if not screen:
+        # 1. Screen 조회 (wizard_data만 추가 로드, 메뉴는 이름만)
+        row = (await db.execute(
+            select(Screen, Menu.name)
+            .options(undefer(Screen.wizard_data))
+            .outerjoin(Menu, Menu.id == Screen.menu_id)
+            .where(Screen.id == screen_id)
+        )).first()
+        if not row:
             raise HTTPException(status_code=404, detail=f"Screen not found: {screen_id}")
+        screen, menu_name = row
         
         # 2. wizard_data 확인
         has_draft = screen.wizard_data is not None and len(screen.wizard_data) > 0
@@ -604,7 +1625,7 @@ async def load_wizard_draft(
             "wizard_data": screen.wizard_data if has_draft else None,
             "saved_at": screen.updated_at.isoformat() if screen.updated_at else None,
             "screen_name": screen.name,
-            "menu_name": screen.menu.name if screen.menu else None
+            "menu_name": menu_name
         }
         
     except HTTPException:
@@ -614,88 +1635,87 @@ async def load_wizard_draft(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/screens/{screen_id}/documents/design/download")
-async def download_stored_design_doc(
+async def _download_stored_document(
+    request: Request,
+    db: AsyncSession,
     screen_id: int,
-    db: Session = Depends(get_db)
+    kind: str,
+    filename_suffix: str,
+    missing_message: str
 ):
     """
-    저장된 설계서 다운로드
+    저장된 산출물 다운로드 (BlobStore 스트리밍, ETag/Range/If-None-Match 지원)
+
+    이전 데이터(행에 본문이 저장된 경우)는 첫 다운로드 시 BlobStore로 옮깁니다.
     """
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    screen = await db.scalar(select(Screen).options(Screen.document_ref_only(kind)).where(Screen.id == screen_id))
     if not screen:
         raise HTTPException(status_code=404, detail="Screen not found")
-        
-    if not screen.design_doc:
-        raise HTTPException(status_code=404, detail="생성된 설계서가 없습니다. 먼저 생성해주세요.")
 
-    # DB의 바이너리 데이터를 스트림으로 변환
-    from io import BytesIO
-    file_stream = BytesIO(screen.design_doc)
-    
-    filename = f"{screen.name}_화면설계서.docx".encode('utf-8').decode('latin-1')
-    quoted_filename = quote(filename)
-    
-    return StreamingResponse(
-        file_stream,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quoted_filename}"}
+    ref = screen.get_document_ref(kind)
+    if ref is None:
+        legacy_content = await db.scalar(select(getattr(Screen, kind)).where(Screen.id == screen_id))
+        if not legacy_content:
+            raise HTTPException(status_code=404, detail=missing_message)
+        info = await asyncio.to_thread(get_blob_store().put, legacy_content, DOCX_CONTENT_TYPE)
+        screen.set_document_ref(kind, info.sha256, info.size, info.content_type)
+        await db.commit()
+        logger.info(f"📦 Screen {screen_id} {kind}: moved to blob store ({info.size} bytes)")
+        ref = info.to_dict()
+
+    store = get_blob_store()
+    if not await asyncio.to_thread(store.exists, ref["sha256"]):
+        logger.error(f"❌ Screen {screen_id} {kind}: blob {ref['sha256']} missing from store")
+        raise HTTPException(status_code=404, detail=missing_message)
+
+    return blob_download_response(
+        request,
+        store,
+        BlobInfo(ref["sha256"], ref["size"], ref["content_type"] or DOCX_CONTENT_TYPE),
+        f"{screen.name}_{filename_suffix}.docx"
+    )
+
+
+@router.get("/screens/{screen_id}/documents/design/download")
+async def download_stored_design_doc(
+    screen_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    저장된 설계서 다운로드
+    """
+    return await _download_stored_document(
+        request, db, screen_id, "design_doc", "화면설계서",
+        "생성된 설계서가 없습니다. 먼저 생성해주세요."
     )
 
 
 @router.get("/screens/{screen_id}/documents/testPlan/download")
 async def download_stored_test_plan(
     screen_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     저장된 테스트 계획서 다운로드
     """
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
-    if not screen:
-        raise HTTPException(status_code=404, detail="Screen not found")
-        
-    if not screen.test_plan_doc:
-        raise HTTPException(status_code=404, detail="생성된 테스트 계획서가 없습니다. 먼저 생성해주세요.")
-
-    from io import BytesIO
-    file_stream = BytesIO(screen.test_plan_doc)
-    
-    from urllib.parse import quote
-    safe_filename = f"{screen.name}_테스트계획서.docx"
-    quoted_filename = quote(safe_filename)
-    
-    return StreamingResponse(
-        file_stream,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quoted_filename}"}
+    return await _download_stored_document(
+        request, db, screen_id, "test_plan_doc", "테스트계획서",
+        "생성된 테스트 계획서가 없습니다. 먼저 생성해주세요."
     )
 
 
 @router.get("/screens/{screen_id}/documents/userManual/download")
 async def download_stored_user_manual(
     screen_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     저장된 사용자 매뉴얼 다운로드
     """
-    screen = db.query(Screen).filter(Screen.id == screen_id).first()
-    if not screen:
-        raise HTTPException(status_code=404, detail="Screen not found")
-        
-    if not screen.user_manual_doc:
-        raise HTTPException(status_code=404, detail="생성된 사용자 매뉴얼이 없습니다. 먼저 생성해주세요.")
-
-    from io import BytesIO
-    file_stream = BytesIO(screen.user_manual_doc)
-    
-    from urllib.parse import quote
-    safe_filename = f"{screen.name}_사용자매뉴얼.docx"
-    quoted_filename = quote(safe_filename)
-    
-    return StreamingResponse(
-        file_stream,
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quoted_filename}"}
-    )
\ No newline at end of file
+    return await _download_stored_document(
+        request, db, screen_id, "user_manual_doc", "사용자매뉴얼",
+        "생성된 사용자 매뉴얼이 없습니다. 먼저 생성해주세요."
+    )
@@ -5,6 +5,8 @@
 from fastapi import APIRouter, Depends
 from services.cache_service import CacheService, get_cache_service
 from services.ai_service import get_ai_service, AIService
+from services.response_cache import get_response_cache
+from services.single_flight import get_single_flight
 from typing import Dict, Any
 
 router = APIRouter(prefix="/api/cache", tags=["Cache"])
@@ -18,9 +20,13 @@ async def get_cache_stats(
     캐시 통계 조회
     
     Returns:
-        dict: 캐시 통계 정보
+        dict: 캐시 통계 정보 (response_cache: LLM 응답 캐시 적중/미스, single_flight: 요청 병합)
     """
-    return cache_service.get_cache_stats()
+    return {
+        **cache_service.get_cache_stats(),
+        "response_cache": get_response_cache().get_stats(),
+        "single_flight": get_single_flight().get_stats()
+    }
 
 
 @router.get("/context-cache/status")
@@ -38,21 +44,19 @@ async def get_context_cache_status(
     prompt_length = len(SYSTEM_PROMPT)
     estimated_tokens = prompt_length // 4  # 대략적인 토큰 수 추정
     
-    cached_context = cache_service.get_cached_context(SYSTEM_PROMPT)
+    cache_status = get_ai_service().get_context_cache_status()
+    min_tokens = cache_status["min_tokens_required"]
+    token_count = cache_status["token_count"] or estimated_tokens
     
     return {
         "system_prompt": {
             "length_chars": prompt_length,
             "estimated_tokens": estimated_tokens,
-            "min_tokens_required": 32768,
-            "meets_requirement": estimated_tokens >= 32768
-        },
-        "cache": {
-            "is_cached": cached_context is not None,
-            "cache_id": cached_context.get('cache_id') if cached_context else None,
-            "created_at": cached_context.get('created_at') if cached_context else None,
-            "expires_at": cached_context.get('expires_at') if cached_context else None,
+            "token_count": cache_status["token_count"],
+            "min_tokens_required": min_tokens,
+            "meets_requirement": token_count >= min_tokens
         },
+        "cache": cache_status,
         "redis_available": cache_service.is_available()
     }
 
@@ -62,8 +66,9 @@ async def create_context_cache() -> Dict[str, Any]:
     """
     Gemini Context Cache 생성 (수동)
     
-    SYSTEM_PROMPT를 Gemini에 캐싱합니다.
-    최소 32,768 토큰이 필요합니다.
+    SYSTEM_PROMPT를 Gemini cachedContents로 캐싱합니다.
+    모델별 최소 토큰 수(GEMINI_CACHE_MIN_TOKENS) 이상이어야 합니다.
+    생성은 첫 프로토타입 생성 시 자동으로도 수행됩니다.
     
     Returns:
         dict: 생성 결과
@@ -71,7 +76,7 @@ async def create_context_cache() -> Dict[str, Any]:
     ai_service = get_ai_service()
     
     try:
-        cache_id = ai_service._create_context_cache()
+        cache_id = await ai_service._create_context_cache()
         
         if cache_id:
             return {
@@ -80,10 +85,14 @@ async def create_context_cache() -> Dict[str, Any]:
                 "message": "Context Cache가 성공적으로 생성되었습니다."
             }
         else:
+            status = ai_service.get_context_cache_status()
             return {
                 "success": False,
                 "cache_id": None,
-                "message": "Context Cache 생성 실패. SYSTEM_PROMPT가 최소 토큰 요구사항(32,768)을 충족하지 못할 수 있습니다."
+                "message": (
+                    "Context Cache 생성 실패 - 인라인 시스템 프롬프트로 동작합니다. "
+                    f"(사유: {status.get('fallback_reason') or 'disabled'})"
+                )
             }
     except Exception as e:
         return {
@@ -104,10 +113,12 @@ async def clear_all_caches(
         dict: 삭제 결과
     """
     deleted = cache_service.clear_all_caches()
+    deleted_responses = get_response_cache().clear()
     return {
         "success": True,
         "deleted_count": deleted,
-        "message": f"{deleted}개의 캐시가 삭제되었습니다."
+        "deleted_response_count": deleted_responses,
+        "message": f"{deleted}개의 캐시와 {deleted_responses}개의 응답 캐시가 삭제되었습니다."
     }
 
 
@@ -137,7 +148,7 @@ async def test_cache_with_design_tokens(
     cache_service: CacheService = Depends(get_cache_service)
 ) -> Dict[str, Any]:
     """
-    디자인 토큰이 포함된 SYSTEM_PROMPT를 Redis에 캐싱 테스트
+    디자인 토큰이 포함된 SYSTEM_PROMPT의 크기와 캐시 상태 확인
     
     Returns:
         dict: 테스트 결과 (prompt 크기, 캐시 키, 캐시 상태)
@@ -157,20 +168,14 @@ async def test_cache_with_design_tokens(
     # 캐시 키 생성
     cache_key = cache_service.get_cache_key(SYSTEM_PROMPT)
     
-    # 캐시 존재 여부 확인
+    # 캐시 존재 여부 확인 (생성은 /context-cache/create 또는 첫 생성 요청 시 수행)
     cached_context = cache_service.get_cached_context(SYSTEM_PROMPT)
     is_cached = cached_context is not None
     
-    # 캐시되지 않았으면 임시로 설정 (실제 Gemini API 호출 없이 테스트)
-    if not is_cached and cache_service.is_available():
-        # 테스트용 캐시 데이터 설정
-        test_cache_id = f"test_cache_{cache_key[-8:]}"
-        cache_service.set_cached_context(SYSTEM_PROMPT, test_cache_id, ttl_hours=1)
-        cached_context = cache_service.get_cached_context(SYSTEM_PROMPT)
-        is_cached = True
-        cache_status = "newly_cached_for_test"
-    elif is_cached:
+    if is_cached:
         cache_status = "already_cached"
+    elif cache_service.is_available():
+        cache_status = "not_cached"
     else:
         cache_status = "redis_unavailable"
     
@@ -4,11 +4,13 @@ Menu Router - 메뉴 관리 API
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List
 import logging
 
-from models import get_db, Menu
+from models import get_async_db, Menu, Screen
 from schemas.menu import (
     MenuCreate,
     MenuUpdate,
@@ -37,16 +39,16 @@ router = APIRouter(
 )
 async def create_menu(
     menu_data: MenuCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메뉴 생성"""
     # order_index 자동 결정 (같은 레벨 내에서 최대값 + 1)
     if menu_data.order_index is None:
-        max_order = db.query(Menu).filter(
-            Menu.parent_id == menu_data.parent_id
-        ).order_by(Menu.order_index.desc()).first()
+        max_order = await db.scalar(
+            select(func.max(Menu.order_index)).where(Menu.parent_id == menu_data.parent_id)
+        )
         
-        order_index = (max_order.order_index + 1) if max_order else 0
+        order_index = (max_order + 1) if max_order is not None else 0
     else:
         order_index = menu_data.order_index
     
@@ -61,8 +63,7 @@ async def create_menu(
     
     # DB에 저장
     db.add(db_menu)
-    db.commit()
-    db.refresh(db_menu)
+    await db.commit()
     
     return db_menu
 
@@ -76,14 +77,14 @@ async def create_menu(
 async def get_menus(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메뉴 목록 조회"""
     # 전체 개수
-    total = db.query(Menu).count()
+    total = await db.scalar(select(func.count(Menu.id)))
     
     # 페이지네이션
-    menus = db.query(Menu).offset(skip).limit(limit).all()
+    menus = (await db.scalars(select(Menu).offset(skip).limit(limit))).all()
     
     return {
         "total": total,
@@ -99,10 +100,17 @@ async def get_menus(
 )
 async def get_menu(
     menu_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메뉴 상세 조회"""
-    db_menu = db.query(Menu).filter(Menu.id == menu_id).first()
+    db_menu = await db.scalar(
+        select(Menu)
+        .options(
+            selectinload(Menu.screens).options(Screen.with_content()),
+            selectinload(Menu.children)
+        )
+        .where(Menu.id == menu_id)
+    )
     
     if not db_menu:
         raise HTTPException(
@@ -131,10 +139,10 @@ async def get_menu(
 async def update_menu(
     menu_id: int,
     menu_data: MenuUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메뉴 수정"""
-    db_menu = db.query(Menu).filter(Menu.id == menu_id).first()
+    db_menu = await db.get(Menu, menu_id)
     
     if not db_menu:
         raise HTTPException(
@@ -147,8 +155,8 @@ async def update_menu(
     for field, value in update_data.items():
         setattr(db_menu, field, value)
     
-    db.commit()
-    db.refresh(db_menu)
+    await db.commit()
+    await db.refresh(db_menu)
     
     return db_menu
 
@@ -161,10 +169,10 @@ async def update_menu(
 )
 async def delete_menu(
     menu_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """메뉴 삭제"""
-    db_menu = db.query(Menu).filter(Menu.id == menu_id).first()
+    db_menu = await db.get(Menu, menu_id)
     
     if not db_menu:
         raise HTTPException(
@@ -172,8 +180,8 @@ async def delete_menu(
             detail=f"Menu with id {menu_id} not found"
         )
     
-    db.delete(db_menu)
-    db.commit()
+    await db.delete(db_menu)
+    await db.commit()
     
     return None
 
@@ -188,7 +196,7 @@ async def delete_menu(
 async def import_menus_from_csv(
     file: UploadFile = File(..., description="CSV 파일 (name, description, is_folder, parent_id, order_index 컬럼 필요)"),
     clear_existing: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     CSV 임포트 (계층적 구조 지원)
@@ -215,8 +223,8 @@ async def import_menus_from_csv(
         # 기존 메뉴 삭제 (옵션)
         if clear_existing:
             logger.info("기존 메뉴 삭제 중...")
-            db.query(Menu).delete()
-            db.commit()
+            await db.execute(delete(Menu))
+            await db.commit()
             logger.info("기존 메뉴 삭제 완료")
         
         # CSV 파싱
@@ -252,7 +260,7 @@ async def import_menus_from_csv(
                     skipped_count += 1
                     continue
                 
-                existing_menu = db.query(Menu).filter(Menu.name == menu_name).first()
+                existing_menu = (await db.scalars(select(Menu).where(Menu.name == menu_name).limit(1))).first()
                 if existing_menu:
                     logger.warning(f"DB에 이미 존재하는 메뉴 스킵: {menu_name}")
                     name_to_id[menu_name] = existing_menu.id
@@ -278,7 +286,7 @@ async def import_menus_from_csv(
                     order_index=menu_data.get('order_index', 0)
                 )
                 db.add(db_menu)
-                db.flush()  # ID 할당을 위해 flush
+                await db.flush()  # ID 할당을 위해 flush
                 
                 name_to_id[menu_name] = db_menu.id
                 created_menus.append(db_menu)
@@ -299,12 +307,8 @@ async def import_menus_from_csv(
             
             remaining_menus = still_pending
         
-        # 최종 커밋
-        db.commit()
-        
-        # 생성된 메뉴 리스트 갱신
-        for menu in created_menus:
-            db.refresh(menu)
+        # 최종 커밋 (expire_on_commit=False - 생성한 메뉴 속성은 그대로 사용)
+        await db.commit()
         
         logger.info(f"CSV 임포트 완료: {len(created_menus)}개 생성, {skipped_count}개 스킵")
         
@@ -330,7 +334,7 @@ async def import_menus_from_csv(
         raise
     except Exception as e:
         logger.error(f"CSV 임포트 실패: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"CSV 임포트 중 오류 발생: {str(e)}"
@@ -7,11 +7,12 @@ Resource Router - Wizard 리소스 관리 API
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import logging
 
-from models import get_db, Layout, Component, Action
+from models import get_async_db, Layout, Component, Action
 from schemas.resource import (
     # Layout
     LayoutCreate, LayoutUpdate, LayoutResponse, LayoutListResponse,
@@ -44,12 +45,12 @@ router = APIRouter(
     description="Wizard에서 사용하는 레이아웃, 컴포넌트, 액션을 한 번에 조회합니다."
 )
 async def get_wizard_resources(
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Wizard 리소스 전체 조회 (활성화된 항목만)"""
-    layouts = db.query(Layout).filter(Layout.is_active == True).order_by(Layout.sort_order).all()
-    components = db.query(Component).filter(Component.is_active == True).order_by(Component.sort_order).all()
-    actions = db.query(Action).filter(Action.is_active == True).order_by(Action.sort_order).all()
+    layouts = (await db.scalars(select(Layout).where(Layout.is_active == True).order_by(Layout.sort_order))).all()
+    components = (await db.scalars(select(Component).where(Component.is_active == True).order_by(Component.sort_order))).all()
+    actions = (await db.scalars(select(Action).where(Action.is_active == True).order_by(Action.sort_order))).all()
     
     return {
         "layouts": layouts,
@@ -72,16 +73,16 @@ async def get_layouts(
     skip: int = 0,
     limit: int = 100,
     include_inactive: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """레이아웃 목록 조회"""
-    query = db.query(Layout)
+    query = select(Layout)
     
     if not include_inactive:
-        query = query.filter(Layout.is_active == True)
+        query = query.where(Layout.is_active == True)
     
-    total = query.count()
-    layouts = query.order_by(Layout.sort_order).offset(skip).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    layouts = (await db.scalars(query.order_by(Layout.sort_order).offset(skip).limit(limit))).all()
     
     return {
         "total": total,
@@ -97,10 +98,10 @@ async def get_layouts(
 )
 async def get_layout(
     layout_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """레이아웃 상세 조회"""
-    layout = db.query(Layout).filter(Layout.id == layout_id).first()
+    layout = await db.get(Layout, layout_id)
     
     if not layout:
         raise HTTPException(
@@ -120,11 +121,11 @@ async def get_layout(
 )
 async def create_layout(
     layout_data: LayoutCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """레이아웃 생성"""
     # 중복 ID 체크
-    existing = db.query(Layout).filter(Layout.id == layout_data.id).first()
+    existing = await db.get(Layout, layout_data.id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -147,8 +148,8 @@ async def create_layout(
     )
     
     db.add(db_layout)
-    db.commit()
-    db.refresh(db_layout)
+    await db.commit()
+    await db.refresh(db_layout)
     
     logger.info(f"Created layout: {layout_data.id}")
     return db_layout
@@ -163,10 +164,10 @@ async def create_layout(
 async def update_layout(
     layout_id: str,
     layout_data: LayoutUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """레이아웃 수정"""
-    layout = db.query(Layout).filter(Layout.id == layout_id).first()
+    layout = await db.get(Layout, layout_id)
     
     if not layout:
         raise HTTPException(
@@ -187,8 +188,8 @@ async def update_layout(
     for field, value in update_data.items():
         setattr(layout, field, value)
     
-    db.commit()
-    db.refresh(layout)
+    await db.commit()
+    await db.refresh(layout)
     
     logger.info(f"Updated layout: {layout_id}")
     return layout
@@ -202,10 +203,10 @@ async def update_layout(
 )
 async def delete_layout(
     layout_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """레이아웃 삭제"""
-    layout = db.query(Layout).filter(Layout.id == layout_id).first()
+    layout = await db.get(Layout, layout_id)
     
     if not layout:
         raise HTTPException(
@@ -213,8 +214,8 @@ async def delete_layout(
             detail=f"Layout '{layout_id}' not found"
         )
     
-    db.delete(layout)
-    db.commit()
+    await db.delete(layout)
+    await db.commit()
     
     logger.info(f"Deleted layout: {layout_id}")
 
@@ -234,19 +235,19 @@ async def get_components(
     limit: int = 100,
     category: str = None,
     include_inactive: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """컴포넌트 목록 조회"""
-    query = db.query(Component)
+    query = select(Component)
     
     if not include_inactive:
-        query = query.filter(Component.is_active == True)
+        query = query.where(Component.is_active == True)
     
     if category:
-        query = query.filter(Component.category == category)
+        query = query.where(Component.category == category)
     
-    total = query.count()
-    components = query.order_by(Component.sort_order).offset(skip).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    components = (await db.scalars(query.order_by(Component.sort_order).offset(skip).limit(limit))).all()
     
     return {
         "total": total,
@@ -262,10 +263,10 @@ async def get_components(
 )
 async def get_component(
     component_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """컴포넌트 상세 조회"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = await db.get(Component, component_id)
     
     if not component:
         raise HTTPException(
@@ -285,11 +286,11 @@ async def get_component(
 )
 async def create_component(
     component_data: ComponentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """컴포넌트 생성"""
     # 중복 ID 체크
-    existing = db.query(Component).filter(Component.id == component_data.id).first()
+    existing = await db.get(Component, component_data.id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -311,8 +312,8 @@ async def create_component(
     )
     
     db.add(db_component)
-    db.commit()
-    db.refresh(db_component)
+    await db.commit()
+    await db.refresh(db_component)
     
     logger.info(f"Created component: {component_data.id}")
     return db_component
@@ -327,10 +328,10 @@ async def create_component(
 async def update_component(
     component_id: str,
     component_data: ComponentUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """컴포넌트 수정"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = await db.get(Component, component_id)
     
     if not component:
         raise HTTPException(
@@ -344,8 +345,8 @@ async def update_component(
     for field, value in update_data.items():
         setattr(component, field, value)
     
-    db.commit()
-    db.refresh(component)
+    await db.commit()
+    await db.refresh(component)
     
     logger.info(f"Updated component: {component_id}")
     return component
@@ -359,10 +360,10 @@ async def update_component(
 )
 async def delete_component(
     component_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """컴포넌트 삭제"""
-    component = db.query(Component).filter(Component.id == component_id).first()
+    component = await db.get(Component, component_id)
     
     if not component:
         raise HTTPException(
@@ -370,8 +371,8 @@ async def delete_component(
             detail=f"Component '{component_id}' not found"
         )
     
-    db.delete(component)
-    db.commit()
+    await db.delete(component)
+    await db.commit()
     
     logger.info(f"Deleted component: {component_id}")
 
@@ -391,19 +392,19 @@ async def get_actions(
     limit: int = 100,
     category: str = None,
     include_inactive: bool = False,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """액션 목록 조회"""
-    query = db.query(Action)
+    query = select(Action)
     
     if not include_inactive:
-        query = query.filter(Action.is_active == True)
+        query = query.where(Action.is_active == True)
     
     if category:
-        query = query.filter(Action.category == category)
+        query = query.where(Action.category == category)
     
-    total = query.count()
-    actions = query.order_by(Action.sort_order).offset(skip).limit(limit).all()
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+    actions = (await db.scalars(query.order_by(Action.sort_order).offset(skip).limit(limit))).all()
     
     return {
         "total": total,
@@ -419,10 +420,10 @@ async def get_actions(
 )
 async def get_action(
     action_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """액션 상세 조회"""
-    action = db.query(Action).filter(Action.id == action_id).first()
+    action = await db.get(Action, action_id)
     
     if not action:
         raise HTTPException(
@@ -442,11 +443,11 @@ async def get_action(
 )
 async def create_action(
     action_data: ActionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """액션 생성"""
     # 중복 ID 체크
-    existing = db.query(Action).filter(Action.id == action_data.id).first()
+    existing = await db.get(Action, action_data.id)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -466,8 +467,8 @@ async def create_action(
     )
     
     db.add(db_action)
-    db.commit()
-    db.refresh(db_action)
+    await db.commit()
+    await db.refresh(db_action)
     
     logger.info(f"Created action: {action_data.id}")
     return db_action
@@ -482,10 +483,10 @@ async def create_action(
 async def update_action(
     action_id: str,
     action_data: ActionUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """액션 수정"""
-    action = db.query(Action).filter(Action.id == action_id).first()
+    action = await db.get(Action, action_id)
     
     if not action:
         raise HTTPException(
@@ -499,8 +500,8 @@ async def update_action(
     for field, value in update_data.items():
         setattr(action, field, value)
     
-    db.commit()
-    db.refresh(action)
+    await db.commit()
+    await db.refresh(action)
     
     logger.info(f"Updated action: {action_id}")
     return action
@@ -514,10 +515,10 @@ async def update_action(
 )
 async def delete_action(
     action_id: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """액션 삭제"""
-    action = db.query(Action).filter(Action.id == action_id).first()
+    action = await db.get(Action, action_id)
     
     if not action:
         raise HTTPException(
@@ -525,7 +526,7 @@ async def delete_action(
             detail=f"Action '{action_id}' not found"
         )
     
-    db.delete(action)
-    db.commit()
+    await db.delete(action)
+    await db.commit()
     
     logger.info(f"Deleted action: {action_id}")
@@ -4,10 +4,11 @@ Screen Router - 화면 관리 API
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from models import get_db, Screen, Menu
+from models import get_async_db, Screen, Menu
 from schemas.screen import (
     ScreenCreate,
     ScreenUpdate,
@@ -21,6 +22,19 @@ router = APIRouter(
     tags=["screens"],
     responses={404: {"description": "Not found"}},
 )
+
+
+async def _load_screen(db: AsyncSession, screen_id: int) -> Optional[Screen]:
+    """to_dict()용 화면 조회 (산출물 blob 제외, 커밋 후 has_* 등 계산 컬럼 갱신을 위해 항상 새로 읽음)"""
+    result = await db.execute(
+        select(Screen)
+        .options(Screen.with_content())
+        .where(Screen.id == screen_id)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
 @router.post(
     "",
     response_model=ScreenResponse,
@@ -30,11 +44,11 @@ router = APIRouter(
 )
 async def create_screen(
     screen_data: ScreenCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """화면 생성"""
     # 메뉴 존재 확인
-    menu = db.query(Menu).filter(Menu.id == screen_data.menu_id).first()
+    menu = await db.get(Menu, screen_data.menu_id)
     if not menu:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -51,10 +65,10 @@ async def create_screen(
     
     # DB에 저장
     db.add(db_screen)
-    db.commit()
-    db.refresh(db_screen)
+    await db.commit()
     
-    return db_screen
+    db_screen = await _load_screen(db, db_screen.id)
+    return db_screen.to_dict()
 
 
 @router.get(
@@ -67,20 +81,22 @@ async def get_screens(
     menu_id: Optional[int] = Query(None, description="메뉴 ID로 필터링"),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """화면 목록 조회"""
-    query = db.query(Screen)
+    count_query = select(func.count(Screen.id))
+    query = select(Screen)
     
     # 메뉴 ID 필터링
     if menu_id is not None:
-        query = query.filter(Screen.menu_id == menu_id)
+        count_query = count_query.where(Screen.menu_id == menu_id)
+        query = query.where(Screen.menu_id == menu_id)
     
-    # 전체 개수
-    total = query.count()
+    # 전체 개수 (지연 컬럼까지 서브쿼리로 감싸지 않도록 COUNT만 조회)
+    total = await db.scalar(count_query)
     
-    # 페이지네이션
-    screens = query.offset(skip).limit(limit).all()
+    # 페이지네이션 (산출물 blob 제외)
+    screens = (await db.scalars(query.options(Screen.with_content()).offset(skip).limit(limit))).all()
     
     return {
         "total": total,
@@ -96,10 +112,10 @@ async def get_screens(
 )
 async def get_screen(
     screen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """화면 상세 조회"""
-    db_screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    db_screen = await _load_screen(db, screen_id)
     if not db_screen:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -117,10 +133,10 @@ async def get_screen(
 async def update_screen(
     screen_id: int,
     screen_data: ScreenUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """화면 수정"""
-    db_screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    db_screen = await _load_screen(db, screen_id)
     
     if not db_screen:
         raise HTTPException(
@@ -133,9 +149,9 @@ async def update_screen(
     for field, value in update_data.items():
         setattr(db_screen, field, value)
     
-    db.commit()
-    db.refresh(db_screen)
+    await db.commit()
     
+    db_screen = await _load_screen(db, screen_id)
     return db_screen.to_dict() if db_screen else None
 
 
@@ -147,10 +163,10 @@ async def update_screen(
 )
 async def delete_screen(
     screen_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """화면 삭제"""
-    db_screen = db.query(Screen).filter(Screen.id == screen_id).first()
+    db_screen = await db.get(Screen, screen_id)
     
     if not db_screen:
         raise HTTPException(
@@ -158,7 +174,7 @@ async def delete_screen(
             detail=f"Screen with id {screen_id} not found"
         )
     
-    db.delete(db_screen)
-    db.commit()
+    await db.delete(db_screen)
+    await db.commit()
     
     return None
\ No newline at end of file
@@ -15,6 +15,7 @@ class GenerateRequest(BaseModel):
     wizard_data: Optional[Dict[str, Any]] = Field(None, description="Wizard 원본 데이터 (Step1~4, 필수)")
     menu_name: str = Field(..., description="메뉴 이름")
     screen_name: str = Field(..., description="화면 이름")
+    bypass_cache: bool = Field(False, description="LLM 응답 캐시를 건너뛰고 새로 생성")
     
     # Pydantic v2: model_config 사용 (기존 class Config 대체)
     model_config = ConfigDict(
@@ -52,14 +53,17 @@ class GenerateResponse(BaseModel):
 class GenerateAckResponse(BaseModel):
     """비동기 생성 시작 즉시 반환되는 응답 (폴링으로 진행 상황 추적)"""
     screen_id: int = Field(..., description="화면 ID")
+    job_id: Optional[int] = Field(None, description="생성 작업 ID (GET /api/ai/jobs/{job_id}로 조회)")
     message: str = Field(..., description="생성 시작 안내 메시지")
     started: bool = Field(True, description="생성 프로세스 시작 여부")
     previous_prototype_cleared: bool = Field(..., description="기존 프로토타입/프롬프트 초기화 여부")
+    coalesced: bool = Field(False, description="같은 입력으로 진행 중인 생성에 합류했는지 여부")
 
     model_config = ConfigDict(
         json_schema_extra={
             "example": {
                 "screen_id": 132,
+                "job_id": 57,
                 "message": "프로토타입 생성이 시작되었습니다. 폴링으로 진행 상황을 확인하세요.",
                 "started": True,
                 "previous_prototype_cleared": True
@@ -68,6 +72,76 @@ class GenerateAckResponse(BaseModel):
     )
 
 
+class DraftPrototypeRequest(BaseModel):
+    """템플릿 초안 생성 요청 (LLM 미사용)"""
+    screen_id: Optional[int] = Field(None, description="화면 ID (save=true일 때 필수)")
+    wizard_data: Dict[str, Any] = Field(..., description="Wizard 원본 데이터 (Step1~4)")
+    menu_name: str = Field(..., description="메뉴 이름")
+    screen_name: str = Field(..., description="화면 이름")
+    save: bool = Field(False, description="초안을 화면 프로토타입으로 저장 (AI 생성 없이 완료 처리)")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "screen_id": 1,
+                "wizard_data": {
+                    "step1": {"screenName": "생산 일정", "description": "작업 지시를 계획하고 관리하는 화면"},
+                    "step2": {"selectedLayout": "search-grid", "layoutAreas": []},
+                    "step3": {"components": []},
+                    "step4": {"interactions": []}
+                },
+                "menu_name": "생산 계획",
+                "screen_name": "생산 일정",
+                "save": False
+            }
+        }
+    )
+
+
+class DraftPrototypeResponse(BaseModel):
+    """템플릿 초안 생성 응답"""
+    screen_id: Optional[int] = Field(None, description="화면 ID")
+    prototype_html: str = Field(..., description="조립된 React 컴포넌트 코드")
+    layout: str = Field(..., description="적용된 레이아웃 ID")
+    layout_template: bool = Field(..., description="Layout.html_template 사용 여부 (False면 기본 레이아웃)")
+    component_templates: int = Field(..., description="Component.jsx_template으로 렌더링한 컴포넌트 수")
+    action_templates: int = Field(..., description="Action.code_template으로 만든 핸들러 수")
+    elapsed_ms: int = Field(..., description="조립 시간 (밀리초)")
+    saved: bool = Field(False, description="화면 프로토타입 저장 여부")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "screen_id": 1,
+                "prototype_html": "const { useState, useEffect } = React;\n...",
+                "layout": "search-grid",
+                "layout_template": True,
+                "component_templates": 0,
+                "action_templates": 0,
+                "elapsed_ms": 3,
+                "saved": False
+            }
+        }
+    )
+
+
+class DocumentBundleJobResponse(BaseModel):
+    """산출물 일괄 생성 작업 등록 응답"""
+    screen_id: int = Field(..., description="화면 ID")
+    job_id: int = Field(..., description="작업 ID (GET /api/ai/jobs/{job_id}의 result.documents로 문서별 상태 조회)")
+    message: str = Field(..., description="안내 메시지")
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "screen_id": 132,
+                "job_id": 58,
+                "message": "산출물 일괄 생성 작업이 등록되었습니다."
+            }
+        }
+    )
+
+
 class GenerateDocumentsRequest(BaseModel):
     """산출물 생성 요청 (승인 후)"""
     screen_id: int = Field(..., description="화면 ID")
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Docx Render Benchmark Script
+- 문서 종류별 렌더링 시간 측정 (템플릿 매번 파싱 vs 템플릿 캐시)
+- 렌더링 중 이벤트 루프 지연 측정 (스레드 vs 프로세스 풀)
+
+LLM 호출 없이 고정된 샘플 데이터로 Word 렌더링만 측정합니다.
+
+Usage:
+    cd backend
+    python scripts/bench_docx_render.py
+    python scripts/bench_docx_render.py --iterations 50 --rows 80 --images 4 --concurrency 12
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import time
+import asyncio
+import argparse
+import statistics
+from io import BytesIO
+
+from PIL import Image
+
+from services import docx_renderer
+from services.docx_renderer import DocxRenderPool, TEMPLATE_FILES, render_document
+
+# ============================================================
+# 샘플 데이터
+# ============================================================
+
+
+def make_images(count: int):
+    """1280x800 PNG 스크린샷 대용 이미지"""
+    images = []
+    for i in range(count):
+        buffer = BytesIO()
+        Image.new("RGB", (1280, 800), (40 * i % 255, 120, 200)).save(buffer, format="PNG")
+        images.append({"label": f"Image {i + 1}", "bytes": buffer.getvalue()})
+    return images
+
+
+def make_wizard_data(rows: int):
+    return {
+        "step1": {"screenName": "생산 일정", "description": "작업 지시를 계획하고 관리하는 화면"},
+        "step3": {"components": [
+            {"label": f"필드{i}", "type": "textbox", "required": i % 3 == 0} for i in range(rows)
+        ]},
+    }
+
+
+def make_sample_data(kind: str, rows: int):
+    """문서 종류별 LLM 추출 결과 형태의 샘플"""
+    if kind == "design_doc":
+        return {
+            "basic_info": {"screen_name": "생산 일정", "component_name": "ProductionSchedule", "description": "샘플"},
+            "layout_structure": [
+                {"area_name": f"영역{a}", "description": "설명", "components": [f"필드{i}" for i in range(a, rows, 4)]}
+                for a in range(4)
+            ],
+            "user_flow": [{"step": i, "action": f"동작 {i}", "system_response": "응답"} for i in range(rows)],
+            "state_specs": [{"name": f"state{i}", "type": "string", "initial_value": "''", "description": "-"} for i in range(rows)],
+            "event_handlers": [{"ui_element": f"버튼{i}", "trigger": "onClick", "logic": "조회"} for i in range(rows)],
+        }
+    if kind == "test_plan_doc":
+        return {
+            "overview": {"screen_name": "생산 일정", "test_objective": "기능 검증", "test_scope": "전체",
+                         "preconditions": [f"조건 {i}" for i in range(5)]},
+            "test_cases": [
+                {"tc_id": f"TC-{i:03d}", "category": "기능", "test_item": f"항목 {i}", "test_description": "설명",
+                 "test_steps": ["입력", "조회", "확인"], "expected_result": "정상", "priority": "High"}
+                for i in range(rows)
+            ],
+            "test_scenarios": [{"scenario_id": f"S-{i}", "scenario_name": f"시나리오 {i}", "description": "-",
+                                "steps": ["A", "B"]} for i in range(rows // 4 or 1)],
+            "boundary_tests": [{"field": f"필드{i}", "test_type": "길이", "min_value": 0, "max_value": 100,
+                                "invalid_cases": ["-1", "101"]} for i in range(rows // 4 or 1)],
+        }
+    return {
+        "overview": {"screen_name": "생산 일정", "description": "샘플", "target_users": "현업 담당자"},
+        "ui_structure": [
+            {"area_name": f"영역{a}", "description": "설명",
+             "components": [{"name": f"필드{i}", "description": "-", "is_required": i % 2 == 0} for i in range(a, rows, 4)]}
+            for a in range(4)
+        ],
+        "procedures": [
+            {"procedure_id": str(p), "title": f"절차 {p}", "description": "설명",
+             "steps": [{"step": s, "action": "클릭", "system_response": "표시"} for s in range(5)], "tips": ["팁"]}
+            for p in range(rows // 8 or 1)
+        ],
+        "troubleshooting": [{"symptom": "증상", "cause": "원인", "solution": "해결"} for _ in range(rows // 4 or 1)],
+    }
+
+
+# ============================================================
+# 측정
+# ============================================================
+
+
+def _summary(samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    return f"mean {statistics.mean(samples) * 1000:7.1f}ms | p50 {statistics.median(samples) * 1000:7.1f}ms | p95 {p95 * 1000:7.1f}ms"
+
+
+def bench_render(iterations: int, rows: int, images):
+    """문서 종류별 렌더링 시간 (단일 프로세스)"""
+    wizard_data = make_wizard_data(rows)
+    print(f"\n[1] 렌더링 시간 (iterations={iterations}, rows={rows}, images={len(images)})")
+    for kind in TEMPLATE_FILES:
+        data = make_sample_data(kind, rows)
+
+        cold = []
+        for _ in range(iterations):
+            docx_renderer._template_cache.clear()
+            started = time.perf_counter()
+            render_document(kind, data, wizard_data, images)
+            cold.append(time.perf_counter() - started)
+
+        cached = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            content = render_document(kind, data, wizard_data, images)
+            cached.append(time.perf_counter() - started)
+
+        print(f"  {kind:<16} parse  : {_summary(cold)}")
+        print(f"  {kind:<16} cached : {_summary(cached)}  ({len(content) // 1024} KB)")
+
+
+async def _measure_loop_lag(pool: DocxRenderPool, concurrency: int, rows: int, images):
+    """렌더링 concurrency건을 동시에 실행하는 동안 이벤트 루프 지연(ms) 측정"""
+    wizard_data = make_wizard_data(rows)
+    kinds = list(TEMPLATE_FILES)
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        interval = 0.01
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - started - interval)
+
+    # 워커 기동/템플릿 파싱은 측정에서 제외
+    await asyncio.gather(*(pool.render(kind, make_sample_data(kind, rows), wizard_data, images) for kind in kinds))
+
+    tick = asyncio.create_task(ticker())
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        pool.render(kinds[i % len(kinds)], make_sample_data(kinds[i % len(kinds)], rows), wizard_data, images)
+        for i in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    return elapsed, lags
+
+
+def bench_event_loop(concurrency: int, rows: int, images, workers: int):
+    """스레드 vs 프로세스 풀 - 다른 요청이 체감하는 이벤트 루프 지연"""
+    print(f"\n[2] 렌더링 중 이벤트 루프 지연 (concurrency={concurrency})")
+    for label, pool_workers in (("thread", 0), (f"process x{workers}", workers)):
+        pool = DocxRenderPool(pool_workers)
+        try:
+            elapsed, lags = asyncio.run(_measure_loop_lag(pool, concurrency, rows, images))
+        finally:
+            pool.shutdown()
+        print(f"  {label:<12} total {elapsed * 1000:7.1f}ms | loop lag {_summary(lags)} | max {max(lags) * 1000:7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Docx render benchmark")
+    parser.add_argument("--iterations", type=int, default=20, help="문서 종류별 반복 횟수")
+    parser.add_argument("--rows", type=int, default=40, help="표 행 수 (컴포넌트/테스트 케이스 등)")
+    parser.add_argument("--images", type=int, default=2, help="삽입할 스크린샷 수")
+    parser.add_argument("--concurrency", type=int, default=9, help="이벤트 루프 측정 시 동시 렌더링 수")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("DOCX_RENDER_WORKERS", "2")) or 2,
+                        help="프로세스 풀 크기")
+    args = parser.parse_args()
+
+    images = make_images(args.images)
+    bench_render(args.iterations, args.rows, images)
+    bench_event_loop(args.concurrency, args.rows, images, args.workers)
+
+
+if __name__ == "__main__":
+    main()
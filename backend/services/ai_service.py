@@ -6,8 +6,10 @@ AI 서비스 - GeminiClient를 사용한 프로토타입 생성
 4단계 프로토타입 생성을 수행합니다.
 """
 
+import os
+import asyncio
 import logging
-from typing import Dict, Any, Optional, Callable, Awaitable
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable
 
 from utils.prompt_templates import (
     SYSTEM_PROMPT,
@@ -17,6 +19,9 @@ from utils.prompt_templates import (
     get_step_4_prompt,
 )
 from services.gemini_client import get_gemini_client, GeminiClientError
+from services.stage_planner import plan_stages
+from services.modal_fanout import get_modal_fanout, modal_interactions
+from utils.modal_splicer import splice_modals, ModalSpliceError
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -41,6 +46,9 @@ class AIService:
     
     def __init__(self):
         self.client = get_gemini_client()
+        self.modal_fanout = get_modal_fanout()
+        # 리소스 템플릿 초안으로 Stage 1 대체 여부
+        self.template_seed = os.getenv("PROTOTYPE_TEMPLATE_SEED", "true").lower() in ("1", "true", "yes")
         logger.info(f"AI Service initialized with GeminiClient: {self.client.model_name}")
     
     async def generate_prototype(
@@ -48,19 +56,36 @@ class AIService:
         menu_name: str,
         screen_name: str,
         wizard_data: Optional[Dict[str, Any]] = None,
-        progress_callback: Optional[Callable[[int, str], Awaitable[None]]] = None
-    ) -> Dict[str, str]:
+        progress_callback: Optional[Callable[[int, str], Awaitable[None]]] = None,
+        chunk_callback: Optional[Callable[[int, str, str], Awaitable[None]]] = None,
+        stage_memo: Optional[List[Dict[str, Any]]] = None,
+        seed_code: Optional[str] = None,
+        stage_callback: Optional[Callable[[int, str], Awaitable[None]]] = None
+    ) -> Dict[str, Any]:
         """
         Wizard 기반 4단계 순차적 코드 생성 (진행률 콜백 포함)
         
+        모달이 PROTOTYPE_MODAL_FANOUT_MIN개 이상이면 모달은 메인 생성과 동시에 독립 컴포넌트로 생성해
+        최종 코드에 합칩니다 (services/modal_fanout.py, utils/modal_splicer.py).
+        합칠 수 없는 메인 코드면 Step 4를 인라인 모달 프롬프트로 다시 실행합니다 (모달 없이 반환하지 않음).
+        
         Args:
             menu_name: 메뉴명
             screen_name: 화면명
             wizard_data: 위자드 데이터 (step1~step4)
             progress_callback: 진행률 콜백 async (percent, message) -> None
+            chunk_callback: 스트리밍 청크 콜백 async (stage, delta, accumulated) -> None
+                            (지정 시 스트리밍 모드, 진행률은 출력 토큰 기준)
+            stage_memo: 이전 생성의 단계별 기록 (결과의 "stages") - 입력이 같은 앞 단계는 재사용
+            seed_code: 리소스 템플릿으로 조립한 초안 (지정 시 Stage 1 대신 사용, 모델은 Stage 2부터 다듬기)
+            stage_callback: 단계 완료 콜백 async (stage, code) -> None
+                            (patch 모드에서는 chunk가 변경 블록이므로 단계별 전체 코드는 여기로 전달)
             
         Returns:
-            {"prototype_html": str, "final_prompt": str, "full_prompt": str}
+            {"prototype_html": str, "final_prompt": str, "full_prompt": str,
+             "turn_usage": [{"turn", "messages", "input_tokens", "cached_tokens", "output_tokens"}, ...],
+             "stages": [{"stage", "input_hash", "code"}, ...], "reused_stages": [int, ...],
+             "template_seeded": bool, "skipped_stages": [int, ...], "stage_plan": {"tier", "score", ...}}
             
         Raises:
             AIServiceError: 생성 실패 시
@@ -70,56 +95,135 @@ class AIService:
         if not wizard_data:
             raise AIServiceError("missing_wizard_data", "Wizard data required.")
         
-        # 전체 프롬프트 조합
-        try:
-            # Step 1~4 프롬프트를 하나로 합침
-            step1_prompt = get_step_1_prompt(wizard_data)
-            step2_prompt = get_step_2_prompt(wizard_data)
-            step3_prompt = get_step_3_prompt(wizard_data)
-            step4_prompt = get_step_4_prompt(wizard_data)
-            
-            # 전체 프롬프트 생성
-            full_prompt = f"""
-# {menu_name} - {screen_name}
-
-{step1_prompt}
-
-{step2_prompt}
-
-{step3_prompt}
-
-{step4_prompt}
-"""
-        except Exception as e:
-            raise AIServiceError("prompt_error", f"프롬프트 템플릿 생성 실패: {e}")
+        # 모달이 많은 화면은 모달을 메인 4단계 밖에서 병렬 생성 (Step 4는 파일 마무리만)
+        modals = modal_interactions(wizard_data)
+        fanout = self.modal_fanout.applies_to(modals)
         
         # 진행률 콜백 래핑 (GeminiClient 시그니처에 맞게)
-        async def wrapped_progress_callback(message: str, current: int, total: int):
+        async def wrapped_progress_callback(message: str, current: float, total: int):
             if progress_callback:
                 percent = int((current / total) * 100)
                 await progress_callback(percent, message)
         
-        try:
+        async def run_stages(external_modals: bool, memo: Optional[List[Dict[str, Any]]]):
+            full_prompt, step_prompts = self._build_prompts(menu_name, screen_name, wizard_data, external_modals)
+            stage_plan = plan_stages(wizard_data, modals_external=external_modals)
             # GeminiClient의 generate_prototype 호출
             result = await self.client.generate_prototype(
                 full_prompt=full_prompt,
                 system_prompt=SYSTEM_PROMPT,
-                progress_callback=wrapped_progress_callback
+                progress_callback=wrapped_progress_callback,
+                chunk_callback=chunk_callback,
+                # Step N 명세는 Stage N에 전달 (단계별 재사용 단위)
+                step_prompts=step_prompts,
+                stage_memo=memo,
+                seed_code=seed_code,
+                stage_callback=stage_callback,
+                # Wizard 복잡도에 따라 명세 전달 단계 수 결정, 로컬 검사 통과 시 이후 단계 생략
+                stage_plan=stage_plan
             )
+            return full_prompt, stage_plan, result
+        
+        # 모달은 메인 화면 코드에 의존하지 않으므로 메인 생성과 동시에 시작
+        modal_task = asyncio.create_task(self.modal_fanout.generate(modals, screen_name)) if fanout else None
+        
+        try:
+            full_prompt, stage_plan, result = await run_stages(fanout, stage_memo)
+            
+            code = result.get("code", "")
+            if modal_task:
+                try:
+                    code = self._splice_modals(code, await modal_task)
+                except ModalSpliceError as e:
+                    # 메인 코드에는 모달 JSX가 없으므로 그대로 저장하면 모달이 사라짐
+                    # → Step 4를 인라인 모달 프롬프트로 다시 실행 (입력이 같은 앞 단계는 재사용)
+                    logger.warning(f"⚠️ Modal splice failed - 인라인 모달로 Step 4 재실행: {e}")
+                    self.modal_fanout.stats["inline_reruns"] += 1
+                    fanout = False
+                    full_prompt, stage_plan, result = await run_stages(False, result.get("stages"))
+                    code = result.get("code", "")
             
             # 결과 형식 변환
             return {
-                "prototype_html": result.get("code", ""),
+                "prototype_html": code,
                 "final_prompt": full_prompt[:500] + "...",  # 요약
-                "full_prompt": full_prompt
+                "full_prompt": full_prompt,
+                "turn_usage": result.get("turn_usage", []),
+                "stages": result.get("stages", []),
+                "reused_stages": result.get("reused_stages", []),
+                "template_seeded": result.get("template_seeded", False),
+                "skipped_stages": result.get("skipped_stages", []),
+                "stage_plan": stage_plan.summary(),
+                "modal_fanout": len(modals) if fanout else 0
             }
             
+        except AIServiceError:
+            raise
         except GeminiClientError as e:
             logger.error(f"❌ Prototype generation failed: {e.error_type}: {e.message}")
             raise AIServiceError(e.error_type, e.message, e.raw_output)
         except Exception as e:
             logger.error(f"❌ Unexpected error: {type(e).__name__}: {e}")
             raise AIServiceError("unknown_error", str(e))
+        finally:
+            if modal_task and not modal_task.done():
+                modal_task.cancel()
+    
+    def _build_prompts(
+        self,
+        menu_name: str,
+        screen_name: str,
+        wizard_data: Dict[str, Any],
+        external_modals: bool
+    ) -> Tuple[str, List[str]]:
+        """전체 프롬프트 + 단계별(Step 1~4) 프롬프트"""
+        try:
+            # Step 1~4 프롬프트를 하나로 합침
+            step1_prompt = get_step_1_prompt(wizard_data)
+            step2_prompt = get_step_2_prompt(wizard_data)
+            step3_prompt = get_step_3_prompt(wizard_data)
+            step4_prompt = get_step_4_prompt(wizard_data, external_modals=external_modals)
+        except Exception as e:
+            raise AIServiceError("prompt_error", f"프롬프트 템플릿 생성 실패: {e}")
+        
+        # 전체 프롬프트 생성
+        header = f"# {menu_name} - {screen_name}"
+        full_prompt = f"""
+{header}
+
+{step1_prompt}
+
+{step2_prompt}
+
+{step3_prompt}
+
+{step4_prompt}
+"""
+        return full_prompt, [f"{header}\n\n{step1_prompt}", step2_prompt, step3_prompt, step4_prompt]
+    
+    def _splice_modals(self, code: str, components: Dict[int, str]) -> str:
+        """
+        병렬 생성한 모달을 메인 코드에 합침
+        
+        Raises:
+            ModalSpliceError: 합칠 수 없는 메인 코드 (호출자가 인라인 모달로 다시 생성)
+        """
+        spliced = splice_modals(code, components)
+        logger.info(f"🧷 Spliced {len(components)} modals into main component ({len(code)} → {len(spliced)} chars)")
+        return spliced
+    
+    async def _create_context_cache(self) -> Optional[str]:
+        """
+        SYSTEM_PROMPT용 Gemini Context Cache 생성 (이미 있으면 TTL 확인 후 재사용)
+        
+        Returns:
+            캐시 이름 (cachedContents/...) 또는 None (최소 토큰 미달/생성 실패)
+        """
+        return await self.client.context_cache.get_or_create(SYSTEM_PROMPT)
+    
+    def get_context_cache_status(self) -> Dict[str, Any]:
+        """SYSTEM_PROMPT 캐시 상태"""
+        return self.client.context_cache.get_status(SYSTEM_PROMPT)
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""
+Blob Store - 내용 주소(SHA-256) 기반 파일 저장소
+
+생성된 문서(docx)/스크린샷을 DB 행 대신 외부 저장소에 두고,
+DB에는 해시/크기/Content-Type만 저장합니다 (DB 크기, VACUUM/백업 시간 감소).
+같은 내용은 한 번만 저장됩니다 (키 = 내용의 SHA-256).
+
+[백엔드]
+- local: 로컬 파일 시스템 (기본값) - {BLOB_STORE_PATH}/ab/cd/abcd...
+- s3: S3 호환 오브젝트 스토리지 (AWS S3, MinIO 등 - boto3 필요)
+
+[다운로드]
+iter_range()로 필요한 바이트 범위만 청크 단위로 읽습니다 (utils/blob_response.py 참고).
+
+환경 변수:
+- BLOB_STORE_BACKEND: local | s3 (기본값: local)
+- BLOB_STORE_PATH: local 저장 경로 (기본값: ./data/blobs)
+- BLOB_S3_BUCKET: s3 버킷 이름
+- BLOB_S3_ENDPOINT_URL: S3 호환 엔드포인트 (MinIO 등, 비우면 AWS)
+- BLOB_S3_REGION: 리전 (기본값: ap-northeast-2)
+- BLOB_S3_PREFIX: 키 접두사 (기본값: blobs/)
+- AWS_ACCESS_KEY_ID / AWS_SECRET_ACCESS_KEY: s3 자격 증명 (boto3 기본 체인)
+"""
+import os
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Any, Optional, Iterator, BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# 해시 계산/복사 청크 크기
+CHUNK_SIZE = 1024 * 1024
+
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+class BlobNotFoundError(Exception):
+    """저장소에 없는 blob"""
+
+
+class BlobInfo:
+    """저장된 blob 정보 (DB에는 이 값만 저장)"""
+
+    def __init__(self, sha256: str, size: int, content_type: str):
+        self.sha256 = sha256
+        self.size = size
+        self.content_type = content_type
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"sha256": self.sha256, "size": self.size, "content_type": self.content_type}
+
+    def __repr__(self):
+        return f"<BlobInfo(sha256='{self.sha256[:12]}...', size={self.size}, content_type='{self.content_type}')>"
+
+
+def _hash_stream(stream: BinaryIO) -> tuple:
+    """스트림 전체의 (SHA-256, 크기)"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore:
+    """저장소 인터페이스 (동기 - 비동기 코드에서는 asyncio.to_thread로 호출)"""
+
+    backend = "base"
+
+    def put(self, data: bytes, content_type: str) -> BlobInfo:
+        """바이트 저장 (이미 있으면 기존 blob 재사용)"""
+        raise NotImplementedError
+
+    def put_file(self, path: str, content_type: str) -> BlobInfo:
+        """파일 저장 (스풀된 업로드 등 - 메모리에 전체를 올리지 않음)"""
+        raise NotImplementedError
+
+    def exists(self, sha256: str) -> bool:
+        raise NotImplementedError
+
+    def iter_range(self, sha256: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """[start, end] 바이트 범위(end 포함, None이면 끝까지)를 청크 단위로 읽기"""
+        raise NotImplementedError
+
+    def delete(self, sha256: str):
+        raise NotImplementedError
+
+    def get_bytes(self, sha256: str) -> bytes:
+        """전체 내용 (작은 blob/내부 처리용)"""
+        return b"".join(self.iter_range(sha256))
+
+
+class LocalBlobStore(BlobStore):
+    """로컬 파일 시스템 저장소"""
+
+    backend = "local"
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self._tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(self._tmp_dir, exist_ok=True)
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def _commit_tmp(self, tmp_path: str, sha256: str):
+        """임시 파일을 최종 위치로 원자적 이동 (동시에 같은 내용을 저장해도 안전)"""
+        path = self._path(sha256)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(tmp_path, path)
+
+    def put(self, data: bytes, content_type: str) -> BlobInfo:
+        sha256 = hashlib.sha256(data).hexdigest()
+        if not os.path.exists(self._path(sha256)):
+            fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            self._commit_tmp(tmp_path, sha256)
+        return BlobInfo(sha256, len(data), content_type)
+
+    def put_file(self, path: str, content_type: str) -> BlobInfo:
+        with open(path, "rb") as f:
+            sha256, size = _hash_stream(f)
+        if not os.path.exists(self._path(sha256)):
+            fd, tmp_path = tempfile.mkstemp(dir=self._tmp_dir)
+            with os.fdopen(fd, "wb") as dst, open(path, "rb") as src:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    dst.write(chunk)
+            self._commit_tmp(tmp_path, sha256)
+        return BlobInfo(sha256, size, content_type)
+
+    def exists(self, sha256: str) -> bool:
+        return os.path.exists(self._path(sha256))
+
+    def iter_range(self, sha256: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        try:
+            f = open(self._path(sha256), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(sha256)
+        with f:
+            f.seek(start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                chunk = f.read(CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, sha256: str):
+        try:
+            os.remove(self._path(sha256))
+        except FileNotFoundError:
+            pass
+
+
+class S3BlobStore(BlobStore):
+    """S3 호환 오브젝트 스토리지 (boto3)"""
+
+    backend = "s3"
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: Optional[str] = None, prefix: str = "blobs/"):
+        try:
+            import boto3
+            from botocore.exceptions import ClientError
+        except ImportError:
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 사용 시 boto3 패키지가 필요합니다 (pip install boto3)")
+        if not bucket:
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 사용 시 BLOB_S3_BUCKET 설정이 필요합니다")
+
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = boto3.client("s3", endpoint_url=endpoint_url or None, region_name=region)
+        self._client_error = ClientError
+
+    def _key(self, sha256: str) -> str:
+        return f"{self.prefix}{sha256[:2]}/{sha256}"
+
+    def exists(self, sha256: str) -> bool:
+        try:
+            self._client.head_object(Bucket=self.bucket, Key=self._key(sha256))
+            return True
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put(self, data: bytes, content_type: str) -> BlobInfo:
+        sha256 = hashlib.sha256(data).hexdigest()
+        if not self.exists(sha256):
+            self._client.put_object(Bucket=self.bucket, Key=self._key(sha256), Body=data, ContentType=content_type)
+        return BlobInfo(sha256, len(data), content_type)
+
+    def put_file(self, path: str, content_type: str) -> BlobInfo:
+        with open(path, "rb") as f:
+            sha256, size = _hash_stream(f)
+        if not self.exists(sha256):
+            self._client.upload_file(path, self.bucket, self._key(sha256), ExtraArgs={"ContentType": content_type})
+        return BlobInfo(sha256, size, content_type)
+
+    def iter_range(self, sha256: str, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        byte_range = f"bytes={start}-" + ("" if end is None else str(end))
+        try:
+            obj = self._client.get_object(Bucket=self.bucket, Key=self._key(sha256), Range=byte_range)
+        except self._client_error as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise BlobNotFoundError(sha256)
+            raise
+        body = obj["Body"]
+        try:
+            yield from body.iter_chunks(CHUNK_SIZE)
+        finally:
+            body.close()
+
+    def delete(self, sha256: str):
+        self._client.delete_object(Bucket=self.bucket, Key=self._key(sha256))
+
+
+# 싱글톤 인스턴스
+_blob_store_instance: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """BlobStore 싱글톤 인스턴스 반환 (BLOB_STORE_BACKEND에 따라 생성)"""
+    global _blob_store_instance
+    if _blob_store_instance is None:
+        backend = os.getenv("BLOB_STORE_BACKEND", "local").lower()
+        if backend == "s3":
+            _blob_store_instance = S3BlobStore(
+                bucket=os.getenv("BLOB_S3_BUCKET", ""),
+                endpoint_url=os.getenv("BLOB_S3_ENDPOINT_URL"),
+                region=os.getenv("BLOB_S3_REGION", "ap-northeast-2"),
+                prefix=os.getenv("BLOB_S3_PREFIX", "blobs/")
+            )
+        else:
+            _blob_store_instance = LocalBlobStore(os.getenv("BLOB_STORE_PATH", "./data/blobs"))
+        logger.info(f"BlobStore initialized: backend={_blob_store_instance.backend}")
+    return _blob_store_instance
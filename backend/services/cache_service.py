@@ -92,15 +92,19 @@ class CacheService:
         self,
         system_prompt: str,
         cache_id: str,
-        ttl_hours: int = 1
+        ttl_hours: int = 1,
+        ttl_seconds: Optional[int] = None,
+        extra: Optional[Dict[str, Any]] = None
     ) -> bool:
         """
         캐시된 컨텍스트 저장
         
         Args:
             system_prompt: 시스템 프롬프트
-            cache_id: Gemini API에서 반환한 캐시 ID
+            cache_id: Gemini API에서 반환한 캐시 이름 (cachedContents/...)
             ttl_hours: 캐시 만료 시간 (시간)
+            ttl_seconds: 캐시 만료 시간 (초, 지정 시 ttl_hours 대신 사용)
+            extra: 함께 저장할 추가 정보 (model, token_count 등)
             
         Returns:
             bool: 저장 성공 여부
@@ -111,9 +115,11 @@ class CacheService:
         try:
             cache_key = self.get_cache_key(system_prompt)
             now = datetime.now()
-            expires_at = now + timedelta(hours=ttl_hours)
+            ttl = timedelta(seconds=ttl_seconds) if ttl_seconds else timedelta(hours=ttl_hours)
+            expires_at = now + ttl
             
             cache_data = {
+                **(extra or {}),
                 "cache_id": cache_id,
                 "created_at": now.isoformat(),
                 "expires_at": expires_at.isoformat(),
@@ -123,11 +129,11 @@ class CacheService:
             # Redis에 저장 (TTL 설정)
             self.redis_client.setex(
                 cache_key,
-                timedelta(hours=ttl_hours),
+                ttl,
                 json.dumps(cache_data)
             )
             
-            logger.info(f"💾 Cache SAVED: {cache_key} (expires in {ttl_hours}h)")
+            logger.info(f"💾 Cache SAVED: {cache_key} (expires in {int(ttl.total_seconds())}s)")
             return True
             
         except Exception as e:
@@ -160,6 +166,57 @@ class CacheService:
             logger.error(f"Error invalidating cache: {e}")
             return False
     
+    def get_json(self, key: str) -> Optional[Any]:
+        """
+        임의 키의 JSON 값 조회 (응답 캐시 등 범용 용도)
+        
+        Returns:
+            역직렬화된 값 또는 None (없음/Redis 불가)
+        """
+        if not self.is_available():
+            return None
+        
+        try:
+            data = self.redis_client.get(key)
+            return json.loads(data) if data else None
+        except Exception as e:
+            logger.error(f"Error getting json ({key}): {e}")
+            return None
+    
+    def set_json(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        """
+        임의 키에 JSON 값 저장 (TTL 설정)
+        
+        Returns:
+            bool: 저장 성공 여부
+        """
+        if not self.is_available():
+            return False
+        
+        try:
+            self.redis_client.setex(key, ttl_seconds, json.dumps(value, ensure_ascii=False))
+            return True
+        except Exception as e:
+            logger.error(f"Error setting json ({key}): {e}")
+            return False
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        패턴과 일치하는 키 삭제
+        
+        Returns:
+            int: 삭제된 키 개수
+        """
+        if not self.is_available():
+            return 0
+        
+        try:
+            keys = list(self.redis_client.scan_iter(match=pattern))
+            return self.redis_client.delete(*keys) if keys else 0
+        except Exception as e:
+            logger.error(f"Error deleting keys ({pattern}): {e}")
+            return 0
+    
     def clear_all_caches(self) -> int:
         """
         모든 Gemini 캐시 삭제
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+Gemini Context Cache - cachedContents 리소스 관리
+
+SYSTEM_PROMPT(디자인 토큰 포함)를 Gemini 서버 측 cachedContents로 만들어 두고
+generateContent 요청에서 cachedContent 이름으로 참조합니다.
+4단계 생성의 모든 호출이 시스템 프롬프트를 다시 보내지 않으므로
+입력 토큰 처리량과 지연이 줄어듭니다.
+
+[저장]
+- 캐시 이름/만료 시각은 CacheService(Redis)에 저장하여 워커 간 공유
+- Redis 불가 시 프로세스 로컬 딕셔너리로 대체
+
+[수명 주기]
+- 조회 시 만료까지 GEMINI_CACHE_REFRESH_MARGIN 이하로 남았으면 TTL 연장(PATCH)
+- 최소 토큰 수 미달/생성 실패 시 일정 시간 재시도하지 않고 인라인 시스템 프롬프트로 동작
+- 캐시는 GEMINI_MODEL 전용 - 다른 모델로 라우팅된 호출은 시스템 프롬프트를 systemInstruction으로 인라인 전달
+
+환경 변수:
+- GEMINI_CONTEXT_CACHE: 사용 여부 (기본값: true)
+- GEMINI_CACHE_TTL: 캐시 TTL(초) (기본값: 3600)
+- GEMINI_CACHE_REFRESH_MARGIN: 만료 전 갱신 여유(초) (기본값: 300)
+- GEMINI_CACHE_MIN_TOKENS: 캐시 생성 최소 토큰 수 (기본값: 1024, 모델별 최소값에 맞게 설정)
+"""
+import os
+import time
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, TYPE_CHECKING
+
+import httpx
+
+from services.cache_service import get_cache_service
+
+if TYPE_CHECKING:
+    from services.gemini_client import GeminiClient
+
+logger = logging.getLogger(__name__)
+
+
+class ContextCacheManager:
+    """시스템 프롬프트별 Gemini cachedContents 관리"""
+
+    # 최소 토큰 미달 시 재시도 억제 시간(초) - 프롬프트가 바뀌지 않는 한 결과가 같음
+    BELOW_MIN_SKIP_SECONDS = 3600
+    # 생성 실패(일시 오류) 시 재시도 억제 시간(초)
+    FAILURE_SKIP_SECONDS = 60
+
+    def __init__(self, client: 'GeminiClient'):
+        self.client = client
+        self.enabled = os.getenv("GEMINI_CONTEXT_CACHE", "true").lower() in ("1", "true", "yes")
+        self.ttl_seconds = int(os.getenv("GEMINI_CACHE_TTL", "3600"))
+        self.refresh_margin = int(os.getenv("GEMINI_CACHE_REFRESH_MARGIN", "300"))
+        self.min_tokens = int(os.getenv("GEMINI_CACHE_MIN_TOKENS", "1024"))
+
+        # Redis 불가 시 로컬 저장소 (캐시 키 -> 캐시 정보)
+        self._local: Dict[str, Dict[str, Any]] = {}
+        # 캐시 생성을 건너뛸 프롬프트 (캐시 키 -> (재시도 가능 시각, 사유))
+        self._skip_until: Dict[str, tuple] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # 캐시 이름 -> 시스템 프롬프트 (다른 모델로 라우팅된 호출에서 systemInstruction으로 인라인 전달)
+        self._prompts: Dict[str, str] = {}
+
+        self.stats = {"hits": 0, "created": 0, "refreshed": 0, "fallbacks": 0, "invalidated": 0}
+
+    # =========================================================================
+    # 저장소 (CacheService + 로컬 대체)
+    # =========================================================================
+
+    def _key(self, system_prompt: str) -> str:
+        return get_cache_service().get_cache_key(system_prompt)
+
+    def _load(self, system_prompt: str) -> Optional[Dict[str, Any]]:
+        """저장된 캐시 정보 (다른 모델용이거나 만료되었으면 None)"""
+        cache_service = get_cache_service()
+        entry = cache_service.get_cached_context(system_prompt) if cache_service.is_available() else None
+        if entry is None:
+            entry = self._local.get(self._key(system_prompt))
+            if entry and datetime.fromisoformat(entry["expires_at"]) <= datetime.now():
+                self._local.pop(self._key(system_prompt), None)
+                entry = None
+        if entry and entry.get("model") != self.client.model_name:
+            return None
+        if entry:
+            self._prompts[entry["cache_id"]] = system_prompt
+        return entry
+
+    def _store(self, system_prompt: str, name: str, token_count: Optional[int]):
+        now = datetime.now()
+        entry = {
+            "cache_id": name,
+            "model": self.client.model_name,
+            "token_count": token_count,
+            "created_at": now.isoformat(),
+            "expires_at": (now + timedelta(seconds=self.ttl_seconds)).isoformat(),
+        }
+        self._local[self._key(system_prompt)] = entry
+        self._prompts[name] = system_prompt
+        get_cache_service().set_cached_context(
+            system_prompt,
+            name,
+            ttl_seconds=self.ttl_seconds,
+            extra={"model": self.client.model_name, "token_count": token_count}
+        )
+
+    @staticmethod
+    def _remaining_seconds(entry: Dict[str, Any]) -> float:
+        return (datetime.fromisoformat(entry["expires_at"]) - datetime.now()).total_seconds()
+
+    # =========================================================================
+    # 공개 API
+    # =========================================================================
+
+    def get_cached_name(self, system_prompt: str) -> Optional[str]:
+        """이미 생성된 유효한 캐시 이름 (생성/갱신 없음 - 동기 호출용)"""
+        if not self.enabled or not system_prompt:
+            return None
+        entry = self._load(system_prompt)
+        if entry and self._remaining_seconds(entry) > self.refresh_margin:
+            self.stats["hits"] += 1
+            return entry["cache_id"]
+        return None
+
+    def system_prompt_for(self, name: str) -> Optional[str]:
+        """캐시 이름에 해당하는 시스템 프롬프트 (이 프로세스에서 조회/생성한 캐시만)"""
+        return self._prompts.get(name)
+
+    async def get_or_create(self, system_prompt: str) -> Optional[str]:
+        """
+        시스템 프롬프트용 캐시 이름 반환 (필요 시 생성/갱신)
+
+        Returns:
+            "cachedContents/..." 또는 None (캐시 미사용 - 인라인 시스템 프롬프트로 대체)
+        """
+        if not self.enabled or not system_prompt:
+            return None
+
+        key = self._key(system_prompt)
+        skip = self._skip_until.get(key)
+        if skip and skip[0] > time.monotonic():
+            self.stats["fallbacks"] += 1
+            return None
+
+        name = self.get_cached_name(system_prompt)
+        if name:
+            return name
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 대기 중 다른 코루틴이 생성/갱신했을 수 있음
+            name = self.get_cached_name(system_prompt)
+            if name:
+                return name
+
+            entry = self._load(system_prompt)
+            if entry and await self._refresh(entry["cache_id"]):
+                self._store(system_prompt, entry["cache_id"], entry.get("token_count"))
+                self.stats["refreshed"] += 1
+                logger.info(f"🔄 Context cache refreshed: {entry['cache_id']}")
+                return entry["cache_id"]
+
+            return await self._create(system_prompt, key)
+
+    def invalidate(self, system_prompt: str):
+        """저장된 캐시 정보 삭제 (서버에서 캐시가 사라진 경우 등)"""
+        self._local.pop(self._key(system_prompt), None)
+        get_cache_service().invalidate_cache(system_prompt)
+        self.stats["invalidated"] += 1
+
+    def get_status(self, system_prompt: str) -> Dict[str, Any]:
+        """캐시 상태 요약 (API 응답용)"""
+        entry = self._load(system_prompt)
+        skip = self._skip_until.get(self._key(system_prompt))
+        return {
+            "enabled": self.enabled,
+            "model": self.client.model_name,
+            "ttl_seconds": self.ttl_seconds,
+            "min_tokens_required": self.min_tokens,
+            "is_cached": entry is not None,
+            "cache_id": entry.get("cache_id") if entry else None,
+            "token_count": entry.get("token_count") if entry else None,
+            "expires_at": entry.get("expires_at") if entry else None,
+            "fallback_reason": skip[1] if skip and skip[0] > time.monotonic() else None,
+            "stats": dict(self.stats),
+        }
+
+    # =========================================================================
+    # REST API (cachedContents / countTokens)
+    # =========================================================================
+
+    def _skip(self, key: str, seconds: int, reason: str):
+        self._skip_until[key] = (time.monotonic() + seconds, reason)
+        self.stats["fallbacks"] += 1
+
+    async def _count_tokens(self, system_prompt: str) -> Optional[int]:
+        """시스템 프롬프트 토큰 수 (실패 시 None)"""
+        url = self.client._build_url("countTokens")
+        payload = {"contents": [{"role": "user", "parts": [{"text": system_prompt}]}]}
+        try:
+            client = self.client._get_async_client()
+            response = await client.post(url, json=payload, timeout=self.client._request_timeout(30))
+            if response.status_code != 200:
+                return None
+            return response.json().get("totalTokens")
+        except (httpx.HTTPError, ValueError):
+            return None
+
+    async def _create(self, system_prompt: str, key: str) -> Optional[str]:
+        token_count = await self._count_tokens(system_prompt)
+        if token_count is not None and token_count < self.min_tokens:
+            reason = f"below_min_tokens ({token_count} < {self.min_tokens})"
+            logger.info(f"ℹ️ Context cache skipped: {reason} - 인라인 시스템 프롬프트 사용")
+            self._skip(key, self.BELOW_MIN_SKIP_SECONDS, reason)
+            return None
+
+        url = self.client._build_resource_url("cachedContents")
+        payload = {
+            "model": f"models/{self.client.model_name}",
+            "displayName": f"forgeflow-{key.split(':')[-1]}",
+            "systemInstruction": {"parts": [{"text": system_prompt}]},
+            "ttl": f"{self.ttl_seconds}s",
+        }
+        try:
+            client = self.client._get_async_client()
+            response = await client.post(url, json=payload, timeout=self.client._request_timeout(60))
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ Context cache create failed: {e}")
+            self._skip(key, self.FAILURE_SKIP_SECONDS, "create_failed")
+            return None
+
+        if response.status_code != 200:
+            body = response.text[:300]
+            # 최소 토큰 미달은 400으로 반환됨 (countTokens 실패로 사전 검사를 못 한 경우)
+            if response.status_code == 400 and "token" in body.lower():
+                self._skip(key, self.BELOW_MIN_SKIP_SECONDS, "below_min_tokens")
+            else:
+                self._skip(key, self.FAILURE_SKIP_SECONDS, f"create_failed ({response.status_code})")
+            logger.warning(f"⚠️ Context cache create failed: {response.status_code} - {body}")
+            return None
+
+        name = response.json().get("name")
+        if not name:
+            self._skip(key, self.FAILURE_SKIP_SECONDS, "create_failed (no name)")
+            return None
+
+        self._store(system_prompt, name, token_count)
+        self.stats["created"] += 1
+        logger.info(f"💾 Context cache created: {name} ({token_count} tokens, ttl={self.ttl_seconds}s)")
+        return name
+
+    async def _refresh(self, name: str) -> bool:
+        """캐시 TTL 연장 (없어졌으면 False)"""
+        url = self.client._build_resource_url(name) + "&updateMask=ttl"
+        try:
+            client = self.client._get_async_client()
+            response = await client.patch(
+                url,
+                json={"ttl": f"{self.ttl_seconds}s"},
+                timeout=self.client._request_timeout(30)
+            )
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ Context cache refresh failed: {e}")
+            return False
@@ -0,0 +1,716 @@
+# -*- coding: utf-8 -*-
+"""
+Docx Renderer - Word 산출물 렌더링 (프로세스 풀 + 템플릿 캐시)
+
+python-docx 작업(템플릿 파싱, 문단/표 순회, 이미지 삽입)은 CPU를 오래 점유하므로
+스레드(asyncio.to_thread)로 넘겨도 GIL 때문에 다른 요청의 응답이 늦어집니다.
+렌더링을 별도 프로세스 풀에서 실행하고, 각 프로세스는 파싱한 템플릿을 캐시해
+렌더링마다 깊은 복사본만 만들어 사용합니다 (매번 디스크에서 다시 파싱하지 않음).
+
+[구성]
+- DocxRenderer: 문서 종류별 Word 작성 로직 (설계서/테스트 계획서/사용자 매뉴얼)
+- load_template(kind): 템플릿 캐시 (파일 수정 시각이 바뀌면 다시 파싱)
+- render_document(kind, ...): 워커 프로세스 진입점 (docx bytes 반환)
+- DocxRenderPool: 비동기 코드용 실행기 (get_docx_render_pool())
+
+환경 변수:
+- DOCX_RENDER_WORKERS: 렌더링 프로세스 수 (기본값: 2, 0이면 프로세스 없이 스레드에서 렌더링)
+"""
+import os
+import copy
+import asyncio
+import logging
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from docx import Document
+from docx.shared import Inches, Pt, RGBColor
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.table import _Cell
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates')
+
+# 산출물 종류 → 템플릿 파일
+TEMPLATE_FILES = {
+    "design_doc": "design_spec_template.docx",
+    "test_plan_doc": "test_plan_template.docx",
+    "user_manual_doc": "user_manual_template.docx",
+}
+
+
+# =============================================================================
+# 템플릿 캐시 (프로세스 단위)
+# =============================================================================
+# kind → (파일 수정 시각, 파싱된 Document)
+_template_cache: Dict[str, Tuple[Optional[float], Any]] = {}
+_template_lock = threading.Lock()
+
+
+def load_template(kind: str):
+    """
+    파싱된 템플릿의 깊은 복사본 반환 (렌더링마다 독립된 문서)
+
+    템플릿 파일이 없으면 빈 문서를 사용합니다.
+    """
+    path = os.path.join(TEMPLATE_DIR, TEMPLATE_FILES[kind])
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+
+    with _template_lock:
+        cached = _template_cache.get(kind)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, Document(path) if mtime is not None else Document())
+            _template_cache[kind] = cached
+            logger.info(f"📄 Template parsed: {kind} ({TEMPLATE_FILES[kind] if mtime is not None else 'blank'})")
+        # 캐시된 원본은 수정하지 않음 - 복사는 잠금 안에서 (원본 순회 중 다른 스레드 접근 방지)
+        return copy.deepcopy(cached[1])
+
+
+def warm_templates():
+    """모든 템플릿 미리 파싱 (워커 프로세스 초기화)"""
+    for kind in TEMPLATE_FILES:
+        load_template(kind)
+
+
+# =============================================================================
+# 문서 작성
+# =============================================================================
+
+class DocxRenderer:
+    """산출물 종류별 Word 문서 작성 (LLM 추출 결과 + Wizard 데이터 → docx)"""
+
+    def _create_design_docx(self, data: dict, wizard_data: dict, images: List[dict] = None) -> BytesIO:
+        doc = load_template("design_doc")
+
+        # (A) 텍스트 치환
+        info = data.get('basic_info', {})
+        replacements = {
+            "{{SCREEN_NAME}}": str(info.get('screen_name', data.get('screen_name', ''))),
+            "{{COMPONENT_NAME}}": str(info.get('component_name', '')),
+            "{{DESCRIPTION}}": str(info.get('description', '')),
+        }
+
+        for paragraph in doc.paragraphs:
+            for key, val in replacements.items():
+                if key in paragraph.text:
+                    paragraph.text = paragraph.text.replace(key, str(val))
+
+        # (B) 이미지 삽입 ({{SCREENSHOT}})
+        for paragraph in doc.paragraphs:
+            if "{{SCREENSHOT}}" in paragraph.text:
+                paragraph.text = "" 
+                if images:
+                    for img in images:
+                        try:
+                            run = paragraph.add_run()
+                            run.add_picture(BytesIO(img['bytes']), width=Inches(6.0))
+                            # 이미지 라벨 추가
+                            run.add_text(f"\n[{img['label']}]\n")
+                        except: pass
+                else:
+                    paragraph.text = "(스크린샷 없음)"
+                break
+
+        # (C) UI 구조 도식화 (Tree Grid 스타일) 🔥
+        # wizard_data에서 컴포넌트 상세 목록을 가져옴
+        raw_components = wizard_data.get('step3', {}).get('components', [])
+        self._generate_ui_structure_table(doc, data.get('layout_structure', []), raw_components)
+
+        # (D) Normal Flow (동작 순서)
+        self._generate_user_flow_table(doc, data.get('user_flow', []))
+
+        # (E) 고정 테이블 채우기 (태그 기반 검색)
+        state_table = self._find_table_by_tag(doc, "{{TABLE:STATE}}")
+        if state_table:
+            self._fill_table(state_table, data.get('state_specs', []), ["name", "type", "initial_value", "description"])
+
+        event_table = self._find_table_by_tag(doc, "{{TABLE:EVENT}}")
+        if event_table:
+            self._fill_table(event_table, data.get('event_handlers', []), ["ui_element", "trigger", "logic"])
+
+        buffer = BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    # --- Helper Methods ---
+
+    def _generate_ui_structure_table(self, doc, layout_data: list, raw_components: list):
+        """
+        {{UI_STRUCTURE}} 위치에 [화면구성 | 유형 | 필수 | 비고] 형태의 트리 테이블 생성
+        """
+        target_p = self._find_and_clear_tag(doc, "{{UI_STRUCTURE}}")
+        if not target_p or not layout_data: return
+
+        # 컴포넌트 상세 정보 매핑 (Label -> Detail)
+        comp_map = {c['label']: c for c in raw_components}
+
+        # 표 생성 (헤더 + 데이터)
+        table = doc.add_table(rows=1, cols=4)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        # [헤더 설정]
+        headers = ["화면 구성", "UI 유형", "필수", "비고"]
+        # 열 너비 비율 (대략적): 4:2:1:3
+        
+        for i, text in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = text
+            self._set_cell_bg(cell, "E7E6E6") # 헤더 회색 배경
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        # [데이터 채우기]
+        for area in layout_data:
+            # 1. 구역(Area) 행 추가 (Root Level)
+            row = table.add_row()
+            
+            # Col 0: 구역명 (Bold)
+            cell_area = self._row_cells(row)[0]
+            cell_area.text = area.get('area_name', 'Area')
+            cell_area.paragraphs[0].runs[0].font.bold = True
+            self._set_cell_bg(self._row_cells(row)[0], "F9F9F9") # 구역 강조
+            self._set_cell_bg(self._row_cells(row)[1], "F9F9F9")
+            self._set_cell_bg(self._row_cells(row)[2], "F9F9F9")
+            self._set_cell_bg(self._row_cells(row)[3], "F9F9F9")
+
+            # Col 1: Type (Area)
+            self._row_cells(row)[1].text = "Area"
+            self._row_cells(row)[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            # Col 3: 비고 (설명)
+            if area.get('description'):
+                self._row_cells(row)[3].text = area['description']
+                self._row_cells(row)[3].paragraphs[0].style.font.size = Pt(9)
+
+            # 2. 컴포넌트(Component) 행 추가 (Child Level)
+            for comp_label in area.get('components', []):
+                comp_detail = comp_map.get(comp_label, {})
+                
+                c_row = table.add_row()
+                
+                # Col 0: 컴포넌트명 (트리 구조 들여쓰기 적용)
+                c_cell = self._row_cells(c_row)[0]
+                p = c_cell.paragraphs[0]
+                p.text = f"   └ {comp_label}" # 공백으로 들여쓰기 시각화
+                # p.paragraph_format.left_indent = Inches(0.2) # 실제 들여쓰기 (선택)
+                
+                # Col 1: UI 유형 (한글 매핑)
+                raw_type = comp_detail.get('type', '-')
+                type_map = {
+                    'textbox': '입력창', 'codeview': '팝업검색', 'combo': '콤보박스',
+                    'date-picker': '날짜선택', 'button': '버튼', 'grid': '그리드',
+                    'textarea': '텍스트영역', 'checkbox': '체크박스', 'radio': '라디오'
+                }
+                ui_type = type_map.get(raw_type, raw_type)
+                self._row_cells(c_row)[1].text = ui_type
+                self._row_cells(c_row)[1].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                
+                # Col 2: 필수 여부
+                is_req = comp_detail.get('required', False)
+                if is_req:
+                    self._row_cells(c_row)[2].text = "O"
+                    self._row_cells(c_row)[2].paragraphs[0].runs[0].font.bold = True
+                    self._row_cells(c_row)[2].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 0, 0) # 빨간색
+                self._row_cells(c_row)[2].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+                # Col 3: 비고 (추가 정보가 있다면)
+                # self._row_cells(c_row)[3].text = ""
+
+    def _generate_user_flow_table(self, doc, flow_data: list):
+        target_p = self._find_and_clear_tag(doc, "{{USER_FLOW}}")
+        if not target_p or not flow_data: return
+
+        table = doc.add_table(rows=1, cols=4)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        headers = ["단계", "사용자 액션", "시스템 반응", "화면 예시"]
+        for i, h in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = h
+            self._set_cell_bg(cell, "E7E6E6")
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        for item in flow_data:
+            row = table.add_row()
+            self._row_cells(row)[0].text = str(item.get('step', '-'))
+            self._row_cells(row)[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            self._row_cells(row)[1].text = item.get('action', '-')
+            if item.get('description'):
+                p = self._row_cells(row)[1].add_paragraph(f"({item.get('description')})")
+                p.style.font.size = Pt(8)
+                p.style.font.color.rgb = RGBColor(100, 100, 100)
+            
+            self._row_cells(row)[2].text = item.get('system_response', '-')
+            self._row_cells(row)[3].text = "" # 스크린샷 공간
+
+    def _row_cells(self, row):
+        """
+        행의 셀 목록 (병합 없는 행 기준)
+
+        python-docx의 row.cells는 호출마다 표 전체 격자를 다시 계산하므로
+        행을 추가하며 채우는 표에서는 렌더링 시간이 행 수의 제곱으로 늘어납니다.
+        """
+        return [_Cell(tc, row.table) for tc in row._tr.tc_lst]
+
+    def _find_table_by_tag(self, doc, tag):
+        for table in doc.tables:
+            for row in table.rows:
+                for cell in self._row_cells(row):
+                    if tag in cell.text:
+                        cell.text = cell.text.replace(tag, "")
+                        return table
+        return None
+
+    def _find_and_clear_tag(self, doc, tag):
+        for p in doc.paragraphs:
+            if tag in p.text:
+                p.text = ""
+                return p
+        return None
+
+    def _set_cell_bg(self, cell, color_hex):
+        tcPr = cell._tc.get_or_add_tcPr()
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:fill'), color_hex)
+        tcPr.append(shd)
+
+    def _fill_table(self, table, data_list, keys):
+        if not data_list: return
+        for item in data_list:
+            try:
+                row = self._row_cells(table.add_row())
+                for i, key in enumerate(keys):
+                    if i < len(row):
+                        row[i].text = str(item.get(key, '-'))
+            except: pass
+
+    def _create_test_plan_docx(self, data: dict, wizard_data: dict, images: List[dict] = None) -> BytesIO:
+        doc = load_template("test_plan_doc")
+
+        # (A) 기본 정보 치환
+        overview = data.get('overview', {})
+        replacements = {
+            "{{SCREEN_NAME}}": str(overview.get('screen_name', wizard_data.get('step1', {}).get('screenName', ''))),
+            "{{TEST_OBJECTIVE}}": str(overview.get('test_objective', '')),
+            "{{TEST_SCOPE}}": str(overview.get('test_scope', '')),
+        }
+
+        for paragraph in doc.paragraphs:
+            for key, val in replacements.items():
+                if key in paragraph.text:
+                    paragraph.text = paragraph.text.replace(key, str(val))
+
+        # (B) 스크린샷 삽입
+        for paragraph in doc.paragraphs:
+            if "{{SCREENSHOT}}" in paragraph.text:
+                paragraph.text = ""
+                if images:
+                    for img in images:
+                        try:
+                            run = paragraph.add_run()
+                            run.add_picture(BytesIO(img['bytes']), width=Inches(5.5))
+                        except: pass
+                break
+
+        # (C) 사전조건 테이블
+        precondition_table = self._find_table_by_tag(doc, "{{TABLE:PRECONDITIONS}}")
+        if precondition_table:
+            preconditions = overview.get('preconditions', [])
+            for i, cond in enumerate(preconditions, 1):
+                row = self._row_cells(precondition_table.add_row())
+                row[0].text = str(i)
+                row[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                row[1].text = str(cond)
+
+        # (D) 테스트 케이스 테이블 생성
+        self._generate_test_cases_table(doc, data.get('test_cases', []))
+
+        # (E) 테스트 시나리오 테이블
+        self._generate_test_scenarios_table(doc, data.get('test_scenarios', []))
+
+        # (F) 경계값 테스트 테이블
+        boundary_table = self._find_table_by_tag(doc, "{{TABLE:BOUNDARY}}")
+        if boundary_table:
+            for item in data.get('boundary_tests', []):
+                row = self._row_cells(boundary_table.add_row())
+                row[0].text = str(item.get('field', '-'))
+                row[1].text = str(item.get('test_type', '-'))
+                row[2].text = str(item.get('min_value', '-'))
+                row[3].text = str(item.get('max_value', '-'))
+                invalid = item.get('invalid_cases', [])
+                row[4].text = ', '.join(invalid) if isinstance(invalid, list) else str(invalid)
+
+        buffer = BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def _generate_test_cases_table(self, doc, test_cases: list):
+        """테스트 케이스 테이블 생성"""
+        target_p = self._find_and_clear_tag(doc, "{{TEST_CASES}}")
+        if not target_p or not test_cases: return
+
+        table = doc.add_table(rows=1, cols=6)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        headers = ["TC ID", "분류", "테스트 항목", "테스트 절차", "예상 결과", "우선순위"]
+        for i, h in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = h
+            self._set_cell_bg(cell, "E7E6E6")
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        for tc in test_cases:
+            row = table.add_row()
+            self._row_cells(row)[0].text = str(tc.get('tc_id', '-'))
+            self._row_cells(row)[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            self._row_cells(row)[1].text = str(tc.get('category', '-'))
+            self._row_cells(row)[2].text = f"{tc.get('test_item', '-')}\n{tc.get('test_description', '')}"
+            
+            steps = tc.get('test_steps', [])
+            self._row_cells(row)[3].text = '\n'.join(steps) if isinstance(steps, list) else str(steps)
+            
+            self._row_cells(row)[4].text = str(tc.get('expected_result', '-'))
+            
+            priority = tc.get('priority', 'Medium')
+            self._row_cells(row)[5].text = str(priority)
+            self._row_cells(row)[5].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            # 우선순위별 색상
+            if priority == 'High':
+                self._row_cells(row)[5].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 0, 0)
+                self._row_cells(row)[5].paragraphs[0].runs[0].font.bold = True
+
+    def _generate_test_scenarios_table(self, doc, scenarios: list):
+        """테스트 시나리오 테이블 생성"""
+        target_p = self._find_and_clear_tag(doc, "{{TEST_SCENARIOS}}")
+        if not target_p or not scenarios: return
+
+        table = doc.add_table(rows=1, cols=4)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        headers = ["시나리오 ID", "시나리오명", "설명", "테스트 절차"]
+        for i, h in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = h
+            self._set_cell_bg(cell, "E7E6E6")
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        for sc in scenarios:
+            row = table.add_row()
+            self._row_cells(row)[0].text = str(sc.get('scenario_id', '-'))
+            self._row_cells(row)[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            
+            self._row_cells(row)[1].text = str(sc.get('scenario_name', '-'))
+            self._row_cells(row)[2].text = str(sc.get('description', '-'))
+            
+            steps = sc.get('steps', [])
+            if isinstance(steps, list):
+                self._row_cells(row)[3].text = ' → '.join(steps)
+            else:
+                self._row_cells(row)[3].text = str(steps)
+
+    def _create_user_manual_docx(self, data: dict, wizard_data: dict, images: List[dict] = None) -> BytesIO:
+        doc = load_template("user_manual_doc")
+
+        # (A) 기본 정보 치환
+        overview = data.get('overview', {})
+        replacements = {
+            "{{SCREEN_NAME}}": str(overview.get('screen_name', wizard_data.get('step1', {}).get('screenName', ''))),
+            "{{DESCRIPTION}}": str(overview.get('description', wizard_data.get('step1', {}).get('description', ''))),
+            "{{TARGET_USERS}}": str(overview.get('target_users', '현업 담당자')),
+        }
+
+        for paragraph in doc.paragraphs:
+            for key, val in replacements.items():
+                if key in paragraph.text:
+                    paragraph.text = paragraph.text.replace(key, str(val))
+
+        # (B) 메인 스크린샷 삽입
+        for paragraph in doc.paragraphs:
+            if "{{SCREENSHOT_MAIN}}" in paragraph.text:
+                paragraph.text = ""
+                if images and len(images) > 0:
+                    try:
+                        run = paragraph.add_run()
+                        run.add_picture(BytesIO(images[0]['bytes']), width=Inches(6.0))
+                    except: pass
+                break
+
+        # (C) UI 구조 테이블 생성
+        self._generate_manual_ui_table(doc, data.get('ui_structure', []))
+
+        # (D) 수행 절차 섹션 생성
+        self._generate_procedure_section(doc, data.get('procedures', []), images)
+
+        # (E) 문제해결 테이블 생성
+        self._generate_troubleshooting_table(doc, data.get('troubleshooting', []))
+
+        buffer = BytesIO()
+        doc.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    def _generate_manual_ui_table(self, doc, ui_structure: list):
+        """사용자 매뉴얼용 UI 구조 테이블"""
+        target_p = self._find_and_clear_tag(doc, "{{UI_STRUCTURE}}")
+        if not target_p or not ui_structure: return
+
+        table = doc.add_table(rows=1, cols=4)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        headers = ["영역", "항목", "설명", "필수"]
+        for i, h in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = h
+            self._set_cell_bg(cell, "4472C4")
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        for area in ui_structure:
+            # 영역 행
+            area_row = table.add_row()
+            area_name = area.get('area_name', '')
+            self._row_cells(area_row)[0].text = area_name
+            self._row_cells(area_row)[0].paragraphs[0].runs[0].font.bold = True
+            self._set_cell_bg(self._row_cells(area_row)[0], "D6DCE4")
+            
+            self._row_cells(area_row)[1].text = ""
+            self._set_cell_bg(self._row_cells(area_row)[1], "D6DCE4")
+            
+            self._row_cells(area_row)[2].text = area.get('description', '')
+            self._set_cell_bg(self._row_cells(area_row)[2], "D6DCE4")
+            
+            self._row_cells(area_row)[3].text = ""
+            self._set_cell_bg(self._row_cells(area_row)[3], "D6DCE4")
+
+            # 컴포넌트 행
+            for comp in area.get('components', []):
+                comp_row = table.add_row()
+                self._row_cells(comp_row)[0].text = ""  # 영역 칸은 비움
+                self._row_cells(comp_row)[1].text = f"  • {comp.get('name', '-')}"
+                self._row_cells(comp_row)[2].text = comp.get('description', '')
+                
+                is_required = comp.get('is_required', False)
+                if is_required:
+                    self._row_cells(comp_row)[3].text = "●"
+                    self._row_cells(comp_row)[3].paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 0, 0)
+                self._row_cells(comp_row)[3].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    def _generate_procedure_section(self, doc, procedures: list, images: List[dict] = None):
+        """수행 절차 섹션 생성"""
+        target_p = self._find_and_clear_tag(doc, "{{PROCEDURE_SECTION}}")
+        if not target_p or not procedures: return
+
+        # 이미지 매핑 (인덱스 기반)
+        image_map = {}
+        if images:
+            for i, img in enumerate(images):
+                image_map[i] = img
+
+        insert_point = target_p._p
+
+        for proc in procedures:
+            # 절차 제목
+            title = f"{proc.get('procedure_id', '')}. {proc.get('title', '')}"
+            title_p = doc.add_paragraph()
+            title_run = title_p.add_run(title)
+            title_run.font.size = Pt(12)
+            title_run.font.bold = True
+            title_run.font.color.rgb = RGBColor(0, 51, 102)
+            insert_point.addnext(title_p._p)
+            insert_point = title_p._p
+
+            # 절차 설명
+            if proc.get('description'):
+                desc_p = doc.add_paragraph(proc['description'])
+                desc_p.style.font.size = Pt(10)
+                insert_point.addnext(desc_p._p)
+                insert_point = desc_p._p
+
+            # 단계별 테이블
+            steps = proc.get('steps', [])
+            if steps:
+                step_table = doc.add_table(rows=1, cols=3)
+                step_table.style = 'Table Grid'
+                insert_point.addnext(step_table._tbl)
+                insert_point = step_table._tbl
+
+                headers = ["단계", "수행 방법", "결과"]
+                for i, h in enumerate(headers):
+                    cell = self._row_cells(step_table.rows[0])[i]
+                    cell.text = h
+                    self._set_cell_bg(cell, "4472C4")
+                    cell.paragraphs[0].runs[0].font.bold = True
+                    cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+                    cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+                for step in steps:
+                    row = step_table.add_row()
+                    self._row_cells(row)[0].text = str(step.get('step', '-'))
+                    self._row_cells(row)[0].paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+                    self._row_cells(row)[1].text = step.get('action', '-')
+                    self._row_cells(row)[2].text = step.get('system_response', '-')
+
+            # Tips
+            tips = proc.get('tips', [])
+            if tips:
+                for tip in tips:
+                    tip_p = doc.add_paragraph()
+                    tip_run = tip_p.add_run(f"💡 {tip}")
+                    tip_run.font.size = Pt(9)
+                    tip_run.font.italic = True
+                    tip_run.font.color.rgb = RGBColor(0, 102, 51)
+                    insert_point.addnext(tip_p._p)
+                    insert_point = tip_p._p
+
+            # 절차 간 공백
+            spacer = doc.add_paragraph()
+            insert_point.addnext(spacer._p)
+            insert_point = spacer._p
+
+    def _generate_troubleshooting_table(self, doc, troubleshooting: list):
+        """문제해결 테이블 생성"""
+        target_p = self._find_and_clear_tag(doc, "{{TROUBLESHOOTING}}")
+        if not target_p or not troubleshooting: return
+
+        table = doc.add_table(rows=1, cols=3)
+        table.style = 'Table Grid'
+        target_p._p.addnext(table._tbl)
+
+        headers = ["증상", "원인", "해결 방법"]
+        for i, h in enumerate(headers):
+            cell = self._row_cells(table.rows[0])[i]
+            cell.text = h
+            self._set_cell_bg(cell, "C65911")
+            cell.paragraphs[0].runs[0].font.bold = True
+            cell.paragraphs[0].runs[0].font.color.rgb = RGBColor(255, 255, 255)
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        for item in troubleshooting:
+            row = table.add_row()
+            self._row_cells(row)[0].text = str(item.get('symptom', '-'))
+            self._row_cells(row)[1].text = str(item.get('cause', '-'))
+            self._row_cells(row)[2].text = str(item.get('solution', '-'))
+
+
+_renderer = DocxRenderer()
+
+_RENDER_METHODS = {
+    "design_doc": _renderer._create_design_docx,
+    "test_plan_doc": _renderer._create_test_plan_docx,
+    "user_manual_doc": _renderer._create_user_manual_docx,
+}
+
+
+def render_document(kind: str, data: dict, wizard_data: dict, images: List[dict] = None) -> bytes:
+    """문서 한 개 렌더링 → docx bytes (워커 프로세스 진입점 - 피클 가능한 최상위 함수)"""
+    return _RENDER_METHODS[kind](data, wizard_data or {}, images).getvalue()
+
+
+# =============================================================================
+# 렌더링 실행기
+# =============================================================================
+
+class DocxRenderPool:
+    """
+    비동기 코드에서 사용하는 렌더링 실행기 (문서 관련 CPU 작업 공용 - run())
+
+    - workers > 0: spawn 방식 프로세스 풀 (부모의 스레드/소켓 상태를 물려받지 않음)
+    - workers = 0: 스레드에서 렌더링 (디버깅/단일 코어 환경)
+    워커 프로세스가 비정상 종료되면 풀을 다시 만들어 한 번 재시도합니다.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.stats = {"rendered": 0, "failed": 0, "restarts": 0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_templates
+                )
+                logger.info(f"🖨️ Docx render pool started ({self.workers} processes)")
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+                self.stats["restarts"] += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def render(self, kind: str, data: dict, wizard_data: dict, images: List[dict] = None) -> BytesIO:
+        """문서 렌더링 (이벤트 루프를 막지 않음)"""
+        try:
+            content = await self.run(render_document, kind, data, wizard_data, images)
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        self.stats["rendered"] += 1
+        return BytesIO(content)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        CPU 작업 실행 (렌더링 외 스크린샷 전처리 등 문서 관련 작업 공용)
+
+        fn은 워커 프로세스에서 import할 수 있는 모듈 최상위 함수여야 합니다 (피클 가능).
+        """
+        if self.workers <= 0:
+            return await asyncio.to_thread(fn, *args)
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return await loop.run_in_executor(executor, fn, *args)
+            except BrokenProcessPool:
+                logger.warning(f"⚠️ Docx render pool broken while running {fn.__name__} - restarting (attempt {attempt + 1})")
+                self._reset_executor(executor)
+                if attempt == 1:
+                    raise
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info("🛑 Docx render pool stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "mode": "process" if self.workers > 0 else "thread", **self.stats}
+
+
+# 싱글톤 인스턴스
+_render_pool_instance: Optional[DocxRenderPool] = None
+
+
+def get_docx_render_pool() -> DocxRenderPool:
+    """DocxRenderPool 싱글톤 인스턴스 반환 (프로세스는 첫 렌더링 시 시작)"""
+    global _render_pool_instance
+    if _render_pool_instance is None:
+        _render_pool_instance = DocxRenderPool(int(os.getenv("DOCX_RENDER_WORKERS", "2")))
+    return _render_pool_instance
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Event Bus - 생성 진행 상황 Pub/Sub
+
+프론트엔드의 2초 폴링(GET /api/ai/status/{screen_id}) 대신
+진행률/단계 변경/완료 이벤트를 SSE로 푸시하기 위한 채널입니다.
+
+[백엔드]
+- memory: 프로세스 내부 asyncio.Queue 팬아웃 (단일 워커)
+- redis: Redis Pub/Sub (여러 uvicorn 워커 간 이벤트 공유)
+- auto (기본값): Redis 연결 가능 시 redis, 아니면 memory
+
+[마지막 상태 스냅샷]
+채널별 마지막 이벤트를 보관하여 상태 조회 API가 DB를 읽지 않고 응답할 수 있습니다.
+(redis 백엔드에서는 Redis 키에 저장하여 다른 워커에서도 조회 가능, Redis가 기준)
+- 메모리/Redis 모두 EVENT_SNAPSHOT_TTL 후 만료
+- 스냅샷에는 발행 시각(published_at, epoch 초)이 포함되어 호출자가 오래된 스냅샷을 판단할 수 있음
+- publish(..., retain=False)는 스냅샷을 지움 (최종 상태 - 조회 API는 DB를 읽음)
+
+환경 변수:
+- EVENT_BUS_BACKEND: auto | memory | redis (기본값: auto)
+- EVENT_SNAPSHOT_TTL: 상태 스냅샷 보관 시간(초) (기본값: 3600)
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Set, Tuple, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Redis 채널/키 접두사
+CHANNEL_PREFIX = "forgeflow:events:"
+SNAPSHOT_PREFIX = "forgeflow:snapshot:"
+
+# 만료된 메모리 스냅샷 정리 주기(초)
+SNAPSHOT_PRUNE_INTERVAL = 60
+
+
+def screen_channel(screen_id: int) -> str:
+    """화면별 이벤트 채널명"""
+    return f"screen:{screen_id}"
+
+
+class EventBus:
+    """프로세스 내부 Pub/Sub + (선택) Redis Pub/Sub 백엔드"""
+
+    def __init__(self):
+        self.backend = os.getenv("EVENT_BUS_BACKEND", "auto").lower()
+        self.snapshot_ttl = int(os.getenv("EVENT_SNAPSHOT_TTL", "3600"))
+
+        # 로컬 구독자 (채널 -> 큐 집합)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        # 채널별 마지막 이벤트 (채널 -> (만료 시각(monotonic), 이벤트))
+        self._snapshots: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._next_prune = 0.0
+
+        # Redis (지연 초기화)
+        self._redis = None
+        self._redis_checked = False
+        self._listener_task: Optional[asyncio.Task] = None
+
+    # =========================================================================
+    # 백엔드 선택
+    # =========================================================================
+
+    def _get_redis(self):
+        """redis 백엔드 사용 시 asyncio Redis 클라이언트 반환 (아니면 None)"""
+        if self._redis_checked:
+            return self._redis
+        self._redis_checked = True
+
+        if self.backend == "memory":
+            return None
+
+        from services.cache_service import get_cache_service
+        if not get_cache_service().is_available():
+            if self.backend == "redis":
+                logger.warning("⚠️ EVENT_BUS_BACKEND=redis 이지만 Redis 연결 불가 - memory 모드로 동작")
+            return None
+
+        try:
+            import redis.asyncio as aioredis
+            redis_url = os.getenv("REDIS_URL", "redis://localhost:6379")
+            self._redis = aioredis.from_url(redis_url, decode_responses=True)
+            logger.info("✅ EventBus: Redis Pub/Sub backend")
+        except Exception as e:
+            logger.warning(f"⚠️ EventBus Redis 초기화 실패: {e} - memory 모드로 동작")
+            self._redis = None
+        return self._redis
+
+    def is_distributed(self) -> bool:
+        """여러 워커 간 이벤트 공유 여부"""
+        return self._get_redis() is not None
+
+    # =========================================================================
+    # 발행
+    # =========================================================================
+
+    async def publish(self, channel: str, event: Dict[str, Any], retain: bool = True):
+        """
+        이벤트 발행
+
+        redis 백엔드에서는 Redis로만 발행하고, 로컬 구독자는
+        Redis 리스너를 통해 전달받습니다 (중복 전달 방지).
+
+        retain=False면 마지막 상태 스냅샷을 남기지 않고 지웁니다 (최종 상태).
+        """
+        event = {**event, "published_at": time.time()}
+        self._store_snapshot(channel, event, retain)
+
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                payload = json.dumps(event, ensure_ascii=False)
+                if retain:
+                    await redis_client.set(SNAPSHOT_PREFIX + channel, payload, ex=self.snapshot_ttl)
+                else:
+                    await redis_client.delete(SNAPSHOT_PREFIX + channel)
+                await redis_client.publish(CHANNEL_PREFIX + channel, payload)
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ EventBus Redis publish 실패: {e} - 로컬 전달로 대체")
+
+        self._dispatch_local(channel, event)
+
+    def _store_snapshot(self, channel: str, event: Dict[str, Any], retain: bool):
+        """메모리 스냅샷 저장/삭제 (만료된 스냅샷은 SNAPSHOT_PRUNE_INTERVAL마다 정리)"""
+        now = time.monotonic()
+        if retain:
+            self._snapshots[channel] = (now + self.snapshot_ttl, event)
+        else:
+            self._snapshots.pop(channel, None)
+        if now >= self._next_prune:
+            self._next_prune = now + SNAPSHOT_PRUNE_INTERVAL
+            for key in [key for key, (expires_at, _) in self._snapshots.items() if expires_at <= now]:
+                del self._snapshots[key]
+
+    def _dispatch_local(self, channel: str, event: Dict[str, Any]):
+        """로컬 구독자 큐에 이벤트 전달"""
+        for queue in list(self._subscribers.get(channel, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 느린 구독자는 가장 오래된 이벤트를 버리고 최신 상태 유지
+                try:
+                    queue.get_nowait()
+                    queue.put_nowait(event)
+                except (asyncio.QueueEmpty, asyncio.QueueFull):
+                    pass
+
+    # =========================================================================
+    # 구독
+    # =========================================================================
+
+    async def _ensure_listener(self):
+        """Redis 패턴 구독 리스너 시작 (프로세스당 1개)"""
+        redis_client = self._get_redis()
+        if redis_client is None:
+            return
+        if self._listener_task is not None and not self._listener_task.done():
+            return
+        self._listener_task = asyncio.create_task(self._redis_listener(redis_client))
+
+    async def _redis_listener(self, redis_client):
+        """Redis 메시지를 로컬 구독자에게 팬아웃"""
+        pubsub = redis_client.pubsub()
+        try:
+            await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+            async for message in pubsub.listen():
+                if message.get("type") != "pmessage":
+                    continue
+                channel = message["channel"][len(CHANNEL_PREFIX):]
+                try:
+                    self._dispatch_local(channel, json.loads(message["data"]))
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"⚠️ EventBus 메시지 파싱 실패: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ EventBus Redis listener 종료: {e}")
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str, max_queue_size: int = 100) -> AsyncIterator[asyncio.Queue]:
+        """
+        채널 구독 (async context manager)
+
+        Usage:
+            async with event_bus.subscribe(screen_channel(1)) as queue:
+                event = await queue.get()
+        """
+        await self._ensure_listener()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+            if not self._subscribers[channel]:
+                self._subscribers.pop(channel, None)
+
+    # =========================================================================
+    # 스냅샷
+    # =========================================================================
+
+    async def get_snapshot(self, channel: str) -> Optional[Dict[str, Any]]:
+        """채널의 마지막 이벤트 (없거나 만료/최종 상태면 None, Redis 조회 실패 시 메모리 스냅샷)"""
+        redis_client = self._get_redis()
+        if redis_client is not None:
+            try:
+                payload = await redis_client.get(SNAPSHOT_PREFIX + channel)
+                return json.loads(payload) if payload else None
+            except Exception as e:
+                logger.warning(f"⚠️ EventBus snapshot 조회 실패: {e}")
+        stored = self._snapshots.get(channel)
+        if stored is None:
+            return None
+        expires_at, event = stored
+        if expires_at <= time.monotonic():
+            self._snapshots.pop(channel, None)
+            return None
+        return event
+
+    async def close(self):
+        """리스너 및 Redis 연결 종료"""
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener_task = None
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception:
+                pass
+            self._redis = None
+        self._redis_checked = False
+
+
+# 싱글톤 인스턴스
+_event_bus_instance: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """EventBus 싱글톤 인스턴스 반환"""
+    global _event_bus_instance
+    if _event_bus_instance is None:
+        _event_bus_instance = EventBus()
+    return _event_bus_instance
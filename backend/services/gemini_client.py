@@ -4,7 +4,7 @@ Gemini API 클라이언트 - LangChain 호환 인터페이스 + 직접 REST API
 
 이 파일은 두 가지 접근 방식을 결합합니다:
 1. LangChain 호환 인터페이스 (Message, Memory 등)
-2. 직접 REST API 호출 (SSL 우회 - requests with verify=False)
+2. 직접 REST API 호출 (SSL 우회 - httpx with verify=False)
 
 LangChain SDK를 직접 사용할 수 없는 이유:
 - 자체 서명 인증서 환경에서 SSL 검증 우회가 불가능
@@ -12,32 +12,53 @@ LangChain SDK를 직접 사용할 수 없는 이유:
 
 해결 방법:
 - LangChain의 추상화 (Message, Memory 등)를 사용하되
-- 실제 API 호출은 requests 라이브러리 직접 사용 (verify=False)
+- 실제 API 호출은 httpx 커넥션 풀을 직접 사용 (verify=False)
+- 비동기 경로는 httpx.AsyncClient 네이티브 호출 (스레드 풀 미사용)
+- 동기 API는 동일한 요청/응답 처리를 공유하는 얇은 래퍼
 
 필요한 패키지:
-pip install langchain langchain-core requests
+pip install langchain langchain-core httpx
+(선택) HTTP/2 사용 시: pip install "httpx[http2]"
 
 환경 변수:
 - GOOGLE_API_KEY: Google AI Studio API 키
 - GEMINI_MODEL: 모델명 (기본값: gemini-2.5-flash)
+- GEMINI_MAX_CONNECTIONS: 커넥션 풀 최대 연결 수 (기본값: 50)
+- GEMINI_MAX_KEEPALIVE: keep-alive 유지 연결 수 (기본값: 20)
+- GEMINI_KEEPALIVE_EXPIRY: keep-alive 만료 시간(초) (기본값: 30)
+- GEMINI_HTTP2: HTTP/2 사용 여부 (기본값: false, h2 패키지 필요)
+- GEMINI_STAGE_OUTPUT: Stage 2~4 출력 형식 (patch: SEARCH/REPLACE 블록, full: 전체 코드 / 기본값: patch)
+- GEMINI_CONTINUATION_TAIL_LINES: 끊긴 응답 연속 생성 시 다시 보낼 코드 끝부분 줄 수 (기본값: 40, 0이면 전체)
+- GEMINI_JSON_REPAIR_ATTEMPTS: JSON 모드 응답의 파싱 실패/누락 섹션 복구 최대 횟수 (기본값: 2)
+- GEMINI_CONTEXT_CACHE 등: 시스템 프롬프트 서버 측 캐시 (services/context_cache.py 참고)
+- GEMINI_RPM_LIMIT/GEMINI_TPM_LIMIT 등: 호출 할당량 스케줄러 (services/rate_limiter.py 참고)
+- GEMINI_MODEL_ROUTES/GEMINI_FALLBACK_MODEL 등: 작업별 모델 라우팅/장애 조치 (services/model_router.py 참고)
+- USAGE_METRICS_DB 등: 호출별 토큰/지연 시간 기록 (services/usage_metrics.py 참고)
 """
 
 import os
+import hashlib
 import logging
 import asyncio
 import warnings
 import re
+import json
 import time
-import requests
-from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple
+import httpx
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Tuple, AsyncIterator
 
-# SSL 경고 비활성화
-import urllib3
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 warnings.filterwarnings('ignore', category=DeprecationWarning)
 
 logger = logging.getLogger(__name__)
 
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용 가능
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 # =============================================================================
 # LangChain 임포트 (인터페이스 및 메모리 관리용)
 # =============================================================================
@@ -53,6 +74,20 @@ from langchain_core.chat_history import InMemoryChatMessageHistory
 # [LangChain 사용] 콜백 핸들러 - 진행률 추적
 from langchain_core.callbacks import BaseCallbackHandler
 
+from services.context_cache import ContextCacheManager
+from services.response_cache import get_response_cache
+from services.rate_limiter import (
+    get_rate_limiter, backoff_delay, request_priority, ModelRateLimiter, PRIORITY_INTERACTIVE, PRIORITY_DEFAULT
+)
+from utils.code_patch import (
+    apply_patch, has_patch_blocks, PatchError, PATCH_SEARCH_MARKER, PATCH_DIVIDER, PATCH_REPLACE_MARKER
+)
+from utils.code_merge import merge_continuation, tail_lines
+from utils.json_stream import JsonSectionParser, sub_schema
+from services.model_router import get_model_router, model_operation, ModelRoute
+from services.usage_metrics import get_usage_recorder
+from services.stage_planner import StagePlan
+
 # =============================================================================
 # [미사용] 아래는 SSL 문제로 직접 사용할 수 없음
 # from langchain_google_genai import ChatGoogleGenerativeAI
@@ -63,12 +98,21 @@ from langchain_core.callbacks import BaseCallbackHandler
 
 class GeminiClientError(Exception):
     """Gemini API 오류"""
-    def __init__(self, error_type: str, message: str, status_code: int = 0, raw_output: Optional[str] = None):
+    def __init__(
+        self,
+        error_type: str,
+        message: str,
+        status_code: int = 0,
+        raw_output: Optional[str] = None,
+        retry_after: Optional[float] = None
+    ):
         super().__init__(message)
         self.error_type = error_type
         self.message = message
         self.status_code = status_code
         self.raw_output = raw_output
+        # 429 응답의 재시도 대기 시간(초) - Retry-After 헤더 또는 RetryInfo.retryDelay
+        self.retry_after = retry_after
 
 
 # =============================================================================
@@ -116,13 +160,34 @@ class ChatSession:
     - ConversationBufferMemory로 히스토리 관리
     
     [REST API 방식 - 실제 호출]
-    - requests.post(url, json=payload, verify=False)
+    - httpx 커넥션 풀로 직접 호출 (verify=False)
     - Google Generative AI REST API 직접 호출
+    
+    [히스토리 정책]
+    - full: 모든 사용자/모델 턴을 그대로 재전송 (기본값)
+    - latest_artifact: 단계 완료 시 compact_stage()로 최신 코드만 남기고
+      이전 단계의 모델 응답(구버전 코드)은 짧은 자리표시자로 대체
     """
     
-    def __init__(self, client: 'GeminiClient', system_prompt: Optional[str] = None):
+    HISTORY_FULL = "full"
+    HISTORY_LATEST_ARTIFACT = "latest_artifact"
+    # 대체된 이전 단계 코드 자리표시자 (user/model 턴 교대를 유지하기 위해 턴은 남김)
+    SUPERSEDED_PLACEHOLDER = "(이전 단계 코드 - 최신 버전으로 대체되어 생략)"
+    
+    def __init__(
+        self,
+        client: 'GeminiClient',
+        system_prompt: Optional[str] = None,
+        cached_content: Optional[str] = None,
+        history_policy: str = HISTORY_FULL
+    ):
         self.client = client
         self.system_prompt = system_prompt
+        self.history_policy = history_policy
+        # 턴별 토큰 사용량 (usageMetadata 기준)
+        self.turn_usage: List[Dict[str, Any]] = []
+        # 시스템 프롬프트를 담은 cachedContents 이름 (있으면 히스토리에 시스템 프롬프트를 넣지 않음)
+        self.cached_content = cached_content if system_prompt else None
         
         # [LangChain] InMemoryChatMessageHistory 사용 (최신 방식)
         # 기존: ConversationBufferMemory (deprecated)
@@ -140,15 +205,146 @@ class ChatSession:
             initial_output = "네, 준비되었습니다. React 프로토타입 생성을 시작하겠습니다."
             self.message_history.add_user_message(initial_input)
             self.message_history.add_ai_message(initial_output)
-            # [REST API] 히스토리에 추가
-            self._rest_history.append({
+            # [REST API] 캐시를 쓰지 않을 때만 히스토리에 추가 (캐시 사용 시 systemInstruction으로 전달됨)
+            if not self.cached_content:
+                self._rest_history.extend(self._system_preamble())
+        # 히스토리 앞부분의 인라인 시스템 프롬프트 턴 수 (compact_stage 기준점 계산용)
+        self._preamble_len = len(self._rest_history)
+    
+    def _system_preamble(self) -> List[Dict[str, Any]]:
+        """시스템 프롬프트를 인라인으로 전달하는 초기 대화 턴"""
+        return [
+            {
                 "role": "user",
-                "parts": [{"text": system_prompt + "\n\n프로젝트를 시작합니다."}]
-            })
-            self._rest_history.append({
+                "parts": [{"text": self.system_prompt + "\n\n프로젝트를 시작합니다."}]
+            },
+            {
                 "role": "model",
                 "parts": [{"text": "네, 준비되었습니다. React 프로토타입 생성을 시작하겠습니다."}]
-            })
+            },
+        ]
+    
+    def _drop_cached_content(self):
+        """서버 캐시가 사라진 경우 인라인 시스템 프롬프트로 전환"""
+        logger.warning(f"⚠️ Context cache unavailable ({self.cached_content}) - 인라인 시스템 프롬프트로 재시도")
+        self.client.context_cache.invalidate(self.system_prompt)
+        self.cached_content = None
+        self._rest_history = self._system_preamble() + self._rest_history
+        self._preamble_len = 2
+    
+    def _build_turn_contents(self, prompt: str) -> List[Dict[str, Any]]:
+        """현재 히스토리 + 새 사용자 메시지 (히스토리는 응답 성공 후에만 갱신)"""
+        return self._rest_history + [{
+            "role": "user",
+            "parts": [{"text": prompt}]
+        }]
+    
+    def checkpoint(self) -> int:
+        """현재 히스토리 위치 (compact_stage에 전달)"""
+        return len(self._rest_history) - self._preamble_len
+    
+    def compact_stage(self, checkpoint: int, stage_prompt: str, artifact: str, force: bool = False):
+        """
+        단계 완료 후 히스토리 압축 (history_policy=latest_artifact 또는 force=True에서 동작)
+        
+        - checkpoint 이후의 턴(단계 요청 + 끊김 연속 생성 턴들)을
+          "단계 요청 → 최종 코드" 한 쌍으로 합침
+        - 그 이전 단계의 모델 응답은 자리표시자로 대체 (단계 지시문인 사용자 턴은 유지, latest_artifact만)
+        
+        Args:
+            checkpoint: 단계 시작 전 checkpoint() 값
+            stage_prompt: 이번 단계 요청 프롬프트
+            artifact: 이번 단계의 최종 코드
+            force: history_policy와 관계없이 이번 단계 턴을 최종 코드로 합침
+                   (패치 응답 대신 적용 결과를 다음 단계가 보도록)
+        """
+        latest_only = self.history_policy == self.HISTORY_LATEST_ARTIFACT
+        if not artifact or not (latest_only or force):
+            return
+        
+        preamble = self._rest_history[:self._preamble_len]
+        earlier = self._rest_history[self._preamble_len:self._preamble_len + checkpoint]
+        
+        compacted = []
+        for message in earlier:
+            if message["role"] == "model" and latest_only:
+                message = {"role": "model", "parts": [{"text": self.SUPERSEDED_PLACEHOLDER}]}
+            compacted.append(message)
+        
+        compacted.append({"role": "user", "parts": [{"text": stage_prompt}]})
+        compacted.append({"role": "model", "parts": [{"text": f"```tsx\n{artifact}\n```"}]})
+        self._rest_history = preamble + compacted
+
+    def replace_reply(self, checkpoint: int, reply: str):
+        """
+        checkpoint 이후 턴을 "첫 사용자 요청 → reply" 한 쌍으로 교체
+
+        끊긴 응답의 연속 생성 중에는 reply로 코드 끝부분만 남겨 재전송 입력을 줄이고,
+        연속 생성이 끝나면 병합된 전체 응답으로 다시 교체합니다.
+        """
+        start = self._preamble_len + checkpoint
+        request = self._rest_history[start]
+        self._rest_history = self._rest_history[:start] + [
+            request,
+            {"role": "model", "parts": [{"text": reply}]},
+        ]
+
+    def seed_stage(self, stage_prompt: str, artifact: str):
+        """
+        이전 생성에서 재사용한 단계를 호출 없이 히스토리에 추가
+
+        실제로 실행한 단계와 같은 모양(단계 요청 → 코드)이 되도록 기록하고,
+        history_policy=latest_artifact이면 compact_stage()로 이전 단계 코드를 자리표시자로 바꿉니다.
+        """
+        checkpoint = self.checkpoint()
+        reply = f"```tsx\n{artifact}\n```"
+        self._rest_history.append({"role": "user", "parts": [{"text": stage_prompt}]})
+        self._rest_history.append({"role": "model", "parts": [{"text": reply}]})
+        self.message_history.add_user_message(stage_prompt)
+        self.message_history.add_ai_message(reply)
+        self.compact_stage(checkpoint, stage_prompt, artifact)
+
+    def _record_usage(self, contents_len: int, usage: Optional[Dict[str, int]]):
+        """턴별 토큰 사용량 기록"""
+        usage = usage or {}
+        entry = {
+            "turn": len(self.turn_usage) + 1,
+            "messages": contents_len,
+            "input_tokens": usage.get("input_tokens", 0),
+            "cached_tokens": usage.get("cached_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+        }
+        self.turn_usage.append(entry)
+        logger.info(
+            f"📊 Turn {entry['turn']}: input={entry['input_tokens']} "
+            f"(cached={entry['cached_tokens']}), output={entry['output_tokens']}, messages={contents_len}"
+        )
+    
+    def _record_turn(self, prompt: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        """성공한 턴을 REST/LangChain 히스토리에 반영하고 결과 반환"""
+        text = response.get("text", "")
+        finish_reason = response.get("finish_reason", 1)
+        self._record_usage(len(self._rest_history) + 1, response.get("usage"))
+        
+        # [REST API] 사용자 메시지 + 응답 히스토리에 추가
+        self._rest_history.append({
+            "role": "user",
+            "parts": [{"text": prompt}]
+        })
+        self._rest_history.append({
+            "role": "model",
+            "parts": [{"text": text}]
+        })
+        
+        # [LangChain] 메시지 히스토리에 저장 (최신 방식)
+        self.message_history.add_user_message(prompt)
+        self.message_history.add_ai_message(text)
+        
+        return {
+            "text": text,
+            "finish_reason": finish_reason,
+            "is_truncated": finish_reason == 2
+        }
     
     def send_message(
         self,
@@ -164,43 +360,29 @@ class ChatSession:
         - ConversationBufferMemory에 저장
         
         [REST API 호출]
-        - requests.post(url, json=payload, verify=False)
+        - GeminiClient._call_api() (풀링된 httpx.Client, verify=False)
         """
         try:
-            # [REST API] 사용자 메시지 추가
-            self._rest_history.append({
-                "role": "user",
-                "parts": [{"text": prompt}]
-            })
-            
-            # [REST API] 직접 호출
-            response = self.client._call_api(
-                contents=self._rest_history,
-                temperature=temperature,
-                max_output_tokens=max_output_tokens
-            )
-            
-            text = response.get("text", "")
-            finish_reason = response.get("finish_reason", 1)
-            
-            # [REST API] 응답 히스토리에 추가
-            self._rest_history.append({
-                "role": "model",
-                "parts": [{"text": text}]
-            })
-            
-            # [LangChain] 메시지 히스토리에 저장 (최신 방식)
-            self.message_history.add_user_message(prompt)
-            self.message_history.add_ai_message(text)
-            
-            is_truncated = finish_reason == 2
-            
-            return {
-                "text": text,
-                "finish_reason": finish_reason,
-                "is_truncated": is_truncated
-            }
+            try:
+                response = self.client._call_api(
+                    contents=self._build_turn_contents(prompt),
+                    temperature=temperature,
+                    max_output_tokens=max_output_tokens,
+                    cached_content=self.cached_content
+                )
+            except GeminiClientError as e:
+                if e.error_type != "cache_invalid":
+                    raise
+                self._drop_cached_content()
+                response = self.client._call_api(
+                    contents=self._build_turn_contents(prompt),
+                    temperature=temperature,
+                    max_output_tokens=max_output_tokens
+                )
+            return self._record_turn(prompt, response)
             
+        except GeminiClientError:
+            raise
         except Exception as e:
             logger.error(f"❌ ChatSession.send_message failed: {e}")
             raise GeminiClientError("api_error", str(e))
@@ -215,17 +397,82 @@ class ChatSession:
         메시지 전송 (비동기)
         
         [비동기 처리]
-        - asyncio.to_thread()로 동기 메서드 래핑
+        - GeminiClient._call_api_async() 네이티브 호출
+        - 스레드 풀을 점유하지 않고 keep-alive 커넥션 재사용
+        """
+        try:
+            try:
+                response = await self.client._call_api_async(
+                    contents=self._build_turn_contents(prompt),
+                    temperature=temperature,
+                    max_output_tokens=max_output_tokens,
+                    cached_content=self.cached_content
+                )
+            except GeminiClientError as e:
+                if e.error_type != "cache_invalid":
+                    raise
+                self._drop_cached_content()
+                response = await self.client._call_api_async(
+                    contents=self._build_turn_contents(prompt),
+                    temperature=temperature,
+                    max_output_tokens=max_output_tokens
+                )
+            return self._record_turn(prompt, response)
+            
+        except GeminiClientError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ ChatSession.send_message_async failed: {e}")
+            raise GeminiClientError("api_error", str(e))
+    
+    async def send_message_stream_async(
+        self,
+        prompt: str,
+        chunk_callback: Optional[Callable[[str, str, int], Awaitable[None]]] = None,
+        temperature: float = 0.2,
+        max_output_tokens: int = 8192
+    ) -> Dict[str, Any]:
+        """
+        메시지 전송 (비동기 스트리밍)
         
-        [참고] LangChain SDK 직접 사용 시 ainvoke() 지원
-        - response = await llm.ainvoke(messages)
+        streamGenerateContent로 응답을 받으면서 청크마다
+        chunk_callback(delta_text, accumulated_text, output_tokens)을 호출합니다.
+        응답이 끝나면 send_message_async()와 동일한 형식으로 반환합니다.
         """
-        return await asyncio.to_thread(
-            self.send_message,
-            prompt,
-            temperature,
-            max_output_tokens
-        )
+        text = ""
+        finish_reason = 1
+        usage = None
+        try:
+            # 캐시 무효 오류는 응답 상태 확인 단계(청크 수신 전)에서 발생하므로 1회 재시도해도 중복 청크가 없음
+            for attempt in range(2):
+                try:
+                    async for chunk in self.client._stream_api_async(
+                        contents=self._build_turn_contents(prompt),
+                        temperature=temperature,
+                        max_output_tokens=max_output_tokens,
+                        cached_content=self.cached_content
+                    ):
+                        delta = chunk.get("text", "")
+                        text += delta
+                        if chunk.get("finish_reason"):
+                            finish_reason = chunk["finish_reason"]
+                        if chunk.get("usage"):
+                            usage = chunk["usage"]
+                        if chunk_callback and delta:
+                            await chunk_callback(delta, text, chunk.get("output_tokens", 0))
+                    break
+                except GeminiClientError as e:
+                    if e.error_type != "cache_invalid" or attempt > 0:
+                        raise
+                    self._drop_cached_content()
+            
+            return self._record_turn(prompt, {"text": text, "finish_reason": finish_reason, "usage": usage})
+            
+        except GeminiClientError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ ChatSession.send_message_stream_async failed: {e}")
+            raise GeminiClientError("api_error", str(e))
     
     def get_langchain_messages(self) -> List[BaseMessage]:
         """
@@ -253,19 +500,27 @@ class GeminiClient:
     - ProgressCallbackHandler
     
     [REST API 직접 호출]
-    - requests.post(url, verify=False)
+    - httpx 커넥션 풀 (keep-alive, verify=False)
     - SSL 인증서 검증 우회
     
     [왜 이렇게 구현했나?]
     - LangChain SDK의 ChatGoogleGenerativeAI는 SSL 우회 옵션이 없음
     - google-generativeai 내부 HTTP 클라이언트는 verify=False 미지원
     - 자체 서명 인증서 환경에서 SSL 오류 발생
-    - 해결: LangChain 인터페이스 + requests(verify=False) 조합
+    - 해결: LangChain 인터페이스 + httpx(verify=False) 조합
+    
+    [커넥션 풀]
+    - 비동기: 이벤트 루프별 장수명 httpx.AsyncClient (TLS 핸드셰이크 재사용)
+    - 동기: 장수명 httpx.Client (스크립트/테스트용 얇은 래퍼)
     """
     
     # Google Generative AI REST API 기본 URL
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
     
+    # Stage 2~4 출력 형식
+    STAGE_OUTPUT_FULL = "full"
+    STAGE_OUTPUT_PATCH = "patch"
+    
     def __init__(self, api_key: Optional[str] = None, model_name: Optional[str] = None):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
@@ -278,31 +533,341 @@ class GeminiClient:
         # 설정
         self.timeout = 180
         self.max_retries = 3
-        self.retry_delay = 60
-        self.max_quota_retries = 10
+        self.max_quota_retries = int(os.getenv("GEMINI_MAX_QUOTA_RETRIES", "6"))
         self.max_continuation_attempts = 3
+        # 연속 생성 시 히스토리에 남길 코드 끝부분 줄 수 (0이면 끊긴 응답 전체 재전송)
+        self.continuation_tail_lines = int(os.getenv("GEMINI_CONTINUATION_TAIL_LINES", "40"))
+        # 스트리밍 진행률 계산용 단계별 예상 출력 토큰 수
+        self.expected_stage_output_tokens = int(os.getenv("GEMINI_EXPECTED_STAGE_TOKENS", "4096"))
+        # 4단계 생성 히스토리 정책 (latest_artifact: 최신 코드만 유지, full: 전체 재전송)
+        self.history_policy = os.getenv("GEMINI_HISTORY_POLICY", ChatSession.HISTORY_LATEST_ARTIFACT)
+        # Stage 2~4 출력 형식 (patch: 이전 단계 코드에 대한 SEARCH/REPLACE 블록, full: 전체 코드)
+        self.stage_output = os.getenv("GEMINI_STAGE_OUTPUT", self.STAGE_OUTPUT_PATCH)
+        self.patch_stats = {"applied": 0, "fallback": 0, "full_output": 0}
+        # JSON 모드 응답의 파싱 실패/누락 섹션 복구 최대 횟수
+        self.max_json_repairs = int(os.getenv("GEMINI_JSON_REPAIR_ATTEMPTS", "2"))
+        self.json_stats = {
+            "valid": 0, "repaired": 0, "incomplete": 0, "failed": 0,
+            "fragment_repairs": 0, "section_retries": 0,
+        }
+        
+        # 커넥션 풀 설정
+        self.max_connections = int(os.getenv("GEMINI_MAX_CONNECTIONS", "50"))
+        self.max_keepalive_connections = int(os.getenv("GEMINI_MAX_KEEPALIVE", "20"))
+        self.keepalive_expiry = float(os.getenv("GEMINI_KEEPALIVE_EXPIRY", "30"))
+        self.http2 = os.getenv("GEMINI_HTTP2", "false").lower() in ("1", "true", "yes")
+        if self.http2 and not _HTTP2_AVAILABLE:
+            logger.warning("⚠️ GEMINI_HTTP2 요청됨 - h2 패키지가 없어 HTTP/1.1로 동작합니다")
+            self.http2 = False
+        
+        # httpx 클라이언트 (지연 생성)
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_client: Optional[httpx.Client] = None
+        
+        # 시스템 프롬프트 서버 측 캐시 (cachedContents)
+        self.context_cache = ContextCacheManager(self)
+        
+        # 모델별 RPM/TPM 예산 스케줄러 (기본 모델 - 라우팅된 호출은 호출 모델의 스케줄러 사용)
+        self.rate_limiter = get_rate_limiter(self.model_name)
         
-        logger.info(f"GeminiClient initialized: model={self.model_name}")
+        # 작업별 모델 라우팅 (stage-1~4, continuation, design-spec 등)
+        self.model_router = get_model_router()
+        
+        logger.info(
+            f"GeminiClient initialized: model={self.model_name}, "
+            f"pool={self.max_connections}/{self.max_keepalive_connections}, http2={self.http2}"
+        )
+    
+    # =========================================================================
+    # HTTP 커넥션 풀
+    # =========================================================================
+    
+    def _pool_limits(self) -> httpx.Limits:
+        """커넥션 풀 제한 설정"""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry
+        )
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        현재 이벤트 루프용 AsyncClient 반환
+        
+        AsyncClient의 커넥션은 생성된 이벤트 루프에 묶이므로
+        루프가 바뀐 경우(스크립트의 asyncio.run 반복 등) 새로 생성합니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client.is_closed or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=self._pool_limits(),
+                http2=self.http2,
+                verify=False  # SSL 인증서 검증 비활성화
+            )
+            self._async_client_loop = loop
+        return self._async_client
+    
+    def _get_sync_client(self) -> httpx.Client:
+        """동기 호출용 Client 반환"""
+        if self._sync_client is None or self._sync_client.is_closed:
+            self._sync_client = httpx.Client(
+                limits=self._pool_limits(),
+                http2=self.http2,
+                verify=False  # SSL 인증서 검증 비활성화
+            )
+        return self._sync_client
+    
+    def _request_timeout(self, timeout: Optional[int]) -> httpx.Timeout:
+        """요청 타임아웃 (연결은 짧게, 응답 대기는 길게)"""
+        return httpx.Timeout(timeout or self.timeout, connect=10.0)
+    
+    async def aclose(self):
+        """커넥션 풀 종료 (앱 종료 시 호출)"""
+        if self._async_client is not None and not self._async_client.is_closed:
+            await self._async_client.aclose()
+        self._async_client = None
+        self._async_client_loop = None
+        self.close()
+    
+    def close(self):
+        """동기 커넥션 풀 종료"""
+        if self._sync_client is not None and not self._sync_client.is_closed:
+            self._sync_client.close()
+        self._sync_client = None
     
     # =========================================================================
     # REST API 직접 호출 (핵심 메서드)
     # =========================================================================
     
-    def _build_url(self, endpoint: str) -> str:
-        """API URL 생성"""
-        return f"{self.BASE_URL}/models/{self.model_name}:{endpoint}?key={self.api_key}"
+    def _build_url(self, endpoint: str, model: Optional[str] = None) -> str:
+        """API URL 생성 (model 생략 시 기본 모델)"""
+        return f"{self.BASE_URL}/models/{model or self.model_name}:{endpoint}?key={self.api_key}"
     
-    def _call_api(
+    def _build_resource_url(self, resource: str) -> str:
+        """모델 외 리소스 URL 생성 (예: cachedContents, cachedContents/{id})"""
+        return f"{self.BASE_URL}/{resource}?key={self.api_key}"
+    
+    def _build_payload(
+        self,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        max_output_tokens: int,
+        top_p: float,
+        top_k: int,
+        cached_content: Optional[str] = None,
+        model: Optional[str] = None,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        generateContent 요청 본문 생성 (cached_content: 참조할 cachedContents 이름)
+        
+        cachedContents는 기본 모델 전용이므로 다른 모델(model)로 보내는 요청은
+        캐시의 시스템 프롬프트를 systemInstruction으로 인라인 전달합니다.
+        response_schema가 주어지면 JSON 모드(responseMimeType + responseSchema)로 요청합니다.
+        """
+        payload = {
+            "contents": contents,
+            "generationConfig": {
+                "temperature": temperature,
+                "maxOutputTokens": max_output_tokens,
+                "topP": top_p,
+                "topK": top_k
+            }
+        }
+        if response_schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+        if cached_content and model and model != self.model_name:
+            system_prompt = self.context_cache.system_prompt_for(cached_content)
+            if system_prompt is None:
+                raise GeminiClientError("cache_invalid", f"Context cache를 {model}에서 사용할 수 없음")
+            payload["systemInstruction"] = {"parts": [{"text": system_prompt}]}
+        elif cached_content:
+            payload["cachedContent"] = cached_content
+        return payload
+    
+    @staticmethod
+    def _estimate_input_tokens(payload: Dict[str, Any]) -> int:
+        """요청 입력 토큰 수 추정 (TPM 예약용, 실제 값은 usageMetadata로 보정)"""
+        chars = sum(
+            len(part.get("text", ""))
+            for content in payload.get("contents", []) + [payload.get("systemInstruction", {})]
+            for part in content.get("parts", [])
+        )
+        return chars // 4 + 1
+    
+    @staticmethod
+    def _parse_retry_after(response: httpx.Response) -> Optional[float]:
+        """429 응답의 재시도 대기 시간(초) - Retry-After 헤더 또는 google.rpc.RetryInfo"""
+        header = response.headers.get("retry-after")
+        if header:
+            try:
+                return max(0.0, float(header))
+            except ValueError:
+                pass
+        try:
+            details = response.json().get("error", {}).get("details", [])
+        except ValueError:
+            return None
+        for detail in details:
+            delay = detail.get("retryDelay") if isinstance(detail, dict) else None
+            if isinstance(delay, str) and delay.endswith("s"):
+                try:
+                    return max(0.0, float(delay[:-1]))
+                except ValueError:
+                    pass
+        return None
+    
+    def _check_response_status(
+        self,
+        response: httpx.Response,
+        cached_content: Optional[str] = None,
+        rate_limiter: Optional[ModelRateLimiter] = None
+    ):
+        """HTTP 상태 코드 검사 (rate_limiter: 호출한 모델의 스케줄러, 생략 시 기본 모델)"""
+        if response.status_code == 429:
+            retry_after = self._parse_retry_after(response)
+            (rate_limiter or self.rate_limiter).penalize(retry_after)
+            raise GeminiClientError("quota_exceeded", "API 할당량 초과", 429, retry_after=retry_after)
+        
+        # 참조한 캐시가 만료/삭제된 경우 (호출자가 인라인 시스템 프롬프트로 재시도)
+        if (
+            cached_content
+            and response.status_code in (400, 403, 404)
+            and "cachedcontent" in response.text.lower()
+        ):
+            raise GeminiClientError(
+                "cache_invalid",
+                f"Context cache 사용 불가: {response.status_code}",
+                response.status_code
+            )
+        
+        if response.status_code != 200:
+            raise GeminiClientError(
+                "api_error",
+                f"API 오류: {response.status_code} - {response.text}",
+                response.status_code
+            )
+    
+    def _parse_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """generateContent 응답 파싱"""
+        candidates = data.get("candidates", [])
+        if not candidates:
+            raise GeminiClientError("empty_response", "빈 응답")
+        
+        candidate = candidates[0]
+        content = candidate.get("content", {})
+        parts = content.get("parts", [])
+        
+        text = ""
+        for part in parts:
+            if "text" in part:
+                text += part["text"]
+        
+        # finish_reason 확인
+        finish_reason_str = candidate.get("finishReason", "STOP")
+        finish_reason = 1  # STOP
+        if finish_reason_str == "MAX_TOKENS":
+            finish_reason = 2
+        elif finish_reason_str == "SAFETY":
+            finish_reason = 3
+        
+        return {
+            "text": text,
+            "finish_reason": finish_reason,
+            "usage": self._parse_usage(data),
+            "raw": data
+        }
+    
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        """응답 캐시 저장 대상 여부 (빈 응답/안전 필터 차단 제외)"""
+        return bool(result.get("text")) and result.get("finish_reason") != 3
+    
+    @staticmethod
+    def _cache_value(result: Dict[str, Any]) -> Dict[str, Any]:
+        """응답 캐시에 저장할 값 (raw/usage 제외)"""
+        return {"text": result["text"], "finish_reason": result["finish_reason"]}
+    
+    @staticmethod
+    def _cached_result(cached: Dict[str, Any]) -> Dict[str, Any]:
+        """응답 캐시 적중 결과 (API 토큰을 사용하지 않았으므로 usage 없음)"""
+        return {**cached, "usage": None, "cache_hit": True}
+    
+    def _settle_usage(
+        self,
+        reserved: int,
+        usage: Optional[Dict[str, int]],
+        rate_limiter: Optional[ModelRateLimiter] = None
+    ):
+        """TPM 예약 추정치를 실제 입력 토큰 수로 보정"""
+        if usage:
+            (rate_limiter or self.rate_limiter).settle(reserved, usage["input_tokens"])
+    
+    @staticmethod
+    def _parse_usage(data: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        """usageMetadata → {"input_tokens", "cached_tokens", "output_tokens"} (없으면 None)"""
+        usage = data.get("usageMetadata")
+        if not usage:
+            return None
+        return {
+            "input_tokens": usage.get("promptTokenCount", 0),
+            "cached_tokens": usage.get("cachedContentTokenCount", 0),
+            "output_tokens": usage.get("candidatesTokenCount", 0),
+        }
+    
+    @staticmethod
+    def _should_fail_over(error: GeminiClientError) -> bool:
+        """보조 모델로 넘길 오류인지 (429 할당량 초과 / 5xx 서버 오류)"""
+        if error.error_type == "quota_exceeded":
+            return True
+        return error.error_type == "api_error" and error.status_code >= 500
+    
+    def _next_model(self, route: ModelRoute, models: List[str], index: int, error: GeminiClientError) -> bool:
+        """models[index] 호출 실패 후 다음 모델로 넘길지 (넘기면 전환 기록)"""
+        if index >= len(models) - 1 or not self._should_fail_over(error):
+            return False
+        reason = "할당량 초과" if error.error_type == "quota_exceeded" else f"{error.status_code} 오류"
+        self.model_router.record_failover(route.operation, models[index], models[index + 1], reason)
+        return True
+    
+    @contextmanager
+    def _track_usage(self, model: str):
+        """
+        호출 1회의 지연 시간/토큰/결과를 usage_metrics에 기록
+        
+        블록 안에서 tracked["usage"]에 _parse_usage() 결과를 넣으면 토큰 수도 기록합니다.
+        """
+        tracked: Dict[str, Any] = {"usage": None}
+        status = "ok"
+        started = time.perf_counter()
+        try:
+            yield tracked
+        except GeminiClientError as e:
+            status = e.error_type
+            raise
+        except BaseException:
+            # 취소/스트림 중단 등
+            status = "cancelled"
+            raise
+        finally:
+            get_usage_recorder().record(model, tracked["usage"], (time.perf_counter() - started) * 1000, status)
+    
+    async def _call_api_async(
         self,
         contents: List[Dict[str, Any]],
         temperature: float = 0.2,
         max_output_tokens: int = 8192,
         top_p: float = 0.95,
         top_k: int = 40,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        cached_content: Optional[str] = None,
+        use_cache: bool = True,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
-        REST API 직접 호출
+        REST API 직접 호출 (비동기, 네이티브)
         
         [요청 형식]
         POST https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent
@@ -311,97 +876,312 @@ class GeminiClient:
             "generationConfig": {...}
         }
         
-        [SSL 우회]
-        requests.post(..., verify=False)
-        """
-        url = self._build_url("generateContent")
+        [커넥션 재사용]
+        장수명 httpx.AsyncClient로 keep-alive 커넥션을 재사용합니다.
         
-        payload = {
-            "contents": contents,
-            "generationConfig": {
-                "temperature": temperature,
-                "maxOutputTokens": max_output_tokens,
-                "topP": top_p,
-                "topK": top_k
-            }
-        }
+        [컨텍스트 캐시]
+        cached_content가 주어지면 "cachedContent" 필드로 참조합니다 (시스템 프롬프트 재전송 없음).
         
-        try:
-            response = requests.post(
-                url,
-                json=payload,
-                timeout=timeout or self.timeout,
-                verify=False  # SSL 인증서 검증 비활성화
-            )
-            
-            if response.status_code == 429:
-                raise GeminiClientError("quota_exceeded", "API 할당량 초과", 429)
-            
-            if response.status_code != 200:
-                raise GeminiClientError(
-                    "api_error",
-                    f"API 오류: {response.status_code} - {response.text}",
-                    response.status_code
+        [응답 캐시]
+        동일한 모델/설정/contents 요청은 응답 캐시(L1 LRU + L2 Redis)에서 반환합니다.
+        use_cache=False 또는 bypass_response_cache() 블록 안에서는 조회를 건너뜁니다.
+        
+        [JSON 모드]
+        response_schema가 주어지면 responseMimeType=application/json + responseSchema로 요청합니다.
+        
+        [할당량]
+        캐시 미스 시 모델별 RPM/TPM 예산을 확보한 뒤 호출합니다 (request_priority() 우선순위 순).
+        
+        [모델 라우팅]
+        model_operation() 블록의 작업 라우트로 모델/생성 설정을 정하고,
+        429/5xx면 라우트의 보조 모델로 같은 요청을 다시 보냅니다.
+        """
+        await self.model_router.refresh_if_stale()
+        route = self.model_router.route()
+        models = route.models(self.model_name)
+        temperature, max_output_tokens, top_p, top_k = route.apply(temperature, max_output_tokens, top_p, top_k)
+        
+        for index, model in enumerate(models):
+            try:
+                return await self._call_model_async(
+                    model, contents, temperature, max_output_tokens, top_p, top_k,
+                    timeout, cached_content, use_cache, response_schema
                 )
+            except GeminiClientError as e:
+                if not self._next_model(route, models, index, e):
+                    raise
+    
+    async def _call_model_async(
+        self,
+        model: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        max_output_tokens: int,
+        top_p: float,
+        top_k: int,
+        timeout: Optional[int],
+        cached_content: Optional[str],
+        use_cache: bool,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """지정한 모델로 generateContent 1회 호출 (응답 캐시 + 모델별 할당량)"""
+        url = self._build_url("generateContent", model)
+        payload = self._build_payload(
+            contents, temperature, max_output_tokens, top_p, top_k, cached_content, model, response_schema
+        )
+        
+        response_cache = get_response_cache()
+        cache_key = response_cache.make_key(model, payload)
+        if response_cache.is_active(use_cache):
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                get_usage_recorder().record(model, None, 0, cache_hit=True)
+                return self._cached_result(cached)
+        
+        rate_limiter = get_rate_limiter(model)
+        reserved = await rate_limiter.acquire(self._estimate_input_tokens(payload))
+        with self._track_usage(model) as tracked:
+            try:
+                client = self._get_async_client()
+                response = await client.post(url, json=payload, timeout=self._request_timeout(timeout))
+                self._check_response_status(response, cached_content, rate_limiter)
+                result = self._parse_response(response.json())
+                tracked["usage"] = result.get("usage")
+                self._settle_usage(reserved, result.get("usage"), rate_limiter)
+                if response_cache.enabled and self._is_cacheable(result):
+                    await response_cache.set_async(cache_key, self._cache_value(result))
+                return result
             
-            data = response.json()
-            
-            # 응답 파싱
-            candidates = data.get("candidates", [])
-            if not candidates:
-                raise GeminiClientError("empty_response", "빈 응답")
-            
-            candidate = candidates[0]
-            content = candidate.get("content", {})
-            parts = content.get("parts", [])
-            
-            text = ""
-            for part in parts:
-                if "text" in part:
-                    text += part["text"]
-            
-            # finish_reason 확인
-            finish_reason_str = candidate.get("finishReason", "STOP")
-            finish_reason = 1  # STOP
-            if finish_reason_str == "MAX_TOKENS":
-                finish_reason = 2
-            elif finish_reason_str == "SAFETY":
-                finish_reason = 3
+            except httpx.TimeoutException:
+                raise GeminiClientError("timeout", "API 요청 시간 초과")
+            except httpx.HTTPError as e:
+                raise GeminiClientError("network_error", f"네트워크 오류: {str(e)}")
+    
+    async def _stream_api_async(
+        self,
+        contents: List[Dict[str, Any]],
+        temperature: float = 0.2,
+        max_output_tokens: int = 8192,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        timeout: Optional[int] = None,
+        cached_content: Optional[str] = None,
+        use_cache: bool = False,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        REST API 스트리밍 호출 (Server-Sent Events)
+        
+        [요청 형식]
+        POST .../models/{model}:streamGenerateContent?alt=sse
+        
+        [반환]
+        청크 단위로 {"text": 증분 텍스트, "finish_reason": int|None, "output_tokens": int, "usage": dict|None} 를 yield
+        - output_tokens: 지금까지 수신한 출력 토큰 수 (usageMetadata 없으면 글자 수로 추정)
+        - usage: 해당 청크의 usageMetadata (_parse_usage 형식)
+        
+        [응답 캐시]
+        use_cache=True면 _call_api_async()와 같은 응답 캐시를 사용합니다 (적중 시 전체 텍스트를 청크 하나로 반환).
+        대화형 단계 생성은 기본값(False)으로 캐시를 쓰지 않습니다.
+        
+        [모델 라우팅]
+        _call_api_async()와 같지만, 보조 모델 전환은 첫 청크를 받기 전(응답 상태 확인 단계)에만 합니다.
+        """
+        await self.model_router.refresh_if_stale()
+        route = self.model_router.route()
+        models = route.models(self.model_name)
+        temperature, max_output_tokens, top_p, top_k = route.apply(temperature, max_output_tokens, top_p, top_k)
+        
+        for index, model in enumerate(models):
+            received = False
+            try:
+                async for chunk in self._stream_model_async(
+                    model, contents, temperature, max_output_tokens, top_p, top_k, timeout, cached_content,
+                    use_cache, response_schema
+                ):
+                    received = True
+                    yield chunk
+                return
+            except GeminiClientError as e:
+                if received or not self._next_model(route, models, index, e):
+                    raise
+    
+    async def _stream_model_async(
+        self,
+        model: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        max_output_tokens: int,
+        top_p: float,
+        top_k: int,
+        timeout: Optional[int],
+        cached_content: Optional[str],
+        use_cache: bool = False,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """지정한 모델로 streamGenerateContent 1회 호출 (모델별 할당량, use_cache면 응답 캐시)"""
+        url = self._build_url("streamGenerateContent", model) + "&alt=sse"
+        payload = self._build_payload(
+            contents, temperature, max_output_tokens, top_p, top_k, cached_content, model, response_schema
+        )
+        received_chars = 0
+        received_text = []
+        last_usage = None
+        last_finish_reason = None
+        
+        response_cache = get_response_cache()
+        cache_key = response_cache.make_key(model, payload)
+        if response_cache.is_active(use_cache):
+            cached = await response_cache.get_async(cache_key)
+            if cached is not None:
+                get_usage_recorder().record(model, None, 0, cache_hit=True)
+                yield {**self._cached_result(cached), "output_tokens": 0}
+                return
+        
+        rate_limiter = get_rate_limiter(model)
+        reserved = await rate_limiter.acquire(self._estimate_input_tokens(payload))
+        with self._track_usage(model) as tracked:
+            try:
+                client = self._get_async_client()
+                async with client.stream("POST", url, json=payload, timeout=self._request_timeout(timeout)) as response:
+                    if response.status_code != 200:
+                        await response.aread()
+                        self._check_response_status(response, cached_content, rate_limiter)
+                
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data_str = line[5:].strip()
+                        if not data_str:
+                            continue
+                    
+                        data = json.loads(data_str)
+                        candidates = data.get("candidates", [])
+                        if not candidates:
+                            continue
+                    
+                        candidate = candidates[0]
+                        text = "".join(
+                            part.get("text", "")
+                            for part in candidate.get("content", {}).get("parts", [])
+                        )
+                        received_chars += len(text)
+                        received_text.append(text)
+                    
+                        finish_reason = None
+                        finish_reason_str = candidate.get("finishReason")
+                        if finish_reason_str:
+                            finish_reason = {"MAX_TOKENS": 2, "SAFETY": 3}.get(finish_reason_str, 1)
+                            last_finish_reason = finish_reason
+                    
+                        usage = data.get("usageMetadata", {})
+                        output_tokens = usage.get("candidatesTokenCount") or received_chars // 4
+                        last_usage = self._parse_usage(data) or last_usage
+                    
+                        yield {
+                            "text": text,
+                            "finish_reason": finish_reason,
+                            "output_tokens": output_tokens,
+                            "usage": self._parse_usage(data)
+                        }
             
-            return {
-                "text": text,
-                "finish_reason": finish_reason,
-                "raw": data
-            }
+                tracked["usage"] = last_usage
+                self._settle_usage(reserved, last_usage, rate_limiter)
+                result = {"text": "".join(received_text), "finish_reason": last_finish_reason or 1}
+                if use_cache and response_cache.enabled and last_finish_reason == 1 and self._is_cacheable(result):
+                    await response_cache.set_async(cache_key, self._cache_value(result))
             
-        except requests.exceptions.Timeout:
-            raise GeminiClientError("timeout", "API 요청 시간 초과")
-        except requests.exceptions.RequestException as e:
-            raise GeminiClientError("network_error", f"네트워크 오류: {str(e)}")
-    
-    # =========================================================================
-    # 기본 생성 메서드
-    # =========================================================================
+            except httpx.TimeoutException:
+                raise GeminiClientError("timeout", "API 요청 시간 초과")
+            except httpx.HTTPError as e:
+                raise GeminiClientError("network_error", f"네트워크 오류: {str(e)}")
+            except json.JSONDecodeError as e:
+                raise GeminiClientError("api_error", f"스트리밍 응답 파싱 실패: {e}")
     
-    def generate_content(
+    def _call_api(
         self,
-        prompt: str,
-        system_prompt: Optional[str] = None,
+        contents: List[Dict[str, Any]],
         temperature: float = 0.2,
         max_output_tokens: int = 8192,
         top_p: float = 0.95,
         top_k: int = 40,
-        timeout: Optional[int] = None
-    ) -> str:
+        timeout: Optional[int] = None,
+        cached_content: Optional[str] = None,
+        use_cache: bool = True,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
-        컨텐츠 생성 (동기)
+        REST API 직접 호출 (동기)
         
-        [LangChain 호환]
-        - SystemMessage, HumanMessage 개념 지원
-        
-        [REST API 호출]
-        - 내부적으로 _call_api() 사용
+        _call_api_async()와 동일한 요청/응답 처리(응답 캐시, 모델 라우팅 포함)를 사용하는 얇은 래퍼입니다.
+        풀링된 httpx.Client로 호출합니다 (verify=False). 라우팅 테이블은 비동기 경로에서 갱신된 값을 사용합니다.
         """
+        route = self.model_router.route()
+        models = route.models(self.model_name)
+        temperature, max_output_tokens, top_p, top_k = route.apply(temperature, max_output_tokens, top_p, top_k)
+        
+        for index, model in enumerate(models):
+            try:
+                return self._call_model(
+                    model, contents, temperature, max_output_tokens, top_p, top_k,
+                    timeout, cached_content, use_cache, response_schema
+                )
+            except GeminiClientError as e:
+                if not self._next_model(route, models, index, e):
+                    raise
+    
+    def _call_model(
+        self,
+        model: str,
+        contents: List[Dict[str, Any]],
+        temperature: float,
+        max_output_tokens: int,
+        top_p: float,
+        top_k: int,
+        timeout: Optional[int],
+        cached_content: Optional[str],
+        use_cache: bool,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """지정한 모델로 generateContent 1회 호출 (동기)"""
+        url = self._build_url("generateContent", model)
+        payload = self._build_payload(
+            contents, temperature, max_output_tokens, top_p, top_k, cached_content, model, response_schema
+        )
+        
+        response_cache = get_response_cache()
+        cache_key = response_cache.make_key(model, payload)
+        if response_cache.is_active(use_cache):
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                get_usage_recorder().record(model, None, 0, cache_hit=True)
+                return self._cached_result(cached)
+        
+        rate_limiter = get_rate_limiter(model)
+        reserved = rate_limiter.acquire_blocking(self._estimate_input_tokens(payload))
+        with self._track_usage(model) as tracked:
+            try:
+                client = self._get_sync_client()
+                response = client.post(url, json=payload, timeout=self._request_timeout(timeout))
+                self._check_response_status(response, cached_content, rate_limiter)
+                result = self._parse_response(response.json())
+                tracked["usage"] = result.get("usage")
+                self._settle_usage(reserved, result.get("usage"), rate_limiter)
+                if response_cache.enabled and self._is_cacheable(result):
+                    response_cache.set(cache_key, self._cache_value(result))
+                return result
+            
+            except httpx.TimeoutException:
+                raise GeminiClientError("timeout", "API 요청 시간 초과")
+            except httpx.HTTPError as e:
+                raise GeminiClientError("network_error", f"네트워크 오류: {str(e)}")
+    
+    # =========================================================================
+    # 기본 생성 메서드
+    # =========================================================================
+    
+    def _build_contents(self, prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, Any]]:
+        """단일 프롬프트 요청용 contents 구성"""
         contents = []
         
         # 시스템 프롬프트가 있으면 첫 번째 user 메시지로 추가
@@ -420,15 +1200,58 @@ class GeminiClient:
             "role": "user",
             "parts": [{"text": prompt}]
         })
+        return contents
+    
+    def generate_content(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.2,
+        max_output_tokens: int = 8192,
+        top_p: float = 0.95,
+        top_k: int = 40,
+        timeout: Optional[int] = None,
+        use_cache: bool = True,
+        response_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        컨텐츠 생성 (동기)
         
-        response = self._call_api(
-            contents=contents,
-            temperature=temperature,
-            max_output_tokens=max_output_tokens,
-            top_p=top_p,
-            top_k=top_k,
-            timeout=timeout
-        )
+        [LangChain 호환]
+        - SystemMessage, HumanMessage 개념 지원
+        
+        [REST API 호출]
+        - 내부적으로 _call_api() 사용
+        - 이미 생성된 시스템 프롬프트 캐시가 있으면 참조 (동기 경로에서는 새로 만들지 않음)
+        - response_schema가 주어지면 JSON 모드로 요청 (반환값은 JSON 문자열)
+        """
+        cached_content = self.context_cache.get_cached_name(system_prompt) if system_prompt else None
+        try:
+            response = self._call_api(
+                contents=self._build_contents(prompt, None if cached_content else system_prompt),
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                timeout=timeout,
+                cached_content=cached_content,
+                use_cache=use_cache,
+                response_schema=response_schema
+            )
+        except GeminiClientError as e:
+            if e.error_type != "cache_invalid":
+                raise
+            self.context_cache.invalidate(system_prompt)
+            response = self._call_api(
+                contents=self._build_contents(prompt, system_prompt),
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                timeout=timeout,
+                use_cache=use_cache,
+                response_schema=response_schema
+            )
         
         return response.get("text", "")
     
@@ -440,24 +1263,47 @@ class GeminiClient:
         max_output_tokens: int = 8192,
         top_p: float = 0.95,
         top_k: int = 40,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        use_cache: bool = True,
+        response_schema: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         컨텐츠 생성 (비동기)
         
         [비동기 처리]
-        - asyncio.to_thread()로 동기 메서드 래핑
+        - _call_api_async() 네이티브 호출 (커넥션 풀 공유)
+        - 시스템 프롬프트는 가능하면 cachedContents로 참조 (필요 시 생성/갱신)
+        - response_schema가 주어지면 JSON 모드로 요청 (반환값은 JSON 문자열)
         """
-        return await asyncio.to_thread(
-            self.generate_content,
-            prompt,
-            system_prompt,
-            temperature,
-            max_output_tokens,
-            top_p,
-            top_k,
-            timeout
-        )
+        cached_content = await self.context_cache.get_or_create(system_prompt) if system_prompt else None
+        try:
+            response = await self._call_api_async(
+                contents=self._build_contents(prompt, None if cached_content else system_prompt),
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                timeout=timeout,
+                cached_content=cached_content,
+                use_cache=use_cache,
+                response_schema=response_schema
+            )
+        except GeminiClientError as e:
+            if e.error_type != "cache_invalid":
+                raise
+            self.context_cache.invalidate(system_prompt)
+            response = await self._call_api_async(
+                contents=self._build_contents(prompt, system_prompt),
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                top_p=top_p,
+                top_k=top_k,
+                timeout=timeout,
+                use_cache=use_cache,
+                response_schema=response_schema
+            )
+        
+        return response.get("text", "")
     
     # =========================================================================
     # ChatSession 관련
@@ -467,55 +1313,74 @@ class GeminiClient:
         """새 ChatSession 시작"""
         return ChatSession(self)
     
-    def start_chat_with_system_prompt(self, system_prompt: str) -> ChatSession:
-        """시스템 프롬프트로 ChatSession 시작"""
-        return ChatSession(self, system_prompt)
+    def start_chat_with_system_prompt(
+        self,
+        system_prompt: str,
+        cached_content: Optional[str] = None,
+        history_policy: str = ChatSession.HISTORY_FULL
+    ) -> ChatSession:
+        """시스템 프롬프트로 ChatSession 시작 (cached_content: 시스템 프롬프트 캐시 이름)"""
+        return ChatSession(self, system_prompt, cached_content, history_policy)
     
     # =========================================================================
     # 재시도 로직
     # =========================================================================
     
+    async def run_with_quota_retry(
+        self,
+        operation_name: str,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        할당량 초과(429) 시 재시도하며 call() 실행
+        
+        서버가 알려준 Retry-After를 우선하고, 없으면 지터가 적용된 지수 백오프로 대기합니다.
+        (대기 중 다른 호출은 rate_limiter가 같은 시간 동안 멈춰 둠)
+        """
+        for attempt in range(self.max_quota_retries):
+            try:
+                return await call()
+            except GeminiClientError as e:
+                if e.error_type != "quota_exceeded" or attempt >= self.max_quota_retries - 1:
+                    raise
+                wait_time = backoff_delay(attempt, e.retry_after)
+                logger.warning(
+                    f"⏳ {operation_name}: 할당량 초과, {wait_time:.1f}초 대기 "
+                    f"(재시도 {attempt + 1}/{self.max_quota_retries})"
+                )
+                await asyncio.sleep(wait_time)
+        
+        raise GeminiClientError("quota_exceeded", f"{operation_name}: 최대 재시도 횟수 초과")
+    
     async def send_chat_with_retry(
         self,
         chat_session: ChatSession,
         prompt: str,
         operation_name: str = "Chat",
         temperature: float = 0.2,
-        max_output_tokens: int = 8192
+        max_output_tokens: int = 8192,
+        chunk_callback: Optional[Callable[[str, str, int], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         ChatSession 메시지 전송 (할당량 재시도 포함)
+        
+        chunk_callback이 주어지면 스트리밍 모드(streamGenerateContent)로 전송합니다.
         """
-        for attempt in range(self.max_quota_retries):
-            try:
-                response = await chat_session.send_message_async(
+        async def send():
+            if chunk_callback:
+                return await chat_session.send_message_stream_async(
                     prompt=prompt,
+                    chunk_callback=chunk_callback,
                     temperature=temperature,
                     max_output_tokens=max_output_tokens
                 )
-                return response
-                
-            except GeminiClientError as e:
-                if e.error_type == "quota_exceeded":
-                    if attempt < self.max_quota_retries - 1:
-                        wait_time = self.retry_delay * (attempt + 1)
-                        logger.warning(
-                            f"⏳ {operation_name}: 할당량 초과, {wait_time}초 대기 "
-                            f"(재시도 {attempt + 1}/{self.max_quota_retries})"
-                        )
-                        await asyncio.sleep(wait_time)
-                        continue
-                raise
-            except Exception as e:
-                if "429" in str(e) or "quota" in str(e).lower():
-                    if attempt < self.max_quota_retries - 1:
-                        wait_time = self.retry_delay * (attempt + 1)
-                        logger.warning(f"⏳ {operation_name}: 재시도 대기 {wait_time}초")
-                        await asyncio.sleep(wait_time)
-                        continue
-                raise
+            return await chat_session.send_message_async(
+                prompt=prompt,
+                temperature=temperature,
+                max_output_tokens=max_output_tokens
+            )
         
-        raise GeminiClientError("quota_exceeded", f"{operation_name}: 최대 재시도 횟수 초과")
+        return await self.run_with_quota_retry(operation_name, send)
     
     # =========================================================================
     # 코드 연속 생성 (끊김 처리)
@@ -525,44 +1390,187 @@ class GeminiClient:
         self,
         chat_session: ChatSession,
         initial_response: Dict[str, Any],
-        operation_name: str = "Code"
+        operation_name: str = "Code",
+        chunk_callback: Optional[Callable[[str, str, int], Awaitable[None]]] = None
     ) -> str:
         """
         끊긴 코드 연속 생성
         
         응답이 MAX_TOKENS로 끊긴 경우 이어서 생성
+        
+        - 끊긴 응답(initial_response)은 chat_session의 마지막 턴이어야 함
+        - 연속 생성 요청 시 히스토리의 끊긴 응답을 코드 끝부분(continuation_tail_lines줄)으로 줄여 보냄
+        - 연속 응답은 merge_continuation()으로 겹치는 줄/다시 열린 펜스/중복 import를 정리해 병합
+        - 끝나면 히스토리를 "요청 → 병합된 전체 응답" 한 쌍으로 정리
         """
         result = initial_response.get("text", "")
         is_truncated = initial_response.get("is_truncated", False)
+        if not is_truncated:
+            return result
+        
+        # 끊긴 응답 턴(요청 + 응답)의 시작 위치
+        checkpoint = chat_session.checkpoint() - 2
+        tail_count = self.continuation_tail_lines
+        
+        try:
+            for attempt in range(self.max_continuation_attempts):
+                if not is_truncated:
+                    break
+                
+                logger.info(f"🔄 {operation_name}: 코드 연속 생성 {attempt + 1}/{self.max_continuation_attempts}")
+                
+                if tail_count > 0:
+                    chat_session.replace_reply(
+                        checkpoint, f"{self.CONTINUATION_TAIL_MARKER}\n{tail_lines(result, tail_count)}"
+                    )
+                    continuation_prompt = self.CONTINUATION_TAIL_PROMPT
+                else:
+                    chat_session.replace_reply(checkpoint, result)
+                    continuation_prompt = self.CONTINUATION_PROMPT
+                
+                try:
+                    # continuation 라우트가 없으면 바깥 작업(stage-N)의 라우트를 따름
+                    with model_operation("continuation"):
+                        response = await self.send_chat_with_retry(
+                            chat_session=chat_session,
+                            prompt=continuation_prompt,
+                            operation_name=f"{operation_name}-continuation",
+                            max_output_tokens=8192,
+                            chunk_callback=chunk_callback
+                        )
+                    
+                    continuation_text = response.get("text", "")
+                    merged = merge_continuation(result, continuation_text)
+                    logger.info(
+                        f"🧩 {operation_name}: 연속 응답 병합 +{len(merged) - len(result)} chars "
+                        f"(응답 {len(continuation_text)} chars)"
+                    )
+                    result = merged
+                    is_truncated = response.get("is_truncated", False)
+                    
+                except Exception as e:
+                    logger.error(f"❌ 연속 생성 실패: {e}")
+                    break
+        finally:
+            chat_session.replace_reply(checkpoint, result)
+        
+        return result
+    
+    # =========================================================================
+    # JSON 구조화 출력 (문서 데이터 추출)
+    # =========================================================================
+    
+    async def generate_json_async(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        operation_name: str = "JSON",
+        temperature: float = 0.2,
+        max_output_tokens: int = 8192,
+        timeout: Optional[int] = None,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        JSON 모드 생성 + 섹션 단위 스트리밍 파싱 + 부분 복구
+        
+        1. responseMimeType=application/json + responseSchema로 스트리밍 요청,
+           최상위 섹션이 완성될 때마다 파싱 (utils/json_stream.py)
+        2. 파싱 실패 섹션: 그 조각과 섹션 스키마만 보내 문법만 고침 (원본 프롬프트 재전송 없음)
+        3. 누락/끊긴 섹션: 원본 프롬프트 + 누락 섹션만 남긴 스키마로 그 섹션만 다시 생성
+        4. 2~3을 최대 max_json_repairs회 반복, 그래도 빠진 섹션은 제외하고 반환
+        
+        Raises:
+            GeminiClientError("invalid_json"): 파싱된 섹션이 하나도 없는 경우
+        """
+        parser = await self._stream_json_sections(
+            prompt, response_schema, operation_name, temperature, max_output_tokens, timeout, use_cache
+        )
+        data = dict(parser.sections)
+        invalid = dict(parser.invalid)
+        if parser.is_valid and not parser.missing_keys(response_schema):
+            self.json_stats["valid"] += 1
+            return data
         
-        for attempt in range(self.max_continuation_attempts):
-            if not is_truncated:
+        properties = response_schema.get("properties", {})
+        for attempt in range(self.max_json_repairs):
+            broken = {key: fragment for key, fragment in invalid.items() if key in properties and key not in data}
+            missing = [key for key in response_schema.get("required", []) if key not in data and key not in broken]
+            if not broken and not missing:
                 break
+            invalid = {}
             
-            logger.info(f"🔄 {operation_name}: 코드 연속 생성 {attempt + 1}/{self.max_continuation_attempts}")
-            
-            continuation_prompt = (
-                "코드가 끊겼습니다. 이전 응답의 마지막 부분부터 이어서 "
-                "남은 코드를 완성해주세요. 중복 없이 이어서 작성해주세요."
-            )
+            for key, fragment in broken.items():
+                logger.warning(f"🩹 {operation_name}: '{key}' 섹션 JSON 오류 - 조각만 복구 요청 ({len(fragment)} chars)")
+                self.json_stats["fragment_repairs"] += 1
+                repair = await self._stream_json_sections(
+                    self.JSON_REPAIR_PROMPT.format(key=key, fragment=fragment),
+                    sub_schema(response_schema, [key]),
+                    f"{operation_name}-repair", 0.0, max_output_tokens, timeout, False
+                )
+                data.update((k, v) for k, v in repair.sections.items() if k == key)
+                invalid.update((k, v) for k, v in repair.invalid.items() if k == key)
             
-            try:
-                response = await self.send_chat_with_retry(
-                    chat_session=chat_session,
-                    prompt=continuation_prompt,
-                    operation_name=f"{operation_name}-continuation",
-                    max_output_tokens=8192
+            if missing:
+                logger.warning(f"🩹 {operation_name}: 누락 섹션 {missing} 재생성 요청 ({attempt + 1}/{self.max_json_repairs})")
+                self.json_stats["section_retries"] += 1
+                retry = await self._stream_json_sections(
+                    prompt + self.JSON_SECTIONS_PROMPT.format(keys=", ".join(missing)),
+                    sub_schema(response_schema, missing),
+                    f"{operation_name}-sections", temperature, max_output_tokens, timeout, False
                 )
-                
-                continuation_text = response.get("text", "")
-                result += "\n" + continuation_text
-                is_truncated = response.get("is_truncated", False)
-                
-            except Exception as e:
-                logger.error(f"❌ 연속 생성 실패: {e}")
-                break
+                data.update((k, v) for k, v in retry.sections.items() if k in missing)
+                invalid.update((k, v) for k, v in retry.invalid.items() if k in missing)
         
-        return result
+        if not data:
+            self.json_stats["failed"] += 1
+            raise GeminiClientError("invalid_json", f"{operation_name}: JSON 응답을 파싱할 수 없음")
+        
+        missing = [key for key in response_schema.get("required", []) if key not in data]
+        if missing:
+            self.json_stats["incomplete"] += 1
+            logger.warning(f"⚠️ {operation_name}: 복구하지 못한 섹션 {missing} - 제외하고 진행")
+        else:
+            self.json_stats["repaired"] += 1
+            logger.info(f"✅ {operation_name}: JSON 섹션 복구 완료")
+        return data
+    
+    async def _stream_json_sections(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        operation_name: str,
+        temperature: float,
+        max_output_tokens: int,
+        timeout: Optional[int],
+        use_cache: bool
+    ) -> JsonSectionParser:
+        """JSON 모드 스트리밍 요청 1회 → 섹션 파서 (할당량 재시도 포함)"""
+        async def stream():
+            parser = JsonSectionParser()
+            async for chunk in self._stream_api_async(
+                contents=self._build_contents(prompt),
+                temperature=temperature,
+                max_output_tokens=max_output_tokens,
+                timeout=timeout,
+                use_cache=use_cache,
+                response_schema=response_schema
+            ):
+                for key in parser.feed(chunk.get("text", "")):
+                    logger.debug(f"🧱 {operation_name}: '{key}' 섹션 수신")
+            return parser.finish()
+        
+        return await self.run_with_quota_retry(operation_name, stream)
+    
+    # JSON 섹션 복구 요청
+    JSON_REPAIR_PROMPT = (
+        "아래는 JSON 객체의 \"{key}\" 항목인데 JSON 문법 오류로 파싱할 수 없습니다.\n"
+        "내용은 바꾸지 말고 문법(따옴표 이스케이프, 쉼표, 괄호)만 고쳐 {{\"{key}\": ...}} 형태로 출력하세요.\n\n"
+        "{fragment}"
+    )
+    JSON_SECTIONS_PROMPT = (
+        "\n\n[부분 출력]\n이전 응답에서 다음 항목이 누락되었습니다: {keys}\n"
+        "위 요청사항에 따라 이 항목만 JSON으로 출력하세요."
+    )
     
     # =========================================================================
     # 프로토타입 생성 (4단계)
@@ -572,7 +1580,13 @@ class GeminiClient:
         self,
         full_prompt: str,
         system_prompt: str,
-        progress_callback: Optional[Callable[[str, int, int], Awaitable[None]]] = None
+        progress_callback: Optional[Callable[[str, float, int], Awaitable[None]]] = None,
+        chunk_callback: Optional[Callable[[int, str, str], Awaitable[None]]] = None,
+        step_prompts: Optional[List[str]] = None,
+        stage_memo: Optional[List[Dict[str, Any]]] = None,
+        seed_code: Optional[str] = None,
+        stage_callback: Optional[Callable[[int, str], Awaitable[None]]] = None,
+        stage_plan: Optional[StagePlan] = None
     ) -> Dict[str, Any]:
         """
         프로토타입 생성 (4단계)
@@ -581,49 +1595,149 @@ class GeminiClient:
         2단계: 기능 구현
         3단계: 스타일링
         4단계: 최적화 및 마무리
+        
+        [스트리밍 모드]
+        chunk_callback(stage, delta_text, accumulated_text)이 주어지면
+        streamGenerateContent로 각 단계를 스트리밍하고,
+        진행률은 수신한 출력 토큰 수 기준으로 (stage - 1 + 진행비율, 4) 형태로 보고합니다.
+        
+        [패치 출력]
+        stage_output=patch면 Stage 2~4는 이전 단계 코드에 대한 SEARCH/REPLACE 블록만 받아 적용합니다
+        (적용 실패 시 같은 단계에서 전체 코드를 다시 요청). 이때 chunk는 패치 텍스트이므로
+        단계별 적용 결과는 stage_callback(stage, code)으로 전달합니다.
+        
+        [증분 재생성]
+        step_prompts(Wizard Step 1~4 명세)가 주어지면 각 단계에 해당 Step 명세를 전달하고,
+        단계별 입력 해시(명세 + 이전 단계 입력 해시/출력 코드)를 계산합니다.
+        stage_memo(이전 생성의 "stages")와 앞에서부터 해시가 같은 단계는 호출 없이 재사용하고
+        입력이 처음 달라진 단계부터 생성합니다.
+        
+        [템플릿 시드]
+        seed_code(리소스 템플릿으로 조립한 초안)가 주어지면 Stage 1을 호출 없이 초안으로 대신하고
+        Stage 2부터 초안을 다듬습니다 (step_prompts가 있을 때만). 초안이 바뀌면 이후 단계 해시도 바뀝니다.
+        
+        [적응형 단계]
+        stage_plan(services/stage_planner.py)이 주어지면 Step 명세를 stage_plan.min_stages개 단계에 나눠 전달하고,
+        그 단계부터 모델이 만든 결과가 로컬 검사를 통과하면 나머지 단계를 생략합니다.
+        
+        [모델 라우팅]
+        각 단계는 model_operation("stage-N") 블록에서 호출되어 단계별 라우트의 모델/생성 설정을 사용합니다
+        (services/model_router.py). 단계 입력 해시에는 단계에 라우팅된 모델이 포함됩니다.
+        
+        Returns:
+            {"code", "language", "stages_completed", "turn_usage",
+             "stages": [{"stage", "input_hash", "code"}], "reused_stages": [재사용한 단계 번호],
+             "template_seeded": bool, "skipped_stages": [생략한 단계 번호]}
         """
         logger.info("🚀 프로토타입 생성 시작 (4단계)")
         
+        # 단계 입력 해시가 단계별 라우트 모델을 포함하므로 재사용 비교 전에 라우팅 테이블 갱신
+        await self.model_router.refresh_if_stale()
+        generated_code = ""
+        stage_prompts = self._create_stage_prompts(
+            full_prompt, step_prompts, stage_plan, seeded=bool(seed_code and step_prompts)
+        )
+        
+        # 템플릿 초안으로 Stage 1 대체
+        seeded: List[Dict[str, Any]] = []
+        if seed_code and step_prompts:
+            stage_name, stage_prompt = stage_prompts[0]
+            stage_prompts[0] = (stage_name, f"{stage_prompt}\n{self.TEMPLATE_SEED_NOTE}")
+            seeded.append({
+                "stage": 1,
+                "input_hash": self._stage_input_hash(1, system_prompt, f"{stage_prompts[0][1]}\n{seed_code}", None),
+                "code": seed_code
+            })
+            logger.info(f"🧩 Stage 1 템플릿 초안 사용 ({len(seed_code)} chars)")
+        
+        # 이전 생성 결과 중 입력이 같은 앞쪽 단계 (재사용)
+        stages = self._match_stage_memo(system_prompt, stage_prompts, stage_memo, seeded) if step_prompts else []
+        reused_stages = [record["stage"] for record in stages[len(seeded):]]
+        if stages:
+            generated_code = stages[-1]["code"]
+            if reused_stages:
+                logger.info(f"♻️ Stage {reused_stages[0]}-{reused_stages[-1]} 재사용 (입력 변경 없음)")
+            if progress_callback:
+                source = "이전 생성 결과 재사용" if reused_stages else "템플릿 초안 사용"
+                await progress_callback(f"Stage {len(stages)}/4: {source}", len(stages), 4)
+        
+        if len(stages) == len(stage_prompts) or \
+                self._stage_plan_satisfied(stage_plan, len(stages), len(seeded), generated_code):
+            return {
+                "code": self._clean_generated_code(generated_code),
+                "language": "tsx",
+                "stages_completed": len(stages),
+                "turn_usage": [],
+                "stages": stages,
+                "reused_stages": reused_stages,
+                "template_seeded": bool(seeded),
+                "skipped_stages": list(range(len(stages) + 1, len(stage_prompts) + 1))
+            }
+        
         # 콜백 핸들러 생성
         callback_handler = ProgressCallbackHandler(progress_callback)
         
-        # ChatSession 시작
-        chat_session = self.start_chat_with_system_prompt(system_prompt)
+        # 시스템 프롬프트 캐시 (4단계 호출 모두 재사용, 실패/최소 토큰 미달 시 인라인 전달)
+        try:
+            cached_content = await self.context_cache.get_or_create(system_prompt)
+        except Exception as e:
+            logger.warning(f"⚠️ Context cache lookup failed: {e}")
+            cached_content = None
         
-        generated_code = ""
-        stage_prompts = self._create_stage_prompts(full_prompt)
+        # ChatSession 시작
+        chat_session = self.start_chat_with_system_prompt(
+            system_prompt, cached_content, history_policy=self.history_policy
+        )
+        # 재사용한 단계는 실제로 실행한 것처럼 히스토리에 기록 (다음 단계가 같은 맥락을 보도록)
+        for record in stages:
+            chat_session.seed_stage(stage_prompts[record["stage"] - 1][1], record["code"])
         
+        skipped = len(stages)
+        last_stage = skipped
         for stage, (stage_name, stage_prompt) in enumerate(stage_prompts, 1):
+            if stage <= skipped:
+                continue
             logger.info(f"📋 Stage {stage}/4: {stage_name}")
+            stage_message = f"Stage {stage}/4: {stage_name}"
             
             if progress_callback:
-                await progress_callback(f"Stage {stage}/4: {stage_name}", stage, 4)
+                await progress_callback(stage_message, stage - 1 if chunk_callback else stage, 4)
             
-            try:
-                response = await self.send_chat_with_retry(
-                    chat_session=chat_session,
-                    prompt=stage_prompt,
-                    operation_name=f"Stage-{stage}",
-                    temperature=0.2,
-                    max_output_tokens=8192
+            stage_chunk_callback = None
+            if chunk_callback:
+                stage_chunk_callback = self._make_stage_chunk_callback(
+                    stage, stage_message, chunk_callback, progress_callback
                 )
-                
-                # 끊김 처리
-                if response.get("is_truncated"):
-                    full_response = await self.continue_truncated_code(
-                        chat_session=chat_session,
-                        initial_response=response,
-                        operation_name=f"Stage-{stage}"
+            
+            # Stage 1은 사용자가 첫 화면을 기다리는 호출 - 할당량 대기열에서 우선 처리
+            stage_priority = PRIORITY_INTERACTIVE if stage == 1 else PRIORITY_DEFAULT
+            
+            try:
+                checkpoint = chat_session.checkpoint()
+                with request_priority(stage_priority), model_operation(f"stage-{stage}"):
+                    full_response = await self._send_stage(
+                        chat_session, stage_prompt, f"Stage-{stage}", stage_chunk_callback
                     )
-                else:
-                    full_response = response.get("text", "")
-                
-                # 코드 추출
-                stage_code = self._extract_code_from_response(full_response)
+                    
+                    # 코드 추출 (patch 모드는 이전 단계 코드에 블록 적용, 실패 시 전체 코드 재요청)
+                    patched = stage > 1 and self.stage_output == self.STAGE_OUTPUT_PATCH and bool(generated_code)
+                    if patched and has_patch_blocks(full_response):
+                        stage_code = await self._apply_stage_patch(
+                            chat_session, stage, generated_code, full_response, stage_chunk_callback
+                        )
+                    else:
+                        if patched:
+                            self.patch_stats["full_output"] += 1
+                        stage_code = self._extract_code_from_response(full_response)
                 
                 if stage_code:
                     generated_code = stage_code
                     logger.info(f"✅ Stage {stage} 완료: {len(stage_code)} chars")
+                    if stage_callback:
+                        await stage_callback(stage, stage_code)
+                    # 다음 단계에는 최신 코드만 전달 (이전 버전 코드/연속 생성 턴 제거)
+                    # patch 모드는 히스토리 정책과 관계없이 패치 대신 적용된 코드를 남김
+                    chat_session.compact_stage(checkpoint, stage_prompt, stage_code, force=patched)
                 
             except Exception as e:
                 logger.error(f"❌ Stage {stage} 실패: {e}")
@@ -631,6 +1745,24 @@ class GeminiClient:
                     raise
                 # Stage 1 이후 실패는 이전 결과 사용
                 break
+            
+            if step_prompts and generated_code:
+                previous = stages[-1] if stages else None
+                stages.append({
+                    "stage": stage,
+                    "input_hash": self._stage_input_hash(stage, system_prompt, stage_prompt, previous),
+                    "code": generated_code
+                })
+            last_stage = stage
+            
+            # 명세를 모두 전달한 뒤 로컬 검사를 통과하면 나머지 단계 생략
+            if stage < len(stage_prompts) and \
+                    self._stage_plan_satisfied(stage_plan, stage, len(seeded), generated_code):
+                if progress_callback:
+                    await progress_callback(f"Stage {stage}/4: 검사 통과 - 이후 단계 생략", 4, 4)
+                break
+        
+        skipped_stages = list(range(last_stage + 1, len(stage_prompts) + 1)) if last_stage else []
         
         if not generated_code:
             raise GeminiClientError("generation_failed", "프로토타입 생성 실패")
@@ -638,51 +1770,294 @@ class GeminiClient:
         # 최종 정리
         final_code = self._clean_generated_code(generated_code)
         
+        input_tokens = sum(turn["input_tokens"] for turn in chat_session.turn_usage)
+        output_tokens = sum(turn.get("output_tokens", 0) for turn in chat_session.turn_usage)
+        logger.info(
+            f"📊 프로토타입 생성 토큰 합계: input {input_tokens}, output {output_tokens} "
+            f"({len(chat_session.turn_usage)} turns, stage output={self.stage_output}, patch={self.patch_stats})"
+        )
+        
         return {
             "code": final_code,
             "language": "tsx",
-            "stages_completed": min(len(stage_prompts), 4)
+            "stages_completed": last_stage,
+            "turn_usage": chat_session.turn_usage,
+            "stages": stages,
+            "reused_stages": reused_stages,
+            "template_seeded": bool(seeded),
+            "skipped_stages": skipped_stages
         }
     
-    def _create_stage_prompts(self, full_prompt: str) -> List[Tuple[str, str]]:
-        """4단계 프롬프트 생성"""
-        return [
-            ("기본 구조 생성", f"""
-{full_prompt}
-
-[Stage 1 - 기본 구조]
+    def _stage_plan_satisfied(
+        self,
+        stage_plan: Optional[StagePlan],
+        stage: int,
+        seeded_count: int,
+        code: str
+    ) -> bool:
+        """
+        stage까지의 결과로 생성을 끝내도 되는지
+        
+        명세를 모두 전달한 단계(min_stages) 이후이고, 템플릿 초안이 아닌 모델 결과이며,
+        로컬 검사(괄호/JSX 짝, TODO, 모달 상태명, 스타일)를 통과해야 합니다.
+        """
+        if not stage_plan or not code or stage < stage_plan.min_stages or stage <= seeded_count:
+            return False
+        problems = stage_plan.check(self._clean_generated_code(code))
+        if problems:
+            logger.info(f"🔎 Stage {stage} 로컬 검사 미통과 - 다음 단계 진행: {'; '.join(problems)}")
+            return False
+        logger.info(f"⏭️ Stage {stage} 로컬 검사 통과 ({stage_plan.tier}) - Stage {stage + 1}~4 생략")
+        return True
+    
+    async def _send_stage(
+        self,
+        chat_session: ChatSession,
+        prompt: str,
+        operation_name: str,
+        chunk_callback: Optional[Callable[[str, str, int], Awaitable[None]]] = None
+    ) -> str:
+        """단계 요청 전송 + 끊김 시 연속 생성 → 전체 응답 텍스트"""
+        response = await self.send_chat_with_retry(
+            chat_session=chat_session,
+            prompt=prompt,
+            operation_name=operation_name,
+            temperature=0.2,
+            max_output_tokens=8192,
+            chunk_callback=chunk_callback
+        )
+        if response.get("is_truncated"):
+            return await self.continue_truncated_code(
+                chat_session=chat_session,
+                initial_response=response,
+                operation_name=operation_name,
+                chunk_callback=chunk_callback
+            )
+        return response.get("text", "")
+    
+    async def _apply_stage_patch(
+        self,
+        chat_session: ChatSession,
+        stage: int,
+        previous_code: str,
+        patch_text: str,
+        chunk_callback: Optional[Callable[[str, str, int], Awaitable[None]]] = None
+    ) -> str:
+        """SEARCH/REPLACE 블록을 이전 단계 코드에 적용 (실패 시 같은 대화에서 전체 코드 요청)"""
+        try:
+            code = apply_patch(previous_code, patch_text)
+            self.patch_stats["applied"] += 1
+            logger.info(f"🩹 Stage {stage} 패치 적용: 응답 {len(patch_text)} chars → 코드 {len(code)} chars")
+            return code
+        except PatchError as e:
+            reason = str(e)
+            self.patch_stats["fallback"] += 1
+            logger.warning(f"⚠️ Stage {stage} 패치 적용 실패 - 전체 코드 요청: {reason}")
+        
+        full_response = await self._send_stage(
+            chat_session,
+            self.PATCH_FALLBACK_PROMPT.format(reason=reason[:200]),
+            f"Stage-{stage}-full",
+            chunk_callback
+        )
+        return self._extract_code_from_response(full_response)
+    
+    def _stage_input_hash(
+        self,
+        stage: int,
+        system_prompt: str,
+        stage_prompt: str,
+        previous: Optional[Dict[str, Any]]
+    ) -> str:
+        """단계 입력 해시 (단계에 라우팅된 모델 + 시스템 프롬프트 + 단계 프롬프트 + 이전 단계 입력 해시/출력 코드)"""
+        digest = hashlib.sha256()
+        for part in (
+            self.model_router.route((f"stage-{stage}",)).models(self.model_name)[0],
+            system_prompt,
+            stage_prompt,
+            previous["input_hash"] if previous else "",
+            previous["code"] if previous else "",
+        ):
+            digest.update(hashlib.sha256(part.encode("utf-8")).digest())
+        return digest.hexdigest()
+    
+    def _match_stage_memo(
+        self,
+        system_prompt: str,
+        stage_prompts: List[Tuple[str, str]],
+        stage_memo: Optional[List[Dict[str, Any]]],
+        seeded: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """이전 생성의 단계 기록 중 입력 해시가 앞에서부터 일치하는 단계들 (seeded 단계 다음부터 비교)"""
+        memo_by_stage = {record.get("stage"): record for record in stage_memo or []}
+        matched: List[Dict[str, Any]] = list(seeded or [])
+        for stage, (_, stage_prompt) in enumerate(stage_prompts, 1):
+            if stage <= len(matched):
+                continue
+            record = memo_by_stage.get(stage)
+            previous = matched[-1] if matched else None
+            if not record or not record.get("code") or \
+                    record.get("input_hash") != self._stage_input_hash(stage, system_prompt, stage_prompt, previous):
+                break
+            matched.append({"stage": stage, "input_hash": record["input_hash"], "code": record["code"]})
+        return matched
+    
+    def _make_stage_chunk_callback(
+        self,
+        stage: int,
+        stage_message: str,
+        chunk_callback: Callable[[int, str, str], Awaitable[None]],
+        progress_callback: Optional[Callable[[str, float, int], Awaitable[None]]]
+    ) -> Callable[[str, str, int], Awaitable[None]]:
+        """
+        스트리밍 청크 콜백 생성
+        
+        - 청크를 (stage, delta, accumulated)로 전달
+        - 출력 토큰 수 기반 진행률 보고 (정수 % 변화가 있을 때만)
+        """
+        last_percent = -1
+        
+        async def on_chunk(delta: str, accumulated: str, output_tokens: int):
+            nonlocal last_percent
+            await chunk_callback(stage, delta, accumulated)
+            
+            if progress_callback:
+                ratio = min(output_tokens / self.expected_stage_output_tokens, 0.95)
+                current = stage - 1 + ratio
+                percent = int(current / 4 * 100)
+                if percent != last_percent:
+                    last_percent = percent
+                    await progress_callback(f"{stage_message} ({output_tokens} tokens)", current, 4)
+        
+        return on_chunk
+    
+    # 끊긴 응답 연속 생성 요청
+    CONTINUATION_PROMPT = (
+        "코드가 끊겼습니다. 이전 응답의 마지막 부분부터 이어서 "
+        "남은 코드를 완성해주세요. 중복 없이 이어서 작성해주세요."
+    )
+    CONTINUATION_TAIL_MARKER = "(앞부분 생략 - 코드 끝부분)"
+    CONTINUATION_TAIL_PROMPT = (
+        "코드가 끊겼습니다. 직전 응답에는 코드의 끝부분만 남겨 두었습니다. "
+        "마지막 줄의 끊긴 지점부터 바로 이어서 남은 코드만 작성해주세요. 앞부분을 반복하지 마세요."
+    )
+    
+    # 단계별 지시문 (단계명, 지시문, 전체 코드 출력 요청 - patch 모드에서는 PATCH_FORMAT_NOTE로 대체)
+    STAGE_INSTRUCTIONS = [
+        ("기본 구조 생성", """[Stage 1 - 기본 구조]
 위 요구사항을 분석하고 기본 컴포넌트 구조를 생성해주세요.
 - 메인 컴포넌트 구조
 - 필요한 상태 정의
 - 기본 레이아웃
-"""),
-            ("기능 구현", """
-[Stage 2 - 기능 구현]
+""", ""),
+        ("기능 구현", """[Stage 2 - 기능 구현]
 이전 단계의 구조를 기반으로 핵심 기능을 구현해주세요.
 - 이벤트 핸들러
 - 데이터 처리 로직
 - 상태 관리 로직
-완전한 코드를 제공해주세요.
-"""),
-            ("스타일링", """
-[Stage 3 - 스타일링]
+""", "완전한 코드를 제공해주세요.\n"),
+        ("스타일링", """[Stage 3 - 스타일링]
 Tailwind CSS를 사용하여 스타일을 적용해주세요.
 - 반응형 디자인
 - 시각적 개선
 - UX 최적화
-완전한 코드를 제공해주세요.
-"""),
-            ("최적화 및 마무리", """
-[Stage 4 - 최적화 및 마무리]
+""", "완전한 코드를 제공해주세요.\n"),
+        ("최적화 및 마무리", """[Stage 4 - 최적화 및 마무리]
 최종 코드를 완성해주세요.
 - 코드 정리
 - 주석 추가
 - 에러 처리
 - TypeScript 타입 완성
-
-최종 완성된 전체 코드를 제공해주세요.
-""")
-        ]
+""", "\n최종 완성된 전체 코드를 제공해주세요.\n"),
+    ]
+    
+    # patch 모드: Stage 2~4 출력 형식 (이전 단계 코드에 대한 SEARCH/REPLACE 블록)
+    PATCH_FORMAT_NOTE = f"""
+[출력 형식 - 변경 사항만]
+이전 단계 코드 전체를 다시 쓰지 말고, 바꿀 부분만 아래 블록으로 제공해주세요.
+{PATCH_SEARCH_MARKER}
+(이전 코드에서 그대로 복사한 연속된 줄 - 위치를 하나로 특정할 만큼만)
+{PATCH_DIVIDER}
+(바꿀 코드)
+{PATCH_REPLACE_MARKER}
+- 블록은 여러 개 쓸 수 있으며 위에서부터 순서대로 적용됩니다.
+- SEARCH는 이전 코드와 글자 그대로 일치해야 합니다 (생략/요약 금지).
+- 코드 끝에 덧붙일 때는 SEARCH를 비워 두세요.
+- 블록 외의 설명은 쓰지 마세요.
+"""
+    
+    # patch 모드: 패치를 적용할 수 없을 때 같은 단계에서 전체 코드 요청
+    PATCH_FALLBACK_PROMPT = (
+        "변경 사항을 이전 코드에 적용할 수 없습니다 ({reason}). "
+        "이번 단계의 변경을 반영한 전체 코드를 하나의 코드 블록으로 제공해주세요."
+    )
+    
+    # 템플릿 초안으로 Stage 1을 대신할 때 Stage 1 요청 뒤에 붙는 안내 (히스토리 기록용)
+    TEMPLATE_SEED_NOTE = (
+        "[템플릿 초안] 이 단계는 Wizard 명세와 리소스 템플릿으로 조립한 실행 가능한 초안으로 대신합니다. "
+        "이후 단계에서는 이 초안의 구조와 상태/모달 변수명을 유지하면서 다듬어 주세요."
+    )
+    
+    # Step 명세를 단계별로 나눠 전달할 때 Stage 2~4 명세 뒤에 붙는 안내
+    STAGE_SPEC_NOTE = (
+        "위 명세는 이번 단계에서 이전 단계 코드에 반영할 범위입니다. "
+        "명세의 작성 범위 안내와 관계없이 반영된 전체 코드를 하나의 코드 블록으로 제공해주세요."
+    )
+    STAGE_SPEC_PATCH_NOTE = (
+        "위 명세는 이번 단계에서 이전 단계 코드에 반영할 범위입니다. "
+        "명세의 작성 범위 안내와 관계없이 이전 단계 코드에 대한 변경만 제공해주세요."
+    )
+    
+    # 적응형 단계: 마지막 명세를 전달하는 단계에 붙는 안내 (이후 단계는 로컬 검사 통과 시 생략)
+    PLAN_COMPLETE_NOTE = (
+        "\n이번 단계로 화면 명세가 모두 전달되었습니다. 기능 구현과 Tailwind CSS 스타일까지 반영해 "
+        "추가 단계 없이 바로 사용할 수 있는 완성된 컴포넌트가 되도록 작성해주세요.\n"
+    )
+    
+    def _create_stage_prompts(
+        self,
+        full_prompt: str,
+        step_prompts: Optional[List[str]] = None,
+        stage_plan: Optional[StagePlan] = None,
+        seeded: bool = False
+    ) -> List[Tuple[str, str]]:
+        """
+        4단계 프롬프트 생성
+        
+        step_prompts(Step 1~4 명세)가 주어지면 Step N 명세를 Stage N에 나눠 전달합니다.
+        Stage N의 입력이 Step N 명세와 이전 단계 결과로 한정되므로
+        Wizard 일부만 바뀐 경우 앞 단계를 재사용할 수 있습니다.
+        없으면 Stage 1에 전체 프롬프트를 전달합니다.
+        
+        stage_output=patch면 Stage 2~4는 전체 코드 대신 이전 단계 코드에 대한 SEARCH/REPLACE 블록을 요청합니다.
+        
+        stage_plan이 주어지면 Step 명세를 min_stages개 단계에 묶어 전달하고(이후 단계는 지시문만),
+        생략 판단을 시작하는 첫 모델 단계(Stage 1이 템플릿 초안이면 Stage 2)에 완성 요청 안내를 붙입니다.
+        """
+        patch_mode = self.stage_output == self.STAGE_OUTPUT_PATCH
+        if step_prompts and stage_plan:
+            step_prompts = stage_plan.group_step_prompts(step_prompts)
+        complete_stage = None
+        if stage_plan and stage_plan.min_stages < len(self.STAGE_INSTRUCTIONS):
+            complete_stage = max(stage_plan.min_stages, 2 if seeded else 1)
+        prompts = []
+        for index, (stage_name, instruction, full_output) in enumerate(self.STAGE_INSTRUCTIONS):
+            if index == 0 or not patch_mode:
+                instruction = f"{instruction}{full_output}"
+                spec_note = self.STAGE_SPEC_NOTE
+            else:
+                instruction = f"{instruction}{self.PATCH_FORMAT_NOTE}"
+                spec_note = self.STAGE_SPEC_PATCH_NOTE
+            if index + 1 == complete_stage:
+                instruction = f"{instruction}{self.PLAN_COMPLETE_NOTE}"
+            if step_prompts and step_prompts[index] is not None:
+                spec = step_prompts[index] if index == 0 else f"{step_prompts[index]}\n\n{spec_note}"
+                prompts.append((stage_name, f"\n{spec}\n\n{instruction}"))
+            elif index == 0:
+                prompts.append((stage_name, f"\n{full_prompt}\n\n{instruction}"))
+            else:
+                prompts.append((stage_name, f"\n{instruction}"))
+        return prompts
     
     def _extract_code_from_response(self, response_text: str) -> str:
         """응답에서 코드 추출"""
@@ -740,7 +2115,15 @@ def get_gemini_client() -> GeminiClient:
     return _gemini_client
 
 
+async def close_gemini_client():
+    """싱글톤 클라이언트의 커넥션 풀 종료 (앱 종료 시)"""
+    if _gemini_client is not None:
+        await _gemini_client.aclose()
+
+
 def reset_gemini_client():
     """클라이언트 리셋 (테스트용)"""
     global _gemini_client
+    if _gemini_client is not None:
+        _gemini_client.close()
     _gemini_client = None
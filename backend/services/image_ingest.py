@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+Image Ingest - 산출물용 스크린샷 전처리
+
+업로드된 스크린샷을 원본 해상도 그대로 Word에 넣으면 docx/DB가 커지고 렌더링도 느려집니다.
+문서에 들어가는 폭(6인치)과 목표 DPI에 맞춰 미리 줄이고 다시 압축합니다.
+
+[처리 순서]
+1. 업로드를 청크 단위로 임시 파일에 스풀 (원본 전체를 메모리에 올리지 않음) + SHA-256 계산
+2. 같은 원본이 다시 올라오면 건너뜀 (요청 내 중복 제거 / 최근 처리 결과 재사용)
+3. 렌더링 프로세스 풀에서 Pillow로 전처리
+   - EXIF 회전 적용 → 6인치 × DPI 폭으로 축소
+   - PNG(optimize) 기본, JPEG가 절반 이하로 작을 때만 JPEG (사진에 가까운 캡처)
+   - EXIF/ICC 등 메타데이터 제거
+4. 전처리 결과가 같은 이미지도 한 번만 포함
+
+환경 변수:
+- SCREENSHOT_TARGET_DPI: 6인치 폭 기준 목표 DPI (기본값: 150 → 최대 900px)
+- SCREENSHOT_JPEG_QUALITY: JPEG 품질 (기본값: 85)
+"""
+import os
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+from fastapi import UploadFile
+from PIL import Image, ImageOps
+
+from services.docx_renderer import get_docx_render_pool
+
+logger = logging.getLogger(__name__)
+
+# 문서에 삽입되는 이미지 폭 (인치) - DocxRenderer의 add_picture(width=Inches(6.0))
+SCREENSHOT_WIDTH_INCHES = 6.0
+
+# 업로드 스풀 청크 크기
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+# JPEG가 PNG보다 이 비율 이상 작을 때만 JPEG 사용 (텍스트/선이 많은 UI 캡처는 PNG 우선)
+JPEG_PREFERENCE_RATIO = 0.5
+
+# 최근 처리 결과 캐시 상한 (원본 SHA-256 → 처리 결과)
+PROCESSED_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+# =============================================================================
+# 전처리 (워커 프로세스에서 실행)
+# =============================================================================
+
+def _encode(image: Image.Image, fmt: str, **options) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
+
+
+def prepare_screenshot(path: str, max_width: int, jpeg_quality: int) -> Tuple[bytes, str]:
+    """
+    스크린샷 파일 → (재압축된 이미지 bytes, Content-Type)
+
+    새 이미지로 다시 저장하므로 EXIF/ICC/텍스트 청크 등 메타데이터는 포함되지 않습니다.
+    """
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        if image.width > max_width:
+            height = max(1, round(image.height * max_width / image.width))
+            image = image.resize((max_width, height), Image.LANCZOS)
+
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        if has_alpha:
+            return _encode(image.convert("RGBA"), "PNG", optimize=True), "image/png"
+
+        image = image.convert("RGB")
+        png = _encode(image, "PNG", optimize=True)
+        jpeg = _encode(image, "JPEG", quality=jpeg_quality, optimize=True)
+        if len(jpeg) < len(png) * JPEG_PREFERENCE_RATIO:
+            return jpeg, "image/jpeg"
+        return png, "image/png"
+
+
+# =============================================================================
+# 업로드 처리
+# =============================================================================
+
+class ImageIngestor:
+    """업로드 스풀 + 중복 제거 + 전처리 결과 캐시"""
+
+    def __init__(self, target_dpi: int, jpeg_quality: int):
+        self.max_width = int(SCREENSHOT_WIDTH_INCHES * target_dpi)
+        self.jpeg_quality = jpeg_quality
+        self._cache: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._cache_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"images": 0, "duplicates": 0, "cache_hits": 0, "invalid": 0, "input_bytes": 0, "output_bytes": 0}
+
+    async def _spool(self, file: UploadFile) -> Tuple[str, str, int]:
+        """업로드 → 임시 파일 (경로, 원본 SHA-256, 크기)"""
+        digest = hashlib.sha256()
+        size = 0
+        fd, path = tempfile.mkstemp(prefix="forgeflow-upload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = await file.read(SPOOL_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+        except BaseException:
+            os.remove(path)
+            raise
+        return path, digest.hexdigest(), size
+
+    def _cache_get(self, raw_sha256: str) -> Optional[Tuple[bytes, str]]:
+        with self._lock:
+            cached = self._cache.get(raw_sha256)
+            if cached is not None:
+                self._cache.move_to_end(raw_sha256)
+            return cached
+
+    def _cache_put(self, raw_sha256: str, result: Tuple[bytes, str]):
+        with self._lock:
+            if raw_sha256 in self._cache:
+                return
+            self._cache[raw_sha256] = result
+            self._cache_bytes += len(result[0])
+            while self._cache_bytes > PROCESSED_CACHE_MAX_BYTES and self._cache:
+                _, (evicted, _) = self._cache.popitem(last=False)
+                self._cache_bytes -= len(evicted)
+
+    async def _process(self, path: str, raw_sha256: str, label: str) -> Optional[Tuple[bytes, str]]:
+        cached = self._cache_get(raw_sha256)
+        if cached is not None:
+            self.stats["cache_hits"] += 1
+            return cached
+        try:
+            result = await get_docx_render_pool().run(prepare_screenshot, path, self.max_width, self.jpeg_quality)
+        except Exception as e:
+            # 이미지가 아닌 파일 등 - 기존처럼 해당 이미지만 제외
+            self.stats["invalid"] += 1
+            logger.warning(f"⚠️ Screenshot '{label}' skipped: {type(e).__name__}: {e}")
+            return None
+        self._cache_put(raw_sha256, result)
+        return result
+
+    async def ingest(self, files: List[UploadFile], labels: List[str]) -> List[Dict[str, Any]]:
+        """
+        업로드된 스크린샷 전처리
+
+        Returns:
+            [{"label", "bytes", "sha256", "content_type"}] (업로드 순서 유지, 빈 파일/중복/잘못된 이미지 제외)
+        """
+        # 1. 스풀 + 원본 기준 중복 제거 (처음 나온 라벨 유지)
+        spooled = []
+        seen_raw = set()
+        try:
+            for idx, file in enumerate(files):
+                label = labels[idx] if idx < len(labels) else f"Image {idx+1}"
+                path, raw_sha256, size = await self._spool(file)
+                if size == 0 or raw_sha256 in seen_raw:
+                    os.remove(path)
+                    if size:
+                        self.stats["duplicates"] += 1
+                    continue
+                seen_raw.add(raw_sha256)
+                self.stats["input_bytes"] += size
+                spooled.append((label, path, raw_sha256))
+
+            # 2. 전처리 (워커 풀에서 병렬)
+            results = await asyncio.gather(*(
+                self._process(path, raw_sha256, label) for label, path, raw_sha256 in spooled
+            ))
+        finally:
+            for _, path, _ in spooled:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+        # 3. 전처리 결과 기준 중복 제거
+        images = []
+        seen_processed = set()
+        for (label, _, _), result in zip(spooled, results):
+            if result is None:
+                continue
+            data, content_type = result
+            sha256 = hashlib.sha256(data).hexdigest()
+            if sha256 in seen_processed:
+                self.stats["duplicates"] += 1
+                continue
+            seen_processed.add(sha256)
+            self.stats["images"] += 1
+            self.stats["output_bytes"] += len(data)
+            images.append({"label": label, "bytes": data, "sha256": sha256, "content_type": content_type})
+
+        if images:
+            logger.info(
+                f"🖼️ Screenshots ingested: {len(images)}/{len(files)} "
+                f"({sum(len(i['bytes']) for i in images) // 1024} KB, max width {self.max_width}px)"
+            )
+        return images
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"max_width": self.max_width, "cached": len(self._cache), **self.stats}
+
+
+# 싱글톤 인스턴스
+_ingestor_instance: Optional[ImageIngestor] = None
+
+
+def get_image_ingestor() -> ImageIngestor:
+    """ImageIngestor 싱글톤 인스턴스 반환"""
+    global _ingestor_instance
+    if _ingestor_instance is None:
+        _ingestor_instance = ImageIngestor(
+            target_dpi=int(os.getenv("SCREENSHOT_TARGET_DPI", "150")),
+            jpeg_quality=int(os.getenv("SCREENSHOT_JPEG_QUALITY", "85"))
+        )
+    return _ingestor_instance
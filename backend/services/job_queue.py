@@ -0,0 +1,650 @@
+# -*- coding: utf-8 -*-
+"""
+Job Queue - 영속 작업 큐 + 워커 풀
+
+FastAPI BackgroundTasks는 요청을 받은 워커 메모리에만 존재하여
+재시작/배포 시 작업이 유실되고 화면이 GENERATING 상태로 남습니다.
+이 모듈은 작업을 DB(generation_jobs)에 영속화하고 워커 풀이 리스를 잡아 실행합니다.
+
+[백엔드]
+- db (기본값): generation_jobs 테이블 (Postgres는 FOR UPDATE SKIP LOCKED로 클레임)
+- memory: 프로세스 내부 대체 구현 (단일 프로세스 개발용, 재시작 시 유실)
+
+[동작]
+- 워커: 큐에서 작업을 클레임 → 리스(lease) 획득 → 하트비트로 리스 연장 → 완료/재시도/실패 기록
+- 리스 상실: 하트비트가 리스를 잃으면 핸들러를 취소하고(JobContext.lease_lost) 결과를 기록하지 않음
+- 재시도: JobError(retryable=True) 발생 시 지수 백오프 후 재큐잉 (max_attempts까지)
+- 리퍼: 시작 시 + 주기적으로 리스가 만료된 RUNNING 작업을 재큐잉(재개)하거나 실패 처리
+
+환경 변수:
+- JOB_QUEUE_BACKEND: db | memory (기본값: db)
+- JOB_WORKERS: 이 프로세스의 워커 수 (기본값: 2, 0이면 API 전용 - worker.py로 별도 실행)
+- JOB_LEASE_SECONDS: 리스 유효 시간 (기본값: 60)
+- JOB_HEARTBEAT_SECONDS: 하트비트 주기 (기본값: 15)
+- JOB_MAX_ATTEMPTS: 기본 최대 시도 횟수 (기본값: 3)
+- JOB_RETRY_BASE_DELAY: 재시도 백오프 기본 대기(초) (기본값: 30)
+- JOB_POLL_INTERVAL: 빈 큐 폴링 주기(초) (기본값: 2)
+"""
+import os
+import socket
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+from models.database import SessionLocal, engine
+from models.job import GenerationJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# 한국 시간대 (모델 타임스탬프와 동일)
+KST = ZoneInfo("Asia/Seoul")
+
+
+def _now() -> datetime:
+    return datetime.now(KST)
+
+
+class JobError(Exception):
+    """작업 핸들러 오류 (retryable=True면 백오프 후 재시도)"""
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.message = message
+        self.retryable = retryable
+
+
+class JobContext:
+    """핸들러에 전달되는 실행 컨텍스트"""
+
+    def __init__(self, job: Dict[str, Any]):
+        self.job_id: int = job["id"]
+        self.kind: str = job["kind"]
+        self.screen_id: Optional[int] = job.get("screen_id")
+        self.attempt: int = job["attempts"]
+        self.max_attempts: int = job["max_attempts"]
+        # 하트비트가 리스를 잃으면 True (다른 워커가 재개할 수 있으므로 핸들러는 결과를 기록하지 않아야 함)
+        self.lease_lost = False
+
+    @property
+    def is_final_attempt(self) -> bool:
+        """마지막 시도 여부 (실패 시 재시도 없음)"""
+        return self.attempt >= self.max_attempts
+
+
+JobHandler = Callable[[Dict[str, Any], JobContext], Awaitable[Optional[Dict[str, Any]]]]
+OrphanHandler = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+
+# =============================================================================
+# 저장소: DB
+# =============================================================================
+class DbJobStore:
+    """generation_jobs 테이블 기반 저장소 (동기 - JobQueue가 스레드에서 호출)"""
+
+    def ensure_table(self):
+        """작업 테이블 보장 (init.sql 미적용 환경/SQLite 대비)"""
+        GenerationJob.__table__.create(bind=engine, checkfirst=True)
+
+    @staticmethod
+    def _snapshot(job: GenerationJob) -> Dict[str, Any]:
+        return {**job.to_dict(), "payload": job.payload}
+
+    def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        screen_id: Optional[int],
+        priority: int,
+        max_attempts: int,
+        dedupe_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        db = SessionLocal()
+        try:
+            job = GenerationJob(
+                kind=kind,
+                screen_id=screen_id,
+                dedupe_key=dedupe_key,
+                payload=payload,
+                status=JobStatus.QUEUED,
+                priority=priority,
+                max_attempts=max_attempts,
+                available_at=_now(),
+            )
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            return self._snapshot(job)
+        finally:
+            db.close()
+
+    def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            now = _now()
+            candidate = (
+                db.query(GenerationJob.id)
+                .filter(
+                    GenerationJob.status == JobStatus.QUEUED,
+                    GenerationJob.available_at <= now,
+                )
+                .order_by(GenerationJob.priority, GenerationJob.id)
+                .with_for_update(skip_locked=True)
+                .first()
+            )
+            if not candidate:
+                db.rollback()
+                return None
+
+            # 상태 조건부 UPDATE로 다른 워커와의 경합 방지 (SKIP LOCKED 미지원 DB 포함)
+            updated = (
+                db.query(GenerationJob)
+                .filter(GenerationJob.id == candidate.id, GenerationJob.status == JobStatus.QUEUED)
+                .update({
+                    GenerationJob.status: JobStatus.RUNNING,
+                    GenerationJob.lease_owner: worker_id,
+                    GenerationJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                    GenerationJob.heartbeat_at: now,
+                    GenerationJob.started_at: now,
+                    GenerationJob.attempts: GenerationJob.attempts + 1,
+                }, synchronize_session=False)
+            )
+            db.commit()
+            if not updated:
+                return None
+
+            job = db.query(GenerationJob).filter(GenerationJob.id == candidate.id).first()
+            return self._snapshot(job) if job else None
+        finally:
+            db.close()
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        db = SessionLocal()
+        try:
+            now = _now()
+            updated = (
+                db.query(GenerationJob)
+                .filter(
+                    GenerationJob.id == job_id,
+                    GenerationJob.lease_owner == worker_id,
+                    GenerationJob.status == JobStatus.RUNNING,
+                )
+                .update({
+                    GenerationJob.heartbeat_at: now,
+                    GenerationJob.lease_expires_at: now + timedelta(seconds=lease_seconds),
+                }, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+        finally:
+            db.close()
+
+    def _finish(self, job_id: int, worker_id: str, values: Dict[Any, Any]) -> bool:
+        db = SessionLocal()
+        try:
+            updated = (
+                db.query(GenerationJob)
+                .filter(GenerationJob.id == job_id, GenerationJob.lease_owner == worker_id)
+                .update(values, synchronize_session=False)
+            )
+            db.commit()
+            return bool(updated)
+        finally:
+            db.close()
+
+    def complete(self, job_id: int, worker_id: str, result: Optional[Dict[str, Any]]) -> bool:
+        return self._finish(job_id, worker_id, {
+            GenerationJob.status: JobStatus.SUCCEEDED,
+            GenerationJob.result: result,
+            GenerationJob.lease_owner: None,
+            GenerationJob.lease_expires_at: None,
+            GenerationJob.finished_at: _now(),
+        })
+
+    def retry(self, job_id: int, worker_id: str, error: str, delay_seconds: float) -> bool:
+        return self._finish(job_id, worker_id, {
+            GenerationJob.status: JobStatus.QUEUED,
+            GenerationJob.last_error: error,
+            GenerationJob.available_at: _now() + timedelta(seconds=delay_seconds),
+            GenerationJob.lease_owner: None,
+            GenerationJob.lease_expires_at: None,
+        })
+
+    def fail(self, job_id: int, worker_id: str, error: str) -> bool:
+        return self._finish(job_id, worker_id, {
+            GenerationJob.status: JobStatus.FAILED,
+            GenerationJob.last_error: error,
+            GenerationJob.lease_owner: None,
+            GenerationJob.lease_expires_at: None,
+            GenerationJob.finished_at: _now(),
+        })
+
+    def reap_expired(self) -> List[Dict[str, Any]]:
+        """
+        리스 만료 작업 처리
+
+        Returns:
+            재큐잉/최종 실패 처리된 작업 목록 (status로 구분)
+        """
+        db = SessionLocal()
+        reaped = []
+        try:
+            now = _now()
+            expired = (
+                db.query(GenerationJob)
+                .filter(
+                    GenerationJob.status == JobStatus.RUNNING,
+                    GenerationJob.lease_expires_at < now,
+                )
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for job in expired:
+                message = f"워커 리스 만료 (worker={job.lease_owner})"
+                job.last_error = message
+                job.lease_owner = None
+                job.lease_expires_at = None
+                if job.attempts < job.max_attempts:
+                    job.status = JobStatus.QUEUED
+                    job.available_at = now
+                    logger.warning(f"♻️ [JobQueue] Re-queued orphaned job {job.id} ({job.attempts}/{job.max_attempts})")
+                else:
+                    job.status = JobStatus.FAILED
+                    job.finished_at = now
+                    logger.error(f"💀 [JobQueue] Orphaned job {job.id} failed (attempts exhausted)")
+                reaped.append(self._snapshot(job))
+            db.commit()
+            return reaped
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def find_active(self, screen_id: int, dedupe_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """화면의 대기/실행 중인 최신 작업 (dedupe_key 지정 시 키 일치 작업만)"""
+        db = SessionLocal()
+        try:
+            query = db.query(GenerationJob).filter(
+                GenerationJob.screen_id == screen_id,
+                GenerationJob.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]),
+            )
+            if dedupe_key is not None:
+                query = query.filter(GenerationJob.dedupe_key == dedupe_key)
+            job = query.order_by(GenerationJob.id.desc()).first()
+            return job.to_dict() if job else None
+        finally:
+            db.close()
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        db = SessionLocal()
+        try:
+            job = db.query(GenerationJob).filter(GenerationJob.id == job_id).first()
+            return job.to_dict() if job else None
+        finally:
+            db.close()
+
+
+# =============================================================================
+# 저장소: 메모리 (대체 구현)
+# =============================================================================
+class MemoryJobStore:
+    """프로세스 내부 저장소 (재시작 시 유실 - 개발/단일 프로세스용)"""
+
+    def __init__(self):
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def ensure_table(self):
+        pass
+
+    def enqueue(self, kind, payload, screen_id, priority, max_attempts, dedupe_key=None) -> Dict[str, Any]:
+        with self._lock:
+            now = _now()
+            job = {
+                "id": self._next_id,
+                "kind": kind,
+                "screen_id": screen_id,
+                "dedupe_key": dedupe_key,
+                "payload": payload,
+                "result": None,
+                "status": JobStatus.QUEUED.value,
+                "priority": priority,
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "last_error": None,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "available_at": now,
+                "heartbeat_at": None,
+                "created_at": now,
+                "started_at": None,
+                "finished_at": None,
+            }
+            self._jobs[job["id"]] = job
+            self._next_id += 1
+            return dict(job)
+
+    def claim(self, worker_id: str, lease_seconds: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            now = _now()
+            ready = [
+                j for j in self._jobs.values()
+                if j["status"] == JobStatus.QUEUED.value and j["available_at"] <= now
+            ]
+            if not ready:
+                return None
+            job = min(ready, key=lambda j: (j["priority"], j["id"]))
+            job.update({
+                "status": JobStatus.RUNNING.value,
+                "lease_owner": worker_id,
+                "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                "heartbeat_at": now,
+                "started_at": now,
+                "attempts": job["attempts"] + 1,
+            })
+            return dict(job)
+
+    def heartbeat(self, job_id: int, worker_id: str, lease_seconds: int) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["lease_owner"] != worker_id or job["status"] != JobStatus.RUNNING.value:
+                return False
+            now = _now()
+            job["heartbeat_at"] = now
+            job["lease_expires_at"] = now + timedelta(seconds=lease_seconds)
+            return True
+
+    def _finish(self, job_id: int, worker_id: str, values: Dict[str, Any]) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["lease_owner"] != worker_id:
+                return False
+            job.update(values)
+            return True
+
+    def complete(self, job_id, worker_id, result) -> bool:
+        return self._finish(job_id, worker_id, {
+            "status": JobStatus.SUCCEEDED.value, "result": result,
+            "lease_owner": None, "lease_expires_at": None, "finished_at": _now(),
+        })
+
+    def retry(self, job_id, worker_id, error, delay_seconds) -> bool:
+        return self._finish(job_id, worker_id, {
+            "status": JobStatus.QUEUED.value, "last_error": error,
+            "available_at": _now() + timedelta(seconds=delay_seconds),
+            "lease_owner": None, "lease_expires_at": None,
+        })
+
+    def fail(self, job_id, worker_id, error) -> bool:
+        return self._finish(job_id, worker_id, {
+            "status": JobStatus.FAILED.value, "last_error": error,
+            "lease_owner": None, "lease_expires_at": None, "finished_at": _now(),
+        })
+
+    def reap_expired(self) -> List[Dict[str, Any]]:
+        # 같은 프로세스 안에서만 실행되므로 만료될 리스가 없음
+        return []
+
+    def find_active(self, screen_id: int, dedupe_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            active = [
+                j for j in self._jobs.values()
+                if j["screen_id"] == screen_id
+                and j["status"] in (JobStatus.QUEUED.value, JobStatus.RUNNING.value)
+                and (dedupe_key is None or j["dedupe_key"] == dedupe_key)
+            ]
+        return self.get(max(active, key=lambda j: j["id"])["id"]) if active else None
+
+    def get(self, job_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job:
+                return None
+            return {
+                k: (v.isoformat() if isinstance(v, datetime) else v)
+                for k, v in job.items() if k != "payload"
+            }
+
+
+# =============================================================================
+# 작업 큐 + 워커 풀
+# =============================================================================
+class JobQueue:
+    """영속 작업 큐 + 워커 풀 + 리퍼"""
+
+    def __init__(self):
+        self.backend = os.getenv("JOB_QUEUE_BACKEND", "db").lower()
+        self.worker_count = int(os.getenv("JOB_WORKERS", "2"))
+        self.lease_seconds = int(os.getenv("JOB_LEASE_SECONDS", "60"))
+        self.heartbeat_seconds = int(os.getenv("JOB_HEARTBEAT_SECONDS", "15"))
+        self.default_max_attempts = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.retry_base_delay = float(os.getenv("JOB_RETRY_BASE_DELAY", "30"))
+        self.poll_interval = float(os.getenv("JOB_POLL_INTERVAL", "2"))
+
+        self.store = MemoryJobStore() if self.backend == "memory" else DbJobStore()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._orphan_handlers: Dict[str, OrphanHandler] = {}
+        self._requeue_handlers: Dict[str, OrphanHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+
+        logger.info(f"JobQueue initialized: backend={self.backend}, workers={self.worker_count}")
+
+    # =========================================================================
+    # 등록 & 등록 조회
+    # =========================================================================
+
+    def register(
+        self,
+        kind: str,
+        handler: JobHandler,
+        on_orphan_failed: Optional[OrphanHandler] = None,
+        on_orphan_requeued: Optional[OrphanHandler] = None
+    ):
+        """
+        작업 종류별 핸들러 등록
+
+        Args:
+            kind: 작업 종류
+            handler: async (payload, ctx) -> result dict
+            on_orphan_failed: 리퍼가 작업을 최종 실패 처리했을 때 호출 (화면 상태 정리 등)
+            on_orphan_requeued: 리퍼가 작업을 재큐잉(재개 대기)했을 때 호출 (화면 상태 갱신 등)
+        """
+        self._handlers[kind] = handler
+        if on_orphan_failed:
+            self._orphan_handlers[kind] = on_orphan_failed
+        if on_orphan_requeued:
+            self._requeue_handlers[kind] = on_orphan_requeued
+
+    async def _call(self, fn: Callable, *args):
+        """저장소 호출 (DB 저장소는 이벤트 루프를 막지 않도록 스레드에서 실행)"""
+        if isinstance(self.store, DbJobStore):
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    # =========================================================================
+    # 공개 API
+    # =========================================================================
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        screen_id: Optional[int] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        dedupe_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """작업 등록 후 작업 스냅샷 반환 (dedupe_key: 동일 요청 병합 키)"""
+        job = await self._call(
+            self.store.enqueue, kind, payload, screen_id, priority,
+            max_attempts or self.default_max_attempts, dedupe_key
+        )
+        logger.info(f"📥 [JobQueue] Enqueued job {job['id']} ({kind}, screen={screen_id})")
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    async def get_job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회"""
+        return await self._call(self.store.get, job_id)
+
+    async def find_active_job(self, screen_id: int, dedupe_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """화면의 대기/실행 중인 작업 (dedupe_key 지정 시 같은 입력의 작업만)"""
+        return await self._call(self.store.find_active, screen_id, dedupe_key)
+
+    # =========================================================================
+    # 수명 주기
+    # =========================================================================
+
+    async def start(self):
+        """리퍼 실행 후 워커 풀 시작"""
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        await self._call(self.store.ensure_table)
+        await self.reap()
+
+        self._tasks.append(asyncio.create_task(self._reaper_loop()))
+        for idx in range(self.worker_count):
+            self._tasks.append(asyncio.create_task(self._worker_loop(idx)))
+        logger.info(f"✅ [JobQueue] Started {self.worker_count} worker(s) as {self.worker_id}")
+
+    async def stop(self):
+        """워커 풀 종료 (실행 중 작업은 리스 만료 후 다른 워커가 재개)"""
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._tasks = []
+
+    async def reap(self):
+        """리스가 만료된 고아 작업 재큐잉/실패 처리"""
+        try:
+            reaped_jobs = await self._call(self.store.reap_expired)
+        except Exception as e:
+            logger.error(f"❌ [JobQueue] Reaper failed: {e}")
+            return
+
+        for job in reaped_jobs:
+            failed = job["status"] == JobStatus.FAILED.value
+            handler = (self._orphan_handlers if failed else self._requeue_handlers).get(job["kind"])
+            if handler:
+                try:
+                    await handler(job, job.get("last_error") or "작업 중단")
+                except Exception as e:
+                    logger.error(f"❌ [JobQueue] Orphan handler failed for job {job['id']}: {e}")
+
+    async def _reaper_loop(self):
+        while not self._stopping:
+            await asyncio.sleep(self.lease_seconds)
+            await self.reap()
+
+    # =========================================================================
+    # 워커
+    # =========================================================================
+
+    async def _worker_loop(self, idx: int):
+        while not self._stopping:
+            try:
+                job = await self._call(self.store.claim, self.worker_id, self.lease_seconds)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ [JobQueue] Worker {idx} claim failed: {e}")
+                job = None
+
+            if not job:
+                # 로컬 enqueue 시 즉시 깨어나고, 아니면 poll_interval마다 확인
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._execute(job)
+
+    async def _heartbeat_loop(self, ctx: JobContext, handler_task: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                alive = await self._call(self.store.heartbeat, ctx.job_id, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"⚠️ [JobQueue] Heartbeat failed for job {ctx.job_id}: {e}")
+                continue
+            if not alive:
+                # 리퍼가 재큐잉/실패 처리함 - 핸들러를 멈추고 결과를 기록하지 않음
+                logger.warning(f"⚠️ [JobQueue] Lost lease on job {ctx.job_id} - 핸들러 취소")
+                ctx.lease_lost = True
+                handler_task.cancel()
+                return
+
+    async def _execute(self, job: Dict[str, Any]):
+        ctx = JobContext(job)
+        handler = self._handlers.get(ctx.kind)
+        if handler is None:
+            await self._call(self.store.fail, ctx.job_id, self.worker_id, f"Unknown job kind: {ctx.kind}")
+            return
+
+        logger.info(f"▶️ [JobQueue] Running job {ctx.job_id} ({ctx.kind}) attempt {ctx.attempt}/{ctx.max_attempts}")
+        handler_task = asyncio.create_task(handler(job.get("payload") or {}, ctx))
+        heartbeat = asyncio.create_task(self._heartbeat_loop(ctx, handler_task))
+        try:
+            result = await handler_task
+            if ctx.lease_lost:
+                logger.warning(f"⚠️ [JobQueue] Job {ctx.job_id} finished after losing its lease - result discarded")
+                return
+            await self._call(self.store.complete, ctx.job_id, self.worker_id, result)
+            logger.info(f"✅ [JobQueue] Job {ctx.job_id} succeeded")
+
+        except JobError as e:
+            if ctx.lease_lost:
+                logger.warning(f"⚠️ [JobQueue] Job {ctx.job_id} failed after losing its lease - not recorded: {e.message}")
+            elif e.retryable and not ctx.is_final_attempt:
+                delay = self.retry_base_delay * (2 ** (ctx.attempt - 1))
+                await self._call(self.store.retry, ctx.job_id, self.worker_id, e.message, delay)
+                logger.warning(f"🔁 [JobQueue] Job {ctx.job_id} retry in {delay:.0f}s: {e.message}")
+            else:
+                await self._call(self.store.fail, ctx.job_id, self.worker_id, e.message)
+                logger.error(f"❌ [JobQueue] Job {ctx.job_id} failed: {e.message}")
+
+        except asyncio.CancelledError:
+            if ctx.lease_lost and not self._stopping:
+                # 리스 상실로 취소한 핸들러 - 작업은 리퍼가 넘긴 상태 그대로 둠
+                logger.warning(f"🛑 [JobQueue] Job {ctx.job_id} cancelled (lease lost)")
+                return
+            # 종료 중: 리스를 그대로 두어 만료 후 리퍼가 재개하도록 함
+            handler_task.cancel()
+            raise
+
+        except Exception as e:
+            if ctx.lease_lost:
+                logger.warning(f"⚠️ [JobQueue] Job {ctx.job_id} crashed after losing its lease - not recorded: {e}")
+                return
+            await self._call(self.store.fail, ctx.job_id, self.worker_id, str(e)[:500])
+            logger.error(f"❌ [JobQueue] Job {ctx.job_id} crashed: {type(e).__name__}: {e}")
+
+        finally:
+            heartbeat.cancel()
+
+
+# 싱글톤 인스턴스
+_job_queue_instance: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """JobQueue 싱글톤 인스턴스 반환"""
+    global _job_queue_instance
+    if _job_queue_instance is None:
+        _job_queue_instance = JobQueue()
+    return _job_queue_instance
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Modal Fan-out - 모달을 독립 컴포넌트로 병렬 생성
+
+모달이 많은 화면은 4단계 대화 안에서 모달을 모두 순서대로 작성하느라 Stage 4가 길어지고
+MAX_TOKENS로 끊기기 쉽습니다. 모달 병렬 생성 모드에서는
+- 메인 화면(4단계)은 모달 상태/열기 핸들러까지만 작성하고 모달 JSX는 쓰지 않음 (Step 4 프롬프트 변경)
+- 각 모달(isModal{N}Open)은 자신의 명세(제목/유형/필드)만으로 `ForgeModal{N}` 컴포넌트를 따로 생성
+  (메인 화면 코드에 의존하지 않으므로 메인 생성과 동시에 시작)
+- utils/modal_splicer.py가 결과를 메인 컴포넌트에 합침
+생성/검사에 실패한 모달은 명세로 만든 기본 모달 컴포넌트로 대신합니다.
+
+환경 변수:
+- PROTOTYPE_MODAL_FANOUT: 모달 병렬 생성 사용 여부 (기본값: true)
+- PROTOTYPE_MODAL_FANOUT_MIN: 병렬 생성을 적용할 최소 모달 수 (기본값: 2)
+- PROTOTYPE_MODAL_CONCURRENCY: 동시에 생성할 모달 수 (기본값: 4)
+"""
+import os
+import json
+import asyncio
+import logging
+import time
+from typing import Dict, Any, List, Optional
+
+from services.gemini_client import GeminiClient, get_gemini_client
+from services.model_router import model_operation
+from utils.prompt_templates import get_modal_component_prompt
+from utils.modal_splicer import modal_component_name, normalize_modal_component
+
+logger = logging.getLogger(__name__)
+
+# 모달 크기 → Tailwind 폭 (prototype_assembler와 동일)
+MODAL_WIDTH_CLASSES = {
+    "sm": "w-full max-w-md",
+    "md": "w-full max-w-2xl",
+    "lg": "w-full max-w-4xl",
+    "xl": "w-full max-w-6xl",
+    "full": "w-[95vw] h-[90vh]",
+}
+
+
+def modal_interactions(wizard_data: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """open-modal 인터랙션 목록 (순서 = isModal{N}Open 인덱스)"""
+    interactions = ((wizard_data or {}).get("step4") or {}).get("interactions") or []
+    return [i for i in interactions if i.get("actionType") == "open-modal"]
+
+
+def fallback_modal_component(index: int, interaction: Dict[str, Any]) -> str:
+    """모달 명세로 만든 기본 ForgeModal{N} (생성 실패 시 사용)"""
+    config = interaction.get("modalConfig") or {}
+    title = config.get("title") or f"모달{index}"
+    width = MODAL_WIDTH_CLASSES.get(config.get("size") or "md", MODAL_WIDTH_CLASSES["md"])
+    fields = [
+        {"label": f.get("label") or f"항목{n + 1}", "required": bool(f.get("required")), "options": f.get("options") or []}
+        for n, f in enumerate(config.get("fields") or [])
+    ]
+    content = config.get("content") or interaction.get("description") or title
+    name = modal_component_name(index)
+    return f"""function {name}({{ onClose, selectedRow }}) {{
+  const fields = {json.dumps(fields, ensure_ascii=False)};
+  const [values, setValues] = useState({{}});
+  const handleSave = () => {{
+    const missing = fields.filter((f) => f.required && !values[f.label]);
+    if (missing.length > 0) {{
+      alert(missing[0].label + '을(를) 입력해주세요.');
+      return;
+    }}
+    alert('저장되었습니다.');
+    onClose();
+  }};
+  return (
+    <div className="fixed inset-0 z-50 flex items-center justify-center">
+      <div className="fixed inset-0 bg-black/50" onClick={{onClose}} />
+      <div className="relative bg-white rounded-lg shadow-xl {width}">
+        <div className="flex items-center justify-between border-b px-6 py-4">
+          <h3 className="text-lg font-semibold text-gray-900">{{{json.dumps(title, ensure_ascii=False)}}}</h3>
+          <button type="button" onClick={{onClose}} className="text-gray-400 hover:text-gray-600">✕</button>
+        </div>
+        <div className="p-6">
+          {{fields.length > 0 ? (
+            <div className="grid grid-cols-2 gap-4">
+              {{fields.map((f) => (
+                <div key={{f.label}} className="flex flex-col space-y-1.5">
+                  <label className="text-sm font-medium text-gray-700">
+                    {{f.label}}{{f.required && <span className="text-red-500 ml-1">*</span>}}
+                  </label>
+                  {{f.options.length > 0 ? (
+                    <select value={{values[f.label] || ''}} onChange={{(e) => setValues({{ ...values, [f.label]: e.target.value }})}} className="h-10 rounded-md border border-gray-300 px-3 text-sm">
+                      <option value="">선택</option>
+                      {{f.options.map((o) => <option key={{o}} value={{o}}>{{o}}</option>)}}
+                    </select>
+                  ) : (
+                    <input value={{values[f.label] || ''}} onChange={{(e) => setValues({{ ...values, [f.label]: e.target.value }})}} className="h-10 rounded-md border border-gray-300 px-3 text-sm" />
+                  )}}
+                </div>
+              ))}}
+            </div>
+          ) : (
+            <p className="text-sm text-gray-600 whitespace-pre-line">{{{json.dumps(content, ensure_ascii=False)}}}</p>
+          )}}
+        </div>
+        <div className="flex justify-end gap-2 border-t px-6 py-4">
+          <button type="button" onClick={{onClose}} className="h-10 px-4 rounded-md border border-gray-300 text-sm">취소</button>
+          <button type="button" onClick={{fields.length > 0 ? handleSave : onClose}} className="h-10 px-4 rounded-md bg-blue-600 text-white text-sm">{{fields.length > 0 ? '저장' : '확인'}}</button>
+        </div>
+      </div>
+    </div>
+  );
+}}"""
+
+
+class ModalFanout:
+    """모달 병렬 생성기"""
+
+    def __init__(self, client: GeminiClient, enabled: bool, min_modals: int, concurrency: int):
+        self.client = client
+        self.enabled = enabled
+        self.min_modals = max(1, min_modals)
+        self.concurrency = max(1, concurrency)
+        self.stats = {"screens": 0, "generated": 0, "fallback": 0, "inline_reruns": 0}
+
+    def applies_to(self, modals: List[Dict[str, Any]]) -> bool:
+        """이 화면에 병렬 생성을 적용할지 (모달 수 기준)"""
+        return self.enabled and len(modals) >= self.min_modals
+
+    async def _generate_one(
+        self,
+        semaphore: asyncio.Semaphore,
+        index: int,
+        interaction: Dict[str, Any],
+        screen_name: str
+    ) -> str:
+        async with semaphore:
+            try:
+                with model_operation("modal"):
+                    response = await self.client.generate_content_async(
+                        prompt=get_modal_component_prompt(interaction, index, screen_name),
+                        temperature=0.2,
+                        max_output_tokens=4096
+                    )
+                code = normalize_modal_component(self.client._extract_code_from_response(response), index)
+                self.stats["generated"] += 1
+                return code
+            except Exception as e:
+                # 모달 하나의 실패로 화면 생성 전체가 실패하지 않도록 (GeminiClientError, ModalSpliceError 등)
+                self.stats["fallback"] += 1
+                logger.warning(f"⚠️ Modal {index} generation failed - 기본 모달 사용: {type(e).__name__}: {e}")
+                return fallback_modal_component(index, interaction)
+
+    async def generate(self, modals: List[Dict[str, Any]], screen_name: str) -> Dict[int, str]:
+        """
+        모달별 ForgeModal{N} 컴포넌트 동시 생성
+
+        Returns:
+            {모달 인덱스: 컴포넌트 코드} (실패한 모달은 기본 모달 컴포넌트)
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        codes = await asyncio.gather(*(
+            self._generate_one(semaphore, index, interaction, screen_name)
+            for index, interaction in enumerate(modals)
+        ))
+        self.stats["screens"] += 1
+        logger.info(
+            f"🪟 Modal fan-out: {len(modals)} modals in {time.perf_counter() - started:.1f}s "
+            f"(concurrency {self.concurrency})"
+        )
+        return dict(enumerate(codes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"enabled": self.enabled, "min_modals": self.min_modals, "concurrency": self.concurrency, **self.stats}
+
+
+# 싱글톤 인스턴스
+_fanout_instance: Optional[ModalFanout] = None
+
+
+def get_modal_fanout() -> ModalFanout:
+    """ModalFanout 싱글톤 인스턴스 반환"""
+    global _fanout_instance
+    if _fanout_instance is None:
+        _fanout_instance = ModalFanout(
+            client=get_gemini_client(),
+            enabled=os.getenv("PROTOTYPE_MODAL_FANOUT", "true").lower() in ("1", "true", "yes"),
+            min_modals=int(os.getenv("PROTOTYPE_MODAL_FANOUT_MIN", "2")),
+            concurrency=int(os.getenv("PROTOTYPE_MODAL_CONCURRENCY", "4"))
+        )
+    return _fanout_instance
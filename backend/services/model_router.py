@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Model Router - 작업별 모델/생성 설정 라우팅 + 보조 모델 장애 조치
+
+GEMINI_MODEL 하나로 4단계 생성, 연속 생성, 문서 JSON 추출을 모두 처리하면
+구조를 잡는 단계와 스타일링/JSON 추출 같은 가벼운 작업이 같은 모델의 할당량을 나눠 씁니다.
+라우팅 테이블로 작업마다 모델과 생성 설정을 지정하면 가벼운 작업은 빠르고 저렴한 모델로 보내
+할당량당 처리량을 높일 수 있습니다.
+
+[작업 이름]
+stage-1 ~ stage-4, continuation, modal, design-spec, test-plan, user-manual, default
+- 호출자는 model_operation("stage-2") 블록 안에서 GeminiClient를 호출
+- 블록이 중첩되면 라우트가 있는 가장 안쪽 작업을 사용
+  (예: Stage 2 안의 연속 생성은 continuation 라우트가 없으면 stage-2 라우트를 따름)
+- 어느 작업에도 라우트가 없으면 default 라우트, 그것도 없으면 GEMINI_MODEL
+
+[라우트 형식]
+{"model": "gemini-2.5-flash-lite", "fallback": ["gemini-2.5-flash"],
+ "temperature": 0.1, "max_output_tokens": 8192, "top_p": 0.95, "top_k": 40}
+- model 생략 시 GEMINI_MODEL, 생성 설정은 지정한 키만 호출자 값을 덮어씀
+- fallback 생략 시 GEMINI_FALLBACK_MODEL
+
+[설정 위치]
+1. GEMINI_MODEL_ROUTES (JSON, {작업 이름: 라우트})
+2. model_routes 테이블 (enabled 행이 환경 변수 라우트를 덮어씀, GEMINI_MODEL_ROUTES_REFRESH초마다 다시 읽음)
+
+[장애 조치]
+기본 모델이 429(할당량 초과) 또는 5xx를 반환하면 같은 요청을 보조 모델로 보냅니다 (GeminiClient).
+모든 모델이 실패하면 마지막 오류를 그대로 올려 기존 할당량 재시도(run_with_quota_retry)가 처리합니다.
+
+환경 변수:
+- GEMINI_MODEL_ROUTES: 작업별 라우트 (JSON, 기본값: 없음)
+- GEMINI_FALLBACK_MODEL: 라우트에 fallback이 없을 때 사용할 보조 모델 (기본값: 없음)
+- GEMINI_MODEL_ROUTES_DB: model_routes 테이블 사용 여부 (기본값: true)
+- GEMINI_MODEL_ROUTES_REFRESH: model_routes 테이블 재조회 간격(초) (기본값: 60)
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS = (
+    "stage-1", "stage-2", "stage-3", "stage-4", "continuation", "modal",
+    "design-spec", "test-plan", "user-manual",
+)
+DEFAULT_OPERATION = "default"
+
+# 라우트에서 덮어쓸 수 있는 생성 설정 키
+GENERATION_CONFIG_KEYS = ("temperature", "max_output_tokens", "top_p", "top_k")
+
+# 현재 작업 이름 스택 (바깥 → 안쪽)
+_operation_var: ContextVar[Tuple[str, ...]] = ContextVar("gemini_model_operation", default=())
+
+
+@contextmanager
+def model_operation(operation: str):
+    """
+    블록 안의 모든 Gemini 호출에 작업 이름 지정 (라우팅 기준)
+
+    Usage:
+        with model_operation("design-spec"):
+            await client.generate_content_async(...)
+    """
+    token = _operation_var.set(_operation_var.get() + (operation.lower(),))
+    try:
+        yield
+    finally:
+        _operation_var.reset(token)
+
+
+def current_operations() -> Tuple[str, ...]:
+    """현재 작업 이름 스택 (바깥 → 안쪽)"""
+    return _operation_var.get()
+
+
+class ModelRoute:
+    """작업 하나의 모델 + 보조 모델 + 생성 설정"""
+
+    def __init__(
+        self,
+        operation: str,
+        model: Optional[str] = None,
+        fallback_models: Optional[List[str]] = None,
+        generation_config: Optional[Dict[str, Any]] = None,
+        source: str = "default"
+    ):
+        self.operation = operation
+        self.model = model or None
+        self.fallback_models = [m for m in fallback_models or [] if m]
+        self.generation_config = {
+            key: value for key, value in (generation_config or {}).items()
+            if key in GENERATION_CONFIG_KEYS and value is not None
+        }
+        self.source = source
+
+    @classmethod
+    def from_config(cls, operation: str, config: Dict[str, Any], source: str) -> 'ModelRoute':
+        """{"model", "fallback", "temperature", ...} 형식 → ModelRoute (fallback은 문자열 또는 목록)"""
+        fallback = config.get("fallback") or []
+        if isinstance(fallback, str):
+            fallback = [fallback]
+        return cls(operation, config.get("model"), list(fallback), config, source)
+
+    def models(self, default_model: str) -> List[str]:
+        """호출 순서대로 모델 목록 (기본 → 보조, 중복 제거)"""
+        ordered: List[str] = []
+        for model in [self.model or default_model] + self.fallback_models:
+            if model not in ordered:
+                ordered.append(model)
+        return ordered
+
+    def apply(self, temperature: float, max_output_tokens: int, top_p: float, top_k: int) -> Tuple[float, int, float, int]:
+        """호출자 생성 설정에 라우트 설정을 덮어쓴 값"""
+        config = self.generation_config
+        return (
+            float(config.get("temperature", temperature)),
+            int(config.get("max_output_tokens", max_output_tokens)),
+            float(config.get("top_p", top_p)),
+            int(config.get("top_k", top_k)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "operation": self.operation,
+            "model": self.model,
+            "fallback": self.fallback_models,
+            "generation_config": self.generation_config,
+            "source": self.source,
+        }
+
+
+class ModelRouter:
+    """작업 이름 → ModelRoute (환경 변수 + model_routes 테이블)"""
+
+    def __init__(
+        self,
+        env_routes: Dict[str, Any],
+        fallback_model: Optional[str] = None,
+        use_db: bool = True,
+        refresh_seconds: float = 60.0
+    ):
+        self.fallback_model = fallback_model or None
+        self.use_db = use_db
+        self.refresh_seconds = refresh_seconds
+        self._env_routes = {
+            operation.lower(): ModelRoute.from_config(operation.lower(), config, "env")
+            for operation, config in env_routes.items()
+            if isinstance(config, dict)
+        }
+        self._routes: Dict[str, ModelRoute] = dict(self._env_routes)
+        self._loaded_at = 0.0
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self._db_error_logged = False
+        self.stats = {"failovers": 0, "failovers_by_operation": {}}
+
+        unknown = sorted(set(self._env_routes) - set(OPERATIONS) - {DEFAULT_OPERATION})
+        if unknown:
+            logger.warning(f"⚠️ GEMINI_MODEL_ROUTES: 알 수 없는 작업 이름 {unknown}")
+
+    # =========================================================================
+    # 라우트 조회
+    # =========================================================================
+
+    def route(self, operations: Optional[Tuple[str, ...]] = None) -> ModelRoute:
+        """
+        작업 이름 스택 → 라우트 (라우트가 있는 가장 안쪽 작업, 없으면 default)
+
+        operations 생략 시 현재 model_operation() 블록 기준
+        """
+        if operations is None:
+            operations = current_operations()
+        route = next(
+            (self._routes[op] for op in reversed(operations) if op in self._routes),
+            self._routes.get(DEFAULT_OPERATION)
+        )
+        operation = operations[-1] if operations else DEFAULT_OPERATION
+        if route is None:
+            route = ModelRoute(operation)
+        if not route.fallback_models and self.fallback_model:
+            route = ModelRoute(
+                route.operation, route.model, [self.fallback_model], route.generation_config, route.source
+            )
+        return route
+
+    def record_failover(self, operation: str, from_model: str, to_model: str, reason: str):
+        """보조 모델 전환 기록"""
+        self.stats["failovers"] += 1
+        by_operation = self.stats["failovers_by_operation"]
+        by_operation[operation] = by_operation.get(operation, 0) + 1
+        logger.warning(f"🔀 {operation}: {from_model} {reason} → {to_model}로 재시도")
+
+    # =========================================================================
+    # model_routes 테이블
+    # =========================================================================
+
+    def _load_db_routes(self) -> Optional[Dict[str, ModelRoute]]:
+        """model_routes 테이블의 enabled 라우트 (조회 실패 시 None)"""
+        from sqlalchemy.exc import SQLAlchemyError
+        from models.database import SessionLocal
+        from models.model_route import ModelRouteConfig
+
+        db = SessionLocal()
+        try:
+            rows = db.query(ModelRouteConfig).filter(ModelRouteConfig.enabled.is_(True)).all()
+            return {
+                row.operation.lower(): ModelRoute(
+                    row.operation.lower(), row.model, row.fallback_models, row.generation_config, "db"
+                )
+                for row in rows
+            }
+        except SQLAlchemyError as e:
+            # 마이그레이션 전(테이블 없음) 등 - 환경 변수 라우트로 계속 동작
+            if not self._db_error_logged:
+                logger.warning(f"⚠️ model_routes 조회 실패 - 환경 변수 라우트만 사용: {type(e).__name__}")
+                self._db_error_logged = True
+            return None
+        finally:
+            db.close()
+
+    def reload(self):
+        """환경 변수 라우트 + model_routes 테이블 라우트로 라우팅 테이블 재구성 (동기)"""
+        db_routes = self._load_db_routes() if self.use_db else None
+        self._loaded_at = time.monotonic()
+        if db_routes is None:
+            return
+        routes = dict(self._env_routes)
+        routes.update(db_routes)
+        if routes.keys() != self._routes.keys() or any(
+            routes[op].to_dict() != self._routes[op].to_dict() for op in routes
+        ):
+            logger.info(f"🧭 Model routes reloaded: {sorted(routes)} (db {len(db_routes)}건)")
+        self._routes = routes
+
+    async def refresh_if_stale(self):
+        """재조회 간격이 지났으면 model_routes 테이블을 스레드에서 다시 읽음"""
+        if not self.use_db or time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        async with self._refresh_lock:
+            if time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+            await asyncio.to_thread(self.reload)
+
+    def describe(self) -> Dict[str, Any]:
+        """현재 라우팅 테이블 + 장애 조치 통계"""
+        return {
+            "routes": {op: route.to_dict() for op, route in sorted(self._routes.items())},
+            "fallback_model": self.fallback_model,
+            **self.stats,
+        }
+
+
+# 싱글톤 인스턴스
+_router_instance: Optional[ModelRouter] = None
+
+
+def _parse_env_routes() -> Dict[str, Any]:
+    raw = os.getenv("GEMINI_MODEL_ROUTES", "").strip()
+    if not raw:
+        return {}
+    try:
+        routes = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.warning(f"⚠️ GEMINI_MODEL_ROUTES 파싱 실패 - 무시: {e}")
+        return {}
+    return routes if isinstance(routes, dict) else {}
+
+
+def get_model_router() -> ModelRouter:
+    """ModelRouter 싱글톤 인스턴스 반환"""
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = ModelRouter(
+            env_routes=_parse_env_routes(),
+            fallback_model=os.getenv("GEMINI_FALLBACK_MODEL", "").strip() or None,
+            use_db=os.getenv("GEMINI_MODEL_ROUTES_DB", "true").lower() in ("1", "true", "yes"),
+            refresh_seconds=float(os.getenv("GEMINI_MODEL_ROUTES_REFRESH", "60"))
+        )
+    return _router_instance
@@ -0,0 +1,826 @@
+# -*- coding: utf-8 -*-
+"""
+Prototype Assembler - 리소스 템플릿 기반 프로토타입 즉시 조립 (LLM 미사용)
+
+Wizard 데이터(레이아웃 영역 / 배치된 컴포넌트 / 인터랙션)와 리소스 테이블의 템플릿
+(Layout.html_template, Component.jsx_template, Action.code_template)으로
+미리보기에서 바로 실행되는 React 컴포넌트를 조립합니다.
+
+[용도]
+- 즉시 초안: LLM 생성(수 분)을 기다리지 않고 밀리초 단위로 미리보기 제공
+- Stage 1 시드: 4단계 생성의 Stage 1을 대신해 모델은 초안을 다듬기만 함
+
+[템플릿 치환]
+- Layout.html_template: <body> 내부를 JSX로 변환, `<!-- {영역 ID} ... -->` 주석 위치에 영역 컴포넌트 삽입
+  ({{title}}, {{description}} 치환, 템플릿에 없는 영역은 본문 끝에 추가)
+- Component.jsx_template: {{label}}, {{field}}, {{value}}, {{onChange}}, {{events}} 치환
+  (비어 있으면 타입별 기본 JSX 사용)
+- Action.code_template: 액션 ID가 actionType과 같으면 핸들러 본문으로 사용
+  ({{modalIndex}}, {{description}} 치환, 비어 있으면 타입별 기본 동작)
+
+출력은 SYSTEM_PROMPT 규칙(단일 export default 컴포넌트, import 없음, 타입 어노테이션 없음,
+isModal{N}Open 상태명, 스크린샷 캡처 PostMessage 리스너, 샘플 데이터 5건 이상)을 따릅니다.
+"""
+import re
+import json
+import time
+import logging
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models.resource import Layout, Component, Action
+
+logger = logging.getLogger(__name__)
+
+# 샘플 데이터 건수
+SAMPLE_ROW_COUNT = 6
+
+# 그리드 컬럼으로 쓸 입력 컴포넌트가 없을 때의 기본 컬럼 (라벨, 타입)
+DEFAULT_GRID_COLUMNS = [("코드", "codeview"), ("명칭", "textbox"), ("상태", "combo"), ("수량", "number-input"), ("등록일", "date-picker")]
+
+# 값(values 상태)을 가지는 입력 컴포넌트
+INPUT_TYPES = {
+    "textbox", "codeview", "combo", "checkbox", "radio",
+    "date-picker", "time-picker", "number-input", "textarea", "file-upload",
+}
+
+# 조회 시 문자열 포함 여부로 필터링하는 입력 컴포넌트
+FILTER_TYPES = {"textbox", "codeview", "combo", "date-picker", "time-picker", "number-input"}
+
+# 콤보/라디오 기본 옵션
+DEFAULT_OPTIONS = ["대기", "진행", "완료"]
+
+# 트리거 이벤트 → JSX 속성 (change/select/submit/row-click/cell-click은 별도 처리)
+EVENT_PROPS = {
+    "click": "onClick",
+    "double-click": "onDoubleClick",
+    "hover": "onMouseEnter",
+}
+
+# 모달 크기 → 컨테이너 클래스
+MODAL_SIZE_CLASSES = {
+    "sm": "w-full max-w-md",
+    "md": "w-full max-w-2xl",
+    "lg": "w-full max-w-4xl",
+    "xl": "w-full max-w-6xl",
+    "full": "w-[95vw] h-[90vh]",
+}
+
+# HTML 주석 / 태그 변환용
+_COMMENT_RE = re.compile(r"<!--\s*(.*?)\s*-->", re.S)
+_BODY_RE = re.compile(r"<body([^>]*)>(.*)</body>", re.S | re.I)
+_CLASS_ATTR_RE = re.compile(r'\sclass="([^"]*)"')
+_DROP_ATTR_RE = re.compile(r'\s(?:x-[\w.:-]+|@[\w.:-]+|:[\w.-]+|style)(?:="[^"]*")?')
+_VOID_TAG_RE = re.compile(r"<(input|img|br|hr)(\s[^<>]*?)?\s*(?<!/)>", re.I)
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+# =============================================================================
+# 문자열 유틸
+# =============================================================================
+
+def _js(value: Any) -> str:
+    """JS 리터럴"""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _jsx_text(text: str) -> str:
+    """JSX 텍스트 노드 (중괄호/꺾쇠가 있으면 문자열 식으로 감쌈)"""
+    if re.search(r"[{}<>]", text):
+        return "{" + _js(text) + "}"
+    return text
+
+
+def _jsx_attr(text: str) -> str:
+    """JSX 문자열 속성값"""
+    if '"' in text or "\\" in text:
+        return "{" + _js(text) + "}"
+    return f'"{text}"'
+
+
+def _fill(template: str, values: Dict[str, str]) -> str:
+    """{{name}} 치환 (없는 이름은 빈 문자열)"""
+    return _PLACEHOLDER_RE.sub(lambda m: values.get(m.group(1), ""), template)
+
+
+def _indent(code: str, spaces: int) -> str:
+    pad = " " * spaces
+    return "\n".join(pad + line if line.strip() else line for line in code.splitlines())
+
+
+def component_name_for(screen_name: str) -> str:
+    """화면명 → 컴포넌트명 (PascalCase, 한글 허용)"""
+    words = [w for w in re.split(r"[^0-9A-Za-z가-힣]+", screen_name or "") if w]
+    name = "".join(w[:1].upper() + w[1:] for w in words)
+    if not name or not name.isidentifier():
+        name = f"Screen{name}" if name and f"Screen{name}".isidentifier() else "GeneratedScreen"
+    return name
+
+
+# =============================================================================
+# 리소스 템플릿
+# =============================================================================
+
+class TemplateResources:
+    """활성화된 Layout/Component/Action 템플릿 (ID → 템플릿 문자열)"""
+
+    def __init__(
+        self,
+        layouts: Optional[Dict[str, str]] = None,
+        components: Optional[Dict[str, str]] = None,
+        actions: Optional[Dict[str, str]] = None
+    ):
+        self.layouts = layouts or {}
+        self.components = components or {}
+        self.actions = actions or {}
+
+    @classmethod
+    def from_db(cls, db: Session) -> "TemplateResources":
+        """리소스 테이블에서 템플릿이 있는 활성 항목만 로드"""
+        layouts = db.query(Layout.id, Layout.html_template).filter(Layout.is_active == True).all()
+        components = db.query(Component.id, Component.jsx_template).filter(Component.is_active == True).all()
+        actions = db.query(Action.id, Action.code_template).filter(Action.is_active == True).all()
+        return cls(
+            layouts={row.id: row.html_template for row in layouts if row.html_template},
+            components={row.id: row.jsx_template for row in components if row.jsx_template},
+            actions={row.id: row.code_template for row in actions if row.code_template},
+        )
+
+
+# =============================================================================
+# 조립기
+# =============================================================================
+
+class PrototypeAssembler:
+    """
+    Wizard 데이터 → React 컴포넌트 코드
+
+    assemble()은 호출마다 독립적인 상태로 조립하며 같은 입력이면 항상 같은 코드를 반환합니다.
+    """
+
+    def __init__(self, resources: Optional[TemplateResources] = None):
+        self.resources = resources or TemplateResources()
+
+    def assemble(self, wizard_data: Dict[str, Any], menu_name: str, screen_name: str) -> Dict[str, Any]:
+        """
+        프로토타입 조립
+
+        Returns:
+            {"code", "component_name", "layout", "layout_template": bool,
+             "component_templates": int, "action_templates": int, "modals": int, "elapsed_ms": int}
+        """
+        started = time.perf_counter()
+        step1 = wizard_data.get("step1") or {}
+        step2 = wizard_data.get("step2") or {}
+        components = (wizard_data.get("step3") or {}).get("components") or []
+        interactions = (wizard_data.get("step4") or {}).get("interactions") or []
+
+        build = _Build(
+            resources=self.resources,
+            title=step1.get("screenName") or screen_name,
+            description=step1.get("description") or "",
+            layout_id=step2.get("selectedLayout") or "search-grid",
+            areas=step2.get("layoutAreas") or [],
+            components=components,
+            interactions=interactions,
+        )
+        component_name = component_name_for(step1.get("screenName") or screen_name)
+        code = build.render(component_name)
+
+        result = {
+            "code": code,
+            "component_name": component_name,
+            "layout": build.layout_id,
+            "layout_template": build.used_layout_template,
+            "component_templates": build.used_component_templates,
+            "action_templates": build.used_action_templates,
+            "modals": len(build.modals),
+            "elapsed_ms": int((time.perf_counter() - started) * 1000),
+        }
+        logger.info(
+            f"🧩 Prototype assembled: {menu_name}/{screen_name} "
+            f"(layout={build.layout_id}, components={len(components)}, interactions={len(interactions)}, "
+            f"{len(code)} chars, {result['elapsed_ms']}ms)"
+        )
+        return result
+
+
+class _Build:
+    """조립 1회분 상태 (필드 키, 이벤트 바인딩, 모달 목록, 템플릿 사용 현황)"""
+
+    def __init__(
+        self,
+        resources: TemplateResources,
+        title: str,
+        description: str,
+        layout_id: str,
+        areas: List[Dict[str, Any]],
+        components: List[Dict[str, Any]],
+        interactions: List[Dict[str, Any]]
+    ):
+        self.resources = resources
+        self.title = title
+        self.description = description
+        self.layout_id = layout_id
+        self.areas = [a for a in areas if a.get("id")]
+        self.components = components
+        self.interactions = interactions
+
+        self.used_layout_template = False
+        self.used_component_templates = 0
+        self.used_action_templates = 0
+
+        # 입력 컴포넌트 → values 키 (field0, field1, ...)
+        self.fields: Dict[str, str] = {}
+        self.field_components: List[Dict[str, Any]] = []
+        for comp in components:
+            if comp.get("type") in INPUT_TYPES:
+                self.fields[comp.get("id")] = f"field{len(self.field_components)}"
+                self.field_components.append(comp)
+
+        # 그리드 컬럼 (필터 가능한 입력 컴포넌트 기준, 없으면 기본 컬럼)
+        columns = [(c.get("label") or f"항목{i + 1}", c.get("type"), self.fields[c.get("id")])
+                   for i, c in enumerate(self.field_components) if c.get("type") in FILTER_TYPES]
+        if not columns:
+            columns = [(label, ctype, f"col{i}") for i, (label, ctype) in enumerate(DEFAULT_GRID_COLUMNS)]
+        self.columns: List[Tuple[str, str, str]] = columns
+
+        # 모달 (open-modal 인터랙션 순서 = isModal{N}Open)
+        self.modals = [i for i in interactions if i.get("actionType") == "open-modal"]
+        self.modal_index = {id(i): n for n, i in enumerate(self.modals)}
+
+        # 트리거 컴포넌트 ID → [(트리거 이벤트, 핸들러명)]
+        self.bindings: Dict[str, List[Tuple[str, str]]] = {}
+        self.handlers: List[str] = []
+        for n, interaction in enumerate(interactions):
+            name = f"handleInteraction{n}"
+            self.handlers.append(self._action_handler(name, interaction))
+            self.bindings.setdefault(interaction.get("triggerComponentId"), []).append(
+                (interaction.get("triggerEvent") or "click", name)
+            )
+
+    # -------------------------------------------------------------------------
+    # 전체 코드
+    # -------------------------------------------------------------------------
+
+    def render(self, component_name: str) -> str:
+        uses_codeview = any(c.get("type") == "codeview" for c in self.components) or any(
+            f.get("type") == "codeview" for m in self.modals for f in (m.get("modalConfig") or {}).get("fields") or []
+        )
+        parts = [
+            "const { useState, useEffect } = React;",
+            self._sample_data(),
+        ]
+        if uses_codeview:
+            parts.append(CODEVIEW_COMPONENT)
+        parts.append(
+            f"export default function {component_name}() {{\n"
+            f"{_indent(self._body(), 2)}\n"
+            "}"
+        )
+        return "\n\n".join(parts) + "\n"
+
+    def _sample_data(self) -> str:
+        rows = []
+        for n in range(1, SAMPLE_ROW_COUNT + 1):
+            row = {"id": n}
+            for label, ctype, key in self.columns:
+                row[key] = _sample_value(label, ctype, n)
+            rows.append("  " + _js(row))
+        return "const sampleData = [\n" + ",\n".join(rows) + "\n];"
+
+    def _body(self) -> str:
+        initial_values = {self.fields[c.get("id")]: _initial_value(c.get("type")) for c in self.field_components}
+        required = [(self.fields[c.get("id")], c.get("label") or "") for c in self.field_components if c.get("required")]
+        column_keys = {key for _, _, key in self.columns}
+        filters = [self.fields[c.get("id")] for c in self.field_components if self.fields[c.get("id")] in column_keys]
+
+        lines = [SCREENSHOT_LISTENER.replace("{modal_open}", self._modal_listener_lines(True))
+                 .replace("{modal_close}", self._modal_listener_lines(False)), ""]
+        lines.append(f"const initialValues = {_js(initial_values)};")
+        lines.append("const [values, setValues] = useState(initialValues);")
+        lines.append("const [gridData, setGridData] = useState(sampleData);")
+        lines.append("const [selectedRow, setSelectedRow] = useState(null);")
+        for n, modal in enumerate(self.modals):
+            title = (modal.get("modalConfig") or {}).get("title") or f"모달{n}"
+            lines.append(f"const [isModal{n}Open, setIsModal{n}Open] = useState(false); // {title}")
+        if self.modals:
+            lines.append("const [modalValues, setModalValues] = useState({});")
+        lines.append("")
+        lines.append("const handleChange = (key, value) => setValues((prev) => ({ ...prev, [key]: value }));")
+        lines.append("")
+        lines.append("const handleSearch = () => {")
+        if filters:
+            lines.append("  setGridData(sampleData.filter((row) =>")
+            lines.append(f"    {_js(filters)}.every((key) => !values[key] || String(row[key]).includes(String(values[key])))")
+            lines.append("  ));")
+        else:
+            lines.append("  setGridData(sampleData);")
+        lines.append("};")
+        lines.append("")
+        lines.append("const handleReset = () => {")
+        lines.append("  setValues(initialValues);")
+        lines.append("  setGridData(sampleData);")
+        lines.append("};")
+        lines.append("")
+        lines.append("const validateRequired = () => {")
+        lines.append(f"  const missing = {_js(required)}.filter(([key]) => !values[key]).map(([, label]) => label);")
+        lines.append("  if (missing.length > 0) {")
+        lines.append("    alert(`필수 입력 항목을 확인하세요: ${missing.join(', ')}`);")
+        lines.append("    return false;")
+        lines.append("  }")
+        lines.append("  return true;")
+        lines.append("};")
+        for handler in self.handlers:
+            lines.append("")
+            lines.append(handler)
+        lines.append("")
+        lines.append("return (")
+        lines.append(_indent(self._layout(), 2))
+        lines.append(");")
+        return "\n".join(lines)
+
+    def _modal_listener_lines(self, open_: bool) -> str:
+        if open_:
+            return "\n".join(f"      if (modalIndex === '{n}') setIsModal{n}Open(true);" for n in range(len(self.modals)))
+        return "\n".join(f"      setIsModal{n}Open(false);" for n in range(len(self.modals)))
+
+    # -------------------------------------------------------------------------
+    # 액션
+    # -------------------------------------------------------------------------
+
+    def _action_handler(self, name: str, interaction: Dict[str, Any]) -> str:
+        action = interaction.get("actionType") or ""
+        description = interaction.get("description") or ""
+        modal_index = self.modal_index.get(id(interaction))
+
+        template = self.resources.actions.get(action)
+        if template:
+            self.used_action_templates += 1
+            body = _fill(template, {
+                "modalIndex": str(modal_index) if modal_index is not None else "",
+                "description": description,
+            }).strip()
+        elif action == "fetch-data":
+            body = "handleSearch();"
+        elif action == "clear":
+            body = "handleReset();"
+        elif action == "submit":
+            body = "if (!validateRequired()) return;\nalert('저장되었습니다.');"
+        elif action == "validate":
+            body = "if (validateRequired()) alert('입력값이 올바릅니다.');"
+        elif action == "open-modal" and modal_index is not None:
+            body = f"if (row) setSelectedRow(row);\nsetIsModal{modal_index}Open(true);"
+        elif action == "navigate":
+            body = f"alert({_js('화면 이동: ' + (description or interaction.get('targetAreaId') or ''))});"
+        else:
+            body = f"console.log({_js(action)}, {_js(description)});"
+
+        comment = f" // {description}" if description else ""
+        return f"const {name} = (row) => {{{comment}\n{_indent(body, 2)}\n}};"
+
+    def _event_props(self, comp_id: str, field: Optional[str] = None, value_expr: str = "e.target.value") -> List[str]:
+        """트리거 바인딩 → JSX 이벤트 속성 목록 (입력 컴포넌트는 값 변경 핸들러 포함)"""
+        bindings = self.bindings.get(comp_id, [])
+        props = []
+        change_calls = [f"handleChange({_js(field)}, {value_expr});"] if field else []
+        change_calls += [f"{handler}();" for event, handler in bindings if event in ("change", "select")]
+        if change_calls:
+            props.append("onChange={(e) => { " + " ".join(change_calls) + " }}")
+
+        by_prop: Dict[str, List[str]] = {}
+        for event, handler in bindings:
+            prop = EVENT_PROPS.get(event)
+            if prop:
+                by_prop.setdefault(prop, []).append(f"{handler}();")
+        for prop, calls in by_prop.items():
+            props.append(f"{prop}={{() => {{ {' '.join(calls)} }}}}")
+
+        submits = [f"{handler}();" for event, handler in bindings if event == "submit"]
+        if submits:
+            props.append("onKeyDown={(e) => { if (e.key === 'Enter') { " + " ".join(submits) + " } }}")
+        return props
+
+    # -------------------------------------------------------------------------
+    # 컴포넌트
+    # -------------------------------------------------------------------------
+
+    def _component(self, comp: Dict[str, Any]) -> str:
+        ctype = comp.get("type") or "label"
+        comp_id = comp.get("id")
+        label = comp.get("label") or ""
+        field = self.fields.get(comp_id)
+
+        template = self.resources.components.get(ctype)
+        if template:
+            self.used_component_templates += 1
+            return _fill(template, {
+                "label": label,
+                "field": field or "",
+                "value": f"values.{field}" if field else "",
+                "onChange": f"(e) => handleChange({_js(field)}, e.target.value)" if field else "undefined",
+                "events": " ".join(self._event_props(comp_id)),
+            }).strip()
+
+        if ctype == "button":
+            attrs = ['type="button"'] + (self._event_props(comp_id) or self._default_button_props(label))
+            return (
+                f'<button {" ".join(attrs)} className="h-10 px-4 rounded-md bg-blue-600 text-white text-sm font-medium hover:bg-blue-700">'
+                f"{_jsx_text(label)}</button>"
+            )
+        if ctype == "grid":
+            return self._grid(comp_id)
+        if ctype == "chart":
+            return self._chart(label)
+        if ctype == "card":
+            attrs = self._event_props(comp_id) + ['className="bg-white rounded-lg border border-gray-200 p-4"']
+            return (
+                f'<div {" ".join(attrs)}>\n'
+                f'  <p className="text-sm text-gray-500">{_jsx_text(label)}</p>\n'
+                '  <p className="text-2xl font-bold text-gray-900 mt-1">{gridData.length}</p>\n'
+                "</div>"
+            )
+        if ctype == "badge":
+            return f'<span className="inline-flex items-center rounded-full bg-blue-100 px-2.5 py-0.5 text-xs font-medium text-blue-700">{_jsx_text(label)}</span>'
+        if ctype == "progress-bar":
+            return (
+                '<div className="w-full">\n'
+                f'  <div className="flex justify-between text-sm text-gray-600 mb-1"><span>{_jsx_text(label)}</span><span>65%</span></div>\n'
+                '  <div className="h-2 rounded-full bg-gray-200"><div className="h-2 rounded-full bg-blue-600" style={{ width: "65%" }} /></div>\n'
+                "</div>"
+            )
+        if ctype == "divider":
+            return '<hr className="w-full border-gray-200" />'
+        if ctype == "label":
+            return f'<p className="text-sm font-medium text-gray-700">{_jsx_text(label)}</p>'
+        return self._field(comp_id, ctype, label, field, comp.get("required", False), "values")
+
+    def _default_button_props(self, label: str) -> List[str]:
+        """인터랙션이 없는 버튼 - 라벨로 기본 동작 추정 (조회/초기화)"""
+        if "조회" in label or "검색" in label:
+            return ["onClick={handleSearch}"]
+        if "초기화" in label:
+            return ["onClick={handleReset}"]
+        return []
+
+    def _field(self, comp_id: Optional[str], ctype: str, label: str, field: Optional[str], required: bool,
+               state: str, setter: Optional[str] = None, options: Optional[List[str]] = None) -> str:
+        """입력 필드 (라벨 + 컨트롤). state/setter로 화면 values 또는 모달 modalValues에 바인딩"""
+        value = f"{state}[{_js(field)}]"
+        if setter:
+            change = lambda expr: [f"onChange={{(e) => {setter}((prev) => ({{ ...prev, [{_js(field)}]: {expr} }}))}}"]
+        else:
+            change = lambda expr: self._event_props(comp_id, field, expr)
+        input_class = 'className="h-10 w-full rounded-md border border-gray-300 px-3 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500"'
+        mark = '<span className="text-red-500 ml-1">*</span>' if required else ""
+        caption = f'<label className="text-sm font-medium text-gray-700">{_jsx_text(label)}{mark}</label>'
+        options = options or DEFAULT_OPTIONS
+
+        if ctype == "codeview":
+            return (
+                f'<CodeView label={_jsx_attr(label)} value={{{value}}} required={{{_js(bool(required))}}} '
+                f"onClick={{() => alert({_js(label + ' 검색')})}} />"
+            )
+        if ctype == "checkbox":
+            props = " ".join(change("e.target.checked"))
+            return (
+                '<label className="inline-flex items-center gap-2 h-10 text-sm text-gray-700">\n'
+                f'  <input type="checkbox" checked={{!!{value}}} {props} className="h-4 w-4 rounded border-gray-300" />\n'
+                f"  {_jsx_text(label)}{mark}\n"
+                "</label>"
+            )
+        if ctype == "radio":
+            radios = "\n".join(
+                f'    <label className="inline-flex items-center gap-1 text-sm text-gray-700">'
+                f'<input type="radio" name={_jsx_attr(field)} value={_jsx_attr(opt)} checked={{{value} === {_js(opt)}}} '
+                f'{" ".join(change("e.target.value"))} />{_jsx_text(opt)}</label>'
+                for opt in options
+            )
+            return (
+                '<div className="flex flex-col space-y-1.5">\n'
+                f"  {caption}\n"
+                f'  <div className="flex items-center gap-4 h-10">\n{radios}\n  </div>\n'
+                "</div>"
+            )
+
+        props = " ".join(change("e.target.value"))
+        if ctype == "combo":
+            opts = "\n".join(f"    <option value={_jsx_attr(opt)}>{_jsx_text(opt)}</option>" for opt in options)
+            control = (
+                f'<select value={{{value}}} {props} {input_class}>\n'
+                '    <option value="">전체</option>\n'
+                f"{opts}\n"
+                "  </select>"
+            )
+        elif ctype == "textarea":
+            control = f'<textarea rows={{3}} value={{{value}}} {props} className="w-full rounded-md border border-gray-300 px-3 py-2 text-sm focus:outline-none focus:ring-2 focus:ring-blue-500" />'
+        elif ctype == "file-upload":
+            file_props = " ".join(change("e.target.files[0]?.name || ''"))
+            control = f'<input type="file" {file_props} className="block w-full text-sm text-gray-600" />'
+        else:
+            input_type = {"date-picker": "date", "time-picker": "time", "number-input": "number"}.get(ctype, "text")
+            control = f'<input type="{input_type}" value={{{value}}} {props} placeholder={_jsx_attr(label)} {input_class} />'
+
+        return (
+            '<div className="flex flex-col space-y-1.5 min-w-[180px]">\n'
+            f"  {caption}\n"
+            f"  {control}\n"
+            "</div>"
+        )
+
+    def _grid(self, comp_id: Optional[str]) -> str:
+        bindings = self.bindings.get(comp_id, [])
+        row_click = [f"{h}(row);" for e, h in bindings if e in ("row-click", "click")]
+        row_dbl = [f"{h}(row);" for e, h in bindings if e == "double-click"]
+        cell_click = [f"{h}(row);" for e, h in bindings if e == "cell-click"]
+
+        row_props = ["key={row.id}", "className=\"border-t border-gray-100 hover:bg-blue-50 cursor-pointer\""]
+        row_props.append("onClick={() => { setSelectedRow(row); " + " ".join(row_click) + " }}")
+        if row_dbl:
+            row_props.append("onDoubleClick={() => { " + " ".join(row_dbl) + " }}")
+        cell_props = (" onClick={() => { " + " ".join(cell_click) + " }}") if cell_click else ""
+
+        headers = "\n".join(f'        <th className="px-4 py-3 text-left font-medium">{_jsx_text(label)}</th>' for label, _, _ in self.columns)
+        cells = "\n".join(
+            f'          <td className="px-4 py-3"{cell_props}>{{String(row[{_js(key)}])}}</td>' for _, _, key in self.columns
+        )
+        return (
+            '<div className="overflow-x-auto">\n'
+            '  <table className="w-full text-sm">\n'
+            '    <thead className="bg-gray-50 text-gray-600">\n'
+            "      <tr>\n"
+            f"{headers}\n"
+            "      </tr>\n"
+            "    </thead>\n"
+            "    <tbody>\n"
+            "      {gridData.map((row) => (\n"
+            f"        <tr {' '.join(row_props)}>\n"
+            f"{_indent(cells, 2)}\n"
+            "        </tr>\n"
+            "      ))}\n"
+            "      {gridData.length === 0 && (\n"
+            f'        <tr><td colSpan={{{len(self.columns)}}} className="px-4 py-8 text-center text-gray-400">조회된 데이터가 없습니다.</td></tr>\n'
+            "      )}\n"
+            "    </tbody>\n"
+            "  </table>\n"
+            "</div>"
+        )
+
+    def _chart(self, label: str) -> str:
+        """막대 차트 (외부 라이브러리 없이 div 막대로 표현)"""
+        return (
+            '<div className="bg-white rounded-lg border border-gray-200 p-4">\n'
+            f'  <p className="text-sm font-medium text-gray-700 mb-4">{_jsx_text(label)}</p>\n'
+            '  <div className="flex items-end gap-3 h-40">\n'
+            "    {gridData.map((row, index) => (\n"
+            '      <div key={row.id} className="flex-1 bg-blue-500 rounded-t" style={{ height: `${30 + ((index * 37) % 70)}%` }} />\n'
+            "    ))}\n"
+            "  </div>\n"
+            "</div>"
+        )
+
+    # -------------------------------------------------------------------------
+    # 레이아웃
+    # -------------------------------------------------------------------------
+
+    def _area(self, area_id: str) -> str:
+        comps = [c for c in self.components if c.get("areaId") == area_id]
+        if not comps:
+            return ""
+        inner = "\n".join(self._component(c) for c in comps)
+        if any(c.get("type") in ("grid", "chart") for c in comps) and len(comps) == 1:
+            return inner
+        return f'<div className="flex flex-wrap items-end gap-4">\n{_indent(inner, 2)}\n</div>'
+
+    def _layout(self) -> str:
+        area_ids = [a.get("id") for a in self.areas]
+        # Step 2 영역 정의 없이 배치된 컴포넌트의 영역도 포함
+        for comp in self.components:
+            if comp.get("areaId") and comp.get("areaId") not in area_ids:
+                area_ids.append(comp.get("areaId"))
+        area_jsx = {area_id: self._area(area_id) for area_id in area_ids}
+
+        body = None
+        template = self.resources.layouts.get(self.layout_id)
+        if template:
+            body = self._layout_from_template(template, area_jsx)
+            self.used_layout_template = body is not None
+        if body is None:
+            body = self._default_layout(area_ids, area_jsx)
+
+        modals = "\n".join(self._modal(n, m) for n, m in enumerate(self.modals))
+        if modals:
+            # 루트 요소 닫는 태그 직전에 모달 삽입
+            head, _, tail = body.rpartition("</div>")
+            body = f"{head}{_indent(modals, 2)}\n</div>{tail}"
+        return body
+
+    def _default_layout(self, area_ids: List[str], area_jsx: Dict[str, str]) -> str:
+        names = {a.get("id"): a.get("name") or a.get("id") for a in self.areas}
+        sections = []
+        for area_id in area_ids:
+            if not area_jsx.get(area_id):
+                continue
+            sections.append(
+                '<section className="bg-white rounded-lg shadow p-4">\n'
+                f'  <h2 className="text-sm font-semibold text-gray-500 mb-3">{_jsx_text(names.get(area_id, area_id))}</h2>\n'
+                f"{_indent(area_jsx[area_id], 2)}\n"
+                "</section>"
+            )
+        return (
+            '<div className="min-h-screen bg-gray-100 p-6 space-y-6">\n'
+            f"{_indent(self._header(), 2)}\n"
+            f"{_indent(chr(10).join(sections), 2)}\n"
+            "</div>"
+        )
+
+    def _header(self) -> str:
+        return (
+            "<div>\n"
+            f'  <h1 className="text-2xl font-bold text-gray-900">{_jsx_text(self.title)}</h1>\n'
+            + (f'  <p className="text-gray-600">{_jsx_text(self.description)}</p>\n' if self.description else "")
+            + "</div>"
+        )
+
+    def _layout_from_template(self, template: str, area_jsx: Dict[str, str]) -> Optional[str]:
+        """
+        Layout.html_template(HTML/Tailwind) → JSX
+
+        <body> 내부를 루트 div로 감싸고, 영역 주석 위치에 영역 JSX를 넣습니다.
+        JSX로 옮길 수 없는 요소(스크립트 등)가 있으면 None (기본 레이아웃 사용).
+        """
+        match = _BODY_RE.search(template)
+        body_attrs, inner = (match.group(1), match.group(2)) if match else ("", template)
+        if re.search(r"<(script|style|link|meta|head|html)\b", inner, re.I):
+            return None
+
+        placed = set()
+
+        def replace_comment(m: re.Match) -> str:
+            text = m.group(1)
+            area_id = text.split()[0] if text.split() else ""
+            if area_id in area_jsx:
+                placed.add(area_id)
+                return area_jsx[area_id] or "{/* " + area_id.replace("*/", "") + " */}"
+            return "{/* " + text.replace("*/", "") + " */}"
+
+        if re.search(r"[{}]", _PLACEHOLDER_RE.sub("", _COMMENT_RE.sub("", inner))):
+            return None
+        inner = _fill(inner.strip(), {"title": _jsx_text(self.title), "description": _jsx_text(self.description)})
+
+        inner = _DROP_ATTR_RE.sub("", inner)
+        inner = _CLASS_ATTR_RE.sub(r' className="\1"', inner)
+        inner = re.sub(r'\sfor="', ' htmlFor="', inner)
+        inner = _VOID_TAG_RE.sub(lambda m: f"<{m.group(1)}{m.group(2) or ''} />", inner)
+        inner = _COMMENT_RE.sub(replace_comment, inner)
+
+        # 템플릿에 자리가 없는 영역은 본문 끝에 추가
+        extra = [area_jsx[a] for a in area_jsx if a not in placed and area_jsx[a]]
+        if extra:
+            inner += "\n" + "\n".join(
+                f'<div className="bg-white rounded-lg shadow p-4 m-6">\n{_indent(jsx, 2)}\n</div>' for jsx in extra
+            )
+
+        root_class = _CLASS_ATTR_RE.search(body_attrs or "")
+        root_class = f"min-h-screen {root_class.group(1)}" if root_class else "min-h-screen bg-gray-100"
+        return f'<div className="{root_class}">\n{_indent(inner, 2)}\n</div>'
+
+    # -------------------------------------------------------------------------
+    # 모달
+    # -------------------------------------------------------------------------
+
+    def _modal(self, index: int, interaction: Dict[str, Any]) -> str:
+        config = interaction.get("modalConfig") or {}
+        title = config.get("title") or f"모달{index}"
+        modal_type = config.get("type") or "custom"
+        size_class = MODAL_SIZE_CLASSES.get(config.get("size") or "md", MODAL_SIZE_CLASSES["md"])
+        close = f"setIsModal{index}Open(false)"
+
+        if modal_type == "form" and config.get("fields"):
+            fields = "\n".join(
+                self._field(None, f.get("type") or "textbox", f.get("label") or "", f"m{index}_{n}",
+                            f.get("required", False), "modalValues", "setModalValues", f.get("options"))
+                for n, f in enumerate(config["fields"])
+            )
+            content = f'<div className="grid grid-cols-2 gap-4">\n{_indent(fields, 2)}\n</div>'
+            confirm = "저장"
+        elif modal_type == "detail":
+            content = (
+                "{selectedRow ? (\n"
+                '  <dl className="grid grid-cols-2 gap-3 text-sm">\n'
+                + "\n".join(
+                    f'    <div><dt className="text-gray-500">{_jsx_text(label)}</dt><dd className="font-medium text-gray-900">{{String(selectedRow[{_js(key)}])}}</dd></div>'
+                    for label, _, key in self.columns
+                )
+                + "\n  </dl>\n"
+                f") : (\n  <p className=\"text-sm text-gray-600\">{_jsx_text(config.get('content') or '선택된 항목이 없습니다.')}</p>\n)}}"
+            )
+            confirm = "확인"
+        else:
+            content = f'<p className="text-sm text-gray-600 whitespace-pre-line">{_jsx_text(config.get("content") or interaction.get("description") or title)}</p>'
+            confirm = "확인"
+
+        return (
+            f"{{isModal{index}Open && (\n"
+            '  <div className="fixed inset-0 z-50 flex items-center justify-center">\n'
+            f'    <div className="fixed inset-0 bg-black/50" onClick={{() => {close}}} />\n'
+            f'    <div className="relative bg-white rounded-lg shadow-xl {size_class}">\n'
+            '      <div className="flex items-center justify-between border-b px-6 py-4">\n'
+            f'        <h3 className="text-lg font-semibold text-gray-900">{_jsx_text(title)}</h3>\n'
+            f'        <button type="button" onClick={{() => {close}}} className="text-gray-400 hover:text-gray-600">✕</button>\n'
+            "      </div>\n"
+            '      <div className="p-6">\n'
+            f"{_indent(content, 8)}\n"
+            "      </div>\n"
+            '      <div className="flex justify-end gap-2 border-t px-6 py-4">\n'
+            f'        <button type="button" onClick={{() => {close}}} className="h-10 px-4 rounded-md border border-gray-300 text-sm">취소</button>\n'
+            f'        <button type="button" onClick={{() => {close}}} className="h-10 px-4 rounded-md bg-blue-600 text-white text-sm">{confirm}</button>\n'
+            "      </div>\n"
+            "    </div>\n"
+            "  </div>\n"
+            ")}"
+        )
+
+
+def _initial_value(ctype: Optional[str]) -> Any:
+    return False if ctype == "checkbox" else ""
+
+
+def _sample_value(label: str, ctype: Optional[str], n: int) -> Any:
+    """컬럼 타입별 샘플 값 (n: 1부터)"""
+    if ctype == "codeview":
+        return f"C{n:04d}"
+    if ctype in ("combo", "radio"):
+        return DEFAULT_OPTIONS[n % len(DEFAULT_OPTIONS)]
+    if ctype == "date-picker":
+        return f"2025-01-{n:02d}"
+    if ctype == "time-picker":
+        return f"{8 + n:02d}:00"
+    if ctype == "number-input":
+        return n * 100
+    return f"{label} {n}"
+
+
+# 스크린샷 캡처 PostMessage 리스너 (SYSTEM_PROMPT 규칙 - 선언된 모달만 포함)
+SCREENSHOT_LISTENER = """// 📸 스크린샷 캡처를 위한 PostMessage 리스너 (수정 금지)
+useEffect(() => {
+  const handleMessage = (event) => {
+    if (event.data && event.data.type === 'OPEN_MODAL') {
+      const modalIndex = event.data.modalId.replace('modal-', '');
+{modal_open}
+      setTimeout(() => {
+        window.parent.postMessage({ type: 'MODAL_OPENED', modalId: event.data.modalId }, '*');
+      }, 300);
+    }
+    if (event.data && event.data.type === 'CLOSE_MODAL') {
+{modal_close}
+      setTimeout(() => {
+        window.parent.postMessage({ type: 'MODAL_CLOSED' }, '*');
+      }, 100);
+    }
+  };
+  window.addEventListener('message', handleMessage);
+  return () => window.removeEventListener('message', handleMessage);
+}, []);"""
+
+# CodeView 공통 컴포넌트 (SYSTEM_PROMPT 규칙의 JSX 구조)
+CODEVIEW_COMPONENT = """const CodeView = ({ label, value, onClick, placeholder = "검색", required = false, disabled = false }) => (
+  <div className="flex flex-col space-y-1.5 min-w-[180px]">
+    {label && (
+      <label className="text-sm font-medium text-gray-700">
+        {label}
+        {required && <span className="text-red-500 ml-1">*</span>}
+      </label>
+    )}
+    <div className="relative">
+      <input
+        type="text"
+        value={value || ""}
+        readOnly
+        disabled={disabled}
+        onClick={!disabled ? onClick : undefined}
+        placeholder={placeholder}
+        className={`flex h-10 w-full rounded-md border border-gray-300 bg-white px-3 py-2 text-sm placeholder:text-gray-400 focus:outline-none focus:ring-2 focus:ring-blue-500 pr-10 ${
+          disabled ? "cursor-not-allowed opacity-50 bg-gray-100" : "cursor-pointer hover:bg-gray-50"
+        }`}
+      />
+      <button
+        type="button"
+        onClick={!disabled ? onClick : undefined}
+        disabled={disabled}
+        className="absolute right-0 top-0 h-10 w-10 flex items-center justify-center text-gray-500 hover:text-blue-600 disabled:opacity-50"
+      >
+        <svg xmlns="http://www.w3.org/2000/svg" width="18" height="18" viewBox="0 0 24 24" fill="none" stroke="currentColor" strokeWidth="2" strokeLinecap="round" strokeLinejoin="round">
+          <circle cx="11" cy="11" r="8"></circle>
+          <line x1="21" y1="21" x2="16.65" y2="16.65"></line>
+        </svg>
+      </button>
+    </div>
+  </div>
+);"""
+
+
+def assemble_prototype(db: Session, wizard_data: Dict[str, Any], menu_name: str, screen_name: str) -> Dict[str, Any]:
+    """리소스 테이블 템플릿으로 프로토타입 조립 (PrototypeAssembler.assemble 결과 반환)"""
+    return PrototypeAssembler(TemplateResources.from_db(db)).assemble(wizard_data, menu_name, screen_name)
@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Rate Limiter - Gemini 호출 할당량(RPM/TPM) 스케줄러
+
+429가 난 뒤에 선형으로 기다리는 대신, 모델별 분당 요청 수(RPM)/분당 입력 토큰 수(TPM)
+예산을 토큰 버킷으로 추적하여 할당량을 넘기 전에 호출을 대기열에 세웁니다.
+
+[우선순위]
+- PRIORITY_INTERACTIVE: 사용자가 기다리는 호출 (프로토타입 Stage 1)
+- PRIORITY_DEFAULT: 일반 호출 (Stage 2~4 등)
+- PRIORITY_BATCH: 배치성 호출 (문서 생성)
+대기열은 우선순위 → 도착 순서로 처리되며, 호출 경로는 with request_priority(...)로 지정합니다.
+
+[429 처리]
+- Retry-After(헤더 또는 RetryInfo.retryDelay)만큼 해당 모델의 모든 호출을 멈춤 (429 폭주 방지)
+- 재시도 대기는 지터가 적용된 지수 백오프 (backoff_delay)
+
+[주의]
+예산은 프로세스 단위입니다. 워커 프로세스가 여러 개면 할당량을 프로세스 수로 나눠 설정하세요.
+
+환경 변수:
+- GEMINI_RPM_LIMIT: 모델별 분당 요청 수 (기본값: 60, 0이면 제한 없음)
+- GEMINI_TPM_LIMIT: 모델별 분당 입력 토큰 수 (기본값: 1000000, 0이면 제한 없음)
+- GEMINI_RATE_LIMITS: 모델별 개별 설정 JSON (예: {"gemini-2.5-pro": {"rpm": 5, "tpm": 250000}})
+- GEMINI_RETRY_BASE_DELAY: 백오프 기본 대기(초) (기본값: 2)
+- GEMINI_RETRY_MAX_DELAY: 백오프 최대 대기(초) (기본값: 60)
+- GEMINI_MAX_QUOTA_RETRIES: 할당량 초과 최대 재시도 횟수 (기본값: 6)
+"""
+import os
+import json
+import time
+import heapq
+import random
+import asyncio
+import logging
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_DEFAULT = 1
+PRIORITY_BATCH = 2
+
+# 429 응답에 재시도 시간이 없을 때 모델 전체 호출을 멈추는 시간(초)
+DEFAULT_COOLDOWN_SECONDS = 5.0
+
+# 요청 단위 우선순위
+_priority_var: ContextVar[int] = ContextVar("gemini_request_priority", default=PRIORITY_DEFAULT)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    블록 안의 모든 Gemini 호출 우선순위 지정
+
+    Usage:
+        with request_priority(PRIORITY_BATCH):
+            await client.generate_content_async(...)
+    """
+    token = _priority_var.set(priority)
+    try:
+        yield
+    finally:
+        _priority_var.reset(token)
+
+
+def current_priority() -> int:
+    return _priority_var.get()
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    재시도 대기 시간 (attempt: 0부터)
+
+    - Retry-After가 있으면 그 시간 + 작은 지터 (동시에 깨어나는 재시도 분산)
+    - 없으면 full jitter 지수 백오프: uniform(0, min(max, base * 2^attempt))
+    """
+    base = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "2"))
+    cap = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "60"))
+    if retry_after is not None:
+        return retry_after + random.uniform(0, base)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class _TokenBucket:
+    """분당 용량 기반 토큰 버킷 (연속 보충)"""
+
+    def __init__(self, per_minute: int, now: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = now
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """amount만큼 쌓일 때까지 남은 시간(초)"""
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+
+class ModelRateLimiter:
+    """모델 하나의 RPM/TPM 예산 + 우선순위 대기열"""
+
+    # 선두가 아닌 대기자의 재확인 간격(초)
+    POLL_INTERVAL = 0.05
+    # 선두 대기자의 최대 대기 단위(초) - 더 높은 우선순위 도착/쿨다운 변경 반영
+    MAX_SLEEP = 0.5
+
+    def __init__(
+        self,
+        model: str,
+        rpm: int,
+        tpm: int,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """clock/sleep: 단조 시계와 비동기 대기 함수 (테스트에서 가짜 시계 주입)"""
+        self.model = model
+        self._clock = clock
+        self._sleep = sleep
+        self._requests = _TokenBucket(rpm, clock()) if rpm > 0 else None
+        self._tokens = _TokenBucket(tpm, clock()) if tpm > 0 else None
+        self._paused_until = 0.0
+
+        # 동기 경로(_call_api)도 사용하므로 threading.Lock 사용
+        self._lock = threading.Lock()
+        self._waiters: list = []
+        self._seq = itertools.count()
+
+        self.stats = {"acquired": 0, "queued": 0, "wait_seconds": 0.0, "throttled": 0}
+
+    # =========================================================================
+    # 예산 획득
+    # =========================================================================
+
+    def _try_acquire(self, ticket: Tuple[int, int], tokens: int) -> float:
+        """획득 시 0, 아니면 다시 시도할 때까지의 대기 시간(초)"""
+        with self._lock:
+            now = self._clock()
+            if now < self._paused_until:
+                return min(self._paused_until - now, self.MAX_SLEEP)
+            if self._waiters[0] != ticket:
+                return self.POLL_INTERVAL
+
+            wait = 0.0
+            if self._requests:
+                self._requests.refill(now)
+                wait = max(wait, self._requests.wait_for(1))
+            if self._tokens:
+                self._tokens.refill(now)
+                # 예산보다 큰 요청은 버킷이 가득 찼을 때 통과 (영원히 대기하지 않도록)
+                wait = max(wait, self._tokens.wait_for(min(tokens, self._tokens.capacity)))
+            if wait > 0:
+                return min(wait, self.MAX_SLEEP)
+
+            if self._requests:
+                self._requests.tokens -= 1
+            if self._tokens:
+                self._tokens.tokens -= tokens
+            heapq.heappop(self._waiters)
+            self.stats["acquired"] += 1
+            return 0.0
+
+    def _enqueue(self, priority: Optional[int]) -> Tuple[int, int]:
+        ticket = (current_priority() if priority is None else priority, next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiters, ticket)
+        return ticket
+
+    def _dequeue(self, ticket: Tuple[int, int]):
+        """취소/오류로 대기열을 떠나는 대기자 제거"""
+        with self._lock:
+            if ticket in self._waiters:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+
+    def _record_wait(self, started: float):
+        waited = self._clock() - started
+        if waited > 0.01:
+            self.stats["queued"] += 1
+            self.stats["wait_seconds"] = round(self.stats["wait_seconds"] + waited, 3)
+
+    async def acquire(self, tokens: int, priority: Optional[int] = None) -> int:
+        """
+        호출 1건 + 입력 토큰 tokens개의 예산 확보 (비동기 대기)
+
+        Returns:
+            예약한 토큰 수 (settle()에 전달)
+        """
+        started = self._clock()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait <= 0:
+                    break
+                await self._sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self._record_wait(started)
+        return tokens
+
+    def acquire_blocking(self, tokens: int, priority: Optional[int] = None) -> int:
+        """acquire()의 동기 버전 (스크립트/동기 경로용)"""
+        started = self._clock()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_acquire(ticket, tokens)
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+        self._record_wait(started)
+        return tokens
+
+    def settle(self, reserved: int, actual: Optional[int]):
+        """예약한 추정치를 실제 입력 토큰 수(usageMetadata)로 보정"""
+        if not self._tokens or actual is None:
+            return
+        with self._lock:
+            self._tokens.tokens = min(self._tokens.capacity, self._tokens.tokens + reserved - actual)
+
+    def penalize(self, retry_after: Optional[float] = None):
+        """429 수신 - 서버가 알려준 시간(없으면 기본 쿨다운)만큼 이 모델의 모든 호출 중지"""
+        cooldown = retry_after if retry_after is not None else DEFAULT_COOLDOWN_SECONDS
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + cooldown)
+            # 서버 기준으로는 이미 예산을 다 쓴 상태 - 재개 직후 몰리지 않도록 버킷 비움
+            if self._requests:
+                self._requests.tokens = min(self._requests.tokens, 0.0)
+        self.stats["throttled"] += 1
+        logger.warning(f"🚦 {self.model}: 할당량 초과 - {cooldown:.1f}초간 호출 중지")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            return {
+                "model": self.model,
+                "rpm_limit": int(self._requests.capacity) if self._requests else None,
+                "tpm_limit": int(self._tokens.capacity) if self._tokens else None,
+                "waiting": len(self._waiters),
+                "paused_seconds": round(max(0.0, self._paused_until - now), 1),
+                **self.stats,
+            }
+
+
+# =============================================================================
+# 모델별 레지스트리
+# =============================================================================
+_limiters: Dict[str, ModelRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _limits_for(model: str) -> Tuple[int, int]:
+    rpm = int(os.getenv("GEMINI_RPM_LIMIT", "60"))
+    tpm = int(os.getenv("GEMINI_TPM_LIMIT", "1000000"))
+    overrides = os.getenv("GEMINI_RATE_LIMITS")
+    if overrides:
+        try:
+            model_limits = json.loads(overrides).get(model, {})
+            rpm = int(model_limits.get("rpm", rpm))
+            tpm = int(model_limits.get("tpm", tpm))
+        except (ValueError, AttributeError) as e:
+            logger.warning(f"⚠️ GEMINI_RATE_LIMITS 파싱 실패: {e}")
+    return rpm, tpm
+
+
+def get_rate_limiter(model: str) -> ModelRateLimiter:
+    """모델별 ModelRateLimiter 인스턴스 반환"""
+    limiter = _limiters.get(model)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(model)
+            if limiter is None:
+                rpm, tpm = _limits_for(model)
+                limiter = ModelRateLimiter(model, rpm, tpm)
+                _limiters[model] = limiter
+                logger.info(f"RateLimiter initialized: model={model}, rpm={rpm or '∞'}, tpm={tpm or '∞'}")
+    return limiter
+
+
+def get_rate_limiter_stats() -> Dict[str, Any]:
+    """모든 모델의 대기/제한 통계"""
+    return {model: limiter.get_stats() for model, limiter in _limiters.items()}
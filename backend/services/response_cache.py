@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+Response Cache - 내용 주소 기반 LLM 응답 캐시
+
+temperature 0.2에서 동일한 요청(재클릭, UI 오류 후 재시도, 변경 없는 화면의 문서 재생성)은
+같은 결과를 얻기 위해 매번 Gemini 왕복 비용을 지불합니다.
+모델 + 생성 설정 + contents(+cachedContent)의 해시를 키로 응답을 캐시합니다.
+
+[계층]
+- L1: 프로세스 내부 LRU (항목 수/바이트 제한)
+- L2: CacheService(Redis) 공유 캐시 (TTL, 워커 간 공유)
+
+[우회]
+- 호출 인자 use_cache=False
+- 요청 단위: with bypass_response_cache(): ... (contextvar - 하위 호출 전체에 적용)
+
+환경 변수:
+- RESPONSE_CACHE_ENABLED: 사용 여부 (기본값: true)
+- RESPONSE_CACHE_TTL: L2 TTL(초) (기본값: 86400)
+- RESPONSE_CACHE_L1_MAX_ENTRIES: L1 최대 항목 수 (기본값: 256)
+- RESPONSE_CACHE_L1_MAX_BYTES: L1 최대 크기(바이트) (기본값: 33554432 = 32MB)
+- RESPONSE_CACHE_MAX_VALUE_BYTES: 캐시할 응답 최대 크기(바이트) (기본값: 1048576 = 1MB)
+"""
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional
+
+from services.cache_service import get_cache_service
+
+logger = logging.getLogger(__name__)
+
+# Redis 키 접두사
+KEY_PREFIX = "gemini_response:"
+
+# 요청 단위 캐시 우회 플래그
+_bypass_var: ContextVar[bool] = ContextVar("response_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_response_cache(enabled: bool = True):
+    """
+    블록 안의 모든 LLM 호출에서 응답 캐시 조회를 건너뜀 (결과는 새로 저장)
+
+    Usage:
+        with bypass_response_cache(request.bypass_cache):
+            await ai_service.generate_prototype(...)
+    """
+    token = _bypass_var.set(enabled or _bypass_var.get())
+    try:
+        yield
+    finally:
+        _bypass_var.reset(token)
+
+
+def is_response_cache_bypassed() -> bool:
+    """현재 요청이 캐시 우회 중인지 (단계 재사용 등 다른 결과 재사용에도 동일하게 적용)"""
+    return _bypass_var.get()
+
+
+class ResponseCache:
+    """L1(LRU) + L2(Redis) 응답 캐시"""
+
+    def __init__(self):
+        self.enabled = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        self.ttl_seconds = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+        self.l1_max_entries = int(os.getenv("RESPONSE_CACHE_L1_MAX_ENTRIES", "256"))
+        self.l1_max_bytes = int(os.getenv("RESPONSE_CACHE_L1_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.max_value_bytes = int(os.getenv("RESPONSE_CACHE_MAX_VALUE_BYTES", str(1024 * 1024)))
+
+        # L1: 키 -> (응답, 크기)
+        self._l1: "OrderedDict[str, tuple]" = OrderedDict()
+        self._l1_bytes = 0
+        # 동기 경로(_call_api)는 스레드에서 호출될 수 있으므로 잠금 사용
+        self._lock = threading.Lock()
+
+        self.stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evictions": 0}
+
+    # =========================================================================
+    # 키
+    # =========================================================================
+
+    @staticmethod
+    def make_key(model: str, payload: Dict[str, Any]) -> str:
+        """모델 + 요청 본문(contents, generationConfig, cachedContent)의 해시"""
+        canonical = json.dumps(
+            {"model": model, "payload": payload},
+            ensure_ascii=False,
+            sort_keys=True,
+            separators=(",", ":")
+        )
+        return KEY_PREFIX + hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def is_active(self, use_cache: bool = True) -> bool:
+        """이번 호출에서 캐시 조회 여부"""
+        if not self.enabled:
+            return False
+        if not use_cache or _bypass_var.get():
+            self.stats["bypassed"] += 1
+            return False
+        return True
+
+    # =========================================================================
+    # L1 (프로세스 내부 LRU)
+    # =========================================================================
+
+    def _l1_get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._l1.get(key)
+            if item is None:
+                return None
+            self._l1.move_to_end(key)
+            return item[0]
+
+    def _l1_set(self, key: str, value: Dict[str, Any], size: int):
+        with self._lock:
+            if key in self._l1:
+                self._l1_bytes -= self._l1.pop(key)[1]
+            self._l1[key] = (value, size)
+            self._l1_bytes += size
+            while self._l1 and (len(self._l1) > self.l1_max_entries or self._l1_bytes > self.l1_max_bytes):
+                _, (_, evicted_size) = self._l1.popitem(last=False)
+                self._l1_bytes -= evicted_size
+                self.stats["evictions"] += 1
+
+    # =========================================================================
+    # 조회 / 저장
+    # =========================================================================
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시 조회 (L1 → L2, L2 적중 시 L1 채움)"""
+        value = self._l1_get(key)
+        if value is not None:
+            self.stats["l1_hits"] += 1
+            return value
+
+        value = get_cache_service().get_json(key)
+        if value is not None:
+            self.stats["l2_hits"] += 1
+            self._l1_set(key, value, len(json.dumps(value, ensure_ascii=False)))
+            return value
+
+        self.stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """캐시 저장 (최대 크기 초과 응답은 저장하지 않음)"""
+        serialized = json.dumps(value, ensure_ascii=False)
+        size = len(serialized)
+        if size > self.max_value_bytes:
+            return
+        self._l1_set(key, value, size)
+        get_cache_service().set_json(key, value, self.ttl_seconds)
+        self.stats["stores"] += 1
+
+    async def get_async(self, key: str) -> Optional[Dict[str, Any]]:
+        """비동기 경로용 조회 (L2 Redis 조회는 스레드에서 실행)"""
+        value = self._l1_get(key)
+        if value is not None:
+            self.stats["l1_hits"] += 1
+            return value
+        if not get_cache_service().is_available():
+            self.stats["misses"] += 1
+            return None
+        return await asyncio.to_thread(self.get, key)
+
+    async def set_async(self, key: str, value: Dict[str, Any]):
+        """비동기 경로용 저장"""
+        if not get_cache_service().is_available():
+            self.set(key, value)
+            return
+        await asyncio.to_thread(self.set, key, value)
+
+    def clear(self) -> int:
+        """L1 + L2 전체 삭제 (삭제된 L2 항목 수 반환)"""
+        with self._lock:
+            self._l1.clear()
+            self._l1_bytes = 0
+        return get_cache_service().delete_pattern(KEY_PREFIX + "*")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """적중/미스 통계"""
+        lookups = self.stats["l1_hits"] + self.stats["l2_hits"] + self.stats["misses"]
+        hits = self.stats["l1_hits"] + self.stats["l2_hits"]
+        return {
+            "enabled": self.enabled,
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "l1_entries": len(self._l1),
+            "l1_bytes": self._l1_bytes,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# 싱글톤 인스턴스
+_response_cache_instance: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """ResponseCache 싱글톤 인스턴스 반환"""
+    global _response_cache_instance
+    if _response_cache_instance is None:
+        _response_cache_instance = ResponseCache()
+    return _response_cache_instance
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Single Flight - 동일 요청 동시 실행 방지 (요청 병합)
+
+같은 화면/같은 입력으로 동시에 들어온 요청(더블 클릭, 여러 사용자)이
+멀티 스테이지 생성을 중복 실행하지 않도록 합니다.
+
+[구성]
+- lock(key): 분산 락 (Redis SET NX PX + 토큰 비교 해제, Redis 불가 시 프로세스 로컬 asyncio.Lock)
+- do(key, fn): 같은 프로세스의 후속 요청은 진행 중인 선행 요청의 결과를 그대로 공유하고,
+  다른 워커의 후속 요청은 락 해제를 기다린 뒤 실행 (LLM 호출은 응답 캐시에서 즉시 반환)
+
+환경 변수:
+- SINGLE_FLIGHT_LOCK_TTL: 분산 락 TTL(초) - 락 보유 프로세스가 죽어도 이 시간 후 해제 (기본값: 600)
+- SINGLE_FLIGHT_WAIT_TIMEOUT: 락 대기 최대 시간(초) (기본값: 900)
+"""
+import os
+import time
+import uuid
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator, List
+
+from services.cache_service import get_cache_service
+
+logger = logging.getLogger(__name__)
+
+# Redis 키 접두사
+LOCK_PREFIX = "forgeflow:lock:"
+
+# 토큰이 일치할 때만 삭제 (다른 프로세스가 재획득한 락을 지우지 않도록)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+else
+    return 0
+end
+"""
+
+
+class SingleFlightTimeout(Exception):
+    """락 대기 시간 초과"""
+
+
+class SingleFlight:
+    """분산 락 + 프로세스 내부 결과 공유"""
+
+    def __init__(self):
+        self.lock_ttl = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL", "600"))
+        self.wait_timeout = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", "900"))
+        self.poll_interval = 0.2
+
+        # 진행 중인 선행 요청 (키 -> 결과 Future)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # 로컬 락 (키 -> [Lock, 참조 수])
+        self._local_locks: Dict[str, List[Any]] = {}
+
+        self.stats = {"leaders": 0, "coalesced": 0, "lock_waits": 0}
+
+    # =========================================================================
+    # 락
+    # =========================================================================
+
+    @asynccontextmanager
+    async def lock(self, key: str, ttl: Optional[int] = None) -> AsyncIterator[None]:
+        """
+        분산 락 (async context manager)
+
+        같은 프로세스 안에서는 asyncio.Lock으로 직렬화하고,
+        Redis 사용 가능 시 워커 간에도 SET NX 락으로 직렬화합니다.
+        """
+        entry = self._local_locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                token = await self._acquire_remote(key, ttl or self.lock_ttl)
+                try:
+                    yield
+                finally:
+                    if token:
+                        await self._release_remote(key, token)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._local_locks.pop(key, None)
+
+    async def _acquire_remote(self, key: str, ttl: int) -> Optional[str]:
+        """Redis 락 획득 (Redis 불가 시 None - 로컬 락만 사용)"""
+        cache_service = get_cache_service()
+        if not cache_service.is_available():
+            return None
+
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.wait_timeout
+        waited = False
+        while True:
+            try:
+                acquired = await asyncio.to_thread(
+                    cache_service.redis_client.set, LOCK_PREFIX + key, token, nx=True, ex=ttl
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ SingleFlight Redis lock 실패: {e} - 로컬 락으로 대체")
+                return None
+            if acquired:
+                return token
+            if not waited:
+                waited = True
+                self.stats["lock_waits"] += 1
+            if time.monotonic() > deadline:
+                raise SingleFlightTimeout(f"Lock wait timeout: {key}")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _release_remote(self, key: str, token: str):
+        try:
+            cache_service = get_cache_service()
+            await asyncio.to_thread(cache_service.redis_client.eval, _RELEASE_SCRIPT, 1, LOCK_PREFIX + key, token)
+        except Exception as e:
+            logger.warning(f"⚠️ SingleFlight Redis unlock 실패: {e} (TTL 만료 시 해제됨)")
+
+    # =========================================================================
+    # 요청 병합
+    # =========================================================================
+
+    def is_inflight(self, key: str) -> bool:
+        """같은 프로세스에서 진행 중인 선행 요청 여부"""
+        return key in self._inflight
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key당 한 번만 fn 실행
+
+        - 같은 프로세스: 진행 중인 선행 요청이 있으면 그 결과(또는 예외)를 공유
+        - 다른 워커: 분산 락으로 직렬화
+        """
+        existing = self._inflight.get(key)
+        if existing is not None:
+            self.stats["coalesced"] += 1
+            logger.info(f"🔗 SingleFlight coalesced: {key}")
+            return await asyncio.shield(existing)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.stats["leaders"] += 1
+        try:
+            async with self.lock(key):
+                result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 후속 요청이 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "inflight": len(self._inflight)}
+
+
+# 싱글톤 인스턴스
+_single_flight_instance: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """SingleFlight 싱글톤 인스턴스 반환"""
+    global _single_flight_instance
+    if _single_flight_instance is None:
+        _single_flight_instance = SingleFlight()
+    return _single_flight_instance
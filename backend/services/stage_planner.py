@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Stage Planner - Wizard 복잡도에 따른 4단계 생성 계획 + 단계 결과 로컬 검사
+
+단순한 화면(컴포넌트 몇 개, 모달/인터랙션 없음)은 Stage 1만으로도 완성된 컴포넌트가 나오는 경우가 많은데
+항상 4단계를 모두 실행하면 지연 시간과 비용이 그대로 듭니다.
+
+[계획]
+복잡도 점수 = 컴포넌트 수 + 인터랙션 수 + 모달 수 × 2 (모달을 따로 생성하면 모달 가중치 제외)
+- simple  (점수 ≤ PROTOTYPE_SIMPLE_MAX_SCORE, 모달 없음): Step 1~4 명세를 Stage 1에 모두 전달
+- medium  (점수 ≤ PROTOTYPE_MEDIUM_MAX_SCORE): Stage 1에 Step 1~2, Stage 2에 Step 3~4
+- complex : Stage N에 Step N (기존 방식)
+명세를 모두 전달한 단계(min_stages)부터 로컬 검사를 통과하면 나머지 단계(다듬기)를 생략합니다.
+complex는 min_stages=4이므로 항상 4단계를 실행합니다.
+
+[로컬 검사] (모델 호출 없음)
+- export default 컴포넌트
+- 괄호 / JSX 태그 짝
+- TODO/FIXME/생략 주석 없음
+- 모달 상태명 isModal{N}Open 모두 존재
+- Tailwind className 적용 (스타일링 단계 생략 조건)
+
+환경 변수:
+- PROTOTYPE_ADAPTIVE_STAGES: 적응형 단계 계획 사용 여부 (기본값: true, false면 항상 4단계)
+- PROTOTYPE_SIMPLE_MAX_SCORE: simple 등급 최대 복잡도 점수 (기본값: 6)
+- PROTOTYPE_MEDIUM_MAX_SCORE: medium 등급 최대 복잡도 점수 (기본값: 14)
+"""
+import os
+import re
+import logging
+from typing import Dict, Any, List, Optional
+
+from utils.code_patch import bracket_balance
+from utils.code_merge import jsx_balance
+
+logger = logging.getLogger(__name__)
+
+TOTAL_STAGES = 4
+
+# 등급별 명세 전달 단계 수 (= 로컬 검사로 생략을 판단하기 시작하는 단계)
+TIER_MIN_STAGES = {"simple": 1, "medium": 2, "complex": 4}
+
+# 스타일이 적용된 것으로 보는 최소 className 수
+MIN_STYLED_CLASSNAMES = 5
+
+_TODO_RE = re.compile(r"\bTODO\b|\bFIXME\b|(?://|/\*)\s*\.\.\.|//[^\n]*(?:생략|구현 예정|이하 동일)")
+
+
+class StagePlan:
+    """단계 계획 (명세 전달 단계 수 + 로컬 검사 기준)"""
+
+    def __init__(self, tier: str, score: int, modal_count: int, adaptive: bool = True):
+        self.tier = tier
+        self.score = score
+        self.modal_count = modal_count
+        self.adaptive = adaptive
+        self.min_stages = TIER_MIN_STAGES[tier] if adaptive else TOTAL_STAGES
+        self.required_states = [f"isModal{n}Open" for n in range(modal_count)]
+
+    def group_step_prompts(self, step_prompts: List[str]) -> List[Optional[str]]:
+        """
+        Step 1~4 명세 → 단계별 명세 (명세를 모두 전달한 뒤의 단계는 None)
+
+        simple: [1+2+3+4, None, None, None] / medium: [1+2, 3+4, None, None] / complex: [1, 2, 3, 4]
+        """
+        if self.min_stages >= len(step_prompts):
+            return list(step_prompts)
+        per_stage = -(-len(step_prompts) // self.min_stages)
+        grouped: List[Optional[str]] = [
+            "\n\n".join(step_prompts[i:i + per_stage]) for i in range(0, len(step_prompts), per_stage)
+        ]
+        return grouped + [None] * (len(step_prompts) - len(grouped))
+
+    def check(self, code: str) -> List[str]:
+        """단계 결과 로컬 검사 → 문제 목록 (비어 있으면 통과)"""
+        problems = []
+        if "export default" not in code:
+            problems.append("export default 없음")
+        unmatched_close, unclosed = bracket_balance(code)
+        if unmatched_close or unclosed:
+            problems.append(f"괄호 짝 불일치 (닫는 괄호 초과 {unmatched_close}, 닫히지 않음 {unclosed})")
+        unmatched_close, unclosed = jsx_balance(code)
+        if unmatched_close or unclosed:
+            problems.append(f"JSX 태그 짝 불일치 (닫는 태그 초과 {unmatched_close}, 닫히지 않음 {unclosed})")
+        todo = _TODO_RE.search(code)
+        if todo:
+            problems.append(f"미완성 표시: {todo.group(0)}")
+        missing = [name for name in self.required_states if name not in code]
+        if missing:
+            problems.append(f"모달 상태 누락: {', '.join(missing)}")
+        if code.count("className=") < MIN_STYLED_CLASSNAMES:
+            problems.append("Tailwind 스타일 미적용")
+        return problems
+
+    def summary(self) -> Dict[str, Any]:
+        return {"tier": self.tier, "score": self.score, "min_stages": self.min_stages, "adaptive": self.adaptive}
+
+
+def plan_stages(wizard_data: Optional[Dict[str, Any]], modals_external: bool = False) -> StagePlan:
+    """
+    Wizard 데이터 → 단계 계획
+
+    modals_external: 모달을 메인 4단계 밖에서 생성하는 경우 (services/modal_fanout.py)
+    """
+    wizard_data = wizard_data or {}
+    components = (wizard_data.get("step3") or {}).get("components") or []
+    interactions = (wizard_data.get("step4") or {}).get("interactions") or []
+    modal_count = sum(1 for i in interactions if i.get("actionType") == "open-modal")
+    score = len(components) + len(interactions) + (0 if modals_external else modal_count * 2)
+
+    if score <= int(os.getenv("PROTOTYPE_SIMPLE_MAX_SCORE", "6")) and (modals_external or not modal_count):
+        tier = "simple"
+    elif score <= int(os.getenv("PROTOTYPE_MEDIUM_MAX_SCORE", "14")):
+        tier = "medium"
+    else:
+        tier = "complex"
+
+    adaptive = os.getenv("PROTOTYPE_ADAPTIVE_STAGES", "true").lower() in ("1", "true", "yes")
+    plan = StagePlan(tier, score, modal_count, adaptive)
+    logger.info(
+        f"🗺️ Stage plan: {tier} (score {score}, modals {modal_count}) → "
+        f"명세 {plan.min_stages}단계, 이후 로컬 검사 통과 시 생략{'' if adaptive else ' (비활성)'}"
+    )
+    return plan
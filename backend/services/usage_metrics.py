@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Usage Metrics - Gemini 호출별 토큰/지연 시간 기록 + 집계
+
+GeminiClient는 generateContent/streamGenerateContent 호출마다 기록 하나를 남깁니다.
+- operation: model_operation() 작업 이름 (stage-1~4, continuation, modal, design-spec, ... / 없으면 default)
+- screen_id: usage_screen() 블록의 화면 ID (생성/문서 엔드포인트가 지정)
+- model: 실제 호출한 모델 (라우팅/장애 조치 반영)
+- prompt/cached/output tokens: usageMetadata (응답 캐시 적중은 0)
+- latency_ms: API 응답 시간 (할당량 대기 제외, 스트리밍은 마지막 청크까지)
+- status: ok 또는 오류 유형 (quota_exceeded, timeout 등)
+
+[저장]
+1. 프로세스 메모리 링 버퍼 (최근 USAGE_METRICS_BUFFER건) - DB 없이도 집계 가능
+2. llm_usage 테이블 (USAGE_METRICS_DB=true) - 독립 워커 프로세스 기록까지 합쳐 집계
+   USAGE_METRICS_FLUSH_SIZE건 또는 USAGE_METRICS_FLUSH_INTERVAL초마다 일괄 INSERT (스레드에서 실행)
+
+[집계]
+summarize(days): 전체/작업별/모델별/일별 호출 수, 토큰 합계, 지연 시간 p50/p95 + 토큰 상위 화면
+
+환경 변수:
+- USAGE_METRICS_DB: llm_usage 테이블 기록 여부 (기본값: true)
+- USAGE_METRICS_BUFFER: 메모리 링 버퍼 크기 (기본값: 5000)
+- USAGE_METRICS_FLUSH_SIZE: 일괄 INSERT 단위 (기본값: 20)
+- USAGE_METRICS_FLUSH_INTERVAL: 최대 INSERT 지연(초) (기본값: 10)
+- USAGE_METRICS_RETENTION_DAYS: llm_usage 보관 일수 (기본값: 30, 0이면 삭제 안 함)
+"""
+import os
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+from zoneinfo import ZoneInfo
+
+from services.model_router import current_operations, DEFAULT_OPERATION
+
+logger = logging.getLogger(__name__)
+
+# 한국 시간대
+KST = ZoneInfo("Asia/Seoul")
+
+# 오래된 기록 삭제 간격(초)
+PRUNE_INTERVAL_SECONDS = 3600
+
+# 토큰 상위 화면 수
+TOP_SCREENS = 10
+
+# 현재 화면 ID (생성/문서 엔드포인트가 지정)
+_screen_var: ContextVar[Optional[int]] = ContextVar("usage_screen_id", default=None)
+
+
+@contextmanager
+def usage_screen(screen_id: Optional[int]):
+    """
+    블록 안의 모든 Gemini 호출 기록에 화면 ID 지정
+
+    Usage:
+        with usage_screen(screen.id):
+            await doc_service.generate_design_doc(...)
+    """
+    token = _screen_var.set(screen_id)
+    try:
+        yield
+    finally:
+        _screen_var.reset(token)
+
+
+def _now() -> datetime:
+    """KST 현재 시각 (naive - llm_usage.created_at과 같은 형식)"""
+    return datetime.now(KST).replace(tzinfo=None)
+
+
+def _percentile(sorted_values: List[int], ratio: float) -> int:
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+def _aggregate(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """기록 목록 → 호출 수/토큰 합계/지연 시간 분포 (지연 시간은 캐시 적중 제외)"""
+    latencies = sorted(r["latency_ms"] for r in records if not r["cache_hit"])
+    prompt_tokens = sum(r["prompt_tokens"] for r in records)
+    output_tokens = sum(r["output_tokens"] for r in records)
+    return {
+        "calls": len(records),
+        "errors": sum(1 for r in records if r["status"] != "ok"),
+        "cache_hits": sum(1 for r in records if r["cache_hit"]),
+        "prompt_tokens": prompt_tokens,
+        "cached_tokens": sum(r["cached_tokens"] for r in records),
+        "output_tokens": output_tokens,
+        "total_tokens": prompt_tokens + output_tokens,
+        "latency_ms": {
+            "p50": _percentile(latencies, 0.5),
+            "p95": _percentile(latencies, 0.95),
+            "max": latencies[-1] if latencies else 0,
+        },
+    }
+
+
+def _group(records: List[Dict[str, Any]], key: str) -> Dict[str, Dict[str, Any]]:
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault(record[key], []).append(record)
+    return {str(name): _aggregate(group) for name, group in sorted(groups.items(), key=lambda item: str(item[0]))}
+
+
+class UsageRecorder:
+    """Gemini 호출 기록 (메모리 링 버퍼 + llm_usage 테이블 일괄 INSERT)"""
+
+    def __init__(
+        self,
+        use_db: bool = True,
+        buffer_size: int = 5000,
+        flush_size: int = 20,
+        flush_interval: float = 10.0,
+        retention_days: int = 30
+    ):
+        self.use_db = use_db
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        self._recent: deque = deque(maxlen=buffer_size)
+        self._pending: List[Dict[str, Any]] = []
+        # 동기 호출 경로(스레드)와 이벤트 루프가 함께 기록
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._last_prune = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+        self._db_error_logged = False
+        self.stats = {"recorded": 0, "flushed": 0, "flush_errors": 0}
+
+    # =========================================================================
+    # 기록
+    # =========================================================================
+
+    def record(
+        self,
+        model: str,
+        usage: Optional[Dict[str, int]],
+        latency_ms: float,
+        status: str = "ok",
+        cache_hit: bool = False
+    ):
+        """호출 1회 기록 (operation/screen_id는 현재 컨텍스트에서)"""
+        operations = current_operations()
+        usage = usage or {}
+        record = {
+            "created_at": _now(),
+            "operation": operations[-1] if operations else DEFAULT_OPERATION,
+            "model": model,
+            "screen_id": _screen_var.get(),
+            "status": status,
+            "cache_hit": cache_hit,
+            "prompt_tokens": usage.get("input_tokens", 0),
+            "cached_tokens": usage.get("cached_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+            "latency_ms": int(latency_ms),
+        }
+        with self._lock:
+            self._recent.append(record)
+            self.stats["recorded"] += 1
+            if not self.use_db:
+                return
+            self._pending.append(record)
+            due = (
+                len(self._pending) >= self.flush_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """이벤트 루프 안이면 스레드에서, 아니면(동기 호출 스레드) 바로 INSERT"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(asyncio.to_thread(self.flush))
+
+    def flush(self) -> int:
+        """대기 중인 기록 일괄 INSERT (동기, 실패한 묶음은 버림 - 링 버퍼에는 남음)"""
+        from sqlalchemy import insert, delete
+        from sqlalchemy.exc import SQLAlchemyError
+        from models.database import SessionLocal
+        from models.llm_usage import LLMUsage
+
+        with self._lock:
+            batch, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+        if not batch:
+            return 0
+
+        db = SessionLocal()
+        try:
+            db.execute(insert(LLMUsage), batch)
+            if self.retention_days > 0 and time.monotonic() - self._last_prune >= PRUNE_INTERVAL_SECONDS:
+                cutoff = _now() - timedelta(days=self.retention_days)
+                db.execute(delete(LLMUsage).where(LLMUsage.created_at < cutoff))
+                self._last_prune = time.monotonic()
+            db.commit()
+            self.stats["flushed"] += len(batch)
+            return len(batch)
+        except SQLAlchemyError as e:
+            db.rollback()
+            self.stats["flush_errors"] += 1
+            # 마이그레이션 전(테이블 없음) 등 - 메모리 링 버퍼로 계속 동작
+            if not self._db_error_logged:
+                logger.warning(f"⚠️ llm_usage 기록 실패 - 메모리 기록만 사용: {type(e).__name__}")
+                self._db_error_logged = True
+            return 0
+        finally:
+            db.close()
+
+    async def flush_async(self):
+        """대기 중인 기록 INSERT (종료 시)"""
+        if self.use_db:
+            await asyncio.to_thread(self.flush)
+
+    # =========================================================================
+    # 집계
+    # =========================================================================
+
+    def _load_db_records(self, since: datetime) -> Optional[List[Dict[str, Any]]]:
+        """llm_usage 테이블의 since 이후 기록 (조회 실패 시 None)"""
+        from sqlalchemy import select
+        from sqlalchemy.exc import SQLAlchemyError
+        from models.database import SessionLocal
+        from models.llm_usage import LLMUsage
+
+        columns = [
+            LLMUsage.created_at, LLMUsage.operation, LLMUsage.model, LLMUsage.screen_id, LLMUsage.status,
+            LLMUsage.cache_hit, LLMUsage.prompt_tokens, LLMUsage.cached_tokens, LLMUsage.output_tokens,
+            LLMUsage.latency_ms,
+        ]
+        db = SessionLocal()
+        try:
+            rows = db.execute(select(*columns).where(LLMUsage.created_at >= since)).mappings().all()
+            return [dict(row) for row in rows]
+        except SQLAlchemyError as e:
+            logger.warning(f"⚠️ llm_usage 조회 실패 - 메모리 기록으로 집계: {type(e).__name__}")
+            return None
+        finally:
+            db.close()
+
+    def summarize(self, days: int = 7) -> Dict[str, Any]:
+        """
+        최근 days일 집계 (동기 - DB 조회 포함, 호출자는 스레드에서 실행)
+
+        llm_usage 테이블을 쓸 수 있으면 테이블(전체 프로세스), 아니면 이 프로세스의 링 버퍼 기준
+        """
+        since = _now() - timedelta(days=days)
+        records = None
+        if self.use_db:
+            self.flush()
+            records = self._load_db_records(since)
+        source = "db"
+        if records is None:
+            with self._lock:
+                records = [r for r in self._recent if r["created_at"] >= since]
+            source = "memory"
+
+        for record in records:
+            record["day"] = record["created_at"].date().isoformat()
+
+        screens = _group([r for r in records if r["screen_id"] is not None], "screen_id")
+        top_screens = sorted(screens.items(), key=lambda item: item[1]["total_tokens"], reverse=True)[:TOP_SCREENS]
+        return {
+            "source": source,
+            "days": days,
+            "since": since.isoformat(),
+            "totals": _aggregate(records),
+            "by_operation": _group(records, "operation"),
+            "by_model": _group(records, "model"),
+            "by_day": _group(records, "day"),
+            "top_screens": [{"screen_id": int(screen_id), **summary} for screen_id, summary in top_screens],
+        }
+
+
+# 싱글톤 인스턴스
+_recorder_instance: Optional[UsageRecorder] = None
+
+
+def get_usage_recorder() -> UsageRecorder:
+    """UsageRecorder 싱글톤 인스턴스 반환"""
+    global _recorder_instance
+    if _recorder_instance is None:
+        _recorder_instance = UsageRecorder(
+            use_db=os.getenv("USAGE_METRICS_DB", "true").lower() in ("1", "true", "yes"),
+            buffer_size=int(os.getenv("USAGE_METRICS_BUFFER", "5000")),
+            flush_size=int(os.getenv("USAGE_METRICS_FLUSH_SIZE", "20")),
+            flush_interval=float(os.getenv("USAGE_METRICS_FLUSH_INTERVAL", "10")),
+            retention_days=int(os.getenv("USAGE_METRICS_RETENTION_DAYS", "30"))
+        )
+    return _recorder_instance
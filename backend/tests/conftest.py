@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+pytest 공통 설정
+
+backend/ 를 import 경로에 추가하고, 외부 서비스(Gemini/Redis/DB) 없이 모듈을 import할 수 있도록
+테스트용 환경 변수를 지정합니다. (실제 API 호출이 필요한 테스트는 두지 않음)
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("GOOGLE_API_KEY", "test-key")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+os.environ.setdefault("EVENT_BUS_BACKEND", "memory")
+os.environ.setdefault("JOB_QUEUE_BACKEND", "memory")
+# 모델 라우팅 테이블은 DB 대신 환경 변수만 사용
+os.environ.setdefault("GEMINI_MODEL_ROUTES_DB", "false")
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""utils/code_compact.py 문서 추출용 React 코드 압축 테스트"""
+import pytest
+
+from utils.code_compact import compact_react_code, estimate_tokens, strip_comments, trim_sample_rows
+
+
+def rows(count: int) -> str:
+    return ", ".join(f"{{ id: {n}, name: '사용자{n}', email: 'user{n}@example.com' }}" for n in range(1, count + 1))
+
+
+SCREEN_CODE = f"""import React, {{ useState }} from 'react';
+
+// 컬럼 정의
+const columns = [{{ key: 'name', label: '이름' }}, {{ key: 'email', label: '이메일' }}, {{ key: 'role', label: '권한' }},
+  {{ key: 'team', label: '팀' }}];
+const roleOptions = [{{ value: 'admin', title: '관리자' }}, {{ value: 'user', title: '사용자' }},
+  {{ value: 'guest', title: '손님' }}, {{ value: 'ops', title: '운영자' }}];
+const sampleData = [{rows(10)}];
+
+export default function UserList() {{
+  const [users, setUsers] = useState([{rows(8)}]);
+  const [keyword, setKeyword] = useState('');
+  const [isModal0Open, setIsModal0Open] = useState(false);
+
+  /* 검색 조건으로 목록 필터링 - 이름/이메일 부분 일치 */
+  const handleSearch = () => {{
+    setUsers(sampleData.filter((user) => user.name.includes(keyword) || user.email.includes(keyword)));
+  }};
+
+  return (
+    <div className="min-h-screen bg-gray-50 p-6 flex flex-col gap-4 rounded-lg shadow-sm border border-gray-200">
+      {{/* 검색 영역 */}}
+      <input className="border rounded px-3 py-2 w-64 text-sm" value={{keyword}}
+        onChange={{(e) => setKeyword(e.target.value)}} />
+      <button className="bg-blue-600 text-white px-4 py-2 rounded hover:bg-blue-700"
+        onClick={{handleSearch}}>조회</button>
+      <button onClick={{() => setIsModal0Open(true)}}>등록</button>
+      <svg><path d="M10 10 L20 20 L30 10 L40 20 L50 10 L60 20 L70 10 L80 20 L90 10" /></svg>
+      <table>
+        <tbody>
+          {{users.map((user) => (
+            <tr key={{user.id}}><td>{{user.name}}</td><td>{{user.email}}</td></tr>
+          ))}}
+        </tbody>
+      </table>
+    </div>
+  );
+}}
+"""
+
+
+@pytest.mark.parametrize("budget", [0, -1])
+def test_non_positive_budget_returns_original(budget):
+    code, report = compact_react_code(SCREEN_CODE, budget)
+
+    assert code == SCREEN_CODE
+    assert report["tokens_after"] == report["tokens_before"]
+    assert report["level"] == 0
+
+
+def test_under_budget_returns_original():
+    budget = estimate_tokens(SCREEN_CODE)
+
+    code, report = compact_react_code(SCREEN_CODE, budget)
+
+    assert code == SCREEN_CODE
+    assert report["level"] == 0
+
+
+def test_compaction_preserves_jsx_handlers_and_labels():
+    code, report = compact_react_code(SCREEN_CODE, 50)
+
+    # 마지막 단계까지 적용해도 예산을 넘으면 자르지 않고 반환
+    assert report["level"] == 3
+    assert report["tokens_after"] < report["tokens_before"]
+    for kept in (
+        "const [keyword, setKeyword] = useState('');",
+        "const [isModal0Open, setIsModal0Open] = useState(false);",
+        "setUsers(sampleData.filter((user) => user.name.includes(keyword) || user.email.includes(keyword)));",
+        "onClick={() => setIsModal0Open(true)}>등록</button>",
+        "{/* 검색 영역 */}",
+        "<tr key={user.id}><td>{user.name}</td><td>{user.email}</td></tr>",
+        "label: '권한'",
+        "title: '운영자'",
+    ):
+        assert kept in code
+    assert "className" not in code
+    assert "/* 검색 조건으로" not in code
+    assert "L90 10" not in code
+
+
+def test_compaction_stops_at_first_level_within_budget():
+    # 0단계: 빈 줄/SVG path만 정리
+    level_0, report_0 = compact_react_code(SCREEN_CODE, estimate_tokens(SCREEN_CODE) - 1)
+
+    assert report_0["level"] == 0
+    assert "\n\n" not in level_0
+    assert '<path d="…" />' in level_0
+    assert "사용자10" in level_0
+
+    # 1단계: 샘플 데이터 3건, className 6개까지
+    level_1, report_1 = compact_react_code(SCREEN_CODE, report_0["tokens_after"] - 1)
+
+    assert report_1["level"] == 1
+    assert "사용자3" in level_1 and "사용자4'" not in level_1
+    assert 'className="min-h-screen bg-gray-50 p-6 flex flex-col gap-4 …"' in level_1
+
+
+def test_trim_only_data_arrays():
+    trimmed = trim_sample_rows(SCREEN_CODE, 2)
+
+    # useState 초기값 / data 이름 배열만 줄임
+    assert f"useState([{rows(2)}, /* … 외 6건 */ ])" in trimmed
+    assert f"const sampleData = [{rows(2)}, /* … 외 8건 */ ];" in trimmed
+    # label/title 키가 있는 컬럼/옵션 정의는 유지
+    assert "{ key: 'team', label: '팀' }" in trimmed
+    assert "{ value: 'ops', title: '운영자' }" in trimmed
+
+
+@pytest.mark.parametrize("code", [
+    # 데이터 이름이 아닌 변수
+    f"const steps = [{rows(5)}];",
+    # 객체가 아닌 원소
+    "const items = [1, 2, 3, 4, 5];",
+    # max_rows 이하
+    f"const rows = [{rows(2)}];",
+])
+def test_trim_leaves_other_arrays(code):
+    assert trim_sample_rows(code, 2) == code
+
+
+def test_strip_comments_keeps_strings_and_urls():
+    code = "const url = 'http://example.com'; // 주소\nconst s = \"/* 문자열 */\";\n{/* 검색 영역 */}"
+
+    assert strip_comments(code) == "const url = 'http://example.com'; \nconst s = \"/* 문자열 */\";\n{/* 검색 영역 */}"
+    assert strip_comments("<div>\n  {/* 검색 영역 */}\n</div>", keep_labels=False) == "<div>\n  \n</div>"
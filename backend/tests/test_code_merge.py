@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""utils/code_merge.py 연속 생성 응답 병합 테스트"""
+from utils.code_merge import (
+    find_line_overlap,
+    jsx_balance,
+    merge_continuation,
+    strip_duplicate_imports,
+)
+
+COMPLETE_CODE = """```tsx
+import React, { useState } from 'react';
+
+export default function UserList() {
+  const [isModal1Open, setIsModal1Open] = useState(false);
+  return (
+    <div className="p-4">
+      <button onClick={() => setIsModal1Open(true)}>등록</button>
+      <table className="w-full">
+        <tbody></tbody>
+      </table>
+    </div>
+  );
+}
+```"""
+
+
+def split_at(marker: str):
+    """COMPLETE_CODE를 marker 앞에서 끊은 (누적, 나머지)"""
+    index = COMPLETE_CODE.index(marker)
+    return COMPLETE_CODE[:index], COMPLETE_CODE[index:]
+
+
+def test_no_overlap_appends_as_is():
+    # 끊긴 글자부터 정확히 이어 쓴 경우
+    accumulated, rest = split_at("Open(true)}>등록")
+
+    assert find_line_overlap(accumulated, rest) == 0
+    assert merge_continuation(accumulated, rest) == COMPLETE_CODE
+
+
+def test_no_overlap_after_complete_line():
+    accumulated, rest = split_at("      <table")
+
+    assert merge_continuation(accumulated, rest) == COMPLETE_CODE
+
+
+def test_full_overlap_keeps_one_copy():
+    # 연속 응답이 이미 받은 줄 전체를 반복 (끊긴 마지막 줄부터 다시 씀)
+    accumulated, rest = split_at("등록</button>")
+    lines = accumulated.split("\n")
+    continuation = "\n".join(line for line in lines[5:-1]) + "\n" + lines[-1] + rest
+
+    merged = merge_continuation(accumulated, continuation)
+
+    assert merged == COMPLETE_CODE
+    assert merged.count("const [isModal1Open") == 1
+
+
+def test_overlap_inside_repeated_line():
+    # 줄 중간에서 끊긴 뒤 그 줄을 처음부터 다시 씀
+    accumulated, rest = split_at('w-full">')
+    repeated_line = accumulated[accumulated.rindex("\n") + 1:]
+    continuation = repeated_line.strip() + rest
+
+    assert find_line_overlap(accumulated, continuation) == 1
+    merged = merge_continuation(accumulated, continuation)
+
+    assert merged.count("<table") == 1
+    assert jsx_balance(merged) == (0, 0)
+
+
+def test_overlap_requires_enough_characters():
+    # "}" 같은 짧은 줄의 우연한 일치는 겹침으로 보지 않음
+    assert find_line_overlap("  );\n}\n", "  );\n}\nexport default App;") == 0
+
+
+def test_fenced_continuation():
+    # 연속 응답이 코드 펜스와 import를 다시 열고 마지막 두 줄을 반복
+    accumulated, rest = split_at("      </table>")
+    repeated = "\n".join(accumulated.split("\n")[-3:-1])
+    continuation = (
+        "```tsx\nimport React, { useState } from 'react';\n\n"
+        f"{repeated}\n{rest}"
+    )
+
+    merged = merge_continuation(accumulated, continuation)
+
+    assert merged == COMPLETE_CODE
+    assert merged.count("```") == 2
+
+
+def test_strip_duplicate_imports_keeps_new_imports():
+    accumulated = "import React from 'react';\n\nfunction A() {"
+    continuation = "import React from 'react';\nimport { X } from 'lucide-react';\n  return null;\n}"
+
+    assert strip_duplicate_imports(accumulated, continuation) == (
+        "import { X } from 'lucide-react';\n  return null;\n}"
+    )
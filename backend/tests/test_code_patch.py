@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""utils/code_patch.py + GeminiClient 패치 적용 실패 시 전체 코드 재요청 테스트"""
+import pytest
+
+from utils.code_patch import (
+    PatchError,
+    apply_patch,
+    bracket_balance,
+    has_patch_blocks,
+    parse_patch_blocks,
+)
+
+BASE_CODE = """function App() {
+  const [rows, setRows] = useState([]);
+  return (
+    <div className="p-4">
+      <h1>목록</h1>
+    </div>
+  );
+}"""
+
+
+def block(search: str, replace: str) -> str:
+    return f"<<<<<<< SEARCH\n{search}\n=======\n{replace}\n>>>>>>> REPLACE"
+
+
+# =========================================================================
+# 파싱
+# =========================================================================
+
+def test_parse_blocks_inside_code_fence():
+    text = "```tsx\n" + block("<h1>목록</h1>", "<h1>사용자 목록</h1>") + "\n" + block("a", "b") + "\n```"
+
+    assert has_patch_blocks(text)
+    assert parse_patch_blocks(text) == [("<h1>목록</h1>", "<h1>사용자 목록</h1>"), ("a", "b")]
+
+
+@pytest.mark.parametrize("text", [
+    # 블록 없음
+    "```tsx\nfunction App() {}\n```",
+    # REPLACE 마커 없이 끊김
+    "<<<<<<< SEARCH\n<h1>목록</h1>\n=======\n<h1>사용자 목록</h1>\n",
+    # 구분선 없음
+    "<<<<<<< SEARCH\n<h1>목록</h1>\n>>>>>>> REPLACE",
+    # 두 번째 블록이 끊김
+    block("a", "b") + "\n<<<<<<< SEARCH\nc\n=======\n",
+])
+def test_parse_malformed_markers(text):
+    with pytest.raises(PatchError):
+        parse_patch_blocks(text)
+
+
+# =========================================================================
+# 적용
+# =========================================================================
+
+def test_apply_exact_match():
+    patched = apply_patch(BASE_CODE, block("      <h1>목록</h1>", "      <h1>사용자 목록</h1>"))
+
+    assert "<h1>사용자 목록</h1>" in patched
+    assert "<h1>목록</h1>" not in patched
+    assert bracket_balance(patched) == (0, 0)
+
+
+def test_apply_blocks_in_order():
+    patch = (
+        block("<h1>목록</h1>", "<h1>사용자</h1>") + "\n"
+        + block("<h1>사용자</h1>", "<h1>사용자 목록</h1>")
+    )
+
+    assert "<h1>사용자 목록</h1>" in apply_patch(BASE_CODE, patch)
+
+
+def test_apply_empty_search_appends():
+    patched = apply_patch(BASE_CODE, block("", "export default App;"))
+
+    assert patched.endswith("}\nexport default App;\n")
+
+
+def test_apply_ignores_indentation_differences():
+    # 모델이 들여쓰기를 잘못 복사한 SEARCH
+    search = "<div className=\"p-4\">\n<h1>목록</h1>\n</div>"
+    replace = "    <div className=\"p-6\">\n      <h1>목록</h1>\n    </div>"
+
+    patched = apply_patch(BASE_CODE, block(search, replace))
+
+    assert 'className="p-6"' in patched
+    assert 'className="p-4"' not in patched
+
+
+def test_apply_missing_search_fails():
+    with pytest.raises(PatchError, match="일치하는 코드가 없습니다"):
+        apply_patch(BASE_CODE, block("<h2>없는 제목</h2>", "<h2>제목</h2>"))
+
+
+def test_apply_multiple_exact_matches_fail():
+    code = BASE_CODE.replace("<h1>목록</h1>", "<h1>목록</h1>\n      <h1>목록</h1>")
+
+    with pytest.raises(PatchError, match="2곳과 일치합니다"):
+        apply_patch(code, block("<h1>목록</h1>", "<h1>사용자 목록</h1>"))
+
+
+def test_apply_multiple_whitespace_matches_fail():
+    code = BASE_CODE.replace("      <h1>목록</h1>", "      <h1>목록</h1>\n        <h1>목록</h1>")
+
+    with pytest.raises(PatchError, match="2곳과 일치합니다"):
+        apply_patch(code, block(" <h1>목록</h1> ", "<h1>사용자 목록</h1>"))
+
+
+def test_apply_rejects_broken_brackets():
+    with pytest.raises(PatchError, match="괄호 짝 불일치"):
+        apply_patch(BASE_CODE, block("  );\n}", "  );"))
+
+
+def test_apply_allows_incomplete_previous_code():
+    # 앞 단계 코드가 끊겨 괄호가 열려 있으면 열린 괄호는 허용
+    incomplete = BASE_CODE.rsplit("\n", 2)[0]
+
+    patched = apply_patch(incomplete, block("<h1>목록</h1>", "<h1>사용자 목록</h1>"))
+
+    assert "<h1>사용자 목록</h1>" in patched
+
+
+def test_bracket_balance_ignores_strings_and_comments():
+    code = "const a = '{(['; // )}]\n/* { */ const b = `}`;\nfunction f() { return [1, (2)]; }"
+
+    assert bracket_balance(code) == (0, 0)
+    assert bracket_balance("}{") == (1, 1)
+
+
+# =========================================================================
+# GeminiClient.generate_prototype - 패치 실패 시 전체 코드 재요청
+# =========================================================================
+
+STAGE_2_CODE = BASE_CODE.replace("<h1>목록</h1>", "<h1>사용자 목록</h1>")
+
+
+def fenced(code: str) -> str:
+    return f"```tsx\n{code}\n```"
+
+
+@pytest.fixture
+def patch_client(monkeypatch):
+    """Stage 1~2만 실행하는 patch 모드 GeminiClient (_send_stage는 작업 이름별 고정 응답)"""
+    from services.gemini_client import GeminiClient
+
+    client = GeminiClient(api_key="test-key")
+    client.stage_output = GeminiClient.STAGE_OUTPUT_PATCH
+    client.sent = []
+
+    async def no_cache(system_prompt):
+        return None
+
+    async def fake_send_stage(chat_session, prompt, operation_name, chunk_callback=None):
+        client.sent.append(operation_name)
+        return client.responses[operation_name]
+
+    monkeypatch.setattr(client.context_cache, "get_or_create", no_cache)
+    monkeypatch.setattr(client, "_send_stage", fake_send_stage)
+    monkeypatch.setattr(
+        client, "_create_stage_prompts",
+        lambda *args, **kwargs: [("구조", "Stage 1 요청"), ("기능", "Stage 2 요청")]
+    )
+    return client
+
+
+async def generate(client, stage_2_response: str) -> dict:
+    client.responses = {
+        "Stage-1": fenced(BASE_CODE),
+        "Stage-2": stage_2_response,
+        "Stage-2-full": fenced(STAGE_2_CODE),
+    }
+    return await client.generate_prototype(full_prompt="화면", system_prompt="시스템")
+
+
+@pytest.mark.asyncio
+async def test_generate_applies_patch(patch_client):
+    result = await generate(patch_client, block("<h1>목록</h1>", "<h1>사용자 목록</h1>"))
+
+    assert result["code"] == STAGE_2_CODE
+    assert patch_client.sent == ["Stage-1", "Stage-2"]
+    assert patch_client.patch_stats == {"applied": 1, "fallback": 0, "full_output": 0}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stage_2_response", [
+    # SEARCH 불일치
+    block("<h2>없는 제목</h2>", "<h2>제목</h2>"),
+    # SEARCH가 여러 곳과 일치 (<div>, </div>)
+    block("div", "section"),
+    # 마커 형식 오류 (REPLACE 마커만 있고 구분선 없음)
+    "<<<<<<< SEARCH\n<h1>목록</h1>\n>>>>>>> REPLACE",
+    # 적용 후 괄호 짝 불일치
+    block("  );\n}", "  );"),
+], ids=["missing-search", "multiple-matches", "malformed-markers", "broken-brackets"])
+async def test_generate_falls_back_to_full_code(patch_client, stage_2_response):
+    result = await generate(patch_client, stage_2_response)
+
+    assert result["code"] == STAGE_2_CODE
+    assert patch_client.sent == ["Stage-1", "Stage-2", "Stage-2-full"]
+    assert patch_client.patch_stats == {"applied": 0, "fallback": 1, "full_output": 0}
+
+
+@pytest.mark.asyncio
+async def test_generate_accepts_full_code_instead_of_patch(patch_client):
+    result = await generate(patch_client, fenced(STAGE_2_CODE))
+
+    assert result["code"] == STAGE_2_CODE
+    assert patch_client.sent == ["Stage-1", "Stage-2"]
+    assert patch_client.patch_stats == {"applied": 0, "fallback": 0, "full_output": 1}
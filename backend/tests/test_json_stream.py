@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""utils/json_stream.py 섹션 파싱 + DocumentService._extract_json 섹션 복구 테스트"""
+import json
+
+import pytest
+
+from utils.doc_schemas import DESIGN_SPEC_SCHEMA
+from utils.json_stream import JsonSectionParser, sub_schema
+
+DESIGN_SPEC = {
+    "basic_info": {"screen_name": "사용자 목록", "component_name": "UserList", "description": "사용자 \"조회\" 화면"},
+    "layout_structure": [{"area_name": "검색", "description": "검색 조건", "components": ["input", "button"]}],
+    "user_flow": [{"step": 1, "action": "조회 클릭", "system_response": "목록 표시"}],
+    "state_specs": [{"name": "rows", "type": "array", "initial_value": "[]", "description": "목록 {데이터}"}],
+    "event_handlers": [{"ui_element": "조회", "name": "handleSearch", "trigger": "onClick", "logic": "a, b"}],
+}
+VALID_TEXT = json.dumps(DESIGN_SPEC, ensure_ascii=False, indent=2)
+# layout_structure 값 안의 따옴표가 이스케이프되지 않은 응답
+BROKEN_TEXT = VALID_TEXT.replace('"description": "검색 조건"', '"description": "검색 "조건""')
+# event_handlers 섹션 도중 끊긴 응답
+TRUNCATED_TEXT = VALID_TEXT[:VALID_TEXT.index('"handleSearch"')]
+
+
+def feed_in_chunks(text: str, size: int = 7) -> JsonSectionParser:
+    parser = JsonSectionParser()
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser.finish()
+
+
+def section_text(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False)
+
+
+# =========================================================================
+# JsonSectionParser
+# =========================================================================
+
+def test_parser_valid_json_in_chunks():
+    parser = feed_in_chunks(f"```json\n{VALID_TEXT}\n```")
+
+    assert parser.is_valid
+    assert parser.sections == DESIGN_SPEC
+    assert parser.missing_keys(DESIGN_SPEC_SCHEMA) == []
+
+
+def test_parser_reports_sections_as_they_complete():
+    parser = JsonSectionParser()
+    first = VALID_TEXT.index('"user_flow"')
+
+    assert parser.feed(VALID_TEXT[:first]) == ["basic_info", "layout_structure"]
+    assert parser.feed(VALID_TEXT[first:]) == ["user_flow", "state_specs", "event_handlers"]
+
+
+def test_parser_truncated_object():
+    parser = feed_in_chunks(TRUNCATED_TEXT)
+
+    assert not parser.is_valid
+    assert parser.truncated == "event_handlers"
+    assert list(parser.sections) == ["basic_info", "layout_structure", "user_flow", "state_specs"]
+    assert parser.missing_keys(DESIGN_SPEC_SCHEMA) == ["event_handlers"]
+
+
+def test_parser_keeps_other_sections_when_one_is_broken():
+    parser = feed_in_chunks(BROKEN_TEXT)
+
+    assert not parser.is_valid
+    assert list(parser.invalid) == ["layout_structure"]
+    assert parser.invalid["layout_structure"].startswith('"layout_structure": [')
+    assert parser.sections == {k: v for k, v in DESIGN_SPEC.items() if k != "layout_structure"}
+    assert parser.missing_keys(DESIGN_SPEC_SCHEMA) == []
+
+
+def test_sub_schema():
+    schema = sub_schema(DESIGN_SPEC_SCHEMA, ["event_handlers", "unknown", "basic_info"])
+
+    assert schema["required"] == ["event_handlers", "basic_info"]
+    assert schema["propertyOrdering"] == ["event_handlers", "basic_info"]
+    assert schema["properties"]["basic_info"] == DESIGN_SPEC_SCHEMA["properties"]["basic_info"]
+
+
+# =========================================================================
+# DocumentService._extract_json (GeminiClient.generate_json_async)
+# =========================================================================
+
+@pytest.fixture
+def document_service(monkeypatch):
+    """응답을 순서대로 스트리밍하는 GeminiClient를 쓰는 DocumentService (요청 스키마/프롬프트 기록)"""
+    from services.document_service import DocumentService
+    from services.gemini_client import GeminiClient
+
+    client = GeminiClient(api_key="test-key")
+    client.responses = []
+    client.requests = []
+
+    async def fake_stream(contents, temperature, max_output_tokens, timeout, use_cache, response_schema):
+        client.requests.append({"prompt": json.dumps(contents, ensure_ascii=False), "schema": response_schema})
+        text = client.responses.pop(0)
+        for i in range(0, len(text), 11):
+            yield {"text": text[i:i + 11]}
+
+    monkeypatch.setattr(client, "_stream_api_async", fake_stream)
+    service = DocumentService()
+    monkeypatch.setattr(service, "client", client)
+    return service
+
+
+async def extract(service) -> dict:
+    return await service._extract_json("설계서 프롬프트", "design_doc", "Design-Spec", "design-spec")
+
+
+@pytest.mark.asyncio
+async def test_extract_json_valid(document_service):
+    client = document_service.client
+    client.responses = [VALID_TEXT]
+
+    assert await extract(document_service) == DESIGN_SPEC
+    assert len(client.requests) == 1
+    assert client.json_stats["valid"] == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_json_regenerates_truncated_section(document_service):
+    client = document_service.client
+    client.responses = [TRUNCATED_TEXT, section_text({"event_handlers": DESIGN_SPEC["event_handlers"]})]
+
+    assert await extract(document_service) == DESIGN_SPEC
+    # 원본 프롬프트 + 누락 섹션만 남긴 스키마로 재요청
+    retry = client.requests[1]
+    assert retry["schema"]["required"] == ["event_handlers"]
+    assert "설계서 프롬프트" in retry["prompt"] and "event_handlers" in retry["prompt"]
+    assert (client.json_stats["section_retries"], client.json_stats["repaired"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_extract_json_repairs_only_broken_section(document_service):
+    client = document_service.client
+    client.responses = [BROKEN_TEXT, section_text({"layout_structure": DESIGN_SPEC["layout_structure"]})]
+
+    assert await extract(document_service) == DESIGN_SPEC
+    # 깨진 조각만 보내 고침 (원본 프롬프트 재전송 없음), 나머지 섹션은 첫 응답 그대로
+    repair = client.requests[1]
+    assert repair["schema"]["required"] == ["layout_structure"]
+    assert "설계서 프롬프트" not in repair["prompt"]
+    assert len(client.requests) == 2
+    assert (client.json_stats["fragment_repairs"], client.json_stats["repaired"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_extract_json_returns_partial_when_repair_fails(document_service):
+    client = document_service.client
+    client.max_json_repairs = 1
+    client.responses = [TRUNCATED_TEXT, "{"]
+
+    data = await extract(document_service)
+
+    assert list(data) == ["basic_info", "layout_structure", "user_flow", "state_specs"]
+    assert client.json_stats["incomplete"] == 1
+
+
+@pytest.mark.asyncio
+async def test_extract_json_fails_without_any_section(document_service):
+    document_service.client.max_json_repairs = 0
+    document_service.client.responses = ["응답 없음"]
+
+    with pytest.raises(Exception, match="invalid_json"):
+        await extract(document_service)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""utils/modal_splicer.py 모달 병합 + AIService 인라인 모달 재실행 테스트"""
+import pytest
+
+from utils.code_merge import jsx_balance
+from utils.code_patch import bracket_balance
+from utils.modal_splicer import ModalSpliceError, normalize_modal_component, splice_modals
+
+MODAL_1 = """function ForgeModal1({ onClose, selectedRow }) {
+  return (
+    <div className="fixed inset-0">
+      <button onClick={onClose}>닫기</button>
+    </div>
+  );
+}"""
+
+MAIN_CODE = """import React, { useState } from 'react';
+
+export default function UserList() {
+  const [selectedRow, setSelectedRow] = useState(null);
+  const [isModal1Open, setIsModal1Open] = useState(false);
+  return (
+    <div className="p-4">
+      <button onClick={() => setIsModal1Open(true)}>등록</button>
+    </div>
+  );
+}
+"""
+
+
+def assert_balanced(code: str):
+    assert bracket_balance(code) == (0, 0)
+    assert jsx_balance(code) == (0, 0)
+
+
+def test_splice_inserts_component_and_render():
+    code = splice_modals(MAIN_CODE, {1: MODAL_1})
+
+    assert code.index("function ForgeModal1") < code.index("export default function UserList")
+    assert (
+        "      {isModal1Open && <ForgeModal1 onClose={() => setIsModal1Open(false)} selectedRow={selectedRow} />}\n"
+        "    </div>"
+    ) in code
+    assert code.count("useState(false)") == 1
+    assert_balanced(code)
+
+
+def test_splice_is_deterministic():
+    modal_2 = MODAL_1.replace("ForgeModal1", "ForgeModal2")
+    main = MAIN_CODE.replace("setIsModal1Open(true)", "setIsModal2Open(true)")
+
+    first = splice_modals(main, {2: modal_2, 1: MODAL_1})
+
+    assert first == splice_modals(main, {1: MODAL_1, 2: modal_2})
+    assert first.index("function ForgeModal1") < first.index("function ForgeModal2")
+
+
+def test_splice_main_without_return_parentheses():
+    main = (
+        "export default function UserList() {\n"
+        "  const [isModal1Open, setIsModal1Open] = useState(false);\n"
+        "  return <div className=\"p-4\"><button onClick={() => setIsModal1Open(true)}>등록</button></div>;\n"
+        "}\n"
+    )
+
+    code = splice_modals(main, {1: MODAL_1})
+
+    # 루트 요소의 닫는 태그 직전에 렌더링
+    assert "{isModal1Open && <ForgeModal1 onClose={() => setIsModal1Open(false)} />}\n</div>;" in code
+    assert_balanced(code)
+
+
+def test_splice_adds_missing_modal_state():
+    main = MAIN_CODE.replace("  const [isModal1Open, setIsModal1Open] = useState(false);\n", "")
+
+    code = splice_modals(main, {1: MODAL_1})
+
+    assert "export default function UserList() {\n  const [isModal1Open, setIsModal1Open] = useState(false);" in code
+    assert code.count("const [isModal1Open") == 1
+
+
+def test_splice_arrow_component_with_named_export():
+    main = (
+        "const UserList = () => {\n"
+        "  return (\n"
+        "    <div>\n"
+        "      <button onClick={() => setIsModal1Open(true)}>등록</button>\n"
+        "    </div>\n"
+        "  );\n"
+        "};\n\n"
+        "export default UserList;\n"
+    )
+
+    code = splice_modals(main, {1: MODAL_1})
+
+    assert code.index("function ForgeModal1") < code.index("const UserList")
+    assert "const [isModal1Open, setIsModal1Open] = useState(false);" in code
+    assert_balanced(code)
+
+
+def test_splice_replaces_existing_modal_definition_and_render():
+    # 모델이 모달 컴포넌트와 렌더링까지 직접 쓴 경우 - 따로 생성한 컴포넌트만 남김
+    existing = MODAL_1.replace("닫기", "이전 모달")
+    main = MAIN_CODE.replace(
+        "export default function",
+        f"{existing}\n\nexport default function"
+    ).replace(
+        "    </div>\n  );\n}\n",
+        "      {isModal1Open && <ForgeModal1 onClose={() => setIsModal1Open(false)} />}\n    </div>\n  );\n}\n"
+    )
+
+    code = splice_modals(main, {1: MODAL_1})
+
+    assert code.count("function ForgeModal1") == 1
+    assert code.count("<ForgeModal1 ") == 1
+    assert "이전 모달" not in code
+    assert_balanced(code)
+
+
+def test_splice_replaces_existing_arrow_modal_definition():
+    existing = "const ForgeModal1 = ({ onClose }) => {\n  return <div>이전 모달</div>;\n};\n\n"
+
+    code = splice_modals(existing + MAIN_CODE, {1: MODAL_1})
+
+    assert "ForgeModal1 =" not in code
+    assert code.count("function ForgeModal1") == 1
+
+
+@pytest.mark.parametrize("main", [
+    # 표현식 본문 (블록 본문이 아님)
+    "const UserList = () => (\n  <div>목록</div>\n);\n\nexport default UserList;\n",
+    # export default 없음
+    "function UserList() {\n  return <div>목록</div>;\n}\n",
+    # 루트 닫는 태그 없음
+    "export default function UserList() {\n  return null;\n}\n",
+])
+def test_splice_unsupported_main_raises(main):
+    with pytest.raises(ModalSpliceError):
+        splice_modals(main, {1: MODAL_1})
+
+
+def test_normalize_modal_component():
+    generated = (
+        "import React from 'react';\n\n"
+        "export default function ForgeModal1({ onClose }) {\n  return <div />;\n}\n"
+    )
+
+    assert normalize_modal_component(generated, 1) == "function ForgeModal1({ onClose }) {\n  return <div />;\n}"
+    with pytest.raises(ModalSpliceError):
+        normalize_modal_component(generated, 2)
+    with pytest.raises(ModalSpliceError):
+        normalize_modal_component("function ForgeModal1() {\n  return <div>;\n", 1)
+
+
+# =========================================================================
+# AIService.generate_prototype - 병합 실패 시 인라인 모달로 Step 4 재실행
+# =========================================================================
+
+WIZARD_DATA = {
+    "step1": {},
+    "step2": {},
+    "step3": {"components": []},
+    "step4": {"interactions": [{"actionType": "open-modal", "targetModal": "사용자 등록"}]},
+}
+
+STAGES = [{"stage": 1, "input_hash": "h1", "code": "초안"}]
+
+# 모달 인덱스는 0부터 (isModal0Open)
+MODAL_0 = MODAL_1.replace("ForgeModal1", "ForgeModal0")
+MAIN_CODE_0 = MAIN_CODE.replace("Modal1Open", "Modal0Open")
+
+
+@pytest.mark.asyncio
+async def test_inline_rerun_after_splice_failure(monkeypatch):
+    from services.ai_service import AIService
+
+    service = AIService()
+    calls = []
+
+    async def fake_generate_prototype(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            # 합칠 수 없는 메인 코드 (표현식 본문)
+            return {"code": "const UserList = () => (<div />);\nexport default UserList;", "stages": STAGES}
+        return {"code": MAIN_CODE_0, "stages": STAGES + [{"stage": 2, "input_hash": "h2", "code": MAIN_CODE_0}]}
+
+    async def fake_modals(modals, screen_name):
+        return {0: MODAL_0}
+
+    monkeypatch.setattr(service.client, "generate_prototype", fake_generate_prototype)
+    monkeypatch.setattr(service.modal_fanout, "applies_to", lambda modals: True)
+    monkeypatch.setattr(service.modal_fanout, "generate", fake_modals)
+    reruns = service.modal_fanout.stats["inline_reruns"]
+
+    result = await service.generate_prototype("회원", "사용자 목록", WIZARD_DATA)
+
+    assert len(calls) == 2
+    # 첫 실행의 단계 기록을 재사용하고 Step 4는 인라인 모달 명세로 교체
+    assert calls[1]["stage_memo"] is STAGES
+    assert calls[1]["step_prompts"][:3] == calls[0]["step_prompts"][:3]
+    assert calls[1]["step_prompts"][3] != calls[0]["step_prompts"][3]
+    # 모달 가중치가 다시 포함된 계획 (simple → medium)
+    assert calls[0]["stage_plan"].tier == "simple"
+    assert calls[1]["stage_plan"].tier == "medium"
+    assert result["prototype_html"] == MAIN_CODE_0
+    assert result["modal_fanout"] == 0
+    assert service.modal_fanout.stats["inline_reruns"] == reruns + 1
+
+
+@pytest.mark.asyncio
+async def test_fanout_splices_without_rerun(monkeypatch):
+    from services.ai_service import AIService
+
+    service = AIService()
+    calls = []
+
+    async def fake_generate_prototype(**kwargs):
+        calls.append(kwargs)
+        return {"code": MAIN_CODE_0, "stages": STAGES}
+
+    async def fake_modals(modals, screen_name):
+        return {0: MODAL_0}
+
+    monkeypatch.setattr(service.client, "generate_prototype", fake_generate_prototype)
+    monkeypatch.setattr(service.modal_fanout, "applies_to", lambda modals: True)
+    monkeypatch.setattr(service.modal_fanout, "generate", fake_modals)
+
+    result = await service.generate_prototype("회원", "사용자 목록", WIZARD_DATA)
+
+    assert len(calls) == 1
+    assert "function ForgeModal0" in result["prototype_html"]
+    assert result["modal_fanout"] == 1
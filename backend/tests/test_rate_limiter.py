@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""services/rate_limiter.py RPM/TPM 토큰 버킷 + 우선순위 대기열 테스트 (가짜 시계)"""
+import asyncio
+
+import pytest
+
+from services.rate_limiter import (
+    PRIORITY_BATCH,
+    PRIORITY_DEFAULT,
+    PRIORITY_INTERACTIVE,
+    ModelRateLimiter,
+    request_priority,
+)
+
+
+class FakeClock:
+    """sleep(seconds)이 실제로 기다리지 않고 시계만 앞당기는 가짜 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float):
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def limiter(clock: FakeClock, rpm: int = 0, tpm: int = 0) -> ModelRateLimiter:
+    return ModelRateLimiter("test-model", rpm, tpm, clock=clock, sleep=clock.sleep)
+
+
+@pytest.mark.asyncio
+async def test_requests_refill_continuously(clock):
+    rate_limiter = limiter(clock, rpm=60)
+
+    for _ in range(60):
+        await rate_limiter.acquire(0)
+    assert clock.now == 0.0
+
+    # 버킷이 비면 1건(= 1초 보충)을 기다림
+    await rate_limiter.acquire(0)
+    assert clock.now == pytest.approx(1.0)
+
+    # 30초 뒤에는 30건이 다시 쌓여 있음
+    clock.now += 30
+    for _ in range(30):
+        await rate_limiter.acquire(0)
+    assert clock.now == pytest.approx(31.0)
+    assert rate_limiter.get_stats()["acquired"] == 91
+
+
+@pytest.mark.asyncio
+async def test_refill_is_capped_at_capacity(clock):
+    rate_limiter = limiter(clock, rpm=60)
+
+    clock.now += 600
+    for _ in range(60):
+        await rate_limiter.acquire(0)
+    await rate_limiter.acquire(0)
+
+    assert clock.now == pytest.approx(601.0)
+
+
+@pytest.mark.asyncio
+async def test_priority_ordering(clock):
+    rate_limiter = limiter(clock, rpm=60)
+    for _ in range(60):
+        await rate_limiter.acquire(0)
+
+    order = []
+
+    async def call(name: str, priority: int):
+        await rate_limiter.acquire(0, priority)
+        order.append(name)
+
+    # 먼저 도착한 배치 호출은 나중에 온 사용자 대기 호출 뒤에서 처리
+    tasks = [
+        asyncio.create_task(call("batch-1", PRIORITY_BATCH)),
+        asyncio.create_task(call("batch-2", PRIORITY_BATCH)),
+        asyncio.create_task(call("default", PRIORITY_DEFAULT)),
+        asyncio.create_task(call("interactive", PRIORITY_INTERACTIVE)),
+    ]
+    await asyncio.gather(*tasks)
+
+    assert order == ["interactive", "default", "batch-1", "batch-2"]
+    assert rate_limiter.get_stats()["waiting"] == 0
+
+
+def test_request_priority_context(clock):
+    rate_limiter = limiter(clock, rpm=60)
+
+    with request_priority(PRIORITY_BATCH):
+        assert rate_limiter._enqueue(None)[0] == PRIORITY_BATCH
+    assert rate_limiter._enqueue(None)[0] == PRIORITY_DEFAULT
+    assert rate_limiter._enqueue(PRIORITY_INTERACTIVE)[0] == PRIORITY_INTERACTIVE
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue(clock):
+    rate_limiter = limiter(clock, rpm=60)
+    for _ in range(60):
+        await rate_limiter.acquire(0)
+
+    task = asyncio.create_task(rate_limiter.acquire(0, PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert rate_limiter.get_stats()["waiting"] == 0
+    # 취소된 대기자가 선두를 막지 않음
+    await rate_limiter.acquire(0, PRIORITY_BATCH)
+
+
+@pytest.mark.asyncio
+async def test_tpm_debit_and_credit(clock):
+    rate_limiter = limiter(clock, tpm=1200)
+    bucket = rate_limiter._tokens
+
+    reserved = await rate_limiter.acquire(600)
+    assert reserved == 600
+    assert bucket.tokens == 600
+
+    # 실제 입력 토큰이 추정보다 적으면 차액 반환, 많으면 추가 차감
+    rate_limiter.settle(reserved, 200)
+    assert bucket.tokens == 1000
+    rate_limiter.settle(100, 400)
+    assert bucket.tokens == 700
+    # usageMetadata가 없으면 보정하지 않음, 반환은 용량까지만
+    rate_limiter.settle(600, None)
+    assert bucket.tokens == 700
+    rate_limiter.settle(5000, 0)
+    assert bucket.tokens == 1200
+
+
+@pytest.mark.asyncio
+async def test_tpm_waits_for_tokens(clock):
+    rate_limiter = limiter(clock, tpm=1200)
+
+    await rate_limiter.acquire(1200)
+    # 600 토큰 = 30초 보충
+    await rate_limiter.acquire(600)
+
+    assert clock.now == pytest.approx(30.0)
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_passes_when_bucket_is_full(clock):
+    rate_limiter = limiter(clock, tpm=1200)
+
+    await rate_limiter.acquire(5000)
+    assert clock.now == 0.0
+    assert rate_limiter._tokens.tokens == -3800
+
+    # 초과분을 갚을 때까지 다음 호출 대기 (3800 + 100 토큰 = 195초)
+    await rate_limiter.acquire(100)
+    assert clock.now == pytest.approx(195.0)
+
+
+@pytest.mark.asyncio
+async def test_penalize_pauses_all_calls(clock):
+    rate_limiter = limiter(clock, rpm=60)
+
+    rate_limiter.penalize(retry_after=3.0)
+    assert rate_limiter.get_stats()["paused_seconds"] == 3.0
+
+    await rate_limiter.acquire(0)
+    # 쿨다운 동안 보충된 요청 예산은 비운 뒤 다시 쌓이므로 최소 쿨다운만큼은 기다림
+    assert clock.now >= 3.0
+    assert rate_limiter.get_stats()["throttled"] == 1
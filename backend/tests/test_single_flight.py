@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""services/single_flight.py 동일 요청 병합 + 락 테스트 (Redis 없이 로컬 락)"""
+import asyncio
+
+import pytest
+
+import services.single_flight as single_flight_module
+from services.single_flight import SingleFlight
+
+
+class UnavailableCache:
+    def is_available(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def single_flight(monkeypatch):
+    monkeypatch.setattr(single_flight_module, "get_cache_service", lambda: UnavailableCache())
+    return SingleFlight()
+
+
+def assert_released(single_flight: SingleFlight, key: str):
+    assert not single_flight.is_inflight(key)
+    assert key not in single_flight._local_locks
+    assert single_flight.get_stats()["inflight"] == 0
+
+
+class GatedCall:
+    """release()될 때까지 끝나지 않는 fn (호출 횟수 기록)"""
+
+    def __init__(self, result=None, error: Exception = None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.gate = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.gate.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def start_callers(single_flight: SingleFlight, key: str, fn, count: int):
+    tasks = [asyncio.create_task(single_flight.do(key, fn)) for _ in range(count)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_keys_share_one_execution(single_flight):
+    fn = GatedCall(result={"code": "export default function A() {}"})
+    tasks = await start_callers(single_flight, "screen-1", fn, 5)
+
+    assert single_flight.is_inflight("screen-1")
+    fn.gate.set()
+    results = await asyncio.gather(*tasks)
+
+    assert fn.calls == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.get_stats()["leaders"] == 1
+    assert single_flight.get_stats()["coalesced"] == 4
+    assert_released(single_flight, "screen-1")
+
+
+@pytest.mark.asyncio
+async def test_different_keys_run_separately(single_flight):
+    first, second = GatedCall(result=1), GatedCall(result=2)
+    tasks = await start_callers(single_flight, "screen-1", first, 2) + \
+        await start_callers(single_flight, "screen-2", second, 2)
+
+    first.gate.set()
+    second.gate.set()
+
+    assert await asyncio.gather(*tasks) == [1, 1, 2, 2]
+    assert (first.calls, second.calls) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_exception_reaches_every_waiter(single_flight):
+    error = RuntimeError("generation failed")
+    fn = GatedCall(error=error)
+    tasks = await start_callers(single_flight, "screen-1", fn, 3)
+
+    fn.gate.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert fn.calls == 1
+    assert results == [error, error, error]
+    assert_released(single_flight, "screen-1")
+
+
+@pytest.mark.asyncio
+async def test_key_released_after_completion(single_flight):
+    fn = GatedCall(result="first")
+    fn.gate.set()
+
+    assert await single_flight.do("screen-1", fn) == "first"
+    assert_released(single_flight, "screen-1")
+
+    # 완료 후 같은 키 요청은 다시 실행
+    fn.result = "second"
+    assert await single_flight.do("screen-1", fn) == "second"
+    assert fn.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_key_released_after_failure(single_flight):
+    fn = GatedCall(error=ValueError("bad input"))
+    fn.gate.set()
+
+    with pytest.raises(ValueError):
+        await single_flight.do("screen-1", fn)
+    assert_released(single_flight, "screen-1")
+
+    fn.error = None
+    fn.result = "retried"
+    assert await single_flight.do("screen-1", fn) == "retried"
+
+
+@pytest.mark.asyncio
+async def test_key_released_after_leader_cancelled(single_flight):
+    fn = GatedCall()
+    leader, follower = await start_callers(single_flight, "screen-1", fn, 2)
+
+    leader.cancel()
+    results = await asyncio.gather(leader, follower, return_exceptions=True)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert_released(single_flight, "screen-1")
+
+
+@pytest.mark.asyncio
+async def test_lock_serializes_same_key(single_flight):
+    events = []
+
+    async def hold(name: str):
+        async with single_flight.lock("screen-1"):
+            events.append(f"{name}:enter")
+            await asyncio.sleep(0)
+            events.append(f"{name}:exit")
+
+    await asyncio.gather(hold("a"), hold("b"))
+
+    assert events == ["a:enter", "a:exit", "b:enter", "b:exit"]
+    assert "screen-1" not in single_flight._local_locks
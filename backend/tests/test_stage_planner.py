@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""services/stage_planner.py 단계 계획 + 로컬 검사(이후 단계 생략 판단) 테스트"""
+import pytest
+
+from services.stage_planner import StagePlan, plan_stages
+
+
+def wizard(components: int = 0, interactions: int = 0, modals: int = 0) -> dict:
+    """컴포넌트/일반 인터랙션/모달 인터랙션 수로 Wizard 데이터 구성"""
+    return {
+        "step3": {"components": [{"type": "table"}] * components},
+        "step4": {
+            "interactions": [{"actionType": "navigate"}] * interactions
+            + [{"actionType": "open-modal"}] * modals
+        },
+    }
+
+
+@pytest.fixture(autouse=True)
+def default_thresholds(monkeypatch):
+    for name in ("PROTOTYPE_SIMPLE_MAX_SCORE", "PROTOTYPE_MEDIUM_MAX_SCORE", "PROTOTYPE_ADAPTIVE_STAGES"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.mark.parametrize("data, modals_external, tier, score, min_stages", [
+    # 점수 = 컴포넌트 + 인터랙션 + 모달 × 2 (기본 simple ≤ 6, medium ≤ 14)
+    (None, False, "simple", 0, 1),
+    (wizard(components=6), False, "simple", 6, 1),
+    (wizard(components=7), False, "medium", 7, 2),
+    (wizard(components=4, interactions=2), False, "simple", 6, 1),
+    # 모달이 있으면 점수와 관계없이 simple 아님
+    (wizard(modals=1), False, "medium", 3, 2),
+    (wizard(components=11, modals=1), False, "medium", 14, 2),
+    (wizard(components=12, modals=1), False, "complex", 15, 4),
+    (wizard(components=15), False, "complex", 15, 4),
+    # 모달을 따로 생성하면 모달 가중치 제외 + 모달이 있어도 simple 가능
+    (wizard(components=4, modals=1), True, "simple", 5, 1),
+    (wizard(components=5, modals=1), True, "simple", 6, 1),
+    (wizard(components=6, modals=1), True, "medium", 7, 2),
+    (wizard(components=14, modals=1), True, "complex", 15, 4),
+])
+def test_tier_thresholds(data, modals_external, tier, score, min_stages):
+    plan = plan_stages(data, modals_external=modals_external)
+
+    assert (plan.tier, plan.score, plan.min_stages) == (tier, score, min_stages)
+
+
+@pytest.mark.parametrize("simple_max, medium_max, components, tier", [
+    ("2", "4", 2, "simple"),
+    ("2", "4", 3, "medium"),
+    ("2", "4", 4, "medium"),
+    ("2", "4", 5, "complex"),
+])
+def test_tier_thresholds_from_env(monkeypatch, simple_max, medium_max, components, tier):
+    monkeypatch.setenv("PROTOTYPE_SIMPLE_MAX_SCORE", simple_max)
+    monkeypatch.setenv("PROTOTYPE_MEDIUM_MAX_SCORE", medium_max)
+
+    assert plan_stages(wizard(components=components)).tier == tier
+
+
+def test_adaptive_disabled_always_runs_four_stages(monkeypatch):
+    monkeypatch.setenv("PROTOTYPE_ADAPTIVE_STAGES", "false")
+
+    plan = plan_stages(wizard())
+
+    assert (plan.tier, plan.min_stages, plan.adaptive) == ("simple", 4, False)
+    assert plan.summary() == {"tier": "simple", "score": 0, "min_stages": 4, "adaptive": False}
+
+
+@pytest.mark.parametrize("tier, expected", [
+    ("simple", ["1\n\n2\n\n3\n\n4", None, None, None]),
+    ("medium", ["1\n\n2", "3\n\n4", None, None]),
+    ("complex", ["1", "2", "3", "4"]),
+])
+def test_group_step_prompts(tier, expected):
+    assert StagePlan(tier, 0, 0).group_step_prompts(["1", "2", "3", "4"]) == expected
+
+
+# =========================================================================
+# 로컬 검사 - 통과하면 이후 단계 생략
+# =========================================================================
+
+STYLED_CODE = """export default function UserList() {
+  const [isModal0Open, setIsModal0Open] = useState(false);
+  return (
+    <div className="p-4">
+      <h1 className="text-xl">사용자</h1>
+      <button className="btn" onClick={() => setIsModal0Open(true)}>등록</button>
+      <table className="w-full"><tbody className="divide-y"></tbody></table>
+    </div>
+  );
+}"""
+
+
+@pytest.mark.parametrize("code, problem", [
+    (STYLED_CODE, None),
+    (STYLED_CODE.replace("export default ", ""), "export default 없음"),
+    (STYLED_CODE[:-2], "괄호 짝 불일치"),
+    (STYLED_CODE.replace("    </div>\n", ""), "JSX 태그 짝 불일치"),
+    (STYLED_CODE.replace("<tbody", "{/* TODO 행 */}<tbody"), "미완성 표시"),
+    (STYLED_CODE.replace("</table>", "</table>\n      {/* ... */}"), "미완성 표시"),
+    (STYLED_CODE.replace("isModal0Open", "isOpen"), "모달 상태 누락: isModal0Open"),
+    (STYLED_CODE.replace(' className="divide-y"', ""), "Tailwind 스타일 미적용"),
+])
+def test_local_check(code, problem):
+    problems = StagePlan("simple", 3, 1).check(code)
+
+    if problem is None:
+        assert problems == []
+    else:
+        assert len(problems) == 1 and problems[0].startswith(problem)
+
+
+@pytest.fixture
+def client():
+    from services.gemini_client import GeminiClient
+
+    return GeminiClient(api_key="test-key")
+
+
+@pytest.mark.parametrize("tier, stage, seeded_count, code, skip", [
+    # 명세를 모두 전달한 단계부터 검사 통과 시 생략
+    ("simple", 1, 0, STYLED_CODE, True),
+    ("medium", 1, 0, STYLED_CODE, False),
+    ("medium", 2, 0, STYLED_CODE, True),
+    ("complex", 3, 0, STYLED_CODE, False),
+    # 템플릿 초안(Stage 1)은 모델 결과가 아니므로 생략하지 않음
+    ("simple", 1, 1, STYLED_CODE, False),
+    ("simple", 2, 1, STYLED_CODE, True),
+    # 검사 미통과 / 코드 없음
+    ("simple", 1, 0, STYLED_CODE.replace("isModal0Open", "isOpen"), False),
+    ("simple", 1, 0, "", False),
+])
+def test_stage_plan_satisfied(client, tier, stage, seeded_count, code, skip):
+    plan = StagePlan(tier, 3, 1)
+
+    assert client._stage_plan_satisfied(plan, stage, seeded_count, code) is skip
+
+
+def test_stage_plan_satisfied_without_plan(client):
+    assert client._stage_plan_satisfied(None, 4, 0, STYLED_CODE) is False
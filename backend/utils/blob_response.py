@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Blob 다운로드 응답 - ETag / If-None-Match / Range 지원
+
+저장소(BlobStore)에서 필요한 범위만 청크 단위로 스트리밍하므로
+큰 문서도 워커 메모리에 전체를 올리지 않습니다.
+내용 주소(SHA-256)가 곧 ETag이므로 변경되지 않은 문서는 304로 응답합니다.
+"""
+import re
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+from services.blob_store import BlobStore, BlobInfo
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _etag(info: BlobInfo) -> str:
+    return f'"{info.sha256}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match / If-Range 비교 (약한 ETag W/ 접두사 허용)"""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 바이트 범위 파싱 → (start, end) (end 포함)
+
+    Returns:
+        None: 만족할 수 없는 범위 (416)
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # bytes=-N: 마지막 N바이트
+        start = max(size - int(last), 0)
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def blob_download_response(
+    request: Request,
+    store: BlobStore,
+    info: BlobInfo,
+    filename: str
+) -> Response:
+    """
+    저장된 blob 다운로드 응답 생성
+
+    - If-None-Match가 ETag와 일치하면 304
+    - Range: bytes=... (단일 범위) → 206 / 만족 불가 시 416
+    - If-Range가 ETag와 다르면 Range 무시 (전체 전송)
+    """
+    etag = _etag(info)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, no-cache",
+        "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+    }
+
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={k: headers[k] for k in ("ETag", "Cache-Control")})
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or _etag_matches(if_range, etag)):
+        byte_range = _parse_range(range_header, info.size)
+        if byte_range is None:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{info.size}", "ETag": etag})
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{info.size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            store.iter_range(info.sha256, start, end),
+            status_code=206,
+            media_type=info.content_type,
+            headers=headers
+        )
+
+    headers["Content-Length"] = str(info.size)
+    return StreamingResponse(
+        store.iter_range(info.sha256),
+        media_type=info.content_type,
+        headers=headers
+    )
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+코드 압축 유틸리티 - 문서 추출 프롬프트에 넣을 React 코드를 토큰 예산에 맞게 줄임
+
+설계서/테스트 계획서/매뉴얼 추출에 필요한 것은 화면 구조, 상태, 핸들러, 라벨입니다.
+생성된 프로토타입 코드의 상당 부분은 샘플 데이터 행, 긴 Tailwind 클래스 목록, SVG 경로, 공백/주석이라
+그대로 넣으면 입력 토큰과 지연 시간만 늘어납니다.
+
+[압축 단계] (원본이 예산 안이면 그대로 반환, 예산 안에 들어오면 중단, 예산을 넘으면 다음 단계를 원본에 다시 적용)
+0. 정리: 줄 끝 공백/빈 줄 제거, SVG path 데이터(d="...") 생략
+1. 샘플 데이터 3건, className 클래스 6개까지, 설명 주석 제거
+   (샘플 데이터: useState([...]) 초기값 또는 data/rows/items/list/sample/mock 이름에 대입한 객체 리터럴 배열,
+    label/header/title 키가 있는 배열은 컬럼/옵션 정의이므로 제외)
+   (한 줄 JSX 주석 {/* 검색 영역 */}은 구역 이름이므로 유지)
+2. 샘플 데이터 2건, className 클래스 3개까지
+3. 샘플 데이터 1건, className/들여쓰기 제거
+
+문자열 라벨, 상태 선언, 핸들러 본문, JSX 구조는 어느 단계에서도 건드리지 않습니다.
+마지막 단계로도 예산을 넘으면 그 결과를 그대로 반환합니다 (코드를 자르지 않음).
+"""
+import re
+from typing import Dict, List, Tuple
+
+from utils.code_scan import matching_brace, skip_literal
+
+# 단계별 (샘플 데이터 최대 건수, className 최대 클래스 수, 들여쓰기 제거)
+COMPACTION_LEVELS = (
+    (3, 6, False),
+    (2, 3, False),
+    (1, 0, True),
+)
+
+# 유지할 한 줄 JSX 주석 최대 길이
+MAX_LABEL_COMMENT_CHARS = 40
+
+_SVG_PATH_RE = re.compile(r'(\sd=)(["\'])[^"\']{40,}\2')
+# 샘플 데이터 배열 앞 문맥: useState([ / rows = [ / sampleData: [
+_DATA_ARRAY_CONTEXT_RE = re.compile(
+    r"(?:\buseState\s*(?:<[^<>()]*>)?\s*\("
+    r"|\b([A-Za-z_$][\w$]*)\s*(?::\s*[\w$.<>]+(?:\[\])?\s*)?="
+    r"|\b([A-Za-z_$][\w$]*)\s*:)\s*$"
+)
+_DATA_NAME_RE = re.compile(r"data|rows|items|list|sample|mock", re.I)
+# 컬럼/라벨/옵션 정의 객체의 키
+_DEFINITION_KEY_RE = re.compile(r"""[{,]\s*['"]?(?:label|header|title)['"]?\s*:""")
+_CLASS_NAME_RE = re.compile(r'(\s*)className=(?:"([^"]*)"|\'([^\']*)\'|\{`([^`$]*)`\})')
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (ASCII 4글자당 1토큰, 한글 등 비 ASCII는 글자당 약 1토큰)"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return (len(text) - non_ascii) // 4 + non_ascii + 1
+
+
+def _clean_lines(code: str, strip_indent: bool = False) -> str:
+    """줄 끝 공백/빈 줄 제거 (strip_indent면 들여쓰기도 제거)"""
+    lines = (line.strip() if strip_indent else line.rstrip() for line in code.split("\n"))
+    return "\n".join(line for line in lines if line.strip())
+
+
+def strip_comments(code: str, keep_labels: bool = True) -> str:
+    """
+    주석 제거 (문자열 안은 제외)
+
+    keep_labels: 한 줄 JSX 주석 {/* 검색 영역 */}은 유지 (MAX_LABEL_COMMENT_CHARS 이하)
+    """
+    out: List[str] = []
+    i, last, n = 0, 0, len(code)
+    while i < n:
+        ch = code[i]
+        nxt = code[i + 1] if i + 1 < n else ""
+        if ch == "/" and nxt == "/" and code[i - 1:i] != ":":
+            end = code.find("\n", i)
+            end = n if end < 0 else end
+            out.append(code[last:i])
+            i = last = end
+            continue
+        if ch == "/" and nxt == "*":
+            end = code.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            comment = code[i:end]
+            before = code[last:i]
+            jsx_open = before.rstrip().endswith("{") and code[end:].lstrip().startswith("}")
+            if keep_labels and jsx_open and "\n" not in comment and len(comment) <= MAX_LABEL_COMMENT_CHARS + 4:
+                i = end
+                continue
+            if jsx_open:
+                # {/* ... */} → 중괄호까지 제거
+                before = before[:before.rstrip().rfind("{")]
+                end = code.find("}", end) + 1
+            out.append(before)
+            i = last = end
+            continue
+        skipped = skip_literal(code, i)
+        i = skipped if skipped != i else i + 1
+    out.append(code[last:])
+    return "".join(out)
+
+
+def _array_elements(code: str, start: int, end: int) -> List[Tuple[int, int]]:
+    """code[start:end] (배열 괄호 안쪽)의 최상위 원소 위치 목록"""
+    elements: List[Tuple[int, int]] = []
+    i = element_start = start
+    while i < end:
+        ch = code[i]
+        if ch in "{([":
+            close = matching_brace(code, i)
+            if close is None:
+                return []
+            i = close + 1
+            continue
+        if ch == ",":
+            elements.append((element_start, i))
+            element_start = i + 1
+            i += 1
+            continue
+        skipped = skip_literal(code, i)
+        i = skipped if skipped != i else i + 1
+    elements.append((element_start, end))
+    return [(s, e) for s, e in elements if code[s:e].strip()]
+
+
+def _is_data_array(code: str, open_index: int) -> bool:
+    """code[open_index]의 [가 샘플 데이터 배열 자리인지 (useState 초기값 또는 데이터 이름에 대입)"""
+    match = _DATA_ARRAY_CONTEXT_RE.search(code, max(0, open_index - 120), open_index)
+    if not match:
+        return False
+    name = match.group(1) or match.group(2)
+    return name is None or bool(_DATA_NAME_RE.search(name))
+
+
+def trim_sample_rows(code: str, max_rows: int) -> str:
+    """
+    샘플 데이터 배열([{...}, {...}, ...])을 앞 max_rows건 + `/* … 외 N건 */`로 줄임
+
+    useState([...]) 초기값과 data/rows/items/list/sample/mock 이름에 대입한 배열만 대상이며,
+    원소에 label/header/title 키가 있으면 (컬럼/옵션 정의) 줄이지 않습니다.
+    """
+    max_rows = max(1, max_rows)
+    out: List[str] = []
+    i, last, n = 0, 0, len(code)
+    while i < n:
+        if code[i] == "[" and _is_data_array(code, i):
+            end = matching_brace(code, i)
+            if end is not None:
+                elements = _array_elements(code, i + 1, end)
+                if len(elements) > max_rows and \
+                        all(code[s:e].lstrip().startswith("{") for s, e in elements) and \
+                        not any(_DEFINITION_KEY_RE.search(code[s:e]) for s, e in elements):
+                    out.append(code[last:elements[max_rows - 1][1]])
+                    out.append(f", /* … 외 {len(elements) - max_rows}건 */ ")
+                    i = last = end
+                    continue
+        skipped = skip_literal(code, i)
+        i = skipped if skipped != i else i + 1
+    out.append(code[last:])
+    return "".join(out)
+
+
+def trim_class_names(code: str, max_classes: int) -> str:
+    """className 클래스 목록을 앞 max_classes개로 줄임 (0이면 속성 제거, ${} 템플릿은 유지)"""
+    def replace(match: re.Match) -> str:
+        classes = next(group for group in match.groups()[1:] if group is not None).split()
+        if max_classes <= 0:
+            return ""
+        if len(classes) <= max_classes:
+            return match.group(0)
+        return f'{match.group(1)}className="{" ".join(classes[:max_classes])} …"'
+
+    return _CLASS_NAME_RE.sub(replace, code)
+
+
+def compact_react_code(code: str, token_budget: int) -> Tuple[str, Dict[str, int]]:
+    """
+    React 코드를 token_budget 토큰 안으로 압축 (token_budget <= 0이거나 이미 예산 안이면 원본 그대로)
+
+    Returns:
+        (압축된 코드, {"tokens_before", "tokens_after", "level"})
+    """
+    tokens_before = estimate_tokens(code)
+    if token_budget <= 0 or tokens_before <= token_budget:
+        return code, {"tokens_before": tokens_before, "tokens_after": tokens_before, "level": 0}
+
+    base = _clean_lines(_SVG_PATH_RE.sub(r'\1\2…\2', code))
+    compacted, level = base, 0
+    for index, (max_rows, max_classes, strip_indent) in enumerate(COMPACTION_LEVELS, start=1):
+        if estimate_tokens(compacted) <= token_budget:
+            break
+        compacted = strip_comments(base)
+        compacted = trim_sample_rows(compacted, max_rows)
+        compacted = _clean_lines(trim_class_names(compacted, max_classes), strip_indent)
+        level = index
+
+    return compacted, {"tokens_before": tokens_before, "tokens_after": estimate_tokens(compacted), "level": level}
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+코드 이어붙이기 유틸리티 - MAX_TOKENS로 끊긴 응답과 연속 생성 응답 병합
+
+모델은 연속 생성 시 끊긴 줄이나 앞의 몇 줄을 반복하거나, 코드 펜스(```tsx)를 다시 열거나,
+import를 다시 쓰는 경우가 많습니다. 단순히 이어붙이면 코드가 깨져 전체 재생성이 필요해지므로
+겹치는 부분을 찾아 한 번만 남깁니다.
+
+[병합 순서]
+1. 연속 응답 앞의 다시 열린 코드 펜스 제거 (누적 텍스트의 펜스가 아직 열려 있을 때)
+2. 연속 응답 앞부분의 이미 있는 import 줄 제거
+3. 후보 생성
+   - 겹침 병합: 누적 텍스트의 마지막 N줄 == 연속 응답의 처음 N줄 (줄 앞뒤 공백 무시,
+     마지막 줄은 끊긴 줄이므로 접두사 일치) → 겹친 줄은 연속 응답 쪽만 남김
+   - 그대로 이어붙이기 (끊긴 글자부터 이어 쓴 경우)
+   - 줄바꿈 후 이어붙이기
+4. 괄호/JSX 태그 짝 검사로 짝이 맞지 않는 닫는 괄호/태그가 가장 적은 후보 선택 (동률이면 위 순서)
+"""
+import re
+from typing import List, Tuple
+
+from utils.code_patch import bracket_balance
+
+# 겹침으로 인정할 최소 글자 수 (짧은 "}" 같은 줄의 우연한 일치 방지)
+MIN_OVERLAP_CHARS = 16
+
+# 겹침을 찾을 최대 줄 수
+MAX_OVERLAP_LINES = 60
+
+_FENCE_OPEN_RE = re.compile(r"^\s*```[\w-]*[ \t]*\n")
+_IMPORT_RE = re.compile(r"^\s*import\s")
+# 식별자 바로 뒤의 <...>는 제네릭(useState<string>)/비교(i<n)이므로 제외
+_JSX_TAG_RE = re.compile(r"(?<![\w$.\])])<(/?)([A-Za-z][\w.]*)?((?:[^<>{}]|\{[^{}]*\})*?)(/?)>")
+
+
+def strip_reopened_fence(accumulated: str, continuation: str) -> str:
+    """누적 텍스트의 코드 펜스가 열려 있으면 연속 응답 앞의 새 펜스 제거"""
+    if accumulated.count("```") % 2 == 1:
+        return _FENCE_OPEN_RE.sub("", continuation, count=1)
+    return continuation
+
+
+def strip_duplicate_imports(accumulated: str, continuation: str) -> str:
+    """연속 응답 앞부분(import 블록)에서 누적 텍스트에 이미 있는 import 줄 제거"""
+    existing = {line.strip() for line in accumulated.split("\n") if _IMPORT_RE.match(line)}
+    if not existing:
+        return continuation
+
+    lines = continuation.split("\n")
+    index = 0
+    kept = []
+    while index < len(lines) and (not lines[index].strip() or _IMPORT_RE.match(lines[index])):
+        if lines[index].strip() not in existing:
+            kept.append(lines[index])
+        index += 1
+    if index == 0:
+        return continuation
+    # import를 모두 제거했으면 import 블록 뒤의 빈 줄도 제거 (겹침 검사가 빈 줄에서 어긋나지 않도록)
+    if not any(line.strip() for line in kept) and any(lines[i].strip() for i in range(index)):
+        kept = []
+    return "\n".join(kept + lines[index:])
+
+
+def find_line_overlap(accumulated: str, continuation: str) -> int:
+    """
+    누적 텍스트 끝과 연속 응답 앞이 겹치는 줄 수 (없으면 0)
+
+    줄 앞뒤 공백은 무시하며, 누적 텍스트의 마지막 줄(끊긴 줄)은 연속 응답 줄의 접두사이면 일치로 봅니다.
+    """
+    acc_lines = accumulated.split("\n")
+    cont_lines = continuation.split("\n")
+    partial = not accumulated.endswith("\n")
+    if not partial:
+        acc_lines = acc_lines[:-1]
+
+    for size in range(min(len(acc_lines), len(cont_lines), MAX_OVERLAP_LINES), 0, -1):
+        tail = [line.strip() for line in acc_lines[-size:]]
+        head = [line.strip() for line in cont_lines[:size]]
+        if partial:
+            if not tail[-1] or not head[-1].startswith(tail[-1]) or tail[:-1] != head[:-1]:
+                continue
+            # 끊긴 줄 하나만 겹치는 경우는 길이와 관계없이 인정 (끊긴 줄부터 다시 쓴 경우)
+            if size == 1:
+                return size
+        elif tail != head:
+            continue
+        if sum(len(line) for line in tail) >= MIN_OVERLAP_CHARS:
+            return size
+    return 0
+
+
+def jsx_balance(code: str) -> Tuple[int, int]:
+    """
+    JSX 태그 짝 검사 (근사 - 문자열/주석 안의 태그도 셈)
+
+    Returns:
+        (짝이 맞지 않는 닫는 태그 수, 닫히지 않은 여는 태그 수)
+    """
+    stack: List[str] = []
+    unmatched_close = 0
+    for closing, name, _, self_closing in _JSX_TAG_RE.findall(code):
+        if self_closing:
+            continue
+        name = name or ""  # <>...</> Fragment
+        if not closing:
+            stack.append(name)
+        elif name in stack:
+            while stack.pop() != name:
+                pass
+        else:
+            unmatched_close += 1
+    return unmatched_close, len(stack)
+
+
+def _code_part(text: str) -> str:
+    """펜스 안의 코드만 (펜스가 없으면 전체)"""
+    start = text.find("```")
+    if start < 0:
+        return text
+    body = text[text.find("\n", start) + 1:] if "\n" in text[start:] else ""
+    end = body.find("```")
+    return body if end < 0 else body[:end]
+
+
+def _damage(text: str) -> int:
+    """짝이 맞지 않는 닫는 괄호 + 닫는 태그 수 (겹친 줄이 중복되면 늘어남)"""
+    code = _code_part(text)
+    return bracket_balance(code)[0] + jsx_balance(code)[0]
+
+
+def merge_continuation(accumulated: str, continuation: str) -> str:
+    """끊긴 응답(누적)과 연속 생성 응답 병합"""
+    if not accumulated:
+        return continuation
+    continuation = strip_reopened_fence(accumulated, continuation)
+    continuation = strip_duplicate_imports(accumulated, continuation)
+    if not continuation.strip():
+        return accumulated
+
+    candidates = []
+    overlap = find_line_overlap(accumulated, continuation)
+    if overlap:
+        acc_lines = accumulated.split("\n")
+        keep = len(acc_lines) - overlap - (0 if not accumulated.endswith("\n") else 1)
+        candidates.append("\n".join(acc_lines[:keep] + continuation.split("\n")))
+    candidates.append(accumulated + continuation)
+    if not accumulated.endswith("\n") and not continuation.startswith("\n"):
+        candidates.append(f"{accumulated}\n{continuation}")
+
+    return min(candidates, key=_damage)
+
+
+def tail_lines(text: str, count: int) -> str:
+    """마지막 count줄 (연속 생성 요청에 다시 보낼 끝부분)"""
+    lines = text.split("\n")
+    return "\n".join(lines[-count:])
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+코드 패치 유틸리티 - SEARCH/REPLACE 블록 파싱 및 적용
+
+4단계 생성의 Stage 2~4가 전체 코드 대신 이전 단계 코드에 대한 변경만 반환할 때 사용합니다.
+
+<<<<<<< SEARCH
+(이전 코드에서 그대로 복사한 연속된 줄)
+=======
+(바꿀 코드)
+>>>>>>> REPLACE
+
+[적용 규칙]
+- SEARCH는 이전 코드에서 정확히 한 곳과 일치해야 함 (없거나 여러 곳이면 실패)
+- 정확히 일치하지 않으면 줄 앞뒤 공백을 무시하고 줄 단위로 비교 (들여쓰기 차이 허용)
+- 빈 SEARCH는 코드 끝에 REPLACE를 덧붙임
+- 적용 결과의 괄호 짝이 이전 코드보다 나빠지면 실패
+"""
+import re
+from typing import List, Tuple
+
+PATCH_SEARCH_MARKER = "<<<<<<< SEARCH"
+PATCH_DIVIDER = "======="
+PATCH_REPLACE_MARKER = ">>>>>>> REPLACE"
+
+_BLOCK_RE = re.compile(
+    r"^<{5,9} SEARCH[^\n]*\n(.*?)^={5,9}[ \t]*\n(.*?)^>{5,9} REPLACE[^\n]*$",
+    re.M | re.S
+)
+
+_BRACKETS = {"}": "{", ")": "(", "]": "["}
+
+
+class PatchError(Exception):
+    """패치 적용 실패"""
+    pass
+
+
+def has_patch_blocks(text: str) -> bool:
+    """응답에 SEARCH/REPLACE 블록이 있는지"""
+    return PATCH_SEARCH_MARKER in text and PATCH_REPLACE_MARKER in text
+
+
+def parse_patch_blocks(text: str) -> List[Tuple[str, str]]:
+    """
+    응답 텍스트 → [(search, replace)]
+
+    블록이 코드 펜스(```) 안에 있어도 됩니다. 시작 마커 수와 파싱된 블록 수가 다르면
+    (끊긴 응답 등) PatchError를 발생시킵니다.
+    """
+    blocks = [(search.rstrip("\n"), replace.rstrip("\n")) for search, replace in _BLOCK_RE.findall(text)]
+    opened = len(re.findall(r"^<{5,9} SEARCH", text, re.M))
+    if not blocks or opened != len(blocks):
+        raise PatchError(f"SEARCH/REPLACE 블록 형식 오류 (시작 {opened}개, 완성 {len(blocks)}개)")
+    return blocks
+
+
+def _find_lines(code_lines: List[str], search_lines: List[str]) -> List[int]:
+    """줄 앞뒤 공백을 무시하고 search_lines와 일치하는 시작 줄 번호들"""
+    target = [line.strip() for line in search_lines]
+    stripped = [line.strip() for line in code_lines]
+    size = len(target)
+    return [i for i in range(len(stripped) - size + 1) if stripped[i:i + size] == target]
+
+
+def _apply_block(code: str, search: str, replace: str) -> str:
+    if not search.strip():
+        return f"{code.rstrip()}\n{replace}\n"
+
+    count = code.count(search)
+    if count == 1:
+        return code.replace(search, replace, 1)
+    if count > 1:
+        raise PatchError(f"SEARCH가 {count}곳과 일치합니다: {search.strip().splitlines()[0][:80]}")
+
+    # 들여쓰기/후행 공백 차이 허용 (줄 단위)
+    code_lines = code.split("\n")
+    search_lines = search.strip("\n").split("\n")
+    matches = _find_lines(code_lines, search_lines)
+    if len(matches) != 1:
+        reason = "일치하는 코드가 없습니다" if not matches else f"{len(matches)}곳과 일치합니다"
+        raise PatchError(f"SEARCH {reason}: {search.strip().splitlines()[0][:80]}")
+    start = matches[0]
+    return "\n".join(code_lines[:start] + replace.split("\n") + code_lines[start + len(search_lines):])
+
+
+def bracket_balance(code: str) -> Tuple[int, int]:
+    """
+    괄호 짝 검사 (문자열/주석 제외, 근사)
+
+    Returns:
+        (짝이 맞지 않는 닫는 괄호 수, 닫히지 않은 여는 괄호 수)
+    """
+    stack: List[str] = []
+    unmatched_close = 0
+    i, n = 0, len(code)
+    while i < n:
+        ch = code[i]
+        nxt = code[i + 1] if i + 1 < n else ""
+        if ch == "/" and nxt == "/":
+            i = code.find("\n", i)
+            if i < 0:
+                break
+            continue
+        if ch == "/" and nxt == "*":
+            end = code.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if ch in "'\"`":
+            i += 1
+            while i < n and code[i] != ch:
+                if code[i] == "\\":
+                    i += 1
+                elif code[i] == "\n" and ch != "`":
+                    break
+                i += 1
+            i += 1
+            continue
+        if ch in "{([":
+            stack.append(ch)
+        elif ch in "})]":
+            if stack and stack[-1] == _BRACKETS[ch]:
+                stack.pop()
+            else:
+                unmatched_close += 1
+        i += 1
+    return unmatched_close, len(stack)
+
+
+def apply_patch(code: str, patch_text: str) -> str:
+    """
+    SEARCH/REPLACE 블록을 순서대로 적용
+
+    Raises:
+        PatchError: 블록 형식 오류, SEARCH 불일치/중복, 적용 후 괄호 짝이 나빠진 경우
+    """
+    result = code
+    for search, replace in parse_patch_blocks(patch_text):
+        result = _apply_block(result, search, replace)
+
+    before_close, before_open = bracket_balance(code)
+    after_close, after_open = bracket_balance(result)
+    # 앞 단계 코드가 미완성(열린 괄호)일 수 있으므로 완성된 코드가 깨진 경우만 실패
+    if after_close > before_close or (before_open == 0 and after_open > 0):
+        raise PatchError(
+            f"패치 적용 후 괄호 짝 불일치 (닫는 괄호 초과 {after_close}, 닫히지 않음 {after_open})"
+        )
+    return result
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+코드 스캔 유틸리티 - 생성된 JS/JSX 코드를 문자열/주석을 건너뛰며 훑는 공용 함수
+
+AST 파서 없이 코드를 다루는 유틸리티(utils/modal_splicer.py, utils/code_compact.py)가 함께 사용합니다.
+- skip_literal: 문자열('...', "...", `...`)/주석(//, /* */) 건너뛰기
+- matching_brace: 짝이 맞는 닫는 괄호 찾기
+"""
+from typing import Optional
+
+
+def skip_literal(code: str, i: int) -> int:
+    """i가 문자열/주석 시작이면 그 끝 다음 위치, 아니면 i"""
+    n = len(code)
+    ch = code[i]
+    nxt = code[i + 1] if i + 1 < n else ""
+    if ch == "/" and nxt == "/":
+        end = code.find("\n", i)
+        return n if end < 0 else end
+    if ch == "/" and nxt == "*":
+        end = code.find("*/", i + 2)
+        return n if end < 0 else end + 2
+    if ch in "'\"`":
+        i += 1
+        while i < n and code[i] != ch:
+            if code[i] == "\\":
+                i += 1
+            elif code[i] == "\n" and ch != "`":
+                return i
+            i += 1
+        return i + 1
+    return i
+
+
+def matching_brace(code: str, open_index: int) -> Optional[int]:
+    """code[open_index]의 여는 괄호({, (, [)와 짝인 닫는 괄호 위치 (문자열/주석 제외, 없으면 None)"""
+    pairs = {"{": "}", "(": ")", "[": "]"}
+    stack = []
+    i = open_index
+    while i < len(code):
+        skipped = skip_literal(code, i)
+        if skipped != i:
+            i = skipped
+            continue
+        ch = code[i]
+        if ch in pairs:
+            stack.append(pairs[ch])
+        elif ch in ")}]":
+            if not stack or stack.pop() != ch:
+                return None
+            if not stack:
+                return i
+        i += 1
+    return None
@@ -1,4 +1,33 @@
+import os
 import json
+import logging
+
+from utils.code_compact import compact_react_code
+
+logger = logging.getLogger(__name__)
+
+# react_code 압축 누적 통계 (추정 토큰 수)
+compaction_stats = {"prompts": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0}
+
+
+def _compact_code(react_code: str, label: str) -> str:
+    """
+    프롬프트에 넣을 react_code를 토큰 예산(DOC_CODE_TOKEN_BUDGET, 0이면 압축 안 함)에 맞게 압축
+    (샘플 데이터 행/긴 className/주석/공백 정리 - utils/code_compact.py)
+    """
+    budget = int(os.getenv("DOC_CODE_TOKEN_BUDGET", "6000"))
+    compacted, report = compact_react_code(react_code or "", budget)
+    compaction_stats["prompts"] += 1
+    compaction_stats["tokens_before"] += report["tokens_before"]
+    compaction_stats["tokens_after"] += report["tokens_after"]
+    if report["level"]:
+        compaction_stats["compacted"] += 1
+    logger.info(
+        f"📉 [{label}] react_code {report['tokens_before']:,} → {report['tokens_after']:,} tokens "
+        f"(압축 단계 {report['level']}, 예산 {budget:,})"
+    )
+    return compacted
+
 
 def _summarize_wizard_context(wizard_data: dict) -> str:
     """Wizard 데이터에서 핵심 정보만 추출하여 문자열화 (토큰 절약 및 가독성)"""
@@ -8,6 +37,7 @@ def _summarize_wizard_context(wizard_data: dict) -> str:
 
 
 def get_design_spec_prompt(react_code: str, wizard_data: dict) -> str:
+    react_code = _compact_code(react_code, "Design Spec")
     context_summary = {
         "screen_name": wizard_data.get('step1', {}).get('screenName'),
         "description": wizard_data.get('step1', {}).get('description'),
@@ -73,6 +103,7 @@ def get_design_spec_prompt(react_code: str, wizard_data: dict) -> str:
 
 def get_test_plan_prompt(react_code: str, wizard_data: dict) -> str:
     """테스트 계획서용 LLM 프롬프트"""
+    react_code = _compact_code(react_code, "Test Plan")
     context_summary = {
         "screen_name": wizard_data.get('step1', {}).get('screenName'),
         "description": wizard_data.get('step1', {}).get('description'),
@@ -146,6 +177,7 @@ def get_test_plan_prompt(react_code: str, wizard_data: dict) -> str:
 
 def get_user_manual_prompt(react_code: str, wizard_data: dict) -> str:
     """사용자 매뉴얼용 LLM 프롬프트"""
+    react_code = _compact_code(react_code, "User Manual")
     context_summary = {
         "screen_name": wizard_data.get('step1', {}).get('screenName'),
         "description": wizard_data.get('step1', {}).get('description'),
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+문서 추출 응답 스키마 - Gemini responseSchema (OpenAPI 부분 집합)
+
+utils/doc_prompts.py의 [출력 JSON 포맷]과 services/docx_renderer.py가 읽는 필드를 그대로 옮긴 것입니다.
+필드를 추가/변경하면 프롬프트, 렌더러, 이 스키마를 함께 수정하세요.
+
+propertyOrdering은 프롬프트 예시와 같은 순서로 지정해 스트리밍 중 섹션이 순서대로 완성되도록 합니다.
+"""
+from typing import Any, Dict, Iterable
+
+
+def _string() -> Dict[str, Any]:
+    return {"type": "STRING"}
+
+
+def _integer() -> Dict[str, Any]:
+    return {"type": "INTEGER"}
+
+
+def _boolean() -> Dict[str, Any]:
+    return {"type": "BOOLEAN"}
+
+
+def _array(items: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "ARRAY", "items": items}
+
+
+def _object(properties: Dict[str, Dict[str, Any]], optional: Iterable[str] = ()) -> Dict[str, Any]:
+    """OBJECT 스키마 (optional에 없는 키는 모두 required)"""
+    optional = set(optional)
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": [key for key in properties if key not in optional],
+        "propertyOrdering": list(properties),
+    }
+
+
+DESIGN_SPEC_SCHEMA = _object({
+    "basic_info": _object({
+        "screen_name": _string(),
+        "component_name": _string(),
+        "description": _string(),
+    }),
+    "layout_structure": _array(_object({
+        "area_name": _string(),
+        "description": _string(),
+        "components": _array(_string()),
+    })),
+    "user_flow": _array(_object({
+        "step": _integer(),
+        "action": _string(),
+        "system_response": _string(),
+        "description": _string(),
+    }, optional=["description"])),
+    "state_specs": _array(_object({
+        "name": _string(),
+        "type": _string(),
+        "initial_value": _string(),
+        "description": _string(),
+    })),
+    "event_handlers": _array(_object({
+        "ui_element": _string(),
+        "name": _string(),
+        "trigger": _string(),
+        "logic": _string(),
+    })),
+})
+
+TEST_PLAN_SCHEMA = _object({
+    "overview": _object({
+        "screen_name": _string(),
+        "test_objective": _string(),
+        "test_scope": _string(),
+        "preconditions": _array(_string()),
+    }),
+    "test_cases": _array(_object({
+        "tc_id": _string(),
+        "category": _string(),
+        "test_item": _string(),
+        "test_description": _string(),
+        "test_steps": _array(_string()),
+        "expected_result": _string(),
+        "priority": {"type": "STRING", "enum": ["High", "Medium", "Low"]},
+    })),
+    "test_scenarios": _array(_object({
+        "scenario_id": _string(),
+        "scenario_name": _string(),
+        "description": _string(),
+        "steps": _array(_string()),
+    })),
+    "boundary_tests": _array(_object({
+        "field": _string(),
+        "test_type": _string(),
+        "min_value": _string(),
+        "max_value": _string(),
+        "invalid_cases": _array(_string()),
+    })),
+})
+
+USER_MANUAL_SCHEMA = _object({
+    "overview": _object({
+        "screen_name": _string(),
+        "description": _string(),
+        "target_users": _string(),
+    }),
+    "ui_structure": _array(_object({
+        "area_name": _string(),
+        "description": _string(),
+        "components": _array(_object({
+            "name": _string(),
+            "description": _string(),
+            "is_required": _boolean(),
+        }, optional=["is_required"])),
+    })),
+    "procedures": _array(_object({
+        "procedure_id": _integer(),
+        "title": _string(),
+        "description": _string(),
+        "steps": _array(_object({
+            "step": _integer(),
+            "action": _string(),
+            "system_response": _string(),
+        })),
+        "tips": _array(_string()),
+    }, optional=["tips"])),
+    "troubleshooting": _array(_object({
+        "symptom": _string(),
+        "cause": _string(),
+        "solution": _string(),
+    })),
+})
+
+# 산출물 종류 → 응답 스키마 (services/document_service.py DOCUMENT_KINDS와 같은 키)
+DOCUMENT_SCHEMAS = {
+    "design_doc": DESIGN_SPEC_SCHEMA,
+    "test_plan_doc": TEST_PLAN_SCHEMA,
+    "user_manual_doc": USER_MANUAL_SCHEMA,
+}
+
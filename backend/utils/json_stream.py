@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+JSON 스트리밍 파싱 유틸리티 - 최상위 JSON 객체를 섹션(최상위 키) 단위로 증분 파싱
+
+문서 추출 응답은 {"basic_info": {...}, "layout_structure": [...], ...}처럼 큰 섹션 몇 개로 이뤄집니다.
+응답 전체를 한 번에 json.loads하면 한 섹션의 따옴표 하나, MAX_TOKENS로 끊긴 끝부분 때문에
+나머지 섹션까지 모두 버리게 되므로, 섹션이 완성될 때마다 따로 파싱합니다.
+
+[파싱 결과]
+- sections: 파싱에 성공한 섹션 {키: 값}
+- invalid: 끝까지 받았지만 파싱에 실패한 섹션 {키: 원문 조각} → 조각만 보내 고치기
+- truncated: 시작했지만 닫히지 않은 마지막 섹션 키 (MAX_TOKENS 등) → 누락 섹션으로 다시 생성
+- 스키마의 required 키 중 sections/invalid에 없는 키는 missing_keys()로 확인
+"""
+import re
+import json
+from typing import Any, Dict, List, Optional
+
+_KEY_RE = re.compile(r'^\s*"((?:[^"\\]|\\.)*)"\s*:', re.S)
+
+
+class JsonSectionParser:
+    """
+    최상위 JSON 객체 증분 파서 (문자열/이스케이프/괄호 깊이만 추적)
+
+    Usage:
+        parser = JsonSectionParser()
+        for delta in chunks:
+            for key in parser.feed(delta):
+                ...  # key 섹션 완성
+        parser.finish()
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.sections: Dict[str, Any] = {}
+        self.invalid: Dict[str, str] = {}
+        self.truncated: Optional[str] = None
+        self.closed = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: Optional[int] = None
+
+    def feed(self, delta: str) -> List[str]:
+        """텍스트 조각 추가 → 이번 조각으로 완성된 섹션 키 목록 (파싱 실패 섹션 포함)"""
+        self.text += delta
+        completed: List[str] = []
+        text = self.text
+        while self._pos < len(text) and not self.closed:
+            ch = text[self._pos]
+            if self._depth == 0:
+                # 객체 시작 전 (코드 펜스/설명 문장 건너뜀)
+                if ch == "{":
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    completed.extend(self._close_member(self._pos))
+                    self.closed = True
+            elif ch == "," and self._depth == 1:
+                completed.extend(self._close_member(self._pos))
+                self._member_start = self._pos + 1
+            self._pos += 1
+        return completed
+
+    def _close_member(self, end: int) -> List[str]:
+        """text[_member_start:end]의 "키": 값 조각 파싱"""
+        fragment = self.text[self._member_start:end].strip()
+        if not fragment:
+            return []
+        try:
+            member = json.loads("{" + fragment + "}")
+        except json.JSONDecodeError:
+            key = self._fragment_key(fragment)
+            self.invalid[key] = fragment
+            return [key]
+        self.sections.update(member)
+        return list(member)
+
+    def _fragment_key(self, fragment: str) -> str:
+        match = _KEY_RE.match(fragment)
+        if match:
+            try:
+                return json.loads(f'"{match.group(1)}"')
+            except json.JSONDecodeError:
+                pass
+        return f"#{len(self.invalid) + 1}"
+
+    def finish(self) -> 'JsonSectionParser':
+        """스트림 종료 - 닫히지 않은 마지막 섹션을 truncated로 기록"""
+        if not self.closed and self._member_start is not None:
+            fragment = self.text[self._member_start:].strip()
+            if fragment:
+                match = _KEY_RE.match(fragment)
+                self.truncated = match.group(1) if match else None
+        return self
+
+    @property
+    def is_valid(self) -> bool:
+        """객체가 닫혔고 모든 섹션이 파싱됨"""
+        return self.closed and not self.invalid
+
+    def missing_keys(self, schema: Dict[str, Any]) -> List[str]:
+        """스키마의 required 키 중 파싱 성공/실패 섹션 어디에도 없는 키 (스키마 순서)"""
+        return [
+            key for key in schema.get("required", [])
+            if key not in self.sections and key not in self.invalid
+        ]
+
+
+def sub_schema(schema: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+    """최상위 OBJECT 스키마에서 keys 섹션만 남긴 스키마 (부분 재요청용)"""
+    properties = {key: schema["properties"][key] for key in keys if key in schema.get("properties", {})}
+    return {
+        "type": "OBJECT",
+        "properties": properties,
+        "required": list(properties),
+        "propertyOrdering": list(properties),
+    }
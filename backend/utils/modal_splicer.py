@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+모달 병합 유틸리티 - 따로 생성한 모달 컴포넌트를 메인 화면 코드에 합침 (AST 없이 문자열 기반)
+
+모달 병렬 생성 모드에서 각 모달은 `function ForgeModal{N}({ onClose, selectedRow })`로 따로 생성되고
+메인 화면은 isModal{N}Open 상태와 열기 핸들러만 가집니다.
+
+[병합 순서] (같은 입력이면 항상 같은 결과)
+1. 메인 코드에 남아 있는 인라인 모달 `{isModal{N}Open && (...)}`과 ForgeModal{N} 정의 제거
+   (템플릿 초안/모델이 쓴 경우 중복 방지 - 따로 생성한 컴포넌트가 우선)
+2. 누락된 isModal{N}Open 상태 선언을 메인 컴포넌트 본문 맨 앞에 추가
+3. 모달 컴포넌트 함수들을 메인 컴포넌트 선언 바로 앞에 인덱스 순서로 삽입
+   (메인 컴포넌트: `export default function X(` 또는 `export default X;`가 가리키는
+   `function X(` / `const X = (...) => {`)
+4. `{isModal{N}Open && <ForgeModal{N} onClose={...} selectedRow={...} />}`를
+   메인 컴포넌트의 마지막 닫는 태그(루트 요소) 직전에 삽입
+"""
+import re
+from typing import Dict, Iterable, Optional
+
+from utils.code_patch import bracket_balance
+from utils.code_scan import matching_brace
+from utils.code_merge import jsx_balance
+
+_EXPORT_DEFAULT_RE = re.compile(r"export\s+default\s+function\s+\w*\s*\(")
+_EXPORT_NAME_RE = re.compile(r"^\s*export\s+default\s+(\w+)\s*;?\s*$", re.M)
+_BODY_OPEN_RE = re.compile(r"\s*(?:=>\s*)?\{")
+_INLINE_MODAL_RE = re.compile(r"\{\s*isModal(\d+)Open\s*&&")
+_CLOSING_TAG_RE = re.compile(r"</[\w.]*\s*>")
+_IMPORT_LINE_RE = re.compile(r"^\s*import\s.*$\n?", re.M)
+
+
+class ModalSpliceError(Exception):
+    """모달 컴포넌트 코드가 병합할 수 없는 형태"""
+    pass
+
+
+def modal_component_name(index: int) -> str:
+    return f"ForgeModal{index}"
+
+
+def _main_component(code: str) -> Optional[tuple]:
+    """메인 컴포넌트의 (선언 시작 위치, 본문 { 위치, 본문 } 위치) - 블록 본문이 아니면 None"""
+    match = _EXPORT_DEFAULT_RE.search(code)
+    if match:
+        declaration_start, params_start = match.start(), match.end() - 1
+    else:
+        # const X = (...) => { ... };  export default X;
+        exported = _EXPORT_NAME_RE.search(code)
+        if not exported:
+            return None
+        name = exported.group(1)
+        match = re.search(
+            rf"^[ \t]*(?:export\s+)?(?:function\s+{name}\s*\(|(?:const|let)\s+{name}\s*=\s*(?:async\s*)?\()",
+            code, re.M
+        )
+        if not match:
+            return None
+        declaration_start, params_start = match.start(), match.end() - 1
+    params_end = matching_brace(code, params_start)
+    if params_end is None:
+        return None
+    body_open = _BODY_OPEN_RE.match(code, params_end + 1)
+    if not body_open:
+        return None
+    body_start = body_open.end() - 1
+    body_end = matching_brace(code, body_start)
+    return (declaration_start, body_start, body_end) if body_end is not None else None
+
+
+def strip_inline_modals(code: str, indices: Iterable[int]) -> str:
+    """`{isModal{N}Open && (...)}` 블록 제거 (indices에 포함된 모달만)"""
+    targets = set(indices)
+    position = 0
+    while True:
+        match = _INLINE_MODAL_RE.search(code, position)
+        if not match:
+            return code
+        end = matching_brace(code, match.start())
+        if int(match.group(1)) not in targets or end is None:
+            position = match.end()
+            continue
+        # 블록이 한 줄을 차지하면 줄째 제거
+        line_start = code.rfind("\n", 0, match.start()) + 1
+        start = line_start if not code[line_start:match.start()].strip() else match.start()
+        stop = end + 1
+        if code[stop:stop + 1] == "\n" and start == line_start:
+            stop += 1
+        code = code[:start] + code[stop:]
+        position = start
+
+
+def strip_modal_definitions(code: str, indices: Iterable[int]) -> str:
+    """
+    메인 코드에 이미 있는 ForgeModal{N} 정의 제거 (indices에 포함된 모달만)
+
+    Raises:
+        ModalSpliceError: 정의는 있지만 본문 범위를 찾을 수 없는 경우
+    """
+    for n in sorted(set(indices)):
+        name = modal_component_name(n)
+        pattern = re.compile(
+            rf"^[ \t]*(?:export\s+)?(?:function\s+{name}\s*\(|(?:const|let)\s+{name}\s*=\s*(?:async\s*)?\()",
+            re.M
+        )
+        while True:
+            match = pattern.search(code)
+            if not match:
+                break
+            params_end = matching_brace(code, match.end() - 1)
+            body_open = _BODY_OPEN_RE.match(code, params_end + 1) if params_end is not None else None
+            body_end = matching_brace(code, body_open.end() - 1) if body_open else None
+            if body_end is None:
+                raise ModalSpliceError(f"메인 코드의 {name} 정의 범위를 찾을 수 없습니다")
+            stop = body_end + 1
+            if code[stop:stop + 1] == ";":
+                stop += 1
+            while code[stop:stop + 1] == "\n":
+                stop += 1
+            code = code[:match.start()] + code[stop:]
+    return code
+
+
+def normalize_modal_component(code: str, index: int) -> str:
+    """
+    모달 생성 결과 정리 (import/export 제거) + 형식 검사
+
+    Raises:
+        ModalSpliceError: ForgeModal{N} 정의가 없거나 괄호/JSX 짝이 맞지 않는 경우
+    """
+    name = modal_component_name(index)
+    code = _IMPORT_LINE_RE.sub("", code)
+    code = re.sub(r"^\s*export\s+default\s+\w+\s*;?\s*$", "", code, flags=re.M)
+    code = re.sub(r"\bexport\s+(default\s+)?(?=(function|const)\b)", "", code).strip()
+    if not re.search(rf"\b(function\s+{name}\s*\(|(const|let)\s+{name}\s*=)", code):
+        raise ModalSpliceError(f"{name} 정의 없음")
+    if bracket_balance(code) != (0, 0) or jsx_balance(code) != (0, 0):
+        raise ModalSpliceError(f"{name} 괄호/JSX 짝 불일치")
+    return code
+
+
+def splice_modals(main_code: str, components: Dict[int, str]) -> str:
+    """
+    메인 화면 코드 + {모달 인덱스: ForgeModal 컴포넌트 코드} → 최종 코드
+
+    Raises:
+        ModalSpliceError: 메인 코드에서 export default 컴포넌트 본문을 찾을 수 없는 경우
+                          (호출자는 모달을 인라인으로 다시 생성해야 함 - 모달 없이 저장 금지)
+    """
+    if not components:
+        return main_code
+    indices = sorted(components)
+    code = strip_modal_definitions(strip_inline_modals(main_code, indices), indices)
+
+    main = _main_component(code)
+    if not main:
+        raise ModalSpliceError("export default 컴포넌트 본문을 찾을 수 없습니다")
+    _, body_start, body_end = main
+
+    # 모달 렌더링 (메인 컴포넌트의 마지막 닫는 태그 직전)
+    row_prop = " selectedRow={selectedRow}" if re.search(r"\bselectedRow\b", code[body_start:body_end]) else ""
+    renders = "\n".join(
+        f"{{isModal{n}Open && <{modal_component_name(n)} onClose={{() => setIsModal{n}Open(false)}}{row_prop} />}}"
+        for n in indices
+    )
+    closing_tags = list(_CLOSING_TAG_RE.finditer(code, body_start, body_end))
+    if not closing_tags:
+        raise ModalSpliceError("메인 컴포넌트의 루트 닫는 태그를 찾을 수 없습니다")
+    insert_at = closing_tags[-1].start()
+    line_start = code.rfind("\n", 0, insert_at) + 1
+    root_indent = code[line_start:insert_at] if not code[line_start:insert_at].strip() else ""
+    child_indent = f"{root_indent}  "
+    rendered = "".join(f"{child_indent}{line}\n" for line in renders.split("\n"))
+    if root_indent or line_start == insert_at:
+        code = code[:line_start] + rendered + code[line_start:]
+    else:
+        code = f"{code[:insert_at]}\n{rendered}{code[insert_at:]}"
+
+    # 누락된 모달 상태 선언 (본문 맨 앞)
+    missing = [n for n in indices if not re.search(rf"\bisModal{n}Open\b\s*,\s*setIsModal{n}Open\b", code)]
+    if missing:
+        declarations = "".join(
+            f"\n  const [isModal{n}Open, setIsModal{n}Open] = useState(false);" for n in missing
+        )
+        code = code[:body_start + 1] + declarations + code[body_start + 1:]
+
+    # 모달 컴포넌트 (메인 컴포넌트 선언 바로 앞 - 위에서 코드를 고쳤으므로 다시 찾음)
+    export_at = _main_component(code)[0]
+    definitions = "\n\n".join(components[n].strip() for n in indices)
+    return f"{code[:export_at]}{definitions}\n\n{code[export_at:]}"
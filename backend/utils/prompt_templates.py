@@ -272,8 +272,10 @@ def get_step_3_prompt(wizard_data: dict) -> str:
 """
 
 
-def get_step_4_prompt(wizard_data: dict) -> str:
-    """Step 4: 모달 구현 및 파일 완성"""
+def get_step_4_prompt(wizard_data: dict, external_modals: bool = False) -> str:
+    """Step 4: 모달 구현 및 파일 완성 (external_modals면 모달은 별도 생성되므로 파일 마무리만)"""
+    if external_modals:
+        return _get_step_4_closing_prompt(wizard_data)
     step2 = wizard_data.get('step2', {})
     step3 = wizard_data.get('step3', {})
     step4 = wizard_data.get('step4', {})
@@ -321,6 +323,72 @@ def get_step_4_prompt(wizard_data: dict) -> str:
 """
 
 
+def _get_step_4_closing_prompt(wizard_data: dict) -> str:
+    """Step 4 (모달 병렬 생성 모드): 모달 없이 파일 마무리"""
+    interactions = wizard_data.get('step4', {}).get('interactions', [])
+    modal_count = len([i for i in interactions if i.get('actionType') == 'open-modal'])
+
+    return f"""
+# [Step 4/4] 최종 완성 (모달은 별도 생성)
+
+**지시 사항:**
+모달 {modal_count}개(isModal0Open ~ isModal{modal_count - 1}Open)는 별도의 컴포넌트로 생성되어
+메인 레이아웃의 닫는 태그 직전에 자동으로 삽입됩니다. **모달 JSX는 작성하지 마세요.**
+
+**작성할 내용:**
+1. 메인 레이아웃의 닫는 태그 `</div>`
+2. 메인 컴포넌트의 `return` 문 닫기 `);`
+3. 메인 컴포넌트 함수 닫기 `}}`
+
+🔴 **매우 중요 (엄격 준수):**
+- **앞 단계의 코드(메인 UI 등)를 절대 반복하지 마세요.**
+- `{{isModal0Open && (...` 같은 모달 렌더링 코드는 쓰지 마세요. (모달 상태 선언/열기 핸들러는 그대로 유지)
+- 마지막에 `}}` 로 파일이 문법적으로 완벽하게 닫히도록 하세요.
+"""
+
+
+def get_modal_component_prompt(interaction: dict, index: int, screen_name: str) -> str:
+    """모달 하나를 독립 컴포넌트(ForgeModal{index})로 생성하는 프롬프트 (모달 병렬 생성 모드)"""
+    config = interaction.get('modalConfig') or {}
+    title = config.get('title') or f'모달{index}'
+    fields = config.get('fields') or []
+    field_lines = "\n".join(
+        f"  - {f.get('label', '')} ({f.get('type', 'textbox')}, {'필수' if f.get('required', False) else '선택'})"
+        + (f" 옵션: {', '.join(str(o) for o in f.get('options'))}" if f.get('options') else "")
+        for f in fields
+    ) or "  - (없음)"
+
+    return f"""
+# [모달 {index}] '{screen_name}' 화면의 '{title}' 모달
+
+아래 명세의 모달 하나만 **독립된 함수 컴포넌트**로 작성하세요.
+메인 화면과 다른 모달은 별도로 생성되어 자동으로 합쳐집니다.
+
+**컴포넌트 시그니처 (반드시 이 이름/props 사용):**
+function ForgeModal{index}({{ onClose, selectedRow }}) {{ ... }}
+- 열림 여부는 부모가 관리합니다 (`{{isModal{index}Open && <ForgeModal{index} ... />}}`). 항상 열린 모습으로 렌더링하세요.
+- onClose(): 닫기/취소/저장 완료 시 호출
+- selectedRow: 그리드에서 선택된 행 객체 (없으면 null/undefined)
+
+**모달 명세:**
+- 제목: {title}
+- 유형: {config.get('type') or 'custom'} (form: 입력폼, detail: 상세정보, confirm: 확인대화상자, custom: 커스텀)
+- 크기: {config.get('size') or 'md'} (sm: 400px, md: 600px, lg: 800px, xl: 1200px, full: 전체화면)
+- 필드:
+{field_lines}
+- 내용: {config.get('content') or interaction.get('description') or '-'}
+
+**규칙:**
+- 순수 JavaScript + Tailwind CSS (타입 어노테이션, import/export 금지)
+- React 훅(useState, useEffect)만 사용하고 다른 컴포넌트/아이콘은 참조하지 마세요 (닫기 버튼은 ✕ 문자)
+- 구조: 오버레이 `fixed inset-0 bg-black/50 z-50` + 컨테이너 `fixed inset-0 z-50 flex items-center justify-center`
+  + 내용 `bg-white rounded-lg shadow-xl` (헤더: 제목+닫기, 본문: p-6, 푸터: 버튼)
+- 폼 값은 컴포넌트 내부 useState로 관리하고, 필수 항목 검사 후 저장 시 alert 후 onClose()
+- 컬러: {get_essential_colors()}
+- 코드 블록 하나로 `function ForgeModal{index}`만 출력하세요.
+"""
+
+
 def _format_layout_areas(layout_areas: list) -> str:
     """레이아웃 영역 정보를 간결하게 포맷팅 (토큰 최적화)"""
     if not layout_areas:
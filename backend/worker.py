@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+ForgeFlow - 생성 작업 워커 (독립 실행)
+
+API 서버와 별도로 생성 작업 큐(generation_jobs)를 처리합니다.
+API 서버는 JOB_WORKERS=0으로 두고 이 프로세스를 원하는 개수만큼 실행하면
+동시 생성 수를 API 워커 수와 독립적으로 조절할 수 있습니다.
+
+Usage:
+    python worker.py
+"""
+
+import os
+import asyncio
+import logging
+import signal
+
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("forgeflow.worker")
+
+
+async def main():
+    from services.job_queue import get_job_queue
+    from services.gemini_client import close_gemini_client
+    from services.event_bus import get_event_bus
+    from services.docx_renderer import get_docx_render_pool
+    from services.usage_metrics import get_usage_recorder
+    # 작업 핸들러 등록 (routers.ai import 시 등록됨)
+    import routers.ai  # noqa: F401
+
+    queue = get_job_queue()
+    if queue.worker_count <= 0:
+        queue.worker_count = int(os.getenv("JOB_STANDALONE_WORKERS", "2"))
+
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except NotImplementedError:
+            # Windows: 시그널 핸들러 미지원 (Ctrl+C는 KeyboardInterrupt로 처리)
+            pass
+
+    await queue.start()
+    logger.info(f"[WORKER] Running {queue.worker_count} worker(s). Press Ctrl+C to stop.")
+    try:
+        await stop_event.wait()
+    finally:
+        logger.info("[WORKER] Shutting down...")
+        await queue.stop()
+        await close_gemini_client()
+        await get_usage_recorder().flush_async()
+        await get_event_bus().close()
+        await asyncio.to_thread(get_docx_render_pool().shutdown)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
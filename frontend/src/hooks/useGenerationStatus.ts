@@ -1,7 +1,8 @@
 /**
- * useGenerationStatus - AI 생성 상태 폴링 훅
+ * useGenerationStatus - AI 생성 상태 구독 훅
  * 
- * 3초마다 서버에 생성 상태를 요청하여 실시간 진행 상황을 추적합니다.
+ * 서버의 SSE 채널(/api/ai/events/{screenId})로 진행 상황을 푸시받습니다.
+ * EventSource를 사용할 수 없거나 연결이 끊기면 기존 폴링 방식으로 대체합니다.
  */
 
 import { useState, useEffect, useRef, useCallback } from 'react';
@@ -20,7 +21,7 @@ export interface GenerationStatus {
 interface UseGenerationStatusOptions {
   screenId: number | null;
   enabled: boolean;
-  pollInterval?: number; // 밀리초 (기본: 3000ms)
+  pollInterval?: number; // 폴링 대체 시 간격, 밀리초 (기본: 3000ms)
   onComplete?: (status: GenerationStatus) => void;
   onError?: (error: Error) => void;
 }
@@ -46,6 +47,7 @@ export const useGenerationStatus = ({
   const [error, setError] = useState<Error | null>(null);
   
   const intervalRef = useRef<number | null>(null);
+  const eventSourceRef = useRef<EventSource | null>(null);
   const previousStatusRef = useRef<string | null>(null);
 
   // 콜백을 ref로 저장하여 dependency 문제 해결
@@ -57,6 +59,39 @@ export const useGenerationStatus = ({
     onErrorRef.current = onError;
   }, [onComplete, onError]);
 
+  // 완료/실패 시 구독 중지
+  const stopTracking = useCallback(() => {
+    if (intervalRef.current) {
+      clearInterval(intervalRef.current);
+      intervalRef.current = null;
+    }
+    if (eventSourceRef.current) {
+      eventSourceRef.current.close();
+      eventSourceRef.current = null;
+    }
+  }, []);
+
+  // 새 상태 반영 (SSE/폴링 공통)
+  const handleStatus = useCallback((newStatus: GenerationStatus) => {
+    setStatus(newStatus);
+
+    // 상태 변경 감지 및 콜백 호출
+    if (previousStatusRef.current !== newStatus.generation_status) {
+      console.log(`[useGenerationStatus] Status changed: ${previousStatusRef.current} → ${newStatus.generation_status}`);
+      previousStatusRef.current = newStatus.generation_status;
+
+      // 완료 시 콜백 호출
+      if (newStatus.generation_status === 'completed' && onCompleteRef.current) {
+        onCompleteRef.current(newStatus);
+      }
+    }
+
+    // 완료 또는 실패 시 구독 중지
+    if (newStatus.generation_status === 'completed' || newStatus.generation_status === 'failed') {
+      stopTracking();
+    }
+  }, [stopTracking]);
+
   // 상태 조회 함수
   const fetchStatus = useCallback(async () => {
     if (!screenId || !enabled) return;
@@ -69,28 +104,7 @@ export const useGenerationStatus = ({
         `${API_BASE_URL}/api/ai/status/${screenId}`
       );
 
-      const newStatus = response.data;
-      setStatus(newStatus);
-
-      // 상태 변경 감지 및 콜백 호출
-      if (previousStatusRef.current !== newStatus.generation_status) {
-        console.log(`[useGenerationStatus] Status changed: ${previousStatusRef.current} → ${newStatus.generation_status}`);
-        previousStatusRef.current = newStatus.generation_status;
-
-        // 완료 시 콜백 호출
-        if (newStatus.generation_status === 'completed' && onCompleteRef.current) {
-          onCompleteRef.current(newStatus);
-        }
-      }
-
-      // 완료 또는 실패 시 폴링 중지
-      if (newStatus.generation_status === 'completed' || newStatus.generation_status === 'failed') {
-        if (intervalRef.current) {
-          clearInterval(intervalRef.current);
-          intervalRef.current = null;
-        }
-      }
-
+      handleStatus(response.data);
       setIsLoading(false);
     } catch (err) {
       const error = err as Error;
@@ -102,43 +116,58 @@ export const useGenerationStatus = ({
         onErrorRef.current(error);
       }
     }
-  }, [screenId, enabled]);
+  }, [screenId, enabled, handleStatus]);
 
-  // 폴링 시작/중지
+  // 폴링 시작 (SSE 미지원/실패 시 대체 경로)
+  const startPolling = useCallback(() => {
+    if (intervalRef.current) return;
+    console.log('[useGenerationStatus] 폴링 모드로 전환');
+    fetchStatus();
+    intervalRef.current = setInterval(() => {
+      fetchStatus();
+    }, pollInterval);
+  }, [fetchStatus, pollInterval]);
+
+  // SSE 구독 시작/중지
   useEffect(() => {
     if (!enabled || !screenId) {
-      // 폴링 중지
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current);
-        intervalRef.current = null;
-      }
+      stopTracking();
       // 상태 초기화
       previousStatusRef.current = null;
       setStatus(null);
       return;
     }
 
-    // 폴링 시작 시 이전 상태 초기화 (중요!)
+    // 구독 시작 시 이전 상태 초기화 (중요!)
     previousStatusRef.current = null;
     setStatus(null);
-    console.log('[useGenerationStatus] 폴링 시작 - 이전 상태 초기화');
 
-    // 즉시 첫 조회
-    fetchStatus();
+    if (typeof EventSource === 'undefined') {
+      startPolling();
+      return stopTracking;
+    }
 
-    // 폴링 시작
-    intervalRef.current = setInterval(() => {
-      fetchStatus();
-    }, pollInterval);
+    console.log('[useGenerationStatus] SSE 구독 시작 - 이전 상태 초기화');
+    setIsLoading(true);
+    const source = new EventSource(`${API_BASE_URL}/api/ai/events/${screenId}`);
+    eventSourceRef.current = source;
 
-    // 클린업
-    return () => {
-      if (intervalRef.current) {
-        clearInterval(intervalRef.current);
-        intervalRef.current = null;
-      }
+    source.addEventListener('status', (event) => {
+      setIsLoading(false);
+      handleStatus(JSON.parse((event as MessageEvent).data) as GenerationStatus);
+    });
+
+    source.onerror = () => {
+      // 정상 종료(완료/실패 후 서버가 스트림을 닫은 경우)는 무시
+      if (eventSourceRef.current !== source) return;
+      source.close();
+      eventSourceRef.current = null;
+      startPolling();
     };
-  }, [enabled, screenId, pollInterval, fetchStatus]);
+
+    // 클린업
+    return stopTracking;
+  }, [enabled, screenId, handleStatus, startPolling, stopTracking]);
 
   return {
     status,